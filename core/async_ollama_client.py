@@ -9,6 +9,15 @@ Features:
 - Connection pooling
 - 3-5x throughput vs sync version
 - All protections preserved (cache, circuit breaker, rate limiter)
+- Single-flight: duplicate in-flight prompts/texts share one request
+- embed_batch(): one /api/embed request per embed_batch_size texts
+- Persistent EmbeddingCache shared with the sync client
+- chat_stream() / chat_until(): NDJSON streaming with early stop
+- call_profile: per-call-site num_predict + token accounting (shared TokenBudget)
+- LLMScheduler: priority admission shared with the sync client (never blocks the loop)
+- OllamaPool: per-model endpoint routing shared with the sync client
+- Tracing: chat() / embed() are llm.* spans (prompt size, tokens, cache, coalesced)
+- keep_alive on every request; PromptPrefixCache (prefix reuse, primed context mode)
 
 Usage:
     async with AsyncOllamaClient(cfg) as client:
@@ -27,9 +36,10 @@ Usage:
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import time
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Iterable, Optional
 
 try:
     import aiohttp
@@ -38,10 +48,20 @@ except ImportError:
     AIOHTTP_AVAILABLE = False
     aiohttp = None  # type: ignore
 
-from core.circuit_breaker import CircuitBreaker, CircuitBreakerOpen, get_registry
+from core.circuit_breaker import CircuitBreakerOpen
 from core.llm_cache import LLMCache
+from core.llm_scheduler import LLMScheduler, SchedulerRejected, get_llm_scheduler
+from core.llm_stream import EarlyStop
+from core.ollama_pool import OllamaEndpoint, OllamaPool, get_ollama_pool
+from core.prompt_prefix import PRIME_PROMPT, PromptPrefixCache, get_prompt_prefix_cache
 from core.rate_limiter import MultiRateLimiter
 from core.metrics import get_metrics
+from core.ollama_client import DEFAULT_EMBED_BATCH_SIZE, make_embedding_cache, text_hash
+from core.single_flight import AsyncSingleFlight
+from core.token_budget import (
+    DEFAULT_PROFILE, TokenBudget, charged_to_next_tick, get_token_budget,
+)
+from core.tracing import annotate, traced
 
 log = logging.getLogger("digital_being.async_ollama")
 
@@ -64,8 +84,14 @@ class AsyncOllamaClient:
         ollama_cfg = cfg.get("ollama", {})
         self._strategy_model: str = ollama_cfg.get("strategy_model", "llama3.2")
         self._embed_model: str = ollama_cfg.get("embed_model", "nomic-embed-text")
-        self._base_url: str = ollama_cfg.get("base_url", "http://localhost:11434")
         self._timeout: int = int(ollama_cfg.get("timeout_sec", 30))
+        keep_alive = ollama_cfg.get("keep_alive")
+        self._keep_alive_kw: dict[str, Any] = (
+            {"keep_alive": keep_alive} if keep_alive is not None else {}
+        )
+        self._embed_batch_size: int = max(
+            1, int(ollama_cfg.get("embed_batch_size", DEFAULT_EMBED_BATCH_SIZE))
+        )
         self._max_calls: int = int(
             cfg.get("resources", {}).get("budget", {}).get("max_llm_calls", 10)
         )
@@ -73,21 +99,26 @@ class AsyncOllamaClient:
         self._base_delay: float = 1.0
         
         self.calls_this_tick: int = 0
+        self.calls_next_tick: int = 0   # prefetch calls made ahead of the next tick
         
-        # Protections (same as sync version)
-        self._circuit_breaker = CircuitBreaker(
-            name="ollama_async",
-            failure_threshold=5,
-            recovery_timeout=30.0,
-            success_threshold=2,
-        )
-        get_registry().register(self._circuit_breaker)
+        # Protections (same as sync version): endpoint pool with per-endpoint
+        # breakers — shared with the sync client, so load and health are too
+        self._pool: OllamaPool = get_ollama_pool(cfg)
         
-        cache_cfg = cfg.get("cache", {})
-        self._cache = LLMCache(
-            max_size=cache_cfg.get("max_size", 100),
-            ttl_seconds=cache_cfg.get("ttl_seconds", 300.0),
-        )
+        # Same tiered cache as the sync client (semantic lookup needs a
+        # sync embed_fn, so it is only enabled there)
+        self._cache = LLMCache.from_config(cfg.get("cache", {}))
+
+        # Coalesce identical in-flight chat/embed calls (one Ollama request)
+        self._inflight = AsyncSingleFlight()
+        
+        # Persistent embedding cache (same files/instance as the sync client)
+        self.embedding_cache = make_embedding_cache(cfg, self._embed_model)
+        
+        # Per-call-site generation limits (same instance as the sync client)
+        self.token_budget: TokenBudget = get_token_budget(cfg)
+        self.prompt_prefix: PromptPrefixCache = get_prompt_prefix_cache(cfg)
+        self._scheduler: LLMScheduler = get_llm_scheduler(cfg)
         
         rate_cfg = cfg.get("rate_limit", {})
         self._rate_limiters = MultiRateLimiter()
@@ -144,19 +175,42 @@ class AsyncOllamaClient:
             log.debug("Closed aiohttp session")
     
     def reset_tick_counter(self) -> None:
-        """Reset budget counter."""
-        self.calls_this_tick = 0
+        """Reset budget counter (prefetch calls are carried over)."""
+        self.calls_this_tick, self.calls_next_tick = self.calls_next_tick, 0
     
     def _check_budget(self) -> bool:
         """Check if budget available."""
-        if self.calls_this_tick >= self._max_calls:
+        used = self.calls_next_tick if charged_to_next_tick() else self.calls_this_tick
+        if used >= self._max_calls:
             log.warning(
                 f"LLM budget exhausted "
-                f"({self.calls_this_tick}/{self._max_calls})"
+                f"({used}/{self._max_calls})"
             )
             return False
         return True
     
+    def _charge_call(self) -> None:
+        if charged_to_next_tick():
+            self.calls_next_tick += 1
+        else:
+            self.calls_this_tick += 1
+    
+    def _refund_call(self) -> None:
+        # A prefetch call may fail after reset_tick_counter() carried it over
+        if charged_to_next_tick() and self.calls_next_tick > 0:
+            self.calls_next_tick -= 1
+        else:
+            self.calls_this_tick = max(0, self.calls_this_tick - 1)
+    
+    def _cache_variant(self, call_profile: str | None) -> str:
+        """Cache / single-flight variant: the same prompt to another model or profile differs."""
+        return f"{self._strategy_model}:{call_profile or DEFAULT_PROFILE}"
+    
+    async def _scheduled_call(self, priority, model: str, fn):
+        """One attempt: wait for an Ollama slot (not held across backoff), then call the pool."""
+        async with self._scheduler.slot_async(priority):
+            return await self._pool.call_async(model, fn)
+    
     async def _retry_with_backoff_async(self, operation, context: str):
         """Асинхронный retry с backoff."""
         delay = self._base_delay
@@ -165,6 +219,8 @@ class AsyncOllamaClient:
         for attempt in range(self._max_retries):
             try:
                 return await operation()
+            except (CircuitBreakerOpen, SchedulerRejected):
+                raise
             except Exception as e:
                 last_exception = e
                 
@@ -192,11 +248,15 @@ class AsyncOllamaClient:
         
         return None
     
-    async def chat(self, prompt: str, system: str = "") -> str:
+    @traced("llm.chat")
+    async def chat(
+        self, prompt: str, system: str = "", call_profile: str | None = None
+    ) -> str:
         """
         Async chat request.
         
         Все защиты активны: rate limiter, cache, circuit breaker, retry.
+        call_profile задаёт num_predict и учёт токенов (TokenBudget).
         """
         await self._ensure_session()
         
@@ -206,6 +266,10 @@ class AsyncOllamaClient:
         start_time = time.time()
         cached = False
         success = False
+        annotate(
+            model=self._strategy_model, profile=call_profile,
+            prompt_chars=len(system) + len(prompt),
+        )
         
         try:
             # Rate limiting (async-safe)
@@ -221,17 +285,18 @@ class AsyncOllamaClient:
             ).inc()
             
             # Cache check
-            cached_response = self._cache.get(prompt, system)
+            variant = self._cache_variant(call_profile)
+            cached_response = self._cache.get(prompt, system, variant)
             if cached_response is not None:
                 log.debug(f"Cache HIT for chat (len={len(prompt)})")
                 cached = True
                 success = True
                 self._metrics.record_cache_hit("llm")
+                annotate(cache="hit")
                 return cached_response
             
             self._metrics.record_cache_miss("llm")
-            
-            self.calls_this_tick += 1
+            annotate(cache="miss")
             
             # Prepare request
             messages = []
@@ -239,34 +304,59 @@ class AsyncOllamaClient:
                 messages.append({"role": "system", "content": system})
             messages.append({"role": "user", "content": prompt})
             
-            async def _do_chat():
-                url = f"{self._base_url}/api/chat"
+            num_predict = self.token_budget.num_predict(call_profile)
+            priority = self._scheduler.priority_for(call_profile)
+            
+            async def _do_chat(ep: OllamaEndpoint):
+                if system and self.prompt_prefix.uses_context(call_profile):
+                    data = await self._generate_in_context(ep, system, prompt, num_predict)
+                    content = data["response"]
+                    self._record_tokens(call_profile, data, system, prompt, content)
+                    return content
+                
+                url = f"{ep.url}/api/chat"
                 payload = {
                     "model": self._strategy_model,
                     "messages": messages,
                     "stream": False,
-                    "options": {"num_predict": 512},
+                    "options": {"num_predict": num_predict},
+                    **self._keep_alive_kw,
                 }
                 
                 async with self._session.post(url, json=payload) as resp:
                     resp.raise_for_status()
                     data = await resp.json()
-                    return data["message"]["content"]
+                    content = data["message"]["content"]
+                    self._record_tokens(call_profile, data, system, prompt, content)
+                    return content
             
             async def _do_chat_with_retry():
-                return await self._retry_with_backoff_async(_do_chat, "chat")
+                # Each attempt picks an endpoint (failover on retry)
+                return await self._retry_with_backoff_async(
+                    lambda: self._scheduled_call(priority, self._strategy_model, _do_chat), "chat"
+                )
             
-            # Circuit breaker (sync wrapper for async)
-            text = self._circuit_breaker.call(
-                lambda: asyncio.get_event_loop().run_until_complete(_do_chat_with_retry())
-            )
+            async def _call_once() -> str | None:
+                # Only the single-flight leader spends budget and fills the cache
+                self._charge_call()
+                try:
+                    result = await _do_chat_with_retry()
+                except Exception:
+                    self._refund_call()
+                    raise
+                if result is None:
+                    self._refund_call()
+                    return None
+                self._cache.set(prompt, system, result, variant)
+                return result
             
+            text, shared = await self._inflight.do(
+                ("chat", self._cache.key_for(prompt, system, variant)), _call_once
+            )
+            if shared:
+                annotate(coalesced=True)
             if text is None:
-                self.calls_this_tick -= 1
                 return ""
-            
-            # Cache response
-            self._cache.set(prompt, system, text)
             success = True
             
             log.debug(f"chat() {self.calls_this_tick}/{self._max_calls}: {len(text)} chars")
@@ -274,12 +364,13 @@ class AsyncOllamaClient:
             
         except CircuitBreakerOpen as e:
             log.warning(f"Chat blocked by circuit breaker: {e}")
-            self.calls_this_tick -= 1
+            return ""
+        except SchedulerRejected as e:
+            log.warning(f"Chat not scheduled: {e}")
             return ""
         except Exception as e:
             log.error(f"Chat failed: {e}")
             self._metrics.record_error("ollama_async", type(e).__name__)
-            self.calls_this_tick -= 1
             return ""
         finally:
             duration = time.time() - start_time
@@ -291,6 +382,188 @@ class AsyncOllamaClient:
                 cached=cached
             )
     
+    async def chat_stream(
+        self,
+        prompt: str,
+        system: str = "",
+        stop: EarlyStop | None = None,
+        call_profile: str | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Async iterator over response chunks (/api/chat with stream=true).
+        
+        Если передан stop — поток закрывается, как только stop.feed()
+        сообщает о завершении ответа; Ollama прекращает генерацию.
+        Без retry и single-flight (частично выданный поток не повторить).
+        """
+        await self._ensure_session()
+        
+        if not self._check_budget():
+            return
+        
+        start_time = time.time()
+        cached = False
+        success = False
+        spent = False
+        parts: list[str] = []
+        
+        try:
+            if not await self._rate_limiters.acquire_async("chat"):
+                log.warning("Chat rate limit exceeded - stream blocked")
+                self._metrics.rate_limit_requests_total.labels(
+                    limiter="chat", status="rejected"
+                ).inc()
+                return
+            
+            self._metrics.rate_limit_requests_total.labels(
+                limiter="chat", status="accepted"
+            ).inc()
+            
+            variant = self._cache_variant(call_profile)
+            cached_response = self._cache.get(prompt, system, variant)
+            if cached_response is not None:
+                cached = True
+                success = True
+                self._metrics.record_cache_hit("llm")
+                if stop is not None:
+                    stop.feed(cached_response)
+                yield cached_response
+                return
+            
+            self._metrics.record_cache_miss("llm")
+            
+            messages = []
+            if system:
+                messages.append({"role": "system", "content": system})
+            messages.append({"role": "user", "content": prompt})
+            payload = {
+                "model": self._strategy_model,
+                "messages": messages,
+                "stream": True,
+                "options": {"num_predict": self.token_budget.num_predict(call_profile)},
+                **self._keep_alive_kw,
+            }
+            
+            self._charge_call()
+            spent = True
+            data: dict = {}
+            async with self._scheduler.slot_async(self._scheduler.priority_for(call_profile)):
+                with self._pool.stream(self._strategy_model) as ep:
+                    url = f"{ep.url}/api/chat"
+                    async with self._session.post(url, json=payload) as resp:
+                        resp.raise_for_status()
+                        # Ollama streams NDJSON: one {"message": {...}, "done": ...} per line
+                        async for line in resp.content:
+                            line = line.strip()
+                            if not line:
+                                continue
+                            data = json.loads(line)
+                            chunk = data.get("message", {}).get("content", "")
+                            if chunk:
+                                parts.append(chunk)
+                                yield chunk
+                                if stop is not None and stop.feed(chunk):
+                                    break
+                            if data.get("done"):
+                                break
+            success = True
+            self._record_tokens(call_profile, data, system, prompt, "".join(parts))
+            
+            if stop is None or not stop.done:
+                self._cache.set(prompt, system, "".join(parts), variant)
+            elif stop.reason == "json":
+                self._cache.set(prompt, system, stop.text(), variant)
+            
+        except GeneratorExit:
+            success = True
+            raise
+        except CircuitBreakerOpen as e:
+            if spent and not parts:
+                self._refund_call()
+            log.warning(f"Chat stream blocked by circuit breaker: {e}")
+        except SchedulerRejected as e:
+            if spent and not parts:
+                self._refund_call()
+            log.warning(f"Chat stream not scheduled: {e}")
+        except Exception as e:
+            if spent and not parts:
+                self._refund_call()
+            log.error(f"Chat stream failed: {e}")
+            self._metrics.record_error("ollama_async", type(e).__name__)
+        finally:
+            self._metrics.record_llm_call(
+                model=self._strategy_model,
+                operation="chat_stream",
+                duration=time.time() - start_time,
+                success=success,
+                cached=cached
+            )
+    
+    async def chat_until(
+        self,
+        prompt: str,
+        system: str = "",
+        json_object: bool = True,
+        stop_patterns: Iterable[str] | None = None,
+        call_profile: str | None = None,
+    ) -> str:
+        """
+        chat(), останавливающий генерацию на завершённом ответе.
+        
+        По умолчанию — после первого сбалансированного JSON-объекта.
+        """
+        stop = EarlyStop(json_object=json_object, stop_patterns=stop_patterns)
+        async for _ in self.chat_stream(prompt, system, stop=stop, call_profile=call_profile):
+            pass
+        return stop.text()
+    
+    async def _generate_in_context(
+        self, ep: OllamaEndpoint, system: str, prompt: str, num_predict: int
+    ) -> dict:
+        """Режим "context": /api/generate поверх один раз прогретого system-префикса."""
+        url = f"{ep.url}/api/generate"
+        context = self.prompt_prefix.context_for(ep.url, self._strategy_model, system)
+        if context is None:
+            prime = {
+                "model": self._strategy_model,
+                "system": system,
+                "prompt": PRIME_PROMPT,
+                "stream": False,
+                "options": {"num_predict": 1},
+                **self._keep_alive_kw,
+            }
+            async with self._session.post(url, json=prime) as resp:
+                resp.raise_for_status()
+                context = (await resp.json()).get("context") or []
+            self.prompt_prefix.store_context(ep.url, self._strategy_model, system, context)
+        
+        payload: dict[str, Any] = {
+            "model": self._strategy_model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {"num_predict": num_predict},
+            **self._keep_alive_kw,
+        }
+        if context:
+            payload["context"] = context
+        else:
+            payload["system"] = system   # server returned no context
+        async with self._session.post(url, json=payload) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+    
+    def _record_tokens(
+        self, call_profile: str | None, data: dict, system: str, prompt: str, output: str
+    ) -> None:
+        """Учесть токены вызова: счётчики Ollama, иначе оценка; время prompt eval."""
+        prompt_tokens = data.get("prompt_eval_count") or self.token_budget.estimate(system + prompt)
+        output_tokens = data.get("eval_count") or self.token_budget.estimate(output)
+        self.token_budget.record(
+            call_profile, prompt_tokens, output_tokens, model=self._strategy_model,
+        )
+        self.prompt_prefix.record(call_profile, system, data)
+        annotate(prompt_tokens=prompt_tokens, output_tokens=output_tokens)
+    
     async def chat_batch(self, prompts: list[str], system: str = "") -> list[str]:
         """
         Batch chat requests - выполняется concurrent!
@@ -300,10 +573,21 @@ class AsyncOllamaClient:
         tasks = [self.chat(prompt, system) for prompt in prompts]
         return await asyncio.gather(*tasks)
     
+    @traced("llm.embed")
     async def embed(self, text: str) -> list[float]:
         """
-        Async embedding request.
+        Async embedding request (embedding cache first).
         """
+        annotate(model=self._embed_model, text_chars=len(text))
+        if self.embedding_cache is not None:
+            cached_vec = self.embedding_cache.get(text)
+            if cached_vec is not None:
+                self._metrics.record_cache_hit("embedding")
+                annotate(cache="hit")
+                return cached_vec
+            self._metrics.record_cache_miss("embedding")
+            annotate(cache="miss")
+        
         await self._ensure_session()
         
         start_time = time.time()
@@ -322,11 +606,12 @@ class AsyncOllamaClient:
                 limiter="embed", status="accepted"
             ).inc()
             
-            async def _do_embed():
-                url = f"{self._base_url}/api/embed"
+            async def _do_embed(ep: OllamaEndpoint):
+                url = f"{ep.url}/api/embed"
                 payload = {
                     "model": self._embed_model,
                     "input": text,
+                    **self._keep_alive_kw,
                 }
                 
                 async with self._session.post(url, json=payload) as resp:
@@ -336,18 +621,27 @@ class AsyncOllamaClient:
                     return embeddings[0] if embeddings else []
             
             async def _do_embed_with_retry():
-                return await self._retry_with_backoff_async(_do_embed, "embed")
+                return await self._retry_with_backoff_async(
+                    lambda: self._scheduled_call(priority, self._embed_model, _do_embed), "embed"
+                )
             
-            result = self._circuit_breaker.call(
-                lambda: asyncio.get_event_loop().run_until_complete(_do_embed_with_retry())
-            )
+            priority = self._scheduler.priority_for()
+            
+            result, shared = await self._inflight.do(("embed", text_hash(text)), _do_embed_with_retry)
+            if shared:
+                annotate(coalesced=True)
             
             success = result is not None and len(result) > 0
+            if success and self.embedding_cache is not None:
+                self.embedding_cache.put(text, result)
             return result if result is not None else []
             
         except CircuitBreakerOpen as e:
             log.warning(f"Embed blocked by circuit breaker: {e}")
             return []
+        except SchedulerRejected as e:
+            log.warning(f"Embed not scheduled: {e}")
+            return []
         except Exception as e:
             log.error(f"Embed failed: {e}")
             self._metrics.record_error("ollama_async", type(e).__name__)
@@ -362,34 +656,137 @@ class AsyncOllamaClient:
                 cached=False
             )
     
-    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+    async def embed_batch(
+        self, texts: list[str], batch_size: int | None = None
+    ) -> list[list[float]]:
         """
-        Batch embedding requests - concurrent!
+        Batched embeddings: one /api/embed request per batch_size texts,
+        chunks sent concurrently. Identical texts are sent once.
         
-        5-10x быстрее чем sequential.
+        Returns one vector per input, in order; [] for failed items.
+        A failed chunk is retried item by item via embed().
         """
-        tasks = [self.embed(text) for text in texts]
-        return await asyncio.gather(*tasks)
+        results: list[list[float]] = [[] for _ in texts]
+        if not texts:
+            return results
+        
+        size = max(1, batch_size or self._embed_batch_size)
+        positions: dict[str, list[int]] = {}
+        unique: list[tuple[str, str]] = []
+        for i, text in enumerate(texts):
+            key = text_hash(text)
+            if key not in positions:
+                positions[key] = []
+                unique.append((key, text))
+            positions[key].append(i)
+        
+        # Embedding cache hits never reach Ollama
+        misses: list[tuple[str, str]] = []
+        for key, text in unique:
+            cached_vec = (
+                self.embedding_cache.get(text) if self.embedding_cache is not None else None
+            )
+            if cached_vec is None:
+                misses.append((key, text))
+                continue
+            for i in positions[key]:
+                results[i] = cached_vec
+        
+        chunks = [misses[s:s + size] for s in range(0, len(misses), size)]
+        chunk_vectors = await asyncio.gather(
+            *(self._embed_chunk([text for _, text in chunk]) for chunk in chunks)
+        )
+        for chunk, vectors in zip(chunks, chunk_vectors):
+            if vectors is None:
+                vectors = await asyncio.gather(*(self.embed(text) for _, text in chunk))
+            for (key, text), vec in zip(chunk, vectors):
+                if vec and self.embedding_cache is not None:
+                    self.embedding_cache.put(text, vec)
+                for i in positions[key]:
+                    results[i] = vec
+        return results
     
-    async def is_available(self) -> bool:
-        """Проверить доступность Ollama."""
+    async def _embed_chunk(self, chunk: list[str]) -> list[list[float]] | None:
+        """One batched /api/embed call. Returns None if the batch failed."""
         await self._ensure_session()
         
+        start_time = time.time()
+        success = False
+        
         try:
-            url = f"{self._base_url}/api/tags"
-            async with self._session.get(url) as resp:
+            if not await self._rate_limiters.acquire_async("embed"):
+                log.warning("Embed rate limit exceeded - batch blocked")
+                self._metrics.rate_limit_requests_total.labels(
+                    limiter="embed", status="rejected"
+                ).inc()
+                return None
+            
+            self._metrics.rate_limit_requests_total.labels(
+                limiter="embed", status="accepted"
+            ).inc()
+            
+            async def _do_embed(ep: OllamaEndpoint):
+                url = f"{ep.url}/api/embed"
+                payload = {"model": self._embed_model, "input": chunk, **self._keep_alive_kw}
+                async with self._session.post(url, json=payload) as resp:
+                    resp.raise_for_status()
+                    data = await resp.json()
+                    return data.get("embeddings", [])
+            
+            vectors = await self._retry_with_backoff_async(
+                lambda: self._scheduled_call(None, self._embed_model, _do_embed), "embed_batch"
+            )
+            if vectors is None or len(vectors) != len(chunk):
+                log.warning(
+                    f"embed_batch(): batch of {len(chunk)} returned "
+                    f"{0 if vectors is None else len(vectors)} vectors — falling back."
+                )
+                return None
+            success = True
+            return vectors
+            
+        except CircuitBreakerOpen as e:
+            log.warning(f"Embed batch blocked by circuit breaker: {e}")
+            return [[] for _ in chunk]
+        except SchedulerRejected as e:
+            log.warning(f"Embed batch not scheduled: {e}")
+            return [[] for _ in chunk]
+        except Exception as e:
+            log.error(f"Embed batch failed: {e}")
+            self._metrics.record_error("ollama_async", type(e).__name__)
+            return None
+        finally:
+            self._metrics.record_llm_call(
+                model=self._embed_model,
+                operation="embed_batch",
+                duration=time.time() - start_time,
+                success=success,
+                cached=False
+            )
+    
+    async def is_available(self) -> bool:
+        """
+        Проверить доступность Ollama: пингует все endpoints,
+        недоступные исключаются из пула, восстановившиеся возвращаются.
+        """
+        await self._ensure_session()
+        
+        async def _probe(ep: OllamaEndpoint) -> bool:
+            async with self._session.get(f"{ep.url}/api/tags") as resp:
                 resp.raise_for_status()
                 return True
-        except Exception as e:
-            log.warning(f"Ollama unavailable: {e}")
-            return False
+        
+        results = await self._pool.check_async(_probe)
+        if not any(results.values()):
+            log.warning(f"Ollama unavailable: {self._pool.get_stats()}")
+        return self._pool.is_routable(self._strategy_model)
     
     # Monitoring (same as sync version)
     def get_circuit_state(self) -> str:
-        return self._circuit_breaker.get_state()
+        return self._pool.get_state(self._strategy_model)
     
     def get_circuit_stats(self) -> dict:
-        return self._circuit_breaker.get_stats()
+        return self._pool.get_stats()
     
     def get_cache_stats(self) -> dict:
         return self._cache.get_stats()
@@ -402,8 +799,16 @@ class AsyncOllamaClient:
             "circuit_breaker": self.get_circuit_stats(),
             "cache": self.get_cache_stats(),
             "rate_limiters": self.get_rate_limiter_stats(),
+            "token_budget": self.token_budget.get_stats(),
+            "prompt_prefix": self.prompt_prefix.get_stats(),
+            "scheduler": self._scheduler.get_stats(),
+            "single_flight": self._inflight.get_stats(),
+            "embedding_cache": (
+                self.embedding_cache.get_stats() if self.embedding_cache is not None else {}
+            ),
             "budget": {
                 "calls_this_tick": self.calls_this_tick,
+                "calls_next_tick": self.calls_next_tick,
                 "max_calls": self._max_calls,
                 "remaining": self._max_calls - self.calls_this_tick,
             },
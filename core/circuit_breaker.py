@@ -19,8 +19,9 @@ from __future__ import annotations
 
 import logging
 import time
+from contextlib import contextmanager
 from enum import Enum
-from typing import Callable, Any, TypeVar
+from typing import Awaitable, Callable, Any, Iterator, TypeVar
 
 log = logging.getLogger("digital_being.circuit_breaker")
 
@@ -86,6 +87,16 @@ class CircuitBreaker:
             f"success_threshold={success_threshold}"
         )
     
+    def _before_call(self) -> None:
+        if self._state == CircuitState.OPEN:
+            if self._should_attempt_reset():
+                self._transition_to_half_open()
+            else:
+                raise CircuitBreakerOpen(
+                    f"Circuit breaker '{self._name}' is OPEN. "
+                    f"Will retry in {self._time_until_retry():.1f}s"
+                )
+
     def call(self, operation: Callable[[], T]) -> T:
         """
         Выполнить операцию через circuit breaker.
@@ -100,14 +111,7 @@ class CircuitBreaker:
             CircuitBreakerOpen: Если circuit открыт
             Exception: Оригинальное исключение от operation
         """
-        if self._state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self._transition_to_half_open()
-            else:
-                raise CircuitBreakerOpen(
-                    f"Circuit breaker '{self._name}' is OPEN. "
-                    f"Will retry in {self._time_until_retry():.1f}s"
-                )
+        self._before_call()
         
         try:
             result = operation()
@@ -117,6 +121,39 @@ class CircuitBreaker:
             self._on_failure()
             raise
     
+    async def call_async(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Async вариант call(): operation — фабрика корутины."""
+        self._before_call()
+        
+        try:
+            result = await operation()
+            self._on_success()
+            return result
+        except Exception:
+            self._on_failure()
+            raise
+    
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        Вариант call() для потоковых операций (chat_stream).
+        
+        Работает и внутри генераторов: закрытие генератора потребителем
+        (GeneratorExit) считается успехом, а не сбоем сервиса.
+        """
+        self._before_call()
+        
+        try:
+            yield
+        except GeneratorExit:
+            self._on_success()
+            raise
+        except Exception:
+            self._on_failure()
+            raise
+        else:
+            self._on_success()
+    
     def _should_attempt_reset(self) -> bool:
         """Проверить можно ли попробовать восстановление."""
         elapsed = time.time() - self._last_failure_time
@@ -186,6 +223,10 @@ class CircuitBreaker:
             f"Service recovered!"
         )
     
+    def allows_request(self) -> bool:
+        """Пропустит ли breaker вызов сейчас (CLOSED, HALF_OPEN или истёк timeout)."""
+        return self._state != CircuitState.OPEN or self._should_attempt_reset()
+    
     def get_state(self) -> str:
         """Получить текущее состояние."""
         return self._state.value
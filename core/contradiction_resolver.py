@@ -76,7 +76,8 @@ class ContradictionResolver:
         prompt = f"Проанализируй два утверждения. Противоречат ли они друг другу?\n\nA) {text_a}\nB) {text_b}\n\nОтвечай JSON: {{\"contradicts\": true/false, \"explanation\": \"...\"}}"
         system = "Ты — Digital Being. Отвечай ТОЛЬКО валидным JSON."
         try:
-            response = ollama.chat(prompt, system)
+            # Only the {"contradicts": ...} object is needed — stop generating once it closes
+            response = ollama.chat_until(prompt, system, call_profile="contradiction")
             if not response:
                 return False
             data = json.loads(response)
@@ -0,0 +1,243 @@
+"""
+Embedding Cache
+
+Persistent text → embedding cache shared by every embed path
+(OllamaClient, AsyncOllamaClient, ResilientOllamaClient).
+
+Layout (one directory per embed model):
+    <root>/<model>/meta.json     {"dim": D, "capacity": N}
+    <root>/<model>/vectors.f32   memmap float32 [N, D]
+    <root>/<model>/keys.bin      memmap uint8   [N, 16]  (sha256 prefix; zeros = free)
+    <root>/<model>/stamps.f64    memmap float64 [N]      (last use, for LRU)
+
+Algorithm:
+- Key: first 16 bytes of sha256(text), scoped by model directory
+- LRU eviction: a full cache reuses the least recently used slot
+- Files are memory-mapped: a hit is a dict lookup + one row copy,
+  and the OS page cache keeps hot rows in RAM across restarts
+
+Пример:
+    cache = get_embedding_cache(Path("memory/embeddings"), "nomic-embed-text")
+    vec = cache.get(text)
+    if vec is None:
+        vec = ollama.embed(text)
+        cache.put(text, vec)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+log = logging.getLogger("digital_being.embedding_cache")
+
+DEFAULT_CAPACITY = 50_000
+_KEY_BYTES = 16
+_FLUSH_EVERY = 256   # puts between memmap flushes
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()[:_KEY_BYTES]
+
+
+class EmbeddingCache:
+    """
+    Memory-mapped LRU cache of float32 embeddings for one model.
+
+    The dimension is fixed by the first put() (or read from meta.json).
+    Thread-safe. Errors are logged; the cache then behaves as a miss.
+    """
+
+    def __init__(self, root: Path, model: str, capacity: int = DEFAULT_CAPACITY) -> None:
+        safe_model = re.sub(r"[^A-Za-z0-9_.-]+", "_", model) or "default"
+        self._dir = Path(root) / safe_model
+        self._model = model
+        self._capacity = max(1, int(capacity))
+        self._lock = threading.Lock()
+        self._dim: int | None = None
+        self._vectors: np.memmap | None = None
+        self._keys: np.memmap | None = None
+        self._stamps: np.memmap | None = None
+        self._slots: OrderedDict[bytes, int] = OrderedDict()   # LRU order: oldest first
+        self._free: list[int] = []
+        self._clock = 0.0
+        self._dirty = 0
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        meta_path = self._dir / "meta.json"
+        if meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                self._capacity = int(meta["capacity"])
+                self._open(int(meta["dim"]), create=False)
+            except Exception as e:
+                log.error(f"EmbeddingCache: cannot open {self._dir}: {e} — starting empty.")
+                self._close_maps()
+
+    # ────────────────────────────────────────────────────────────
+    # Files
+    # ────────────────────────────────────────────────────────────
+    def _open(self, dim: int, create: bool) -> None:
+        mode = "w+" if create else "r+"
+        if create:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            (self._dir / "meta.json").write_text(
+                json.dumps({"dim": dim, "capacity": self._capacity, "model": self._model}),
+                encoding="utf-8",
+            )
+        self._vectors = np.memmap(
+            self._dir / "vectors.f32", dtype=np.float32, mode=mode,
+            shape=(self._capacity, dim),
+        )
+        self._keys = np.memmap(
+            self._dir / "keys.bin", dtype=np.uint8, mode=mode,
+            shape=(self._capacity, _KEY_BYTES),
+        )
+        self._stamps = np.memmap(
+            self._dir / "stamps.f64", dtype=np.float64, mode=mode,
+            shape=(self._capacity,),
+        )
+        self._dim = dim
+
+        used = np.flatnonzero(self._keys.any(axis=1))
+        order = used[np.argsort(self._stamps[used], kind="stable")]
+        self._slots = OrderedDict(
+            (self._keys[slot].tobytes(), int(slot)) for slot in order
+        )
+        self._free = sorted(set(range(self._capacity)) - set(int(s) for s in used), reverse=True)
+        self._clock = float(self._stamps[used].max()) if len(used) else 0.0
+        if not create:
+            log.info(
+                f"EmbeddingCache: loaded {len(self._slots)} vectors "
+                f"(dim={dim}, model={self._model})"
+            )
+
+    def _close_maps(self) -> None:
+        self._vectors = self._keys = self._stamps = None
+        self._dim = None
+        self._slots.clear()
+        self._free = []
+
+    def _touch(self, slot: int) -> None:
+        self._clock += 1.0
+        self._stamps[slot] = self._clock
+
+    # ────────────────────────────────────────────────────────────
+    # Get / put
+    # ────────────────────────────────────────────────────────────
+    def get(self, text: str, count_miss: bool = True) -> list[float] | None:
+        """
+        Cached embedding for text, or None.
+        count_miss=False for pre-checks whose miss is counted by a later get().
+        """
+        key = _digest(text)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                if count_miss:
+                    self._misses += 1
+                return None
+            self._slots.move_to_end(key)
+            self._touch(slot)
+            self._hits += 1
+            return self._vectors[slot].tolist()
+
+    def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        return [self.get(text) for text in texts]
+
+    def put(self, text: str, embedding: list[float]) -> None:
+        """Store an embedding (ignored if empty or of the wrong dimension)."""
+        if not embedding:
+            return
+        arr = np.asarray(embedding, dtype=np.float32)
+        key = _digest(text)
+        with self._lock:
+            try:
+                if self._dim is None:
+                    self._open(len(arr), create=True)
+                if arr.shape != (self._dim,):
+                    log.debug(
+                        f"EmbeddingCache: dim {arr.shape} != {self._dim} — not cached."
+                    )
+                    return
+
+                slot = self._slots.get(key)
+                if slot is None:
+                    if self._free:
+                        slot = self._free.pop()
+                    else:
+                        _, slot = self._slots.popitem(last=False)
+                        self._evictions += 1
+                    self._slots[key] = slot
+                else:
+                    self._slots.move_to_end(key)
+
+                self._vectors[slot] = arr
+                self._keys[slot] = np.frombuffer(key, dtype=np.uint8)
+                self._touch(slot)
+
+                self._dirty += 1
+                if self._dirty >= _FLUSH_EVERY:
+                    self._flush_locked()
+            except Exception as e:
+                log.error(f"EmbeddingCache.put() error: {e}")
+
+    def _flush_locked(self) -> None:
+        for arr in (self._vectors, self._keys, self._stamps):
+            if arr is not None:
+                arr.flush()
+        self._dirty = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def get_stats(self) -> dict[str, Any]:
+        total = self._hits + self._misses
+        return {
+            "model": self._model,
+            "size": len(self._slots),
+            "capacity": self._capacity,
+            "dim": self._dim,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / total * 100, 2) if total else 0,
+            "evictions": self._evictions,
+        }
+
+
+# One instance per (directory, model): several clients share the same files
+_caches: dict[tuple[str, str], EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(
+    root: Path, model: str, capacity: int = DEFAULT_CAPACITY
+) -> EmbeddingCache:
+    """Получить общий EmbeddingCache для модели."""
+    key = (str(Path(root).resolve()), model)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(Path(root), model, capacity)
+            _caches[key] = cache
+        return cache
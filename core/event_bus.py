@@ -11,9 +11,41 @@ Features:
   - Error isolation and tracking
   - Dead letter queue for critical events
   - Health reporting for monitoring
+  - Optional per-handler timeouts
+  - Queued dispatch mode: a bounded queue and worker task(s) per subscriber
+
+Dispatch modes:
+  - direct (default): publish() awaits all handlers via asyncio.gather
+  - queued: publish() only enqueues. Each subscription has its own bounded
+    queue drained by `workers` tasks, in order, so a slow or flooded handler
+    never holds up the publisher or the other handlers. When a queue is
+    full the overflow policy applies:
+      drop_oldest — discard the oldest queued event
+      coalesce    — lossless per key: an event with the same key (data[key],
+                    e.g. "path") replaces the queued one in place, an event
+                    with a new key is always queued, so the queue holds at
+                    most one entry per distinct key plus queue_size entries
+                    without a key (the oldest of those is dropped)
+      block       — publish() waits for space (publish_nowait() schedules
+                    the wait as a task)
+  - publish_nowait() is the cheap entry point for other threads:
+    loop.call_soon_threadsafe(bus.publish_nowait, name, data)
+  - get_health_report() includes per-subscription queue depth, drops,
+    coalesced events, timeouts and queue-wait / handler latency
+
+config.yaml:
+    event_bus:
+      mode: queued
+      queue_size: 100
+      overflow: drop_oldest
+      handler_timeout: 120
+      events:
+        world.file_changed: {overflow: coalesce, key: path}
 
 Changelog:
   TD-007 fix — added comprehensive error tracking and monitoring.
+  Perf — queued dispatch with bounded per-subscriber queues, overflow
+         policies and handler timeouts (file-watcher storms).
 """
 
 from __future__ import annotations
@@ -23,13 +55,19 @@ import logging
 import time
 from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Iterable
 
 log = logging.getLogger("digital_being.event_bus")
 
 # Type alias: handler is an async function that receives event data
 Handler = Callable[[dict], Coroutine[Any, Any, None]]
 
+DISPATCH_MODES = ("direct", "queued")
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "block")
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_OVERFLOW = "drop_oldest"
+_EWMA_ALPHA = 0.2
+
 
 @dataclass
 class ErrorRecord:
@@ -41,6 +79,159 @@ class ErrorRecord:
     data: dict
 
 
+class _Subscription:
+    """One handler on one event: options, and in queued mode its queue and workers."""
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        event_name: str,
+        handler: Handler,
+        queue_size: int,
+        overflow: str,
+        key: str | None,
+        timeout: float | None,
+        workers: int,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"EventBus: unknown overflow policy '{overflow}'")
+        self.bus = bus
+        self.event_name = event_name
+        self.handler = handler
+        self.name = getattr(handler, "__name__", type(handler).__name__)
+        self.queue_size = max(1, int(queue_size))
+        self.overflow = overflow
+        self.key = key
+        self.timeout = timeout
+        self.workers = max(1, int(workers))
+
+        self._queue: deque[list] = deque()       # [data, enqueued_at, key]
+        self._by_key: dict[Any, list] = {}
+        self._not_empty: asyncio.Event | None = None
+        self._not_full: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._busy = 0
+
+        self.stats = {
+            "enqueued": 0, "processed": 0, "dropped": 0, "coalesced": 0,
+            "timeouts": 0, "errors": 0, "max_depth": 0,
+        }
+        self._wait_ewma = 0.0
+        self._run_ewma = 0.0
+        self._run_max = 0.0
+
+    # ── handler call (both modes) ──
+    async def call(self, data: dict) -> None:
+        if self.timeout is None:
+            await self.handler(data)
+            return
+        try:
+            await asyncio.wait_for(self.handler(data), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise TimeoutError(f"handler timed out after {self.timeout}s") from None
+
+    def record_run(self, seconds: float) -> None:
+        self.stats["processed"] += 1
+        self._run_ewma = _EWMA_ALPHA * seconds + (1 - _EWMA_ALPHA) * self._run_ewma
+        self._run_max = max(self._run_max, seconds)
+
+    # ── queued mode ──
+    def offer(self, data: dict) -> bool:
+        """Enqueue without waiting; False only for a full `block` queue."""
+        self._start()
+        key = data.get(self.key) if self.key is not None and self.overflow == "coalesce" else None
+        if key is not None and key in self._by_key:
+            self._by_key[key][0] = data      # keeps its place and enqueue time
+            self.stats["coalesced"] += 1
+            return True
+        if key is None and len(self._queue) - len(self._by_key) >= self.queue_size:
+            if self.overflow == "block":
+                return False
+            self._drop_oldest_unkeyed()
+            self.stats["dropped"] += 1
+        entry = [data, time.monotonic(), key]
+        self._queue.append(entry)
+        if key is not None:
+            self._by_key[key] = entry
+        self.stats["enqueued"] += 1
+        self.stats["max_depth"] = max(self.stats["max_depth"], len(self._queue))
+        self._not_empty.set()
+        return True
+
+    async def put(self, data: dict) -> None:
+        """Enqueue, waiting for space under the `block` policy."""
+        while not self.offer(data):
+            self._not_full.clear()
+            await self._not_full.wait()
+
+    def _drop_oldest_unkeyed(self) -> None:
+        # Keyed (coalesced) entries are never dropped; without a key that is the head
+        for i, entry in enumerate(self._queue):
+            if entry[2] is None:
+                del self._queue[i]
+                return
+
+    def _forget(self, entry: list) -> None:
+        if entry[2] is not None and self._by_key.get(entry[2]) is entry:
+            del self._by_key[entry[2]]
+
+    def _start(self) -> None:
+        if self._tasks:
+            return
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._worker(), name=f"bus:{self.event_name}:{self.name}")
+            for _ in range(self.workers)
+        ]
+
+    async def _worker(self) -> None:
+        while True:
+            while not self._queue:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+            entry = self._queue.popleft()
+            self._forget(entry)
+            self._not_full.set()
+            data, enqueued_at, _ = entry
+            started = time.monotonic()
+            self._wait_ewma = _EWMA_ALPHA * (started - enqueued_at) + (1 - _EWMA_ALPHA) * self._wait_ewma
+            self._busy += 1
+            try:
+                await self.call(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.bus._handle_error(self.event_name, self.handler, e, data)
+            finally:
+                self._busy -= 1
+                self.record_run(time.monotonic() - started)
+
+    @property
+    def idle(self) -> bool:
+        return not self._queue and not self._busy
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def report(self) -> dict:
+        return {
+            "depth": len(self._queue),
+            "queue_size": self.queue_size,
+            "overflow": self.overflow,
+            **self.stats,
+            "avg_queue_wait_ms": round(self._wait_ewma * 1000, 1),
+            "avg_handler_ms": round(self._run_ewma * 1000, 1),
+            "max_handler_ms": round(self._run_max * 1000, 1),
+        }
+
+
 class EventBus:
     """
     Async pub/sub event bus with error tracking.
@@ -50,12 +241,37 @@ class EventBus:
         bus.subscribe("user.message", my_handler)
         await bus.publish("user.message", {"text": "hello"})
         
+        # Bounded per-subscriber queues, file events coalesced by path (lossless)
+        bus = EventBus(mode="queued", queue_size=100, handler_timeout=30)
+        bus.subscribe("world.file_changed", on_change, overflow="coalesce", key="path")
+        
         # Monitor health
         report = bus.get_health_report()
     """
 
-    def __init__(self, max_error_history: int = 100) -> None:
-        self._subscribers: dict[str, list[Handler]] = defaultdict(list)
+    def __init__(
+        self,
+        max_error_history: int = 100,
+        mode: str = "direct",
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = DEFAULT_OVERFLOW,
+        handler_timeout: float | None = None,
+        workers: int = 1,
+        event_options: dict[str, dict] | None = None,
+    ) -> None:
+        if mode not in DISPATCH_MODES:
+            raise ValueError(f"EventBus: unknown dispatch mode '{mode}'")
+        self._subscribers: dict[str, list[_Subscription]] = defaultdict(list)
+        self._mode = mode
+        self._defaults = {
+            "queue_size": queue_size,
+            "overflow": overflow,
+            "key": None,
+            "timeout": handler_timeout,
+            "workers": workers,
+        }
+        self._event_options = dict(event_options or {})
+        self._pending_publishes: set[asyncio.Task] = set()
         
         # TD-007: Error tracking
         self._error_history: deque[ErrorRecord] = deque(maxlen=max_error_history)
@@ -63,42 +279,129 @@ class EventBus:
         self._dead_letter_queue: list[dict] = []
         self._critical_events = {"system.crash", "ollama.unavailable", "memory.full"}
 
-    def subscribe(self, event_name: str, handler: Handler) -> None:
-        """Register an async handler for the given event name."""
-        self._subscribers[event_name].append(handler)
-        log.debug(f"Subscribed '{handler.__name__}' to '{event_name}'")
+    @classmethod
+    def from_config(cls, cfg: dict) -> "EventBus":
+        """Build from the `event_bus` config section."""
+        section = cfg.get("event_bus", {}) or {}
+        timeout = section.get("handler_timeout")
+        return cls(
+            mode=section.get("mode", "direct"),
+            queue_size=int(section.get("queue_size", DEFAULT_QUEUE_SIZE)),
+            overflow=section.get("overflow", DEFAULT_OVERFLOW),
+            handler_timeout=float(timeout) if timeout else None,
+            workers=int(section.get("workers", 1)),
+            event_options=section.get("events") or {},
+        )
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def subscribe(self, event_name: str, handler: Handler, **options: Any) -> None:
+        """
+        Register an async handler for the given event name.
+
+        options (override the bus defaults and config `events.<name>`):
+            queue_size, overflow, key, timeout, workers
+        """
+        unknown = set(options) - set(self._defaults)
+        if unknown:
+            raise TypeError(f"EventBus.subscribe: unknown options {sorted(unknown)}")
+        merged = {**self._defaults, **self._event_options.get(event_name, {}), **options}
+        self._subscribers[event_name].append(_Subscription(self, event_name, handler, **merged))
+        log.debug(f"Subscribed '{self._subscribers[event_name][-1].name}' to '{event_name}'")
 
     async def publish(self, event_name: str, data: dict | None = None) -> None:
         """
         Publish an event to all subscribers.
-        All handlers are called concurrently via asyncio.gather.
+        direct: all handlers are called concurrently via asyncio.gather.
+        queued: the event is put on every subscriber's queue (see module doc).
         Tracks errors and maintains dead letter queue for critical events.
         """
         if data is None:
             data = {}
 
-        handlers = self._subscribers.get(event_name, [])
-        if not handlers:
+        subscriptions = self._subscribers.get(event_name, [])
+        if not subscriptions:
             log.debug(f"Event '{event_name}' published but no subscribers.")
             return
 
-        log.debug(f"Publishing '{event_name}' to {len(handlers)} handler(s).")
+        log.debug(f"Publishing '{event_name}' to {len(subscriptions)} handler(s).")
+
+        if self._mode == "queued":
+            for sub in subscriptions:
+                await sub.put(data)
+            return
 
         results = await asyncio.gather(
-            *[h(data) for h in handlers],
+            *[self._call_direct(sub, data) for sub in subscriptions],
             return_exceptions=True,
         )
 
         # Track handler errors
-        for handler, result in zip(handlers, results):
+        for sub, result in zip(subscriptions, results):
             if isinstance(result, Exception):
                 self._handle_error(
                     event_name=event_name,
-                    handler=handler,
+                    handler=sub.handler,
                     error=result,
                     data=data
                 )
 
+    async def _call_direct(self, sub: _Subscription, data: dict) -> None:
+        started = time.monotonic()
+        try:
+            await sub.call(data)
+        except Exception:
+            sub.stats["errors"] += 1
+            raise
+        finally:
+            sub.record_run(time.monotonic() - started)
+
+    def publish_nowait(self, event_name: str, data: dict | None = None) -> None:
+        """
+        Publish without awaiting (call on the loop thread, e.g. via
+        loop.call_soon_threadsafe). In queued mode no coroutine is created
+        unless a `block` queue is full.
+        """
+        if data is None:
+            data = {}
+        subscriptions = self._subscribers.get(event_name, [])
+        if self._mode == "queued":
+            blocked = [sub for sub in subscriptions if not sub.offer(data)]
+            for sub in blocked:
+                self._track(asyncio.ensure_future(sub.put(data)))
+        elif subscriptions:
+            self._track(asyncio.ensure_future(self.publish(event_name, data)))
+
+    def _track(self, task: asyncio.Task) -> None:
+        self._pending_publishes.add(task)
+        task.add_done_callback(self._pending_publishes.discard)
+
+    async def drain(self, timeout: float | None = None) -> bool:
+        """Wait until every queued event has been handled; False on timeout."""
+        async def _wait() -> None:
+            while self._pending_publishes or not all(
+                sub.idle for subs in self._subscribers.values() for sub in subs
+            ):
+                await asyncio.sleep(0.01)
+        try:
+            await asyncio.wait_for(_wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self) -> None:
+        """Stop the queue workers (queued events not yet handled are dropped)."""
+        for task in list(self._pending_publishes):
+            task.cancel()
+        for sub in self._iter_subscriptions():
+            await sub.close()
+
+    def _iter_subscriptions(self) -> Iterable[_Subscription]:
+        for subs in self._subscribers.values():
+            yield from subs
+
     def _handle_error(
         self, 
         event_name: str, 
@@ -107,7 +410,7 @@ class EventBus:
         data: dict
     ) -> None:
         """Track and log handler errors."""
-        handler_name = handler.__name__
+        handler_name = getattr(handler, "__name__", type(handler).__name__)
         
         # Record error
         error_record = ErrorRecord(
@@ -169,6 +472,9 @@ class EventBus:
               - dead_letter_queue_size: Critical events that failed
               - failing_handlers: Dict of handler -> failure count
               - recent_errors: Last 5 error details
+              - mode: direct | queued
+              - queues: per "event → handler" depth, drops, coalesced,
+                timeouts, queue-wait and handler latency
         """
         now = time.time()
         one_hour_ago = now - 3600
@@ -197,9 +503,22 @@ class EventBus:
             "dead_letter_queue_size": len(self._dead_letter_queue),
             "failing_handlers": dict(self._handler_error_counts),
             "recent_errors": recent_errors,
+            "mode": self._mode,
+            "queues": self._queue_report(),
             "healthy": len(errors_last_hour) < 10  # Arbitrary threshold
         }
     
+    def _queue_report(self) -> dict:
+        report: dict[str, dict] = {}
+        for sub in self._iter_subscriptions():
+            name = f"{sub.event_name} → {sub.name}"
+            n = 2
+            while name in report:
+                name = f"{sub.event_name} → {sub.name}#{n}"
+                n += 1
+            report[name] = sub.report()
+        return report
+    
     def get_dead_letter_queue(self) -> list[dict]:
         """Get all critical events that failed."""
         return self._dead_letter_queue.copy()
@@ -6,6 +6,10 @@ This is the main orchestrator that integrates:
 - PriorityExecutor for priority-based execution
 - Graceful degradation with fallback strategies
 - Parallel execution of optional steps
+- Dependency-graph step scheduling (core.step_graph) with critical-path timing
+- Next-tick prefetch during the idle interval (core.tick_prefetch)
+- Per-tick tracing spans with flame-graph export (core.tracing)
+- Adaptive tick interval; OPTIONAL steps deferred under load (core.tick_interval)
 
 Usage:
     Replace HeavyTick with FaultTolerantHeavyTick in main.py:
@@ -27,6 +31,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
@@ -34,7 +39,12 @@ from core.circuit_breaker import CircuitBreaker
 from core.health_monitor import HealthMonitor, SystemMode
 from core.priority_system import PriorityExecutor, Priority
 from core.fallback_generators import FallbackGenerators
+from core.memory.async_memory import AsyncEpisodicMemory, AsyncVectorMemory
 from core.resilient_ollama import ResilientOllamaClient
+from core.step_graph import STOP, Step, StepGraph
+from core.tick_interval import TickIntervalController
+from core.tick_prefetch import TickPrefetcher
+from core.tracing import annotate, get_tracer
 
 # Import implementation mixins
 from core.fault_tolerant_heavy_tick_impl import FaultTolerantHeavyTickImpl
@@ -50,6 +60,7 @@ if TYPE_CHECKING:
     from core.memory.episodic import EpisodicMemory
     from core.memory.vector_memory import VectorMemory
     from core.milestones import Milestones
+    from core.llm_backend import LLMBackend
     from core.narrative_engine import NarrativeEngine
     from core.ollama_client import OllamaClient
     from core.reflection_engine import ReflectionEngine
@@ -99,6 +110,10 @@ STEP_PRIORITIES = {
     "meta_cognition": Priority.OPTIONAL,
 }
 
+# The step graph's deadline ends this much before the tick timeout,
+# so cancelled steps still get their timings recorded
+_DEADLINE_MARGIN = 1.0
+
 _DEFAULT_GOAL: dict = {
     "goal": "наблюдать за средой",
     "reasoning": "LLM недоступен или не вернул валидный JSON",
@@ -158,6 +173,7 @@ class FaultTolerantHeavyTick(FaultTolerantHeavyTickImpl, FaultTolerantHeavyTickS
         proactive = None,
         meta_optimizer = None,
         multi_agent_coordinator: Optional["MultiAgentCoordinator"] = None,  # NEW: Stage 27
+        llm: Optional["LLMBackend"] = None,
     ) -> None:
         # Store all components
         self._cfg = cfg
@@ -194,15 +210,32 @@ class FaultTolerantHeavyTick(FaultTolerantHeavyTickImpl, FaultTolerantHeavyTickS
         self._meta_optimizer = meta_optimizer
         self._multi_agent = multi_agent_coordinator  # NEW: Stage 27
         
+        # Awaitable memory: dedicated writer thread + bounded reader pool
+        self._amem = AsyncEpisodicMemory(mem)
+        self._avec = AsyncVectorMemory(vector_memory) if vector_memory is not None else None
+        
         # Initialize Health Monitor
         self._health_monitor = HealthMonitor(check_interval=30)
         
-        # Initialize Resilient Ollama Client
-        self._ollama = ResilientOllamaClient(ollama, self._health_monitor)
+        # Initialize Resilient Ollama Client (awaits the async LLM backend;
+        # without one, the sync client runs on a bounded executor)
+        self._ollama = ResilientOllamaClient(ollama, self._health_monitor, backend=llm)
         
         # Initialize Priority Executor
         self._executor = PriorityExecutor()
         
+        # Next-tick interval from load and pending work; OPTIONAL steps deferred under pressure
+        self.interval_ctl = TickIntervalController.from_config(cfg)
+        
+        # Tick steps as a dependency graph
+        self._graph = self._build_graph()
+        
+        # Next tick's monologue prompt, prepared while the loop is idle
+        self.prefetch = TickPrefetcher.from_config(cfg)
+        
+        # Per-tick spans (tick → step → LLM call / DB query / file write)
+        self._tracer = get_tracer(cfg)
+        
         # Configuration
         self._interval = cfg["ticks"]["heavy_tick_sec"]
         self._timeout = int(cfg.get("resources", {}).get("budget", {}).get("tick_timeout_sec", 120))
@@ -259,6 +292,7 @@ class FaultTolerantHeavyTick(FaultTolerantHeavyTickImpl, FaultTolerantHeavyTickS
         while self._running:
             tick_start = time.monotonic()
             self._tick_count += 1
+            self.interval_ctl.begin_tick(self._tick_count)
             
             # Check system health
             system_status = self._health_monitor.get_system_status()
@@ -273,7 +307,7 @@ class FaultTolerantHeavyTick(FaultTolerantHeavyTickImpl, FaultTolerantHeavyTickS
                 continue
             
             # Check if Ollama is available
-            if not self._ollama.is_available():
+            if not await self._ollama.is_available_async():
                 log.warning(
                     f"[HeavyTick #{self._tick_count}] Ollama unavailable "
                     "(circuit breaker OPEN), skipping tick"
@@ -282,17 +316,20 @@ class FaultTolerantHeavyTick(FaultTolerantHeavyTickImpl, FaultTolerantHeavyTickS
                 continue
             
             # Run tick
+            timed_out = False
             try:
-                await asyncio.wait_for(
-                    self._run_tick(),
-                    timeout=self._timeout
-                )
+                with self._tracer.trace("heavy_tick", tick=self._tick_count):
+                    await asyncio.wait_for(
+                        self._run_tick(),
+                        timeout=self._timeout
+                    )
             except asyncio.TimeoutError:
+                timed_out = True
                 log.error(
                     f"[HeavyTick #{self._tick_count}] "
                     f"Total timeout ({self._timeout}s) exceeded"
                 )
-                self._mem.add_episode(
+                await self._amem.add_episode(
                     "heavy_tick.timeout",
                     f"Heavy tick #{self._tick_count} exceeded {self._timeout}s timeout",
                     outcome="error",
@@ -306,207 +343,181 @@ class FaultTolerantHeavyTick(FaultTolerantHeavyTickImpl, FaultTolerantHeavyTickS
             # Reset budgets for next tick
             self._executor.reset_budgets()
             
-            # Sleep until next tick
-            elapsed = time.monotonic() - tick_start
-            await asyncio.sleep(max(0.0, self._interval - elapsed))
+            # Sleep until next tick (adaptive interval), preparing it meanwhile
+            delay = self.interval_ctl.end_tick(time.monotonic() - tick_start, timed_out)
+            await self.interval_ctl.sleep(
+                self.prefetch.idle(
+                    delay,
+                    self._build_monologue_prompt,
+                    warm=self._draft_monologue,
+                    embed=self._embed_draft,
+                ),
+                tick_start,
+            )
     
     def stop(self) -> None:
         """Stop Heavy Tick loop and health monitoring."""
         self._running = False
+        self.prefetch.close()
         # Health monitor will be stopped by event loop
+        self._amem.shutdown(wait=False)
+        if self._avec is not None:
+            self._avec.shutdown(wait=False)
         log.info("[FaultTolerantHeavyTick] Stopped")
     
-    async def _run_tick(self) -> None:
-        """Execute single Heavy Tick with fault tolerance."""
-        n = self._tick_count
-        log.info(f"[HeavyTick #{n}] Starting (fault-tolerant mode)")
-        
-        # Update time context
-        if self._time_perc is not None:
-            self._time_perc.update_context()
-        
-        # === PHASE 1: Critical Sequential Steps ===
-        
-        # Step 1: Monologue
-        monologue_result = await self._executor.execute_step(
-            step_name="monologue",
-            func=self._step_monologue,
-            priority=STEP_PRIORITIES["monologue"],
-            timeout=STEP_TIMEOUTS["monologue"],
-            fallback=lambda: FallbackGenerators.monologue_fallback({"tick_number": n}),
+    # ────────────────────────────────────────────────────────────────
+    # Step graph
+    # ────────────────────────────────────────────────────────────────
+    def _build_graph(self) -> StepGraph:
+        """monologue → semantic_ctx → goal → action → after_action, optional steps branch off."""
+        def optional(name: str, fn, fallback, *after: str) -> Step:
+            run = partial(self._execute, name, fn, fallback)
+            if STEP_PRIORITIES[name] == Priority.OPTIONAL:
+                run = self.interval_ctl.gate(name, run)
+            return Step(name, run, inputs=("n",), after=("after_action", *after), fallback=None)
+        
+        def skipped() -> dict:
+            return {"status": "skipped"}
+        
+        return StepGraph("fault_tolerant_heavy_tick", [
+            Step("monologue", self._node_monologue, inputs=("n",), outputs=("monologue", "monologue_id")),
+            Step("embed_monologue", self._embed_monologue, inputs=("monologue", "monologue_id"), fallback=None),
+            Step("mode", self._node_mode, inputs=("n",), after=("monologue",), outputs=("mode",)),
+            Step("semantic_context", self._node_semantic_context, inputs=("monologue",), after=("mode",),
+                 outputs=("semantic_ctx",), fallback=""),
+            Step("goal_selection", self._node_goal, inputs=("n", "monologue", "semantic_ctx"),
+                 outputs=("goal",), fallback=lambda: dict(_DEFAULT_GOAL)),
+            Step("action", self._node_action, inputs=("n", "monologue", "goal"), outputs=("action",)),
+            Step("after_action", self._node_after_action, inputs=("n", "mode", "goal", "action"),
+                 fallback=None),
+            optional("curiosity", self._step_curiosity, FallbackGenerators.curiosity_fallback),
+            optional("self_modification", self._step_self_modification, skipped),
+            optional("belief_system", self._step_belief_system, FallbackGenerators.beliefs_fallback),
+            # these two read the beliefs belief_system rewrites
+            optional("contradiction_resolver", self._step_contradiction_resolver, skipped, "belief_system"),
+            optional("meta_cognition", self._step_meta_cognition,
+                     FallbackGenerators.meta_cognition_fallback, "belief_system"),
+            optional("time_perception", self._step_time_perception, skipped),
+            optional("social_interaction", self._step_social_interaction, FallbackGenerators.social_fallback),
+        ])
+    
+    async def _execute(self, step_name: str, func, fallback, **kwargs):
+        """Run one step through the PriorityExecutor; raises if even the fallback failed."""
+        result = await self._executor.execute_step(
+            step_name=step_name,
+            func=func,
+            priority=STEP_PRIORITIES[step_name],
+            timeout=STEP_TIMEOUTS[step_name],
+            # the executor passes the step's kwargs on to the fallback
+            fallback=lambda *_, **__: fallback(),
+            **kwargs,
+        )
+        if not result.success:
+            raise RuntimeError(result.error or f"{step_name} failed")
+        return result.result
+    
+    async def _node_monologue(self, n: int) -> tuple[str, int | None]:
+        result = await self._execute(
+            "monologue",
+            self._step_monologue,
+            lambda: FallbackGenerators.monologue_fallback({"tick_number": n}),
             n=n,
         )
-        
-        if not monologue_result.success:
-            log.error(f"[HeavyTick #{n}] Monologue failed, aborting tick")
-            return
-        
-        monologue = monologue_result.result["text"]
-        ep_id = monologue_result.result.get("ep_id")
-        
-        # Embed monologue
-        await self._embed_and_store(ep_id, "monologue", monologue)
-        
-        # Check if defensive mode
+        if isinstance(result, str):  # fallback text
+            return result, None
+        return result["text"], result.get("ep_id")
+    
+    async def _embed_monologue(self, monologue: str, monologue_id: int | None) -> None:
+        await self._embed_and_store(monologue_id, "monologue", monologue)
+    
+    async def _node_mode(self, n: int) -> str | object:
+        """Current value mode; defensive mode ends the tick after the monologue."""
         mode = self._values.get_mode()
-        if mode == "defensive":
-            log.info(f"[HeavyTick #{n}] Mode=defensive, skipping goal selection")
-            self._mem.add_episode(
-                "heavy_tick.defensive",
-                f"Tick #{n}: defensive mode, only monologue executed",
-                outcome="skipped",
-            )
-            self._decision_log.info(
-                f"TICK #{n} | goal=observe(defensive) | action=none | outcome=skipped"
-            )
-            return
-        
-        # Step 2: Semantic Context
-        semantic_result = await self._executor.execute_step(
-            step_name="semantic_context",
-            func=self._semantic_context,
-            priority=STEP_PRIORITIES["semantic_context"],
-            timeout=STEP_TIMEOUTS["semantic_context"],
-            fallback=lambda: "",
-            query_text=monologue,
+        if mode != "defensive":
+            return mode
+        log.info(f"[HeavyTick #{n}] Mode=defensive, skipping goal selection")
+        await self._amem.add_episode(
+            "heavy_tick.defensive",
+            f"Tick #{n}: defensive mode, only monologue executed",
+            outcome="skipped",
         )
-        
-        semantic_ctx = semantic_result.result if semantic_result.success else ""
-        
-        # Step 3: Goal Selection
-        goal_result = await self._executor.execute_step(
-            step_name="goal_selection",
-            func=self._step_goal_selection,
-            priority=STEP_PRIORITIES["goal_selection"],
-            timeout=STEP_TIMEOUTS["goal_selection"],
-            fallback=lambda: FallbackGenerators.goal_selection_fallback({"tick_number": n}),
+        self._decision_log.info(
+            f"TICK #{n} | goal=observe(defensive) | action=none | outcome=skipped"
+        )
+        return STOP
+    
+    async def _node_semantic_context(self, monologue: str) -> str:
+        return await self._execute(
+            "semantic_context", self._semantic_context, lambda: "", query_text=monologue
+        )
+    
+    async def _node_goal(self, n: int, monologue: str, semantic_ctx: str) -> dict:
+        goal_data = await self._execute(
+            "goal_selection",
+            self._step_goal_selection,
+            lambda: FallbackGenerators.goal_selection_fallback({"tick_number": n}),
             n=n,
             monologue=monologue,
             semantic_ctx=semantic_ctx,
         )
-        
-        if not goal_result.success:
-            log.error(f"[HeavyTick #{n}] Goal selection failed, using fallback")
-        
-        goal_data = goal_result.result
-        
         if self._goal_pers is not None:
             self._goal_pers.set_active(goal_data, tick=n)
-        
-        action_type = goal_data.get("action_type", "observe")
-        risk_level = goal_data.get("risk_level", "low")
-        goal_text = goal_data.get("goal", _DEFAULT_GOAL["goal"])
-        
-        # Step 4: Action
-        action_result = await self._executor.execute_step(
-            step_name="action",
-            func=self._dispatch_action,
-            priority=STEP_PRIORITIES["action"],
-            timeout=STEP_TIMEOUTS["action"],
-            fallback=lambda: FallbackGenerators.action_result_fallback(action_type),
-            n=n,
-            action_type=action_type,
-            goal_text=goal_text,
-            goal_data=goal_data,
-            monologue=monologue,
-        )
-        
-        success = action_result.result.get("success", True) if action_result.success else False
-        outcome = action_result.result.get("outcome", "observed") if action_result.success else "action_failed"
-        
-        # Step 5: After Action
-        await self._executor.execute_step(
-            step_name="after_action",
-            func=self._step_after_action,
-            priority=STEP_PRIORITIES["after_action"],
-            timeout=STEP_TIMEOUTS["after_action"],
-            fallback=lambda: {"status": "skipped"},
+        return goal_data
+    
+    async def _node_action(self, n: int, monologue: str, goal: dict) -> tuple[bool, str]:
+        action_type = goal.get("action_type", "observe")
+        try:
+            result = await self._execute(
+                "action",
+                self._dispatch_action,
+                lambda: FallbackGenerators.action_result_fallback(action_type),
+                n=n,
+                action_type=action_type,
+                goal_text=goal.get("goal", _DEFAULT_GOAL["goal"]),
+                goal_data=goal,
+                monologue=monologue,
+            )
+        except RuntimeError:
+            return False, "action_failed"
+        return result.get("success", True), result.get("outcome", "observed")
+    
+    async def _node_after_action(self, n: int, mode: str, goal: dict, action: tuple[bool, str]) -> None:
+        success, outcome = action
+        await self._execute(
+            "after_action",
+            self._step_after_action,
+            lambda: {"status": "skipped"},
             n=n,
-            action_type=action_type,
-            goal_text=goal_text,
-            risk_level=risk_level,
+            action_type=goal.get("action_type", "observe"),
+            goal_text=goal.get("goal", _DEFAULT_GOAL["goal"]),
+            risk_level=goal.get("risk_level", "low"),
             mode=mode,
             success=success,
             outcome=outcome,
         )
+    
+    async def _run_tick(self) -> None:
+        """Execute single Heavy Tick with fault tolerance."""
+        n = self._tick_count
+        log.info(f"[HeavyTick #{n}] Starting (fault-tolerant mode)")
+        self._ollama.reset_tick_counter()
         
-        # === PHASE 2: Optional Parallel Steps ===
-        log.info(f"[HeavyTick #{n}] Starting parallel optional steps")
-        
-        optional_tasks = [
-            self._executor.execute_step(
-                step_name="curiosity",
-                func=self._step_curiosity,
-                priority=STEP_PRIORITIES["curiosity"],
-                timeout=STEP_TIMEOUTS["curiosity"],
-                fallback=lambda: FallbackGenerators.curiosity_fallback(),
-                n=n,
-            ),
-            self._executor.execute_step(
-                step_name="self_modification",
-                func=self._step_self_modification,
-                priority=STEP_PRIORITIES["self_modification"],
-                timeout=STEP_TIMEOUTS["self_modification"],
-                fallback=lambda: {"status": "skipped"},
-                n=n,
-            ),
-            self._executor.execute_step(
-                step_name="belief_system",
-                func=self._step_belief_system,
-                priority=STEP_PRIORITIES["belief_system"],
-                timeout=STEP_TIMEOUTS["belief_system"],
-                fallback=lambda: FallbackGenerators.beliefs_fallback(),
-                n=n,
-            ),
-            self._executor.execute_step(
-                step_name="contradiction_resolver",
-                func=self._step_contradiction_resolver,
-                priority=STEP_PRIORITIES["contradiction_resolver"],
-                timeout=STEP_TIMEOUTS["contradiction_resolver"],
-                fallback=lambda: {"status": "skipped"},
-                n=n,
-            ),
-            self._executor.execute_step(
-                step_name="time_perception",
-                func=self._step_time_perception,
-                priority=STEP_PRIORITIES["time_perception"],
-                timeout=STEP_TIMEOUTS["time_perception"],
-                fallback=lambda: {"status": "skipped"},
-                n=n,
-            ),
-            self._executor.execute_step(
-                step_name="social_interaction",
-                func=self._step_social_interaction,
-                priority=STEP_PRIORITIES["social_interaction"],
-                timeout=STEP_TIMEOUTS["social_interaction"],
-                fallback=lambda: FallbackGenerators.social_fallback(),
-                n=n,
-            ),
-            self._executor.execute_step(
-                step_name="meta_cognition",
-                func=self._step_meta_cognition,
-                priority=STEP_PRIORITIES["meta_cognition"],
-                timeout=STEP_TIMEOUTS["meta_cognition"],
-                fallback=lambda: FallbackGenerators.meta_cognition_fallback(),
-                n=n,
-            ),
-        ]
+        # Update time context
+        if self._time_perc is not None:
+            self._time_perc.update_context()
         
-        # Execute all optional tasks in parallel
-        optional_results = await asyncio.gather(
-            *optional_tasks,
-            return_exceptions=True
+        # === PHASE 1-2: Step graph (critical chain, optional steps branch off) ===
+        run = await self._graph.run(
+            {"n": n},
+            deadline=max(1.0, self._timeout - _DEADLINE_MARGIN),
+            label=f"HeavyTick #{n}",
         )
-        
-        # Log results
-        for i, result in enumerate(optional_results):
-            if isinstance(result, Exception):
-                log.warning(f"[HeavyTick #{n}] Optional step #{i} failed: {result}")
-            elif not result.success:
-                log.info(
-                    f"[HeavyTick #{n}] Optional step '{result.step_name}' "
-                    f"{'used fallback' if result.used_fallback else 'failed'}"
-                )
+        log.info(f"[HeavyTick #{n}] Step graph: {run.summary()}")
+        annotate(critical_path=run.critical_path)
+        if run.deadline_hit:
+            raise asyncio.TimeoutError
+        if run.steps["mode"].status != "ok":
+            return  # monologue failed or defensive mode
         
         # === PHASE 3: Skill Extraction (Stage 26.5) ===
         if self._skill_library and n % 20 == 0:  # Every 20 ticks
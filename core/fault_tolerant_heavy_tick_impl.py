@@ -13,6 +13,10 @@ import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 
+from core.prompt_prefix import join_sections
+from core.token_budget import get_token_budget
+from core.tracing import span
+
 if TYPE_CHECKING:
     from core.fault_tolerant_heavy_tick import FaultTolerantHeavyTick
 
@@ -37,12 +41,34 @@ class FaultTolerantHeavyTickImpl:
     # ────────────────────────────────────────────────────────────────
     async def _step_monologue(self: "FaultTolerantHeavyTick", n: int) -> Dict[str, Any]:
         """Generate internal monologue."""
+        # Prepared during the idle interval (its draft is likely in LLMCache)
+        system, prompt = self.prefetch.take() or await self._build_monologue_prompt()
+        
+        monologue = await self._ollama.chat(
+            prompt, system, timeout=30,
+            fallback="(monologue unavailable — LLM did not respond)",
+            call_profile="monologue",
+        )
+        
+        ts = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._monologue_log.info(f"[{ts}] TICK #{n}\n{monologue}\n---")
+        
+        ep_id = await self._amem.add_episode(
+            "monologue", monologue[:1000],
+            outcome="success", data={"tick": n}
+        )
+        
+        log.info(f"[HeavyTick #{n}] Monologue written ({len(monologue)} chars)")
+        return {"text": monologue, "ep_id": ep_id}
+    
+    async def _build_monologue_prompt(self: "FaultTolerantHeavyTick") -> Tuple[str, str]:
+        """(stable system prefix, per-tick prompt) for the internal monologue."""
         recent_changes = self._world.get_recent_changes(3)
         changes_str = ", ".join(
             f"{c.change_type}:{Path(c.path).name}" for c in recent_changes
         ) or "нет"
         
-        raw_eps = self._mem.get_recent_episodes(10)
+        raw_eps = await self._amem.get_recent_episodes(10)
         filtered = self._attention_filter_episodes(raw_eps)
         eps_str = self._attention_build_context(filtered)
         
@@ -63,62 +89,72 @@ class FaultTolerantHeavyTickImpl:
             self._meta_cog.to_prompt_context(2) if self._meta_cog else ""
         )
         
-        prompt = (
-            f"Твоё состояние:\n{self._self_model.to_prompt_context()}\n"
-            f"{self._values.to_prompt_context()}\n{strategy_ctx}\n"
-            f"Мир: {self._world.summary()}\n"
-            f"Последние изменения: {changes_str}\n"
-            f"Значимые эпизоды:\n{eps_str}\n"
-        )
-        
-        if time_ctx:
-            prompt += f"\n{time_ctx}\n"
-        if meta_ctx:
-            prompt += f"\n{meta_ctx}\n"
-        
-        prompt += (
-            "\nНапиши короткий внутренний монолог (3-5 предложений):\n"
-            "Что ты сейчас замечаешь? Что тебя беспокоит или интересует? "
-            "О чём ты думаешь?"
-        )
-        
-        if beliefs_ctx:
-            prompt += f"\n{beliefs_ctx}"
-        
+        questions_str = ""
         if self._curiosity is not None and self._curiosity_enabled:
             open_q = self._curiosity.get_open_questions(3)
             if open_q:
                 questions_str = "; ".join(q["question"] for q in open_q)
-                prompt += f"\nОткрытые вопросы: {questions_str}"
         
         focus_summary = self._attention_focus_summary()
-        system_parts = [
+        identity = (
             "Ты — Digital Being. Автономная система. Отвечай от первого лица. "
             "Будь краток."
-        ]
-        if emotion_ctx:
-            system_parts.append(emotion_ctx)
-        if tone_modifier:
-            system_parts.append(tone_modifier)
-        if focus_summary:
-            system_parts.append(focus_summary)
-        system = "\n".join(system_parts)
-        
-        monologue = await self._ollama.chat(
-            prompt, system, timeout=30,
-            fallback="(monologue unavailable — LLM did not respond)"
+        )
+        self_ctx = f"Твоё состояние:\n{self._self_model.to_prompt_context()}"
+        instructions = (
+            "Напиши короткий внутренний монолог (3-5 предложений):\n"
+            "Что ты сейчас замечаешь? Что тебя беспокоит или интересует? "
+            "О чём ты думаешь?"
         )
         
-        ts = time.strftime("%Y-%m-%d %H:%M:%S")
-        self._monologue_log.info(f"[{ts}] TICK #{n}\n{monologue}\n---")
-        
-        ep_id = self._mem.add_episode(
-            "monologue", monologue[:1000],
-            outcome="success", data={"tick": n}
+        # Injected context is trimmed to the "monologue" prompt budget.
+        # Prefix sections come first so volatile context is cut before them.
+        budget = get_token_budget()
+        ctx = budget.fit(
+            "monologue",
+            {
+                "strategy": strategy_ctx,
+                "beliefs": beliefs_ctx,
+                "episodes": eps_str,
+                "questions": questions_str,
+                "time": time_ctx,
+                "meta": meta_ctx,
+            },
+            reserved=budget.estimate(
+                identity + self_ctx + instructions + emotion_ctx + tone_modifier
+                + focus_summary
+            ),
         )
         
-        log.info(f"[HeavyTick #{n}] Monologue written ({len(monologue)} chars)")
-        return {"text": monologue, "ep_id": ep_id}
+        # Stable prefix (system message): identical across ticks until identity,
+        # strategy or beliefs change, so Ollama reuses its evaluated KV cache
+        system = join_sections(
+            identity, self_ctx, ctx["strategy"], ctx["beliefs"], instructions
+        )
+        # Variable suffix (user message): everything that changes per tick
+        prompt = join_sections(
+            self._values.to_prompt_context(),
+            emotion_ctx,
+            tone_modifier,
+            focus_summary,
+            f"Мир: {self._world.summary()}",
+            f"Последние изменения: {changes_str}",
+            f"Значимые эпизоды:\n{ctx['episodes']}",
+            ctx["time"],
+            ctx["meta"],
+            f"Открытые вопросы: {ctx['questions']}" if ctx["questions"] else "",
+        )
+        return system, prompt
+    
+    async def _draft_monologue(self: "FaultTolerantHeavyTick", system: str, prompt: str) -> str:
+        """Prefetch: the next tick's monologue call, made early to fill LLMCache."""
+        return await self._ollama.chat(
+            prompt, system, timeout=30, fallback="", call_profile="monologue"
+        )
+    
+    async def _embed_draft(self: "FaultTolerantHeavyTick", text: str) -> None:
+        """Prefetch: embed the draft as semantic_context / _embed_and_store will."""
+        await self._ollama.embed(text[:2000], fallback=[])
     
     # ────────────────────────────────────────────────────────────────
     # STEP: Semantic Context
@@ -127,18 +163,15 @@ class FaultTolerantHeavyTickImpl:
         self: "FaultTolerantHeavyTick", query_text: str
     ) -> str:
         """Get semantic context from vector memory."""
-        if self._vector_mem is None or self._vector_mem.count() == 0:
+        if self._avec is None or self._avec.count() == 0:
             return ""
         
         try:
-            loop = asyncio.get_event_loop()
-            embedding = await loop.run_in_executor(
-                None, lambda: self._ollama.ollama.embed(query_text[:2000])
-            )
+            embedding = await self._ollama.embed(query_text[:2000], fallback=[])
             if not embedding:
                 return ""
             
-            results = self._vector_mem.search(embedding, top_k=3)
+            results = await self._avec.search(embedding, top_k=3)
             if not results:
                 return ""
             
@@ -181,7 +214,7 @@ class FaultTolerantHeavyTickImpl:
                 self._goal_pers.increment_resume()
                 self._resume_incremented = True
         
-        raw_eps = self._mem.get_recent_episodes(10)
+        raw_eps = await self._amem.get_recent_episodes(10)
         filtered_eps = self._attention_filter_episodes(raw_eps)
         attn_ctx = self._attention_build_context(filtered_eps)
         focus_summary = self._attention_focus_summary()
@@ -212,13 +245,6 @@ class FaultTolerantHeavyTickImpl:
             risk_score=0.25 if mode in ("curious", "normal") else 0.5,
         )
         
-        sem_block = f"\n{semantic_ctx}\n" if semantic_ctx else ""
-        em_block = f"\n{emotion_ctx}\n" if emotion_ctx else ""
-        resume_block = f"\n{resume_ctx}\n" if resume_ctx else ""
-        attn_block = (
-            f"\nЗначимые эпизоды:\n{attn_ctx}\n" if attn_ctx else ""
-        )
-        
         shell_hint = ""
         if self._shell_executor is not None:
             allowed_commands = ", ".join(
@@ -232,25 +258,55 @@ class FaultTolerantHeavyTickImpl:
                 f'"action_type": "shell", "shell_command": "ls config.yaml"}}'
             )
         
-        prompt = (
-            f"{monologue}\n{sem_block}{em_block}{resume_block}{attn_block}"
-            f"\nТекущий режим: {mode}\n"
-            f"Конфликты: exploration_vs_stability={c_expl}, "
-            f"action_vs_caution={c_act}\n"
-            f"{shell_hint}\nВыбери ONE цель. JSON:\n"
+        output_format = (
+            f"Выбери ONE цель. JSON:\n"
             f'{{"goal": "...", "reasoning": "...", '
             f'"action_type": "observe|analyze|write|reflect|shell", '
             f'"risk_level": "low|medium|high", "shell_command": "..."}}'
         )
+        situation = (
+            f"Текущий режим: {mode}\n"
+            f"Конфликты: exploration_vs_stability={c_expl}, "
+            f"action_vs_caution={c_act}"
+        )
+        
+        # Stable prefix (system message): role, shell hint and output format
+        system = join_sections(
+            "Ты — Digital Being. Отвечай ТОЛЬКО валидным JSON.",
+            shell_hint,
+            output_format,
+        )
         
-        system_parts = ["Ты — Digital Being. Отвечай ТОЛЬКО валидным JSON."]
-        if focus_summary:
-            system_parts.append(focus_summary)
-        system = "\n".join(system_parts)
+        # Injected context is trimmed to the "goal" prompt budget
+        budget = get_token_budget()
+        ctx = budget.fit(
+            "goal",
+            {
+                "resume": resume_ctx,
+                "monologue": monologue,
+                "episodes": attn_ctx,
+                "semantic": semantic_ctx,
+                "emotion": emotion_ctx,
+            },
+            reserved=budget.estimate(system + situation + focus_summary),
+        )
+        
+        # Variable suffix (user message)
+        prompt = join_sections(
+            ctx["monologue"],
+            ctx["semantic"],
+            ctx["emotion"],
+            ctx["resume"],
+            f"Значимые эпизоды:\n{ctx['episodes']}" if ctx["episodes"] else "",
+            focus_summary,
+            situation,
+        )
         
         raw = await self._ollama.chat(
             prompt, system, timeout=90,
-            fallback=json.dumps(_DEFAULT_GOAL)
+            fallback=json.dumps(_DEFAULT_GOAL),
+            json_object=True,
+            call_profile="goal",
         )
         
         goal_data = self._parse_goal_json(raw, n)
@@ -327,7 +383,8 @@ class FaultTolerantHeavyTickImpl:
                 f"Время: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
                 f"Монолог:\n{monologue}\n"
             )
-            out_path.write_text(content, encoding="utf-8")
+            with span("file.write", path=out_path.name, bytes=len(content.encode("utf-8"))):
+                out_path.write_text(content, encoding="utf-8")
             log.info(f"[HeavyTick #{n}] Written: {out_path.name}")
             return True, f"written:{out_path.name}"
         except Exception as e:
@@ -339,10 +396,10 @@ class FaultTolerantHeavyTickImpl:
     ) -> Tuple[bool, str]:
         """Reflect on errors and create principle."""
         try:
-            errors = self._mem.get_episodes_by_type("error", limit=5)
+            errors = await self._amem.get_episodes_by_type("error", limit=5)
             if not errors:
                 errors = [
-                    e for e in (self._mem.get_recent_episodes(20) or [])
+                    e for e in (await self._amem.get_recent_episodes(20) or [])
                     if e.get("outcome") == "error"
                 ][:5]
         except Exception:
@@ -365,7 +422,7 @@ class FaultTolerantHeavyTickImpl:
         system = "Ты — Digital Being. Формулируй правила из опыта."
         
         principle = await self._ollama.chat(
-            prompt, system, timeout=30, fallback=""
+            prompt, system, timeout=30, fallback="", call_profile="principle"
         )
         principle = principle.strip()
         
@@ -447,7 +504,7 @@ class FaultTolerantHeavyTickImpl:
         if self._goal_pers is not None and success:
             self._goal_pers.mark_completed(tick=n)
         
-        self._mem.add_episode(
+        await self._amem.add_episode(
             f"heavy_tick.{action_type}",
             f"Tick #{n}: goal='{goal_text[:200]}' outcome={outcome}",
             outcome="success" if success else "error",
@@ -499,10 +556,10 @@ class FaultTolerantHeavyTickImpl:
         # Vector memory cleanup
         WEEKLY_CLEANUP_TICKS = 1008
         if (
-            self._vector_mem is not None
+            self._avec is not None
             and self._tick_count % WEEKLY_CLEANUP_TICKS == 0
         ):
-            deleted = self._vector_mem.delete_old(days=30)
+            deleted = await self._avec.delete_old(days=30)
             log.info(
                 f"[HeavyTick #{n}] VectorMemory cleanup: "
                 f"{deleted} old records removed"
@@ -32,7 +32,7 @@ class FaultTolerantHeavyTickSteps:
         if self._curiosity.should_ask(n):
             log.info(f"[HeavyTick #{n}] CuriosityEngine: generating questions")
             try:
-                recent_eps = self._mem.get_recent_episodes(10)
+                recent_eps = await self._amem.get_recent_episodes(10)
                 new_questions = await loop.run_in_executor(
                     None,
                     lambda: self._curiosity.generate_questions(
@@ -135,7 +135,7 @@ class FaultTolerantHeavyTickSteps:
                         f"[HeavyTick #{n}] Config change APPROVED: "
                         f"{key} = {value} (was {result.get('old')})"
                     )
-                    self._mem.add_episode(
+                    await self._amem.add_episode(
                         "self_modification.approved",
                         f"Config change: {key} = {value}. "
                         f"Reason: {reason[:200]}",
@@ -163,7 +163,7 @@ class FaultTolerantHeavyTickSteps:
             return {"status": "unavailable"}
         
         loop = asyncio.get_event_loop()
-        recent_episodes = self._mem.get_recent_episodes(15)
+        recent_episodes = await self._amem.get_recent_episodes(15)
         
         # Form new beliefs
         if self._beliefs.should_form(n):
@@ -183,7 +183,7 @@ class FaultTolerantHeavyTickSteps:
                         b.get("initial_confidence", 0.5)
                     )
                     if added:
-                        self._mem.add_episode(
+                        await self._amem.add_episode(
                             "belief.formed",
                             f"[{b['category']}] {b['statement'][:200]}",
                             outcome="success",
@@ -261,7 +261,7 @@ class FaultTolerantHeavyTickSteps:
                         c["type"], c["item_a"], c["item_b"]
                     )
                     if added:
-                        self._mem.add_episode(
+                        await self._amem.add_episode(
                             "contradiction.detected",
                             f"[{c['type']}] {c['item_a']['text'][:60]} vs "
                             f"{c['item_b']['text'][:60]}",
@@ -326,7 +326,7 @@ class FaultTolerantHeavyTickSteps:
                 f"[HeavyTick #{n}] TimePerception: detecting patterns"
             )
             try:
-                episodes = self._mem.get_recent_episodes(50)
+                episodes = await self._amem.get_recent_episodes(50)
                 patterns = await loop.run_in_executor(
                     None,
                     lambda: self._time_perc.detect_patterns(
@@ -372,7 +372,7 @@ class FaultTolerantHeavyTickSteps:
         if new_messages:
             for msg in new_messages:
                 msg["tick"] = n
-                self._mem.add_episode(
+                await self._amem.add_episode(
                     "social.incoming",
                     f"Пользователь написал: {msg['content'][:200]}",
                     outcome="success",
@@ -393,7 +393,7 @@ class FaultTolerantHeavyTickSteps:
                         None, lambda r=response: self._social.write_to_outbox(r)
                     )
                     self._social.mark_responded(msg["id"])
-                    self._mem.add_episode(
+                    await self._amem.add_episode(
                         "social.outgoing",
                         f"Ответил пользователю: {response[:200]}",
                         outcome="success",
@@ -403,7 +403,7 @@ class FaultTolerantHeavyTickSteps:
                         "responded to user message"
                     )
                 else:
-                    self._mem.add_episode(
+                    await self._amem.add_episode(
                         "social.llm_unavailable",
                         "Не удалось сгенерировать ответ — LLM недоступен",
                         outcome="error",
@@ -435,7 +435,7 @@ class FaultTolerantHeavyTickSteps:
                 await loop.run_in_executor(
                     None, lambda m=message: self._social.write_to_outbox(m)
                 )
-                self._mem.add_episode(
+                await self._amem.add_episode(
                     "social.initiative",
                     f"Написал пользователю (reason={reason}): "
                     f"{message[:200]}",
@@ -471,7 +471,7 @@ class FaultTolerantHeavyTickSteps:
                 "analyzing decision quality"
             )
             try:
-                episodes = self._mem.get_recent_episodes(20)
+                episodes = await self._amem.get_recent_episodes(20)
                 quality = await loop.run_in_executor(
                     None,
                     lambda: self._meta_cog.analyze_decision_quality(
@@ -568,7 +568,7 @@ class FaultTolerantHeavyTickSteps:
         
         if verdict == "choose_a":
             await self._modify_item_confidence(item_b, -0.3, loop)
-            self._mem.add_episode(
+            await self._amem.add_episode(
                 "contradiction.resolved",
                 f"Verdict: choose_a. Weakened: {item_b['text'][:100]}",
                 outcome="success",
@@ -576,7 +576,7 @@ class FaultTolerantHeavyTickSteps:
             )
         elif verdict == "choose_b":
             await self._modify_item_confidence(item_a, -0.3, loop)
-            self._mem.add_episode(
+            await self._amem.add_episode(
                 "contradiction.resolved",
                 f"Verdict: choose_b. Weakened: {item_a['text'][:100]}",
                 outcome="success",
@@ -588,14 +588,14 @@ class FaultTolerantHeavyTickSteps:
                 await self._create_synthesis(item_a, item_b, synthesis_text, loop)
                 await self._modify_item_confidence(item_a, -0.2, loop)
                 await self._modify_item_confidence(item_b, -0.2, loop)
-                self._mem.add_episode(
+                await self._amem.add_episode(
                     "contradiction.resolved",
                     f"Verdict: synthesis. Created: {synthesis_text[:100]}",
                     outcome="success",
                     data={"verdict": verdict, "synthesis": synthesis_text}
                 )
         elif verdict == "both_valid":
-            self._mem.add_episode(
+            await self._amem.add_episode(
                 "contradiction.resolved",
                 "Verdict: both_valid. No changes applied.",
                 outcome="success",
@@ -682,13 +682,13 @@ class FaultTolerantHeavyTickSteps:
         
         try:
             direction = await self._ollama.chat(
-                prompt, system, timeout=30, fallback=""
+                prompt, system, timeout=30, fallback="", call_profile="weekly"
             )
             direction = direction.strip() if direction else ""
             
             if direction:
                 self._strategy.update_weekly(direction)
-                self._mem.add_episode(
+                await self._amem.add_episode(
                     "strategy.weekly_update",
                     f"Недельное направление обновлено: '{direction[:200]}'",
                     outcome="success",
@@ -711,16 +711,13 @@ class FaultTolerantHeavyTickSteps:
         text: str
     ) -> None:
         """Embed text and store in vector memory."""
-        if self._vector_mem is None:
+        if self._avec is None:
             return
         
         try:
-            loop = asyncio.get_event_loop()
-            embedding = await loop.run_in_executor(
-                None, lambda: self._ollama.ollama.embed(text[:2000])
-            )
+            embedding = await self._ollama.embed(text[:2000], fallback=[])
             if embedding:
-                self._vector_mem.add(
+                await self._avec.add(
                     episode_id=ep_id or 0,
                     event_type=event_type,
                     text=text[:500],
@@ -49,11 +49,9 @@ class _EventHandler(FileSystemEventHandler):
         if self._should_ignore(path):
             return
         data = {"path": path}
-        # Schedule coroutine safely from watchdog's background thread
-        asyncio.run_coroutine_threadsafe(
-            self._bus.publish(event_name, data),
-            self._loop,
-        )
+        # Hand over to the loop thread; a queued bus only enqueues there,
+        # so a burst (git pull) does not create a coroutine per file
+        self._loop.call_soon_threadsafe(self._bus.publish_nowait, event_name, data)
 
     def on_modified(self, event: FileModifiedEvent) -> None:   # type: ignore[override]
         if not event.is_directory:
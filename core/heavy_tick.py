@@ -8,6 +8,22 @@ Minutes are intentionally ignored as a reasonable simplification for current ver
 
 Changelog:
   TD-018 integration — added error boundaries to protect critical operations.
+  Perf — LLM calls on the loop go through an awaitable LLMBackend
+         (monologue / goal used a non-existent OllamaClient.generate()).
+  Perf — tick steps run as a StepGraph: independent steps overlap under
+         the tick deadline, per-step and critical-path timing is recorded.
+  Perf — the next tick's monologue prompt (and a draft answer) is prepared
+         during the idle interval (TickPrefetcher).
+  Perf — per-tick tracing spans (tick → step → LLM / DB / file write)
+         with Chrome trace / collapsed-stack export (core.tracing).
+  Perf — adaptive tick interval from load / backlog; OPTIONAL steps
+         (curiosity, self_modification, meta_cognition, time_perception)
+         are deferred under pressure (TickIntervalController).
+  Perf — episodic / vector memory is awaited through AsyncEpisodicMemory /
+         AsyncVectorMemory instead of sync calls on the loop and ad-hoc
+         run_in_executor(None, ...) hops. Executor calls that remain wrap
+         blocking engines (reflection, beliefs, social, ...) that call the
+         sync Ollama client themselves.
 """
 
 from __future__ import annotations
@@ -16,10 +32,18 @@ import asyncio
 import json
 import logging
 import time
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from core.error_boundary import ErrorBoundary, ErrorBoundaryFactory
+from core.llm_backend import ExecutorBackend
+from core.memory.async_memory import AsyncEpisodicMemory, AsyncVectorMemory
+from core.prompt_prefix import join_sections
+from core.step_graph import STOP, Step, StepGraph
+from core.tick_interval import TickIntervalController
+from core.tick_prefetch import TickPrefetcher
+from core.tracing import annotate, get_tracer, span
 
 if TYPE_CHECKING:
     from core.attention_system import AttentionSystem
@@ -28,6 +52,7 @@ if TYPE_CHECKING:
     from core.curiosity_engine import CuriosityEngine
     from core.emotion_engine import EmotionEngine
     from core.goal_persistence import GoalPersistence
+    from core.llm_backend import LLMBackend
     from core.memory.episodic import EpisodicMemory
     from core.memory.vector_memory import VectorMemory
     from core.milestones import Milestones
@@ -51,6 +76,10 @@ WEEKLY_CLEANUP_TICKS = 1008
 # Timeout (seconds) for each individual step that calls Ollama
 _STEP_TIMEOUT = 20
 
+# The step graph's deadline ends this much before the tick timeout,
+# so cancelled steps still get their timings recorded
+_DEADLINE_MARGIN = 1.0
+
 _DEFAULT_GOAL: dict = {
     "goal":        "наблюдать за средой",
     "reasoning":   "LLM недоступен или не вернул валидный JSON",
@@ -86,9 +115,13 @@ class HeavyTick:
         time_perception:   "TimePerception | None"   = None,
         social_layer:      "SocialLayer | None"      = None,
         meta_cognition:    "MetaCognition | None"    = None,
+        llm:               "LLMBackend | None"       = None,
     ) -> None:
         self._cfg          = cfg
         self._ollama       = ollama
+        # Awaitable LLM calls; the sync client is still handed to engines
+        # that run in executor threads
+        self._llm          = llm if llm is not None else ExecutorBackend(ollama)
         self._world        = world
         self._values       = values
         self._self_model   = self_model
@@ -112,6 +145,10 @@ class HeavyTick:
         self._social       = social_layer
         self._meta_cog     = meta_cognition
 
+        # Awaitable memory: dedicated writer thread + bounded reader pool
+        self._amem = AsyncEpisodicMemory(mem)
+        self._avec = AsyncVectorMemory(vector_memory) if vector_memory is not None else None
+
         self._interval    = cfg["ticks"]["heavy_tick_sec"]
         self._timeout     = int(cfg.get("resources", {}).get("budget", {}).get("tick_timeout_sec", 30))
         self._tick_count  = 0
@@ -133,6 +170,17 @@ class HeavyTick:
         self._boundary_ollama = ErrorBoundaryFactory.for_ollama()
         self._boundary_memory = ErrorBoundaryFactory.for_memory_write()
 
+        # Next-tick interval from load and pending work; OPTIONAL steps deferred under pressure
+        self.interval_ctl = TickIntervalController.from_config(cfg)
+
+        self._graph = self._build_graph()
+
+        # Next tick's monologue prompt, prepared while the loop is idle
+        self.prefetch = TickPrefetcher.from_config(cfg)
+
+        # Per-tick spans (tick → step → LLM call / DB query / file write)
+        self._tracer = get_tracer(cfg)
+
     # ────────────────────────────────────────────────────────────────
     # Lifecycle
     # ────────────────────────────────────────────────────────────────
@@ -145,17 +193,21 @@ class HeavyTick:
         while self._running:
             tick_start = time.monotonic()
             self._tick_count += 1
+            self.interval_ctl.begin_tick(self._tick_count)
 
-            if not self._ollama.is_available():
+            if not await self._llm.is_available():
                 log.warning(f"[HeavyTick #{self._tick_count}] Ollama unavailable — skipping tick.")
                 await asyncio.sleep(self._interval)
                 continue
 
+            timed_out = False
             try:
-                await asyncio.wait_for(self._run_tick(), timeout=self._timeout)
+                with self._tracer.trace("heavy_tick", tick=self._tick_count):
+                    await asyncio.wait_for(self._run_tick(), timeout=self._timeout)
             except asyncio.TimeoutError:
+                timed_out = True
                 log.error(f"[HeavyTick #{self._tick_count}] Timeout ({self._timeout}s) exceeded.")
-                self._mem.add_episode(
+                await self._amem.add_episode(
                     "heavy_tick.timeout",
                     f"Heavy tick #{self._tick_count} exceeded {self._timeout}s timeout",
                     outcome="error",
@@ -164,11 +216,23 @@ class HeavyTick:
                 await self._values._publish_changed()
                 self._update_emotions("heavy_tick.timeout", "failure")
 
-            elapsed = time.monotonic() - tick_start
-            await asyncio.sleep(max(0.0, self._interval - elapsed))
+            delay = self.interval_ctl.end_tick(time.monotonic() - tick_start, timed_out)
+            await self.interval_ctl.sleep(
+                self.prefetch.idle(
+                    delay,
+                    self._build_monologue_prompt,
+                    warm=self._draft_monologue,
+                    embed=self._embed_draft,
+                ),
+                tick_start,
+            )
 
     def stop(self) -> None:
         self._running = False
+        self.prefetch.close()
+        self._amem.shutdown(wait=False)
+        if self._avec is not None:
+            self._avec.shutdown(wait=False)
         log.info("HeavyTick stopped.")
 
     # ────────────────────────────────────────────────────────────────
@@ -177,127 +241,116 @@ class HeavyTick:
     async def _run_tick(self) -> None:
         n = self._tick_count
         log.info(f"[HeavyTick #{n}] Starting.")
-        self._ollama.reset_tick_counter()
+        self._llm.reset_tick_counter()
 
         if self._time_perc is not None:
             self._time_perc.update_context()
 
-        monologue, ep_id = await self._step_monologue(n)
-        await self._embed_and_store(ep_id, "monologue", monologue)
-
+        run = await self._graph.run(
+            {"n": n},
+            deadline=max(1.0, self._timeout - _DEADLINE_MARGIN),
+            label=f"HeavyTick #{n}",
+        )
+        log.info(f"[HeavyTick #{n}] All steps finished: {run.summary()}")
+        annotate(critical_path=run.critical_path)
+        if run.deadline_hit:
+            raise asyncio.TimeoutError
+
+    # ────────────────────────────────────────────────────────────────
+    # Step graph
+    # ────────────────────────────────────────────────────────────────
+    def _build_graph(self) -> StepGraph:
+        """monologue → semantic_ctx → goal → action → after_action, optional steps branch off."""
+        def optional(name: str, fn, *after: str, deferrable: bool = True) -> Step:
+            if deferrable:
+                fn = self.interval_ctl.gate(name, fn)
+            return Step(name, fn, inputs=("n",), after=("after_action", *after),
+                        timeout=_STEP_TIMEOUT, fallback=None)
+
+        return StepGraph("heavy_tick", [
+            Step("monologue", self._step_monologue, inputs=("n",), outputs=("monologue", "monologue_id")),
+            Step("embed_monologue", self._embed_monologue, inputs=("monologue", "monologue_id"), fallback=None),
+            Step("mode", self._node_mode, inputs=("n",), after=("monologue",), outputs=("mode",)),
+            Step("semantic_context", self._semantic_context, inputs=("monologue",), after=("mode",),
+                 outputs=("semantic_ctx",), timeout=_STEP_TIMEOUT, fallback=""),
+            Step("goal_selection", self._node_goal, inputs=("n", "monologue", "semantic_ctx"),
+                 outputs=("goal",)),
+            Step("action", self._node_action, inputs=("n", "monologue", "goal"), outputs=("action",)),
+            Step("after_action", self._node_after_action, inputs=("n", "mode", "goal", "action"),
+                 timeout=_STEP_TIMEOUT, fallback=None),
+            optional("curiosity", self._step_curiosity),
+            optional("self_modification", self._step_self_modification),
+            optional("belief_system", self._step_belief_system, deferrable=False),
+            # these two read the beliefs belief_system rewrites
+            optional("contradiction_resolver", self._step_contradiction_resolver, "belief_system",
+                     deferrable=False),
+            optional("meta_cognition", self._step_meta_cognition, "belief_system"),
+            optional("time_perception", self._step_time_perception),
+            optional("social_interaction", self._step_social_interaction, deferrable=False),
+        ])
+
+    async def _embed_monologue(self, monologue: str, monologue_id: int) -> None:
+        await self._embed_and_store(monologue_id, "monologue", monologue)
+
+    async def _node_mode(self, n: int) -> str | object:
+        """Current value mode; defensive mode ends the tick after the monologue."""
         mode = self._values.get_mode()
-        if mode == "defensive":
-            log.info(f"[HeavyTick #{n}] Mode=defensive — skipping goal selection.")
-            self._mem.add_episode(
-                "heavy_tick.defensive",
-                f"Tick #{n}: defensive mode, only monologue executed.",
-                outcome="skipped",
-            )
-            self._decision_log.info(f"TICK #{n} | goal=observe(defensive) | action=none | outcome=skipped")
-            return
-
-        log.info(f"[HeavyTick #{n}] STEP: semantic_context")
-        try:
-            semantic_ctx = await asyncio.wait_for(
-                self._semantic_context(monologue), timeout=_STEP_TIMEOUT
-            )
-        except asyncio.TimeoutError:
-            log.warning(f"[HeavyTick #{n}] STEP semantic_context TIMEOUT ({_STEP_TIMEOUT}s) — skipping.")
-            semantic_ctx = ""
+        if mode != "defensive":
+            return mode
+        log.info(f"[HeavyTick #{n}] Mode=defensive — skipping goal selection.")
+        await self._amem.add_episode(
+            "heavy_tick.defensive",
+            f"Tick #{n}: defensive mode, only monologue executed.",
+            outcome="skipped",
+        )
+        self._decision_log.info(f"TICK #{n} | goal=observe(defensive) | action=none | outcome=skipped")
+        return STOP
 
+    async def _node_goal(self, n: int, monologue: str, semantic_ctx: str) -> dict:
         # PROTECTED: Goal selection with error boundary
-        log.info(f"[HeavyTick #{n}] STEP: goal_selection")
         goal_data = await self._boundary_ollama.execute(
-            operation=lambda: self._step_goal_selection(n, monologue, semantic_ctx),
+            operation=partial(self._step_goal_selection, n, monologue, semantic_ctx),
             context=f"goal_selection_tick_{n}",
             timeout=_STEP_TIMEOUT
         )
-        
         if goal_data is None:
             goal_data = dict(_DEFAULT_GOAL)
             log.warning(f"[HeavyTick #{n}] Goal selection failed - using default")
 
         if self._goal_pers is not None:
             self._goal_pers.set_active(goal_data, tick=n)
+        return goal_data
 
-        action_type = goal_data.get("action_type", "observe")
-        risk_level  = goal_data.get("risk_level",  "low")
-        goal_text   = goal_data.get("goal",         _DEFAULT_GOAL["goal"])
-
-        success = True
-        outcome = "observe"
-
-        # PROTECTED: Action dispatch with error boundary
+    async def _node_action(self, n: int, monologue: str, goal: dict) -> tuple[bool, str]:
+        action_type = goal.get("action_type", "observe")
         log.info(f"[HeavyTick #{n}] STEP: action ({action_type})")
-        
         if action_type == "observe":
-            outcome = "observed"
             log.info(f"[HeavyTick #{n}] Action: observe (passive tick).")
-        else:
-            action_result = await self._boundary_ollama.execute(
-                operation=lambda: self._dispatch_action(n, action_type, monologue, goal_text, goal_data),
-                context=f"action_{action_type}_tick_{n}",
-                timeout=_STEP_TIMEOUT
-            )
-            
-            if action_result is None:
-                success, outcome = False, f"{action_type}_failed"
-                log.warning(f"[HeavyTick #{n}] Action {action_type} failed")
-            else:
-                success, outcome = action_result
-
-        log.info(f"[HeavyTick #{n}] STEP: after_action")
-        try:
-            await asyncio.wait_for(
-                self._step_after_action(n, action_type, goal_text, risk_level, mode, success, outcome),
-                timeout=_STEP_TIMEOUT
-            )
-        except asyncio.TimeoutError:
-            log.warning(f"[HeavyTick #{n}] STEP after_action TIMEOUT ({_STEP_TIMEOUT}s).")
-
-        log.info(f"[HeavyTick #{n}] STEP: curiosity")
-        try:
-            await asyncio.wait_for(self._step_curiosity(n), timeout=_STEP_TIMEOUT)
-        except asyncio.TimeoutError:
-            log.warning(f"[HeavyTick #{n}] STEP curiosity TIMEOUT ({_STEP_TIMEOUT}s).")
-
-        log.info(f"[HeavyTick #{n}] STEP: self_modification")
-        try:
-            await asyncio.wait_for(self._step_self_modification(n), timeout=_STEP_TIMEOUT)
-        except asyncio.TimeoutError:
-            log.warning(f"[HeavyTick #{n}] STEP self_modification TIMEOUT ({_STEP_TIMEOUT}s).")
-
-        log.info(f"[HeavyTick #{n}] STEP: belief_system")
-        try:
-            await asyncio.wait_for(self._step_belief_system(n), timeout=_STEP_TIMEOUT)
-        except asyncio.TimeoutError:
-            log.warning(f"[HeavyTick #{n}] STEP belief_system TIMEOUT ({_STEP_TIMEOUT}s).")
-
-        log.info(f"[HeavyTick #{n}] STEP: contradiction_resolver")
-        try:
-            await asyncio.wait_for(self._step_contradiction_resolver(n), timeout=_STEP_TIMEOUT)
-        except asyncio.TimeoutError:
-            log.warning(f"[HeavyTick #{n}] STEP contradiction_resolver TIMEOUT ({_STEP_TIMEOUT}s).")
-
-        log.info(f"[HeavyTick #{n}] STEP: time_perception")
-        try:
-            await asyncio.wait_for(self._step_time_perception(n), timeout=_STEP_TIMEOUT)
-        except asyncio.TimeoutError:
-            log.warning(f"[HeavyTick #{n}] STEP time_perception TIMEOUT ({_STEP_TIMEOUT}s).")
-
-        log.info(f"[HeavyTick #{n}] STEP: social_interaction")
-        try:
-            await asyncio.wait_for(self._step_social_interaction(n), timeout=_STEP_TIMEOUT)
-        except asyncio.TimeoutError:
-            log.warning(f"[HeavyTick #{n}] STEP social_interaction TIMEOUT ({_STEP_TIMEOUT}s).")
-
-        log.info(f"[HeavyTick #{n}] STEP: meta_cognition")
-        try:
-            await asyncio.wait_for(self._step_meta_cognition(n), timeout=_STEP_TIMEOUT)
-        except asyncio.TimeoutError:
-            log.warning(f"[HeavyTick #{n}] STEP meta_cognition TIMEOUT ({_STEP_TIMEOUT}s).")
+            return True, "observed"
 
-        log.info(f"[HeavyTick #{n}] All steps finished.")
+        # PROTECTED: Action dispatch with error boundary
+        goal_text = goal.get("goal", _DEFAULT_GOAL["goal"])
+        action_result = await self._boundary_ollama.execute(
+            operation=partial(self._dispatch_action, n, action_type, monologue, goal_text, goal),
+            context=f"action_{action_type}_tick_{n}",
+            timeout=_STEP_TIMEOUT
+        )
+        if action_result is None:
+            log.warning(f"[HeavyTick #{n}] Action {action_type} failed")
+            return False, f"{action_type}_failed"
+        return action_result
+
+    async def _node_after_action(self, n: int, mode: str, goal: dict, action: tuple[bool, str]) -> None:
+        success, outcome = action
+        await self._step_after_action(
+            n,
+            goal.get("action_type", "observe"),
+            goal.get("goal", _DEFAULT_GOAL["goal"]),
+            goal.get("risk_level", "low"),
+            mode,
+            success,
+            outcome,
+        )
 
     # ────────────────────────────────────────────────────────────────
     # Action dispatch helper (NEW for error boundaries)
@@ -331,7 +384,7 @@ class HeavyTick:
         if self._time_perc.should_detect(n):
             log.info(f"[HeavyTick #{n}] TimePerception: detecting patterns.")
             try:
-                episodes = self._mem.get_recent_episodes(50)
+                episodes = await self._amem.get_recent_episodes(50)
                 patterns = await loop.run_in_executor(
                     None, lambda: self._time_perc.detect_patterns(episodes, self._ollama)
                 )
@@ -358,7 +411,7 @@ class HeavyTick:
         if new_messages:
             for msg in new_messages:
                 msg["tick"] = n
-                self._mem.add_episode(
+                await self._amem.add_episode(
                     "social.incoming",
                     f"Пользователь написал: {msg['content'][:200]}",
                     outcome="success",
@@ -375,14 +428,14 @@ class HeavyTick:
                         None, lambda r=response: self._social.write_to_outbox(r)
                     )
                     self._social.mark_responded(msg["id"])
-                    self._mem.add_episode(
+                    await self._amem.add_episode(
                         "social.outgoing",
                         f"Ответил пользователю: {response[:200]}",
                         outcome="success",
                     )
                     log.info(f"[HeavyTick #{n}] SocialLayer: responded to user message.")
                 else:
-                    self._mem.add_episode(
+                    await self._amem.add_episode(
                         "social.llm_unavailable",
                         "Не удалось сгенерировать ответ — LLM недоступен",
                         outcome="error",
@@ -406,7 +459,7 @@ class HeavyTick:
                 await loop.run_in_executor(
                     None, lambda m=message: self._social.write_to_outbox(m)
                 )
-                self._mem.add_episode(
+                await self._amem.add_episode(
                     "social.initiative",
                     f"Написал пользователю (reason={reason}): {message[:200]}",
                     outcome="success",
@@ -426,7 +479,7 @@ class HeavyTick:
         if self._meta_cog.should_analyze(n):
             log.info(f"[HeavyTick #{n}] MetaCognition: analyzing decision quality.")
             try:
-                episodes = self._mem.get_recent_episodes(20)
+                episodes = await self._amem.get_recent_episodes(20)
                 quality = await loop.run_in_executor(
                     None, lambda: self._meta_cog.analyze_decision_quality(episodes, self._ollama)
                 )
@@ -507,10 +560,11 @@ class HeavyTick:
     # ────────────────────────────────────────────────────────────────
     async def _step_monologue(self, n: int) -> tuple[str, int]:
         """Generate internal monologue and log it."""
-        prompt = self._build_monologue_prompt()
+        # Prepared during the idle interval (its draft is likely in LLMCache)
+        system, prompt = self.prefetch.take() or await self._build_monologue_prompt()
         try:
             response = await asyncio.wait_for(
-                self._ollama.generate(prompt, max_tokens=300),
+                self._llm.chat(prompt, system, call_profile="monologue"),
                 timeout=_STEP_TIMEOUT
             )
             mono = response.strip()
@@ -519,52 +573,51 @@ class HeavyTick:
             mono = "(монолог недоступен — LLM ошибка)"
 
         self._monologue_log.info(f"TICK #{n} | {mono}")
-        ep_id = self._mem.add_episode("monologue", mono, outcome="generated")
+        ep_id = await self._amem.add_episode("monologue", mono, outcome="generated")
         return mono, ep_id
 
-    def _build_monologue_prompt(self) -> str:
-        """Build prompt for internal monologue."""
-        parts = [
+    async def _draft_monologue(self, system: str, prompt: str) -> str:
+        """Prefetch: the next tick's monologue call, made early to fill LLMCache."""
+        return await self._llm.chat(prompt, system, call_profile="monologue")
+
+    async def _embed_draft(self, text: str) -> None:
+        """Prefetch: embed the draft as semantic_context / _embed_and_store will."""
+        await self._llm.embed(text.strip())
+
+    async def _build_monologue_prompt(self) -> tuple[str, str]:
+        """Build (stable system prefix, per-tick prompt) for internal monologue."""
+        system = join_sections(
             "# Внутренний монолог",
-            "",
             self._self_model.to_prompt_context(),
-            self._values.to_prompt_context(),
-        ]
+            "Вырази в 2-3 предложениях свои мысли о текущем состоянии и что делать дальше.",
+        )
+        parts = [self._values.to_prompt_context()]
         if self._emotions:
             parts.append(self._emotions.to_prompt_context())
         if self._time_perc:
             parts.append(self._time_perc.to_prompt_context(2))
         
-        recent = self._mem.get_recent_episodes(3)
+        recent = await self._amem.get_recent_episodes(3)
         if recent:
-            parts.append("\n## Последние события:")
+            parts.append("## Последние события:")
             for ep in recent:
                 parts.append(f"- {ep['event_type']}: {ep['description'][:100]}")
-        
-        parts.append("\nВырази в 2-3 предложениях свои мысли о текущем состоянии и что делать дальше.")
-        return "\n".join(parts)
+        return system, join_sections(*parts)
 
     # ────────────────────────────────────────────────────────────────
     # Step: Semantic Context (Attention)
     # ────────────────────────────────────────────────────────────────
     async def _semantic_context(self, monologue: str) -> str:
         """Retrieve relevant memories based on monologue."""
-        if self._vector_mem is None or self._attention is None:
+        if self._avec is None or self._attention is None:
             return ""
         
-        loop = asyncio.get_event_loop()
         try:
-            emb = await loop.run_in_executor(
-                None,
-                lambda: self._ollama.embed(monologue)
-            )
-            if emb is None:
+            emb = await self._llm.embed(monologue)
+            if not emb:
                 return ""
             
-            results = await loop.run_in_executor(
-                None,
-                lambda: self._vector_mem.search(emb, k=self._attn_top_k)
-            )
+            results = await self._avec.search(emb, top_k=self._attn_top_k)
             
             filtered = [r for r in results if r["score"] >= self._attn_min_score]
             if not filtered:
@@ -593,11 +646,11 @@ class HeavyTick:
         self, n: int, monologue: str, semantic_ctx: str
     ) -> dict:
         """Select goal using LLM."""
-        prompt = self._build_goal_prompt(monologue, semantic_ctx)
+        system, prompt = self._build_goal_prompt(monologue, semantic_ctx)
         
         try:
             response = await asyncio.wait_for(
-                self._ollama.generate(prompt, max_tokens=200),
+                self._llm.chat(prompt, system, call_profile="goal", json_object=True),
                 timeout=_STEP_TIMEOUT
             )
             goal_data = self._parse_goal_json(response)
@@ -608,32 +661,30 @@ class HeavyTick:
         
         return dict(_DEFAULT_GOAL)
 
-    def _build_goal_prompt(self, monologue: str, semantic_ctx: str) -> str:
-        """Build prompt for goal selection."""
-        parts = [
+    def _build_goal_prompt(self, monologue: str, semantic_ctx: str) -> tuple[str, str]:
+        """Build (stable system prefix, per-tick prompt) for goal selection."""
+        system = join_sections(
             "# Выбор цели",
-            "",
             self._self_model.to_prompt_context(),
-            self._values.to_prompt_context(),
-        ]
+            "Выбери цель на следующий тик. Ответь JSON:",
+            '{"goal": "текст цели", "reasoning": "почему", "action_type": "observe|analyze|write|reflect|shell", "risk_level": "low|medium|high"}',
+        )
+        parts = [self._values.to_prompt_context()]
         
         if self._emotions:
             parts.append(self._emotions.to_prompt_context())
         
         if semantic_ctx:
-            parts.append(f"\n{semantic_ctx}")
+            parts.append(semantic_ctx)
         
-        parts.append(f"\n## Текущие мысли:\n{monologue}")
+        parts.append(f"## Текущие мысли:\n{monologue}")
         
         if self._curiosity and self._curiosity_enabled:
             q = self._curiosity.get_top_question()
             if q:
-                parts.append(f"\n## Открытый вопрос:\n{q['question']}")
+                parts.append(f"## Открытый вопрос:\n{q['question']}")
         
-        parts.append("\nВыбери цель на следующий тик. Ответь JSON:")
-        parts.append('{"goal": "текст цели", "reasoning": "почему", "action_type": "observe|analyze|write|reflect|shell", "risk_level": "low|medium|high"}')
-        
-        return "\n".join(parts)
+        return system, join_sections(*parts)
 
     def _parse_goal_json(self, text: str) -> dict | None:
         """Parse goal from LLM response."""
@@ -653,7 +704,7 @@ class HeavyTick:
     # ────────────────────────────────────────────────────────────────
     async def _action_analyze(self, n: int) -> tuple[bool, str]:
         """Analyze recent episodes."""
-        episodes = self._mem.get_recent_episodes(10)
+        episodes = await self._amem.get_recent_episodes(10)
         if not episodes:
             return True, "analyze:no_data"
         
@@ -665,7 +716,7 @@ class HeavyTick:
         summary = ", ".join([f"{k}={v}" for k, v in patterns.items()])
         log.info(f"[HeavyTick #{n}] Analysis: {summary}")
         
-        self._mem.add_episode(
+        await self._amem.add_episode(
             "action.analyze",
             f"Проанализировал последние 10 эпизодов: {summary}",
             outcome="success"
@@ -679,10 +730,11 @@ class HeavyTick:
         
         try:
             content = f"Tick #{n}\n\nМонолог: {monologue}\n\nЦель: {goal}\n"
-            filepath.write_text(content, encoding="utf-8")
+            with span("file.write", path=filename, bytes=len(content.encode("utf-8"))):
+                filepath.write_text(content, encoding="utf-8")
             
             log.info(f"[HeavyTick #{n}] Wrote to {filename}")
-            self._mem.add_episode(
+            await self._amem.add_episode(
                 "action.write",
                 f"Записал мысли в {filename}",
                 outcome="success"
@@ -700,7 +752,7 @@ class HeavyTick:
         
         try:
             loop = asyncio.get_event_loop()
-            episodes = self._mem.get_recent_episodes(20)
+            episodes = await self._amem.get_recent_episodes(20)
             
             reflection = await loop.run_in_executor(
                 None,
@@ -709,7 +761,7 @@ class HeavyTick:
             
             if reflection:
                 log.info(f"[HeavyTick #{n}] Reflection: {reflection[:100]}")
-                self._mem.add_episode(
+                await self._amem.add_episode(
                     "action.reflect",
                     f"Рефлексия: {reflection[:200]}",
                     outcome="success"
@@ -746,7 +798,7 @@ class HeavyTick:
             f"mode={mode} | success={success} | outcome={outcome}"
         )
         
-        self._mem.add_episode(
+        await self._amem.add_episode(
             "heavy_tick.complete",
             f"Tick #{n}: {action_type} - {outcome}",
             outcome="success" if success else "failure"
@@ -757,7 +809,7 @@ class HeavyTick:
             log.info(f"[HeavyTick #{n}] Weekly strategy update")
             try:
                 loop = asyncio.get_event_loop()
-                episodes = self._mem.get_recent_episodes(100)
+                episodes = await self._amem.get_recent_episodes(100)
                 await loop.run_in_executor(
                     None,
                     lambda: self._strategy.update_from_history(episodes, self._ollama)
@@ -766,13 +818,9 @@ class HeavyTick:
                 log.error(f"[HeavyTick #{n}] Strategy update failed: {e}")
         
         # Periodic cleanup
-        if self._vector_mem and n % 24 == 0:
+        if self._avec and n % 24 == 0:
             try:
-                loop = asyncio.get_event_loop()
-                deleted = await loop.run_in_executor(
-                    None,
-                    lambda: self._vector_mem.cleanup_old_vectors(days=30)
-                )
+                deleted = await self._avec.cleanup_old_vectors(days=30)
                 if deleted > 0:
                     log.info(f"[HeavyTick #{n}] Cleaned up {deleted} old vectors")
             except Exception as e:
@@ -802,7 +850,7 @@ class HeavyTick:
         
         try:
             loop = asyncio.get_event_loop()
-            episodes = self._mem.get_recent_episodes(10)
+            episodes = await self._amem.get_recent_episodes(10)
             
             await loop.run_in_executor(
                 None,
@@ -848,7 +896,7 @@ class HeavyTick:
             log.info(f"[HeavyTick #{n}] Updating belief system")
             try:
                 loop = asyncio.get_event_loop()
-                episodes = self._mem.get_recent_episodes(30)
+                episodes = await self._amem.get_recent_episodes(30)
                 await loop.run_in_executor(
                     None,
                     lambda: self._beliefs.update_from_episodes(episodes, self._ollama)
@@ -892,20 +940,13 @@ class HeavyTick:
     # ────────────────────────────────────────────────────────────────
     async def _embed_and_store(self, episode_id: int, label: str, text: str) -> None:
         """Embed text and store in vector memory."""
-        if self._vector_mem is None:
+        if self._avec is None:
             return
         
         try:
-            loop = asyncio.get_event_loop()
-            emb = await loop.run_in_executor(
-                None,
-                lambda: self._ollama.embed(text)
-            )
+            emb = await self._llm.embed(text)
             if emb:
-                await loop.run_in_executor(
-                    None,
-                    lambda: self._vector_mem.add(f"{label}_{episode_id}", text, emb)
-                )
+                await self._avec.add(episode_id, label, text, emb)
         except Exception as e:
             log.error(f"Embedding failed: {e}")
 
@@ -3,6 +3,7 @@ Digital Being — IntrospectionAPI
 Stage 27.5: Added Web UI + Chat endpoints.
 Stage 28-30: Added Advanced Multi-Agent, Memory, Self-Evolution endpoints.
 Stage 31: Added Autoscaler endpoints.
+Perf: /traces — per-tick spans as JSON, Chrome trace events or collapsed stacks.
 """
 
 from __future__ import annotations
@@ -13,6 +14,7 @@ import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from core.multi_agent.agent_roles import AgentRoleManager, AgentRole, ROLE_DEFINITIONS
+from core.tracing import to_chrome_trace, to_collapsed
 try:
     from aiohttp import web
 except ImportError:
@@ -119,6 +121,10 @@ class IntrospectionAPI:
         app.router.add_post("/autoscaler/enable", self._handle_autoscaler_enable)
         app.router.add_post("/autoscaler/disable", self._handle_autoscaler_disable)
         
+        # Tick tracing
+        app.router.add_get("/traces", self._handle_traces)
+        app.router.add_get("/traces/{trace_id}", self._handle_trace)
+        
         self._runner = web.AppRunner(app, access_log=None)
         await self._runner.setup()
         self._site = web.TCPSite(self._runner, self._host, self._port)
@@ -722,15 +728,21 @@ class IntrospectionAPI:
             mem = self._c.get("episodic")
             values = self._c.get("value_engine")
             ollama = self._c.get("ollama")
+            llm = self._c.get("llm")
             gp = self._c.get("goal_persistence")
             attn = self._c.get("attention_system")
             emotions = self._c.get("emotion_engine")
             
+            if llm is not None:
+                ollama_available = await llm.is_available()
+            else:
+                ollama_available = ollama.is_available() if ollama else False
+            
             payload = {
                 "uptime_sec": int(uptime),
                 "tick_count": getattr(self._c.get("heavy_tick"), "_tick_count", 0),
                 "mode": values.get_mode() if values else "unknown",
-                "ollama_available": ollama.is_available() if ollama else False,
+                "ollama_available": ollama_available,
                 "episode_count": mem.count() if mem else 0,
                 "attention_focus": attn.get_focus_summary() if attn else ""
             }
@@ -810,7 +822,10 @@ class IntrospectionAPI:
                 return self._json({"error": "EpisodicMemory not available"})
             limit = int(request.query.get("limit", "50"))
             event_type = request.query.get("event_type", "")
-            if event_type:
+            text_query = request.query.get("q", "")
+            if text_query:
+                episodes = mem.search_text(text_query, limit=limit, event_type=event_type or None)
+            elif event_type:
                 episodes = mem.get_episodes_by_type(event_type, limit=limit)
             else:
                 episodes = mem.get_recent_episodes(limit)
@@ -826,9 +841,11 @@ class IntrospectionAPI:
             top_k = int(request.query.get("top_k", "5"))
             vec = self._c.get("vector_memory")
             ollama = self._c.get("ollama")
-            if not vec or not ollama:
+            llm = self._c.get("llm")
+            if not vec or not (ollama or llm):
                 return self._json({"error": "VectorMemory or Ollama not available"})
-            embedding = ollama.embed(query)
+            # Awaitable backend keeps the API loop free while Ollama embeds
+            embedding = await llm.embed(query) if llm is not None else ollama.embed(query)
             if not embedding:
                 return self._json({"error": "Failed to generate embedding"})
             results = vec.search(embedding, top_k=top_k)
@@ -930,6 +947,41 @@ class IntrospectionAPI:
         except Exception as e:
             return self._error(e)
 
+    async def _handle_traces(self, request: web.Request) -> web.Response:
+        """GET /traces?limit=20&format=json|chrome|collapsed"""
+        try:
+            tracer = self._c.get("tracer")
+            if tracer is None:
+                return self._json({"error": "Tracer not available"})
+            limit = int(request.query.get("limit", 20))
+            return self._traces_response(tracer.get_traces(limit), request.query.get("format", "json"),
+                                         {"stats": tracer.get_stats()})
+        except Exception as e:
+            return self._error(e)
+
+    async def _handle_trace(self, request: web.Request) -> web.Response:
+        """GET /traces/{trace_id}?format=json|chrome|collapsed"""
+        try:
+            tracer = self._c.get("tracer")
+            if tracer is None:
+                return self._json({"error": "Tracer not available"})
+            trace = tracer.get_trace(int(request.match_info["trace_id"]))
+            if trace is None:
+                return web.Response(text=json.dumps({"error": "trace not found"}), content_type="application/json", status=404)
+            fmt = request.query.get("format", "json")
+            if fmt == "json":
+                return self._json(trace.to_dict())
+            return self._traces_response([trace], fmt, {})
+        except Exception as e:
+            return self._error(e)
+
+    def _traces_response(self, traces: list, fmt: str, extra: dict) -> "web.Response":
+        if fmt == "chrome":
+            return self._json(to_chrome_trace(traces))
+        if fmt == "collapsed":
+            return web.Response(text=to_collapsed(traces), content_type="text/plain")
+        return self._json({"traces": [t.summary() for t in reversed(traces)], **extra})
+
     def _json(self, data: dict) -> "web.Response":
         return web.Response(text=json.dumps(data, ensure_ascii=False, default=str), content_type="application/json")
 
@@ -0,0 +1,219 @@
+"""
+Digital Being — LLM backend
+One awaitable interface over Ollama for HeavyTick, cognitive engines and the API.
+
+Design rules:
+  - Code running on the event loop awaits an LLMBackend; nothing blocks the loop
+  - AsyncOllamaBackend: native aiohttp client (pooled connections,
+    asyncio.sleep backoff) — the default whenever aiohttp is installed
+  - ExecutorBackend: fallback — the sync OllamaClient on a bounded thread pool,
+    so its time.sleep() retries never run on the loop
+  - Both keep the client protections: circuit breaker, rate limiter,
+    LLMCache, EmbeddingCache, TokenBudget, metrics
+  - Errors never crash the caller: "" / [] like the clients
+  - .sync is the blocking OllamaClient for engines that already run in
+    executor threads (ReflectionEngine, ContradictionResolver, ...)
+
+Usage:
+    llm = make_llm_backend(cfg, ollama)
+    text = await llm.chat(prompt, system, call_profile="goal", json_object=True)
+    vec  = await llm.embed(text)
+    await llm.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from core.async_ollama_client import AIOHTTP_AVAILABLE, AsyncOllamaClient
+
+if TYPE_CHECKING:
+    from core.ollama_client import OllamaClient
+
+log = logging.getLogger("digital_being.llm_backend")
+
+DEFAULT_EXECUTOR_WORKERS = 4
+
+
+class LLMBackend(ABC):
+    """Awaitable LLM interface shared by all async callers."""
+
+    name = "base"
+
+    def __init__(self, sync_client: "OllamaClient") -> None:
+        self._sync = sync_client
+
+    @property
+    def sync(self) -> "OllamaClient":
+        """The blocking client (for code already running in a worker thread)."""
+        return self._sync
+
+    @property
+    def embedding_cache(self) -> Any:
+        return getattr(self._sync, "embedding_cache", None)
+
+    @abstractmethod
+    async def chat(
+        self,
+        prompt: str,
+        system: str = "",
+        call_profile: str | None = None,
+        json_object: bool = False,
+    ) -> str:
+        """Chat completion; json_object stops generation after the first {...}."""
+
+    @abstractmethod
+    async def embed(self, text: str) -> list[float]:
+        """Embedding of one text ([] on error)."""
+
+    @abstractmethod
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Batched embeddings, one vector per text ([] for failed items)."""
+
+    @abstractmethod
+    async def is_available(self) -> bool:
+        """Availability ping."""
+
+    def reset_tick_counter(self) -> None:
+        """Call at the start of each Heavy Tick (also closes the prompt-eval tally)."""
+        self._sync.reset_tick_counter()
+        prefix = getattr(self._sync, "prompt_prefix", None)
+        if prefix is not None:
+            prefix.end_tick()
+
+    async def close(self) -> None:
+        """Release connections / worker threads."""
+
+    def get_stats(self) -> dict:
+        return {"backend": self.name, "sync": self._sync.get_comprehensive_stats()}
+
+
+class AsyncOllamaBackend(LLMBackend):
+    """Native asyncio backend over AsyncOllamaClient."""
+
+    name = "aiohttp"
+
+    def __init__(self, cfg: dict, sync_client: "OllamaClient") -> None:
+        super().__init__(sync_client)
+        self._client = AsyncOllamaClient(cfg)
+
+    @property
+    def client(self) -> AsyncOllamaClient:
+        return self._client
+
+    async def chat(
+        self,
+        prompt: str,
+        system: str = "",
+        call_profile: str | None = None,
+        json_object: bool = False,
+    ) -> str:
+        if json_object:
+            return await self._client.chat_until(prompt, system, call_profile=call_profile)
+        return await self._client.chat(prompt, system, call_profile=call_profile)
+
+    async def embed(self, text: str) -> list[float]:
+        return await self._client.embed(text)
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        return await self._client.embed_batch(texts)
+
+    async def is_available(self) -> bool:
+        return await self._client.is_available()
+
+    def reset_tick_counter(self) -> None:
+        super().reset_tick_counter()
+        self._client.reset_tick_counter()
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        stats["async"] = self._client.get_comprehensive_stats()
+        return stats
+
+
+class ExecutorBackend(LLMBackend):
+    """Sync OllamaClient on a dedicated, bounded thread pool."""
+
+    name = "executor"
+
+    def __init__(
+        self, sync_client: "OllamaClient", workers: int = DEFAULT_EXECUTOR_WORKERS
+    ) -> None:
+        super().__init__(sync_client)
+        self._workers = max(1, int(workers))
+        self._pool = ThreadPoolExecutor(
+            max_workers=self._workers, thread_name_prefix="llm-backend"
+        )
+
+    async def _run(self, fn, *args, **kwargs) -> Any:
+        # Carry the caller's llm_priority() into the worker thread
+        ctx = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, functools.partial(ctx.run, fn, *args, **kwargs)
+        )
+
+    async def chat(
+        self,
+        prompt: str,
+        system: str = "",
+        call_profile: str | None = None,
+        json_object: bool = False,
+    ) -> str:
+        if json_object:
+            return await self._run(
+                self._sync.chat_until, prompt, system, call_profile=call_profile
+            )
+        return await self._run(self._sync.chat, prompt, system, call_profile=call_profile)
+
+    async def embed(self, text: str) -> list[float]:
+        # Embedding cache hit: no thread hop
+        cache = self.embedding_cache
+        if cache is not None:
+            vec = cache.get(text, count_miss=False)
+            if vec is not None:
+                return vec
+        return await self._run(self._sync.embed, text)
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        return await self._run(self._sync.embed_many, texts)
+
+    async def is_available(self) -> bool:
+        return await self._run(self._sync.is_available)
+
+    async def close(self) -> None:
+        self._pool.shutdown(wait=False)
+
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        stats["workers"] = self._workers
+        return stats
+
+
+def make_llm_backend(cfg: dict, sync_client: "OllamaClient") -> LLMBackend:
+    """
+    Build the backend selected by `ollama.backend` ("auto" | "aiohttp" | "executor").
+
+    "auto" uses aiohttp when it is installed, else the executor fallback.
+    """
+    ollama_cfg = cfg.get("ollama", {})
+    choice = str(ollama_cfg.get("backend", "auto")).lower()
+    if choice in ("auto", "aiohttp") and AIOHTTP_AVAILABLE:
+        backend: LLMBackend = AsyncOllamaBackend(cfg, sync_client)
+    else:
+        if choice == "aiohttp":
+            log.warning("LLM backend: aiohttp not installed — using executor backend.")
+        backend = ExecutorBackend(
+            sync_client, int(ollama_cfg.get("executor_workers", DEFAULT_EXECUTOR_WORKERS))
+        )
+    log.info(f"LLM backend: {backend.name}")
+    return backend
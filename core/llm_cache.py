@@ -4,49 +4,93 @@ LLM Response Cache
 Кэширование ответов LLM для ускорения повторных запросов.
 
 Algorithm:
-- LRU (Least Recently Used) eviction
-- TTL (Time To Live) expiration
-- Hash-based key generation
+- L1: in-memory LRU (Least Recently Used) + TTL (Time To Live)
+- L2 (optional): SQLite-backed store, survives restarts and hot reloads
+- Keys are hashes of the *normalized* prompt: volatile fragments
+  (tick counters, timestamps, uuids) are stripped by regex rules
+- The caller's variant (model + call profile) is part of the key, so a
+  persisted answer is never reused for another model or generation profile
+- Optional semantic lookup: on a miss, the nearest cached prompt of the
+  same family is reused if its embedding similarity >= threshold
+- Hit-rate stats per prompt family
 
 Performance:
-- Cache hit: ~0.001ms (1000x faster than LLM)
+- L1 hit: ~0.001ms (1000x faster than LLM)
+- L2 hit: ~0.1ms (one indexed SQLite read, then promoted to L1)
 - Cache miss: normal LLM latency
 - Memory: ~1KB per cached response
 
 Пример:
     cache = LLMCache(max_size=100, ttl_seconds=300)
-    
-    response = cache.get(prompt, system)
+
+    response = cache.get(prompt, system, variant="llama3.2:goal")
     if response is None:
-        response = ollama.chat(prompt, system)
-        cache.set(prompt, system, response)
+        response = ollama.chat(prompt, system, call_profile="goal")
+        cache.set(prompt, system, response, variant="llama3.2:goal")
+
+    # Persistent + semantic:
+    cache = LLMCache.from_config(cfg["cache"], embed_fn=ollama.embed)
 """
 
 from __future__ import annotations
 
 import hashlib
 import logging
+import re
+import sqlite3
+import threading
 import time
 from collections import OrderedDict
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
 
 log = logging.getLogger("digital_being.llm_cache")
 
+# Volatile prompt fragments replaced before hashing: (pattern, replacement)
+DEFAULT_VOLATILE_PATTERNS: list[tuple[str, str]] = [
+    (r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?", "<ts>"),     # ISO timestamps
+    (r"\d{4}-\d{2}-\d{2}", "<date>"),
+    (r"\b\d{1,2}:\d{2}(:\d{2})?\b", "<time>"),
+    (r"(?i)\b(tick)\s*#?\s*\d+", r"\1 #<n>"),                          # TICK #123, tick 5
+    (r"(?i)\b(tick|tick_count|ts|timestamp)\s*[=:]\s*\d+(\.\d+)?", r"\1=<n>"),
+    (r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", "<uuid>"),
+]
+
+DEFAULT_DISK_TTL_SECONDS   = 7 * 86400
+DEFAULT_DISK_MAX_ENTRIES   = 20_000
+DEFAULT_SEMANTIC_THRESHOLD = 0.97
+_SEMANTIC_MAX_CANDIDATES   = 2_000   # newest rows per family compared on a miss
+
+
+class PromptNormalizer:
+    """Strip volatile fragments so near-identical prompts share a key."""
+
+    def __init__(self, patterns: list[tuple[str, str]] | None = None) -> None:
+        rules = DEFAULT_VOLATILE_PATTERNS if patterns is None else patterns
+        self._rules = [(re.compile(p), r) for p, r in rules]
+
+    def normalize(self, text: str) -> str:
+        for pattern, repl in self._rules:
+            text = pattern.sub(repl, text)
+        return " ".join(text.split())
+
 
 class CacheEntry:
     """Элемент кэша с TTL."""
-    
-    def __init__(self, value: str, ttl: float) -> None:
+
+    def __init__(self, value: str, ttl: float, created_at: float | None = None) -> None:
         self.value = value
-        self.created_at = time.time()
+        self.created_at = time.time() if created_at is None else created_at
         self.ttl = ttl
-        self.access_count = 1
+        self.access_count = 0
         self.last_accessed = self.created_at
-    
+
     def is_expired(self) -> bool:
         """Проверить истёк TTL."""
         return time.time() - self.created_at > self.ttl
-    
+
     def access(self) -> str:
         """Зарегистрировать доступ и вернуть значение."""
         self.access_count += 1
@@ -54,152 +98,500 @@ class CacheEntry:
         return self.value
 
 
+class DiskCache:
+    """
+    SQLite-backed L2 store.
+
+    One row per normalized key; embeddings (optional) are stored as
+    float32 BLOBs for the semantic lookup. Errors are logged, never raised.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = DEFAULT_DISK_TTL_SECONDS,
+        max_entries: int = DEFAULT_DISK_MAX_ENTRIES,
+    ) -> None:
+        self._path = path
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._sets_since_trim = 0
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key         TEXT PRIMARY KEY,
+                    family      TEXT NOT NULL,
+                    response    TEXT NOT NULL,
+                    embedding   BLOB,
+                    created_at  REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hits        INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_llm_cache_family
+                    ON llm_cache(family, created_at);
+                CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access
+                    ON llm_cache(last_access);
+            """)
+            self._conn.commit()
+        except sqlite3.Error as e:
+            log.error(f"DiskCache: cannot open {path}: {e} — L2 disabled.")
+            self._conn = None
+
+    @property
+    def available(self) -> bool:
+        return self._conn is not None
+
+    def get(self, key: str) -> tuple[str, float] | None:
+        """Return (response, created_at) or None if missing/expired."""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if time.time() - row[1] > self._ttl:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    return None
+                self._conn.execute(
+                    "UPDATE llm_cache SET hits = hits + 1, last_access = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                self._conn.commit()
+                return row[0], row[1]
+        except sqlite3.Error as e:
+            log.error(f"DiskCache.get() error: {e}")
+            return None
+
+    def set(
+        self,
+        key: str,
+        family: str,
+        response: str,
+        embedding: np.ndarray | None = None,
+    ) -> None:
+        if self._conn is None:
+            return
+        now = time.time()
+        blob = embedding.astype(np.float32).tobytes() if embedding is not None else None
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache "
+                    "(key, family, response, embedding, created_at, last_access, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (key, family, response, blob, now, now),
+                )
+                self._conn.commit()
+                self._sets_since_trim += 1
+                if self._sets_since_trim >= 100:
+                    self._sets_since_trim = 0
+                    self._trim()
+        except sqlite3.Error as e:
+            log.error(f"DiskCache.set() error: {e}")
+
+    def nearest(
+        self, family: str, query: np.ndarray, threshold: float
+    ) -> tuple[str, str, float] | None:
+        """
+        Most similar non-expired entry of the family.
+        Returns (key, response, score) if score >= threshold, else None.
+        """
+        if self._conn is None:
+            return None
+        cutoff = time.time() - self._ttl
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, response, embedding FROM llm_cache "
+                    "WHERE family = ? AND embedding IS NOT NULL AND created_at >= ? "
+                    "ORDER BY created_at DESC LIMIT ?",
+                    (family, cutoff, _SEMANTIC_MAX_CANDIDATES),
+                ).fetchall()
+        except sqlite3.Error as e:
+            log.error(f"DiskCache.nearest() error: {e}")
+            return None
+
+        rows = [r for r in rows if len(r[2]) == query.nbytes]
+        if not rows:
+            return None
+        matrix = np.frombuffer(b"".join(r[2] for r in rows), dtype=np.float32)
+        scores = matrix.reshape(len(rows), -1) @ query
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        if score < threshold:
+            return None
+        return rows[best][0], rows[best][1], score
+
+    def _trim(self) -> None:
+        """Drop expired rows, then least recently used rows above max_entries."""
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self._ttl,)
+        )
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "  SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?"
+            ")",
+            (self._max_entries,),
+        )
+        self._conn.commit()
+
+    def clear(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+        except sqlite3.Error as e:
+            log.error(f"DiskCache.clear() error: {e}")
+
+    def count(self) -> int:
+        if self._conn is None:
+            return 0
+        try:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
 class LLMCache:
     """
     LRU + TTL кэш для LLM ответов.
-    
+
     Features:
     - LRU eviction при переполнении
     - TTL expiration (default 5 min)
     - Thread-safe
-    - Statistics tracking
+    - Statistics tracking (overall and per prompt family)
+    - Optional persistent L2 tier (persist_path)
+    - Optional semantic near-duplicate lookup (embed_fn)
     """
-    
-    def __init__(self, max_size: int = 100, ttl_seconds: float = 300.0) -> None:
+
+    def __init__(
+        self,
+        max_size: int = 100,
+        ttl_seconds: float = 300.0,
+        persist_path: Path | None = None,
+        disk_ttl_seconds: float = DEFAULT_DISK_TTL_SECONDS,
+        disk_max_entries: int = DEFAULT_DISK_MAX_ENTRIES,
+        normalize: bool = True,
+        volatile_patterns: list[tuple[str, str]] | None = None,
+        embed_fn: Callable[[str], list[float]] | None = None,
+        semantic_threshold: float = DEFAULT_SEMANTIC_THRESHOLD,
+    ) -> None:
         """
         Args:
-            max_size: Максимум элементов в кэше
-            ttl_seconds: Time To Live в секундах
+            max_size: Максимум элементов в L1 (0 = кэш выключен)
+            ttl_seconds: Time To Live L1 в секундах
+            persist_path: SQLite файл для L2 (None = только память)
+            disk_ttl_seconds: TTL записей L2
+            disk_max_entries: Максимум записей L2
+            normalize: Убирать volatile-фрагменты из ключа
+            volatile_patterns: Свои правила (regex, replacement) вместо DEFAULT_VOLATILE_PATTERNS
+            embed_fn: text -> embedding; включает semantic lookup (нужен persist_path)
+            semantic_threshold: Минимальная cosine similarity для semantic hit
         """
-        self._max_size = max_size
+        self._max_size = max(0, int(max_size))
         self._ttl = ttl_seconds
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
-        
+        self._lock = threading.RLock()
+        self._normalizer = PromptNormalizer(volatile_patterns) if normalize else None
+        self._disk = (
+            DiskCache(Path(persist_path), disk_ttl_seconds, disk_max_entries)
+            if persist_path and self._max_size > 0 else None
+        )
+        self._embed_fn = embed_fn if self._disk is not None else None
+        self._semantic_threshold = semantic_threshold
+        # Embeddings computed on a miss, reused by the following set()
+        self._pending_embeddings: OrderedDict[str, np.ndarray] = OrderedDict()
+
         # Statistics
         self._hits = 0
         self._misses = 0
+        self._disk_hits = 0
+        self._semantic_hits = 0
         self._evictions = 0
         self._expirations = 0
-        
+        self._families: dict[str, list[int]] = {}   # family -> [hits, misses]
+
         log.info(
-            f"LLMCache initialized: max_size={max_size}, ttl={ttl_seconds}s"
+            f"LLMCache initialized: max_size={max_size}, ttl={ttl_seconds}s, "
+            f"persistent={'yes' if self._disk is not None else 'no'}, "
+            f"semantic={'yes' if self._embed_fn is not None else 'no'}"
         )
-    
-    def _make_key(self, prompt: str, system: str = "") -> str:
-        """Сгенерировать ключ кэша."""
-        content = f"{system}||{prompt}"
+
+    @classmethod
+    def from_config(
+        cls,
+        cache_cfg: dict,
+        embed_fn: Callable[[str], list[float]] | None = None,
+    ) -> "LLMCache":
+        """Build from the `cache:` section of config.yaml."""
+        semantic_cfg = cache_cfg.get("semantic", {})
+        patterns = cache_cfg.get("volatile_patterns")
+        return cls(
+            max_size=cache_cfg.get("max_size", 100),
+            ttl_seconds=cache_cfg.get("ttl_seconds", 300.0),
+            persist_path=cache_cfg.get("persist_path"),
+            disk_ttl_seconds=cache_cfg.get("disk_ttl_seconds", DEFAULT_DISK_TTL_SECONDS),
+            disk_max_entries=cache_cfg.get("disk_max_entries", DEFAULT_DISK_MAX_ENTRIES),
+            normalize=cache_cfg.get("normalize", True),
+            volatile_patterns=[tuple(p) for p in patterns] if patterns else None,
+            embed_fn=embed_fn if semantic_cfg.get("enabled", False) else None,
+            semantic_threshold=semantic_cfg.get("threshold", DEFAULT_SEMANTIC_THRESHOLD),
+        )
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl
+
+    # ────────────────────────────────────────────────────────────
+    # Keys
+    # ────────────────────────────────────────────────────────────
+    def _normalize(self, text: str) -> str:
+        return self._normalizer.normalize(text) if self._normalizer else text
+
+    def _make_key(self, prompt: str, system: str = "", variant: str = "") -> str:
+        """Сгенерировать ключ кэша (variant — модель и профиль вызова)."""
+        content = f"{variant}||{self._normalize(system)}||{self._normalize(prompt)}"
         return hashlib.sha256(content.encode()).hexdigest()[:16]
-    
-    def get(self, prompt: str, system: str = "") -> str | None:
+
+    def key_for(self, prompt: str, system: str = "", variant: str = "") -> str:
+        """Public cache key (used for single-flight coalescing)."""
+        return self._make_key(prompt, system, variant)
+
+    @staticmethod
+    def family_of(system: str) -> str:
+        """Prompt family: the first line of the system prompt (one per call site)."""
+        first = system.strip().split("\n", 1)[0].strip()
+        return first[:60] or "default"
+
+    @staticmethod
+    def _disk_family(family: str, variant: str) -> str:
+        # L2 rows are grouped per variant so semantic lookup never crosses models
+        return f"{family}@{variant}" if variant else family
+
+    def _record(self, family: str, hit: bool) -> None:
+        counts = self._families.setdefault(family, [0, 0])
+        counts[0 if hit else 1] += 1
+        if hit:
+            self._hits += 1
+        else:
+            self._misses += 1
+
+    def _embed(self, prompt: str) -> np.ndarray | None:
+        try:
+            vec = self._embed_fn(self._normalize(prompt))
+        except Exception as e:
+            log.debug(f"LLMCache: embed_fn failed: {e}")
+            return None
+        if not vec:
+            return None
+        arr = np.asarray(vec, dtype=np.float32)
+        norm = float(np.linalg.norm(arr))
+        return arr / norm if norm > 0 else None
+
+    def _put_memory(self, key: str, entry: CacheEntry) -> None:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        elif len(self._cache) >= self._max_size:
+            evicted_key, _ = self._cache.popitem(last=False)
+            self._evictions += 1
+            log.debug(f"Cache evicted (LRU): {evicted_key}")
+        self._cache[key] = entry
+
+    # ────────────────────────────────────────────────────────────
+    # Get / set
+    # ────────────────────────────────────────────────────────────
+    def get(self, prompt: str, system: str = "", variant: str = "") -> str | None:
         """
-        Получить значение из кэша.
-        
+        Получить значение из кэша: L1 → L2 → semantic L2.
+        Semantic matches are looked up only among entries of the same variant.
+
         Returns:
             Cached response or None if not found/expired
         """
-        key = self._make_key(prompt, system)
-        
-        if key not in self._cache:
-            self._misses += 1
-            return None
-        
-        entry = self._cache[key]
-        
-        # Check expiration
-        if entry.is_expired():
-            self._expirations += 1
+        if self._max_size == 0:
             self._misses += 1
-            del self._cache[key]
-            log.debug(f"Cache entry expired: {key}")
             return None
-        
-        # Move to end (LRU)
-        self._cache.move_to_end(key)
-        self._hits += 1
-        
-        log.debug(
-            f"Cache HIT: {key} (accessed {entry.access_count} times)"
-        )
-        return entry.access()
-    
-    def set(self, prompt: str, system: str, response: str) -> None:
+
+        key = self._make_key(prompt, system, variant)
+        family = self.family_of(system)
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry.is_expired():
+                    self._expirations += 1
+                    del self._cache[key]
+                    log.debug(f"Cache entry expired: {key}")
+                else:
+                    # Move to end (LRU)
+                    self._cache.move_to_end(key)
+                    self._record(family, hit=True)
+                    log.debug(f"Cache HIT: {key} (accessed {entry.access_count + 1} times)")
+                    return entry.access()
+
+        if self._disk is not None:
+            found = self._disk.get(key)
+            if found is not None:
+                response, created_at = found
+                with self._lock:
+                    self._put_memory(key, CacheEntry(response, self._ttl))
+                    self._disk_hits += 1
+                    self._record(family, hit=True)
+                log.debug(f"Cache L2 HIT: {key}")
+                return response
+
+            if self._embed_fn is not None:
+                query = self._embed(prompt)
+                if query is not None:
+                    near = self._disk.nearest(
+                        self._disk_family(family, variant), query, self._semantic_threshold
+                    )
+                    with self._lock:
+                        self._pending_embeddings[key] = query
+                        while len(self._pending_embeddings) > 64:
+                            self._pending_embeddings.popitem(last=False)
+                    if near is not None:
+                        near_key, response, score = near
+                        with self._lock:
+                            self._semantic_hits += 1
+                            self._record(family, hit=True)
+                        log.debug(f"Cache semantic HIT: {key} ~ {near_key} ({score:.3f})")
+                        return response
+
+        with self._lock:
+            self._record(family, hit=False)
+        return None
+
+    def set(self, prompt: str, system: str, response: str, variant: str = "") -> None:
         """
         Добавить значение в кэш.
-        
+
         Args:
             prompt: User prompt
             system: System prompt
             response: LLM response to cache
+            variant: Model / call profile the response was generated with
         """
-        if not response:  # Don't cache empty responses
+        if not response or self._max_size == 0:  # Don't cache empty responses
             return
-        
-        key = self._make_key(prompt, system)
-        
-        # Evict if full
-        if len(self._cache) >= self._max_size:
-            evicted_key = next(iter(self._cache))
-            del self._cache[evicted_key]
-            self._evictions += 1
-            log.debug(f"Cache evicted (LRU): {evicted_key}")
-        
-        self._cache[key] = CacheEntry(response, self._ttl)
+
+        key = self._make_key(prompt, system, variant)
+        with self._lock:
+            self._put_memory(key, CacheEntry(response, self._ttl))
+            embedding = self._pending_embeddings.pop(key, None)
         log.debug(f"Cache SET: {key}")
-    
+
+        if self._disk is not None:
+            if embedding is None and self._embed_fn is not None:
+                embedding = self._embed(prompt)
+            self._disk.set(
+                key, self._disk_family(self.family_of(system), variant), response, embedding
+            )
+
     def clear(self) -> None:
-        """Очистить весь кэш."""
-        count = len(self._cache)
-        self._cache.clear()
+        """Очистить весь кэш (L1 и L2)."""
+        with self._lock:
+            count = len(self._cache)
+            self._cache.clear()
+            self._pending_embeddings.clear()
+        if self._disk is not None:
+            self._disk.clear()
         log.info(f"Cache cleared: {count} entries removed")
-    
+
     def cleanup_expired(self) -> int:
         """
-        Удалить все просроченные элементы.
-        
+        Удалить все просроченные элементы L1.
+
         Returns:
             Количество удалённых элементов
         """
-        expired = [
-            key for key, entry in self._cache.items()
-            if entry.is_expired()
-        ]
-        
-        for key in expired:
-            del self._cache[key]
-            self._expirations += 1
-        
+        with self._lock:
+            expired = [
+                key for key, entry in self._cache.items()
+                if entry.is_expired()
+            ]
+
+            for key in expired:
+                del self._cache[key]
+                self._expirations += 1
+
         if expired:
             log.info(f"Cache cleanup: {len(expired)} expired entries removed")
-        
+
         return len(expired)
-    
+
+    def close(self) -> None:
+        """Закрыть L2 store."""
+        if self._disk is not None:
+            self._disk.close()
+
+    # ────────────────────────────────────────────────────────────
+    # Stats
+    # ────────────────────────────────────────────────────────────
     def get_stats(self) -> dict[str, Any]:
         """Получить статистику кэша."""
         total_requests = self._hits + self._misses
         hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
-        
+
         return {
             "size": len(self._cache),
+            "current_size": len(self._cache),
             "max_size": self._max_size,
             "hits": self._hits,
             "misses": self._misses,
             "hit_rate": round(hit_rate, 2),
+            "disk_hits": self._disk_hits,
+            "semantic_hits": self._semantic_hits,
+            "disk_size": self._disk.count() if self._disk is not None else 0,
             "evictions": self._evictions,
             "expirations": self._expirations,
             "total_requests": total_requests,
+            "families": self.get_family_stats(),
         }
-    
-    def get_top_entries(self, n: int = 5) -> list[dict]:
-        """Получить топ N часто используемых элементов."""
-        entries = [
-            {
-                "key": key[:8],
-                "access_count": entry.access_count,
-                "age_seconds": round(time.time() - entry.created_at, 1),
-                "response_len": len(entry.value),
+
+    def get_family_stats(self) -> dict[str, dict]:
+        """Hit rate per prompt family."""
+        with self._lock:
+            return {
+                family: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / (hits + misses) * 100, 2) if hits + misses else 0,
+                }
+                for family, (hits, misses) in self._families.items()
             }
-            for key, entry in self._cache.items()
-        ]
-        
-        entries.sort(key=lambda x: x["access_count"], reverse=True)
+
+    def get_top_entries(self, n: int = 5) -> list[tuple[str, int]]:
+        """Получить топ N часто используемых элементов: (key prefix, hits)."""
+        with self._lock:
+            entries = [
+                (key[:8], entry.access_count)
+                for key, entry in self._cache.items()
+            ]
+
+        entries.sort(key=lambda x: x[1], reverse=True)
         return entries[:n]
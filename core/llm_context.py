@@ -0,0 +1,44 @@
+"""
+Digital Being — LLM call context
+Priority and deadline that LLM calls inherit from the code that makes them.
+
+Design rules:
+  - Plain ContextVars, no dependencies: both the scheduler and the
+    PriorityExecutor import this module at the top without a cycle
+  - priority=None / timeout=None keep the enclosing context's value
+  - Contexts are copied into asyncio tasks and asyncio.to_thread() workers
+
+Пример:
+    with llm_priority(Priority.OPTIONAL, timeout=30):
+        await asyncio.to_thread(dream.run)
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from core.priority_system import Priority
+
+_priority_var: ContextVar[Priority | None] = ContextVar("llm_priority", default=None)
+_deadline_var: ContextVar[float | None] = ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def llm_priority(priority: Priority | None, timeout: float | None = None) -> Iterator[None]:
+    """
+    LLM calls made in this context use `priority` (None = keep the current one)
+    and must start within `timeout` seconds.
+    """
+    p_token = _priority_var.set(priority if priority is not None else _priority_var.get())
+    d_token = _deadline_var.set(
+        time.monotonic() + timeout if timeout is not None else _deadline_var.get()
+    )
+    try:
+        yield
+    finally:
+        _deadline_var.reset(d_token)
+        _priority_var.reset(p_token)
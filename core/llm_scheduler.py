@@ -0,0 +1,358 @@
+"""
+Digital Being — LLM request scheduler
+Priority admission in front of the single local Ollama instance.
+
+Design rules:
+  - At most max_in_flight Ollama requests run at once (sync and async callers alike)
+  - Waiting requests are granted by priority (CRITICAL → IMPORTANT → OPTIONAL), FIFO within a class
+  - Deadline-aware admission: a request that cannot start before its deadline
+    (estimated from the queue and the mean service time) is rejected up front
+  - A CRITICAL request that has to wait preempts queued OPTIONAL work;
+    a full queue evicts its lowest-priority entry before rejecting a newcomer
+  - Priority comes from the llm_priority() context, else from the call profile
+    (llm_scheduler.profiles), else the default class
+  - Only real Ollama requests are scheduled — cache hits never queue
+  - Per-class queue depth, wait time and rejections go to Prometheus metrics;
+    inside a tick trace a request that has to wait gets an llm.queue span
+
+Пример:
+    scheduler = get_llm_scheduler(cfg)
+    with scheduler.slot(Priority.CRITICAL, deadline=time.monotonic() + 30):
+        response = client.chat(...)
+
+    async with scheduler.slot_async(scheduler.priority_for("narrative")):
+        ...
+
+    with llm_priority(Priority.OPTIONAL):
+        await asyncio.to_thread(dream.run)   # to_thread copies the context
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator
+
+from core.llm_context import _deadline_var, _priority_var, llm_priority  # noqa: F401 (re-export)
+from core.metrics import get_metrics
+from core.priority_system import Priority
+from core.tracing import span
+
+log = logging.getLogger("digital_being.llm_scheduler")
+
+DEFAULT_MAX_IN_FLIGHT = 2
+DEFAULT_MAX_QUEUE = 64
+_EWMA_ALPHA = 0.2
+
+_RANK = {Priority.CRITICAL: 0, Priority.IMPORTANT: 1, Priority.OPTIONAL: 2}
+
+
+class SchedulerRejected(Exception):
+    """The request was not admitted (deadline | preempted | queue_full)."""
+
+    def __init__(self, priority: Priority, reason: str) -> None:
+        super().__init__(f"LLM request ({priority.value}) rejected: {reason}")
+        self.priority = priority
+        self.reason = reason
+
+
+class _Ticket:
+    """One request waiting for (or holding) a slot."""
+
+    __slots__ = ("priority", "rank", "seq", "deadline", "enqueued",
+                 "granted", "rejected", "event", "future", "loop")
+
+    def __init__(self, priority: Priority, seq: int, deadline: float | None) -> None:
+        self.priority = priority
+        self.rank = _RANK[priority]
+        self.seq = seq
+        self.deadline = deadline
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.rejected: str | None = None
+        self.event: threading.Event | None = None
+        self.future: asyncio.Future | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    def signal(self) -> None:
+        if self.event is not None:
+            self.event.set()
+        elif self.future is not None and self.loop is not None:
+            fut = self.future
+            try:
+                self.loop.call_soon_threadsafe(
+                    lambda: fut.done() or fut.set_result(None)
+                )
+            except RuntimeError:
+                pass   # loop already closed
+
+
+class LLMScheduler:
+    """Thread-safe priority scheduler; usable from threads and coroutines."""
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        profile_priorities: dict[str, Priority] | None = None,
+        default_priority: Priority = Priority.IMPORTANT,
+    ) -> None:
+        self._max_in_flight = max(1, int(max_in_flight))
+        self._max_queue = max(1, int(max_queue))
+        self._profiles = dict(profile_priorities or {})
+        self._default = default_priority
+
+        self._lock = threading.Lock()
+        self._queue: list[_Ticket] = []
+        self._in_flight = 0
+        self._seq = itertools.count()
+        self._avg_service: float | None = None   # EWMA of slot hold time, seconds
+
+        self._granted = {p: 0 for p in Priority}
+        self._rejected = {p: 0 for p in Priority}
+        self._wait_total = {p: 0.0 for p in Priority}
+        self._metrics = get_metrics()
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "LLMScheduler":
+        """
+        Build from the `llm_scheduler` config section:
+            max_in_flight, max_queue, default_priority, profiles: {call_profile: priority}
+        """
+        section = cfg.get("llm_scheduler", {}) or {}
+        profiles = {
+            name: Priority(str(value).lower())
+            for name, value in (section.get("profiles") or {}).items()
+        }
+        return cls(
+            max_in_flight=section.get("max_in_flight", DEFAULT_MAX_IN_FLIGHT),
+            max_queue=section.get("max_queue", DEFAULT_MAX_QUEUE),
+            profile_priorities=profiles,
+            default_priority=Priority(str(section.get("default_priority", "important")).lower()),
+        )
+
+    # ────────────────────────────────────────────────────────────
+    # Priority resolution
+    # ────────────────────────────────────────────────────────────
+    def priority_for(self, call_profile: str | None = None) -> Priority:
+        """llm_priority() context > call profile mapping > default."""
+        explicit = _priority_var.get()
+        if explicit is not None:
+            return explicit
+        if call_profile and call_profile in self._profiles:
+            return self._profiles[call_profile]
+        return self._default
+
+    # ────────────────────────────────────────────────────────────
+    # Admission (all under self._lock)
+    # ────────────────────────────────────────────────────────────
+    def _submit(self, ticket: _Ticket) -> None:
+        now = time.monotonic()
+        if ticket.deadline is not None and now >= ticket.deadline:
+            self._reject(ticket, "deadline")
+            return
+
+        if self._in_flight < self._max_in_flight and not self._queue:
+            self._grant(ticket, now)
+            return
+
+        # Estimated start time: everyone ahead of us, spread over the slots
+        if ticket.deadline is not None and self._avg_service is not None:
+            ahead = sum(1 for t in self._queue if t.rank <= ticket.rank)
+            est_wait = (ahead + 1) * self._avg_service / self._max_in_flight
+            if now + est_wait > ticket.deadline:
+                self._reject(ticket, "deadline")
+                return
+
+        if ticket.priority == Priority.CRITICAL:
+            for queued in [t for t in self._queue if t.priority == Priority.OPTIONAL]:
+                self._queue.remove(queued)
+                self._reject(queued, "preempted")
+
+        if len(self._queue) >= self._max_queue:
+            victim = max(self._queue, key=lambda t: (t.rank, t.seq))
+            if victim.rank <= ticket.rank:
+                self._reject(ticket, "queue_full")
+                return
+            self._queue.remove(victim)
+            self._reject(victim, "preempted")
+
+        self._queue.append(ticket)
+        self._update_depth()
+
+    def _grant(self, ticket: _Ticket, now: float) -> None:
+        self._in_flight += 1
+        ticket.granted = True
+        wait = now - ticket.enqueued
+        self._granted[ticket.priority] += 1
+        self._wait_total[ticket.priority] += wait
+        self._metrics.record_llm_queue_wait(ticket.priority.value, wait)
+        ticket.signal()
+
+    def _reject(self, ticket: _Ticket, reason: str) -> None:
+        ticket.rejected = reason
+        self._rejected[ticket.priority] += 1
+        self._metrics.record_llm_queue_rejected(ticket.priority.value, reason)
+        log.debug(f"LLMScheduler: {ticket.priority.value} request rejected ({reason})")
+        ticket.signal()
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        for expired in [t for t in self._queue if t.deadline is not None and now >= t.deadline]:
+            self._queue.remove(expired)
+            self._reject(expired, "deadline")
+        while self._in_flight < self._max_in_flight and self._queue:
+            best = min(self._queue, key=lambda t: (t.rank, t.seq))
+            self._queue.remove(best)
+            self._grant(best, now)
+        self._update_depth()
+
+    def _release(self, held: float | None) -> None:
+        """Free a slot; `held` (None = never used) feeds the service-time EWMA."""
+        with self._lock:
+            self._in_flight -= 1
+            if held is None:
+                pass
+            elif self._avg_service is None:
+                self._avg_service = held
+            else:
+                self._avg_service += _EWMA_ALPHA * (held - self._avg_service)
+            self._dispatch()
+
+    def _settle(self, ticket: _Ticket) -> None:
+        """After waiting: raise if not granted (withdrawing the ticket if still queued)."""
+        with self._lock:
+            if ticket.granted:
+                return
+            if ticket.rejected is None:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    self._update_depth()
+                self._reject(ticket, "deadline")
+        raise SchedulerRejected(ticket.priority, ticket.rejected)
+
+    def _update_depth(self) -> None:
+        for p in Priority:
+            depth = sum(1 for t in self._queue if t.priority == p)
+            self._metrics.llm_queue_depth.labels(priority=p.value).set(depth)
+
+    def _new_ticket(self, priority: Priority | None, deadline: float | None) -> _Ticket:
+        if priority is None:
+            priority = self.priority_for()
+        if deadline is None:
+            deadline = _deadline_var.get()
+        return _Ticket(priority, next(self._seq), deadline)
+
+    # ────────────────────────────────────────────────────────────
+    # Public API
+    # ────────────────────────────────────────────────────────────
+    @contextmanager
+    def slot(
+        self, priority: Priority | None = None, deadline: float | None = None
+    ) -> Iterator[None]:
+        """
+        Hold one Ollama slot (blocking wait).
+
+        Args:
+            priority: request class (None = priority_for())
+            deadline: time.monotonic() by which the request must start
+
+        Raises:
+            SchedulerRejected: not admitted / preempted / deadline passed
+        """
+        ticket = self._new_ticket(priority, deadline)
+        ticket.event = threading.Event()
+        with self._lock:
+            self._submit(ticket)
+        if not ticket.granted and ticket.rejected is None:
+            timeout = (
+                None if ticket.deadline is None
+                else max(0.0, ticket.deadline - time.monotonic())
+            )
+            with span("llm.queue", priority=ticket.priority.value):
+                ticket.event.wait(timeout)
+        self._settle(ticket)
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - start)
+
+    @asynccontextmanager
+    async def slot_async(
+        self, priority: Priority | None = None, deadline: float | None = None
+    ) -> AsyncIterator[None]:
+        """Awaitable slot(): waiting never blocks the event loop."""
+        ticket = self._new_ticket(priority, deadline)
+        ticket.loop = asyncio.get_running_loop()
+        ticket.future = ticket.loop.create_future()
+        with self._lock:
+            self._submit(ticket)
+        if not ticket.granted and ticket.rejected is None:
+            timeout = (
+                None if ticket.deadline is None
+                else max(0.0, ticket.deadline - time.monotonic())
+            )
+            try:
+                with span("llm.queue", priority=ticket.priority.value):
+                    await asyncio.wait_for(asyncio.shield(ticket.future), timeout)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                with self._lock:
+                    granted = ticket.granted
+                    if not granted and ticket in self._queue:
+                        self._queue.remove(ticket)
+                        self._update_depth()
+                if granted:
+                    # Granted just as the waiter was cancelled: the slot was
+                    # never used, so it says nothing about service time
+                    self._release(None)
+                raise
+        self._settle(ticket)
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - start)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            depth = {p.value: sum(1 for t in self._queue if t.priority == p) for p in Priority}
+            return {
+                "max_in_flight": self._max_in_flight,
+                "in_flight": self._in_flight,
+                "queue_depth": depth,
+                "avg_service_sec": round(self._avg_service or 0.0, 3),
+                "classes": {
+                    p.value: {
+                        "granted": self._granted[p],
+                        "rejected": self._rejected[p],
+                        "avg_wait_sec": (
+                            round(self._wait_total[p] / self._granted[p], 3)
+                            if self._granted[p] else 0.0
+                        ),
+                    }
+                    for p in Priority
+                },
+            }
+
+
+# Shared by every Ollama client in the process (first caller's config wins)
+_scheduler: LLMScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler(cfg: dict | None = None) -> LLMScheduler:
+    """Получить общий LLMScheduler (создаётся из cfg при первом вызове)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler.from_config(cfg or {})
+        return _scheduler
@@ -0,0 +1,143 @@
+"""
+Digital Being — LLM stream early-stop
+Incremental detectors that end a streamed chat as soon as the answer is complete.
+
+Design rules:
+  - Detectors are fed chunk by chunk; the JSON scanner never re-reads consumed text
+  - JSON: done when the first top-level {...} closes (braces inside strings ignored)
+  - Stop patterns: regexes searched in the accumulated text
+  - text() returns the answer truncated at the completion point
+  - Pure Python, no I/O — the clients close the HTTP stream when feed() says stop
+
+Пример:
+    stop = EarlyStop(json_object=True)
+    for chunk in ollama.chat_stream(prompt, system, stop=stop):
+        pass
+    data = json.loads(stop.text())
+
+    # or simply
+    raw = ollama.chat_until(prompt, system)
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+
+class JSONObjectScanner:
+    """
+    Brace balancer for the first top-level JSON object in a text stream.
+
+    Text before the opening '{' (e.g. "```json") is skipped.
+    """
+
+    def __init__(self) -> None:
+        self._pos = 0          # global offset of the next char to scan
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.start = -1        # offset of the opening '{'
+        self.end = -1          # offset of the matching '}'
+
+    @property
+    def done(self) -> bool:
+        return self.end != -1
+
+    def feed(self, chunk: str) -> bool:
+        """Scan the next chunk. Returns True once the object is closed."""
+        if self.done:
+            return True
+        for i, ch in enumerate(chunk):
+            if self.start == -1:
+                if ch == "{":
+                    self.start = self._pos + i
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = self._pos + i
+                    self._pos += len(chunk)
+                    return True
+        self._pos += len(chunk)
+        return False
+
+
+class EarlyStop:
+    """
+    Decides when a streamed completion is complete.
+
+    Args:
+        json_object:   stop after the first balanced {...}
+        stop_patterns: regexes; stop after the first match (included in text())
+        max_chars:     hard cap on accumulated characters (0 = none)
+    """
+
+    def __init__(
+        self,
+        json_object: bool = False,
+        stop_patterns: Iterable[str] | None = None,
+        max_chars: int = 0,
+    ) -> None:
+        self._json = JSONObjectScanner() if json_object else None
+        self._patterns = [re.compile(p) for p in (stop_patterns or ())]
+        self._max_chars = max(0, int(max_chars))
+        self._parts: list[str] = []
+        self._length = 0
+        self._cut = -1          # end offset of the answer once done
+        self.reason: str | None = None   # "json" | "pattern" | "max_chars"
+
+    @property
+    def done(self) -> bool:
+        return self.reason is not None
+
+    def feed(self, chunk: str) -> bool:
+        """Add a streamed chunk. Returns True when generation can stop."""
+        if self.done:
+            return True
+        if not chunk:
+            return False
+        self._parts.append(chunk)
+        self._length += len(chunk)
+
+        if self._json is not None and self._json.feed(chunk):
+            self._finish("json", self._json.end + 1)
+            return True
+
+        if self._patterns:
+            text = "".join(self._parts)
+            ends = [m.end() for m in (p.search(text) for p in self._patterns) if m]
+            if ends:
+                self._finish("pattern", min(ends))
+                return True
+
+        if self._max_chars and self._length >= self._max_chars:
+            self._finish("max_chars", self._max_chars)
+            return True
+        return False
+
+    def _finish(self, reason: str, cut: int) -> None:
+        self.reason = reason
+        self._cut = cut
+
+    def text(self) -> str:
+        """Accumulated answer, truncated at the completion point."""
+        text = "".join(self._parts)
+        if self.reason == "json":
+            return text[self._json.start: self._cut]
+        if self._cut != -1:
+            return text[: self._cut]
+        return text
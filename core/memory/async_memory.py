@@ -0,0 +1,261 @@
+"""
+Digital Being — Async memory facades
+Awaitable wrappers around EpisodicMemory and VectorMemory.
+
+Design rules:
+  - The wrapped sync store stays the source of truth (and stays usable directly)
+  - Writes run on one dedicated thread, in submission order. The stores
+    serialize every use of their writer connection (SQLitePool.write_lock),
+    so sync writes made directly on the wrapped store stay safe alongside
+  - Reads run on a bounded reader pool sized like the store's SQLitePool
+  - Idle hook: when the last queued write finishes, the writer thread runs the
+    store's background maintenance (VectorMemory: incremental_vacuum steps)
+    step by step until it reports no more work or new writes are queued
+  - No ad-hoc `loop.run_in_executor(None, ...)`: the default executor is never used
+  - Queue depth / in-flight counts are exposed via get_stats() so saturation is visible
+  - Errors never crash the caller (the sync stores already log and return defaults)
+  - Inside a tick trace every call is a db.<method> span (rows returned;
+    the worker thread's own annotations, e.g. vectors scanned, land on it)
+
+Usage:
+    amem = AsyncEpisodicMemory(mem)
+    ep_id = await amem.add_episode("monologue", text)
+    recent = await amem.get_recent_episodes(10)
+    amem.shutdown()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+from core.memory.sqlite_pool import DEFAULT_READ_POOL_SIZE
+from core.memory.vector_memory import DEFAULT_CLEANUP_DAYS
+from core.tracing import propagate, span
+
+if TYPE_CHECKING:
+    from core.memory.episodic import EpisodicMemory
+    from core.memory.vector_memory import VectorMemory
+
+log = logging.getLogger("digital_being.async_memory")
+
+
+class _AsyncStore:
+    """Single-writer thread + bounded reader pool around a sync store."""
+
+    def __init__(
+        self,
+        store: Any,
+        name: str,
+        read_workers: int | None = None,
+        idle_fn: Callable[[], int] | None = None,
+    ) -> None:
+        if read_workers is None:
+            read_workers = getattr(store, "_read_pool_size", DEFAULT_READ_POOL_SIZE)
+        self._store = store
+        self._name = name
+        self._read_workers = max(1, int(read_workers))
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{name}-writer"
+        )
+        self._readers = ThreadPoolExecutor(
+            max_workers=self._read_workers, thread_name_prefix=f"{name}-reader"
+        )
+        self._pending_writes = 0
+        self._pending_reads = 0
+        self._closed = False
+        self._idle_fn = idle_fn          # one step of maintenance; returns work done
+        self._idle_runs = 0
+
+    @property
+    def sync(self) -> Any:
+        """The wrapped synchronous store."""
+        return self._store
+
+    async def _write(self, fn: Callable, *args, **kwargs) -> Any:
+        self._pending_writes += 1
+        try:
+            return await self._run(self._writer, "write", fn, args, kwargs)
+        finally:
+            self._pending_writes -= 1
+            if self._pending_writes == 0 and self._idle_fn is not None and not self._closed:
+                self._writer.submit(self._run_idle)
+
+    def _run_idle(self) -> None:
+        # Writer thread: yield to any write queued meanwhile, one step at a time
+        try:
+            while self._pending_writes == 0 and not self._closed and self._idle_fn():
+                self._idle_runs += 1
+        except Exception as e:
+            log.warning(f"{self._name}: idle maintenance failed: {e}")
+
+    async def _read(self, fn: Callable, *args, **kwargs) -> Any:
+        self._pending_reads += 1
+        try:
+            return await self._run(self._readers, "read", fn, args, kwargs)
+        finally:
+            self._pending_reads -= 1
+
+    async def _run(
+        self, executor: ThreadPoolExecutor, kind: str, fn: Callable, args: tuple, kwargs: dict
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        with span(f"db.{getattr(fn, '__name__', kind)}", store=self._name, kind=kind) as s:
+            result = await loop.run_in_executor(
+                executor, propagate(functools.partial(fn, *args, **kwargs))
+            )
+            if isinstance(result, list):
+                s.set(rows=len(result))
+            return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads. The wrapped store is NOT closed."""
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.shutdown(wait=wait)
+        self._readers.shutdown(wait=wait)
+        log.info(f"{self._name}: async workers stopped.")
+
+    def get_stats(self) -> dict:
+        return {
+            "read_workers": self._read_workers,
+            "pending_writes": self._pending_writes,
+            "pending_reads": self._pending_reads,
+            "idle_steps": self._idle_runs,
+        }
+
+
+class AsyncEpisodicMemory(_AsyncStore):
+    """Awaitable EpisodicMemory."""
+
+    def __init__(self, store: "EpisodicMemory", read_workers: int | None = None) -> None:
+        super().__init__(store, "AsyncEpisodicMemory", read_workers)
+
+    # ── writes ──
+    async def add_episode(
+        self,
+        event_type:  str,
+        description: str,
+        outcome:     str = "unknown",
+        data:        Any = None,
+    ) -> int | None:
+        return await self._write(
+            self._store.add_episode, event_type, description, outcome, data
+        )
+
+    async def add_episodes(self, episodes: list[dict]) -> list[int]:
+        return await self._write(self._store.add_episodes, episodes)
+
+    async def add_error(
+        self,
+        error_type:  str,
+        description: str,
+        cause:       str = "my_assessment",
+    ) -> int | None:
+        return await self._write(self._store.add_error, error_type, description, cause)
+
+    async def add_principle(self, text: str, source_error_id: int | None = None) -> int | None:
+        return await self._write(self._store.add_principle, text, source_error_id)
+
+    async def archive_old_episodes(self, days: int = 90) -> int:
+        return await self._write(self._store.archive_old_episodes, days)
+
+    # ── reads ──
+    async def count(self) -> int:
+        return await self._read(self._store.count)
+
+    async def get_recent_episodes(self, limit: int = 20) -> list[dict]:
+        return await self._read(self._store.get_recent_episodes, limit)
+
+    async def get_episodes_by_type(
+        self,
+        event_type: str,
+        limit: int = 20,
+        outcome: str | None = None,
+    ) -> list[dict]:
+        return await self._read(self._store.get_episodes_by_type, event_type, limit, outcome)
+
+    async def search_text(
+        self,
+        query: str,
+        limit: int = 20,
+        event_type: str | None = None,
+        match_all: bool = False,
+    ) -> list[dict]:
+        return await self._read(
+            self._store.search_text, query, limit, event_type, match_all
+        )
+
+    async def get_errors_by_type(self, error_type: str) -> list[dict]:
+        return await self._read(self._store.get_errors_by_type, error_type)
+
+    async def count_recent_similar(self, event_type: str, hours: int = 1) -> int:
+        return await self._read(self._store.count_recent_similar, event_type, hours)
+
+    async def get_active_principles(self) -> list[dict]:
+        return await self._read(self._store.get_active_principles)
+
+    async def health_check(self) -> bool:
+        return await self._read(self._store.health_check)
+
+
+class AsyncVectorMemory(_AsyncStore):
+    """Awaitable VectorMemory."""
+
+    def __init__(self, store: "VectorMemory", read_workers: int | None = None) -> None:
+        super().__init__(store, "AsyncVectorMemory", read_workers, idle_fn=store.vacuum_step)
+
+    # ── writes ──
+    async def add(
+        self,
+        episode_id: int,
+        event_type: str,
+        text:       str,
+        embedding:  list[float],
+    ) -> int | None:
+        return await self._write(self._store.add, episode_id, event_type, text, embedding)
+
+    async def add_many(self, records: list[dict]) -> list[int]:
+        return await self._write(self._store.add_many, records)
+
+    async def delete_old(self, days: int = DEFAULT_CLEANUP_DAYS) -> int:
+        return await self._write(self._store.delete_old, days)
+
+    async def cleanup_old_vectors(self, days: int = DEFAULT_CLEANUP_DAYS) -> int:
+        return await self._write(self._store.cleanup_old_vectors, days)
+
+    async def flush_access_stats(self) -> int:
+        return await self._write(self._store.flush_access_stats)
+
+    async def vacuum_step(self, pages: int | None = None) -> int:
+        return await self._write(self._store.vacuum_step, pages)
+
+    # ── reads ──
+    async def search(
+        self,
+        query_embedding:   list[float],
+        top_k:             int = 5,
+        event_type_filter: str | None = None,
+    ) -> list[dict]:
+        return await self._read(
+            self._store.search, query_embedding, top_k, event_type_filter
+        )
+
+    def count(self) -> int:
+        """Cached row count — no I/O, so no executor hop."""
+        return self._store.count()
+
+    async def get_recent(self, limit: int = 20) -> list[dict]:
+        return await self._read(self._store.get_recent, limit)
+
+    async def health_check(self) -> bool:
+        return await self._read(self._store.health_check)
+
+    def get_stats(self) -> dict:
+        stats = self._store.get_stats()
+        stats["async"] = super().get_stats()
+        return stats
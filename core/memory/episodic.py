@@ -10,6 +10,8 @@ Three tables:
 Design rules:
   - Pure sqlite3, no ORM
   - check_same_thread=False for asyncio compatibility
+  - One writer connection, used only under the pool's write_lock;
+    reads go through a pool of read-only WAL readers
   - All writes are validated before touching the DB
   - Errors never crash the caller — they are logged and skipped
   - Automatic archival prevents unbounded growth
@@ -19,17 +21,23 @@ Changelog:
   API Fix — added count() method for IntrospectionAPI compatibility.
   Perf Fix — added missing indexes for 5-10x query speedup (TD-009).
   TD-008 fix — added archive_old_episodes() to prevent unbounded growth.
+  Perf — added add_episodes() for bulk inserts in a single transaction.
+  Perf — SQLitePool: read methods use pooled read-only connections.
+  Perf — episodes_fts (FTS5, trigger-synced) + search_text() with BM25 ranking.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import re
 import sqlite3
 import time
 from pathlib import Path
 from typing import Any
 
+from core.memory.sqlite_pool import DEFAULT_READ_POOL_SIZE, SQLitePool
+
 log = logging.getLogger("digital_being.episodic")
 
 # Validation limits
@@ -39,6 +47,30 @@ _MAX_DESC_LEN = 1000
 _OUTCOMES = {"success", "failure", "unknown"}
 _CAUSES   = {"my_assessment", "bad_plan", "external"}
 
+# Full-text index over episodes.description (external-content FTS5 table)
+_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS episodes_fts USING fts5(
+        description,
+        content='episodes',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS episodes_fts_ai AFTER INSERT ON episodes BEGIN
+        INSERT INTO episodes_fts(rowid, description) VALUES (new.id, new.description);
+    END;
+    CREATE TRIGGER IF NOT EXISTS episodes_fts_ad AFTER DELETE ON episodes BEGIN
+        INSERT INTO episodes_fts(episodes_fts, rowid, description)
+            VALUES ('delete', old.id, old.description);
+    END;
+    CREATE TRIGGER IF NOT EXISTS episodes_fts_au AFTER UPDATE OF description ON episodes BEGIN
+        INSERT INTO episodes_fts(episodes_fts, rowid, description)
+            VALUES ('delete', old.id, old.description);
+        INSERT INTO episodes_fts(rowid, description) VALUES (new.id, new.description);
+    END;
+"""
+_FTS_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
 
 class EpisodicMemory:
     """
@@ -53,9 +85,12 @@ class EpisodicMemory:
         archived = mem.archive_old_episodes(days=90)
     """
 
-    def __init__(self, db_path: Path) -> None:
+    def __init__(self, db_path: Path, read_pool_size: int = DEFAULT_READ_POOL_SIZE) -> None:
         self._db_path = db_path
-        self._conn: sqlite3.Connection | None = None
+        self._read_pool_size = read_pool_size
+        self._pool: SQLitePool | None = None
+        self._conn: sqlite3.Connection | None = None   # writer
+        self._fts = False   # True once episodes_fts is available
 
     # ──────────────────────────────────────────────────────────────
     # Lifecycle
@@ -63,22 +98,22 @@ class EpisodicMemory:
     def init(self) -> None:
         """Open the DB connection and create tables if needed."""
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(
-            str(self._db_path),
-            check_same_thread=False,
+        self._pool = SQLitePool(self._db_path, read_pool_size=self._read_pool_size)
+        self._conn = self._pool.open_writer(
             isolation_level=None,   # autocommit — each write is its own transaction
         )
-        self._conn.row_factory = sqlite3.Row
-        self._conn.execute("PRAGMA journal_mode=WAL")   # safer for concurrent access
+        self._conn.execute("PRAGMA journal_mode=WAL")   # readers never block the writer
         self._conn.execute("PRAGMA foreign_keys=ON")
         self._create_tables()
+        self._create_fts()
         log.info(f"EpisodicMemory initialised. DB: {self._db_path}")
 
     def close(self) -> None:
-        if self._conn:
-            self._conn.close()
+        if self._pool:
+            self._pool.close()
+            self._pool = None
             self._conn = None
-            log.info("EpisodicMemory connection closed.")
+            log.info("EpisodicMemory connections closed.")
 
     def _create_tables(self) -> None:
         assert self._conn is not None
@@ -130,6 +165,26 @@ class EpisodicMemory:
         """)
         log.debug("DB tables and indexes verified/created.")
 
+    def _create_fts(self) -> None:
+        """
+        Create the FTS5 index + sync triggers; backfill it on first creation.
+        SQLite builds without FTS5 fall back to LIKE in search_text().
+        """
+        try:
+            existed = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'episodes_fts'"
+            ).fetchone() is not None
+            self._conn.executescript(_FTS_SCHEMA)
+            if not existed:
+                self._conn.execute(
+                    "INSERT INTO episodes_fts(episodes_fts) VALUES ('rebuild')"
+                )
+                log.info("episodes_fts created and backfilled.")
+            self._fts = True
+        except sqlite3.Error as e:
+            self._fts = False
+            log.warning(f"FTS5 unavailable ({e}) — search_text() will use LIKE.")
+
     # ──────────────────────────────────────────────────────────────
     # Validation helpers
     # ──────────────────────────────────────────────────────────────
@@ -191,18 +246,69 @@ class EpisodicMemory:
 
         data_json = self._serialize_data(data, "add_episode")
 
-        try:
-            cur = self._conn.execute(
-                "INSERT INTO episodes (timestamp, event_type, description, outcome, data) "
-                "VALUES (?, ?, ?, ?, ?)",
-                (self._now(), event_type, description.strip(), outcome, data_json),
-            )
-            row_id = cur.lastrowid
-            log.debug(f"Episode #{row_id} written: [{event_type}] {description[:60]}")
-            return row_id
-        except sqlite3.Error as e:
-            log.error(f"[add_episode] DB error: {e}")
-            return None
+        with self._pool.write_lock:
+            try:
+                cur = self._conn.execute(
+                    "INSERT INTO episodes (timestamp, event_type, description, outcome, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self._now(), event_type, description.strip(), outcome, data_json),
+                )
+                row_id = cur.lastrowid
+                log.debug(f"Episode #{row_id} written: [{event_type}] {description[:60]}")
+                return row_id
+            except sqlite3.Error as e:
+                log.error(f"[add_episode] DB error: {e}")
+                return None
+
+    def add_episodes(self, episodes: list[dict]) -> list[int]:
+        """
+        Record many episodes in a single transaction.
+
+        Each item is a dict with keys: event_type, description,
+        and optionally outcome (default 'unknown') and data.
+        Items are validated like add_episode(); invalid ones are skipped.
+        Returns the new row ids of the stored episodes, in input order.
+        """
+        now = self._now()
+        params: list[tuple] = []
+        for ep in episodes:
+            description = ep.get("description", "")
+            if not self._validate_description(description, "add_episodes"):
+                continue
+            outcome = ep.get("outcome", "unknown")
+            if outcome not in _OUTCOMES:
+                log.warning(f"[add_episodes] invalid outcome '{outcome}', using 'unknown'.")
+                outcome = "unknown"
+            params.append((
+                now,
+                ep.get("event_type", "unknown"),
+                description.strip(),
+                outcome,
+                self._serialize_data(ep.get("data"), "add_episodes"),
+            ))
+
+        if not params:
+            return []
+
+        with self._pool.write_lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO episodes (timestamp, event_type, description, outcome, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    params,
+                )
+                # AUTOINCREMENT ids are consecutive inside one write transaction
+                last_id = self._conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                log.error(f"[add_episodes] DB error: {e}")
+                return []
+
+        log.debug(f"{len(params)} episodes written in one batch.")
+        return list(range(last_id - len(params) + 1, last_id + 1))
 
     def add_error(
         self,
@@ -222,54 +328,56 @@ class EpisodicMemory:
             log.warning(f"[add_error] invalid cause '{cause}', using 'my_assessment'.")
             cause = "my_assessment"
 
-        try:
-            # Check if same error_type exists — increment if so
-            row = self._conn.execute(
-                "SELECT id FROM errors WHERE error_type = ? ORDER BY id DESC LIMIT 1",
-                (error_type,),
-            ).fetchone()
-
-            if row:
-                self._conn.execute(
-                    "UPDATE errors SET repeat_count = repeat_count + 1, timestamp = ? "
-                    "WHERE id = ?",
-                    (self._now(), row["id"]),
-                )
-                log.debug(f"Error '{error_type}' repeat_count incremented (id={row['id']}).")
-                return row["id"]
-            else:
-                cur = self._conn.execute(
-                    "INSERT INTO errors (timestamp, error_type, description, cause) "
-                    "VALUES (?, ?, ?, ?)",
-                    (self._now(), error_type, description.strip(), cause),
-                )
-                log.debug(f"Error #{cur.lastrowid} written: [{error_type}]")
-                return cur.lastrowid
-        except sqlite3.Error as e:
-            log.error(f"[add_error] DB error: {e}")
-            return None
+        with self._pool.write_lock:
+            try:
+                # Check if same error_type exists — increment if so
+                row = self._conn.execute(
+                    "SELECT id FROM errors WHERE error_type = ? ORDER BY id DESC LIMIT 1",
+                    (error_type,),
+                ).fetchone()
+
+                if row:
+                    self._conn.execute(
+                        "UPDATE errors SET repeat_count = repeat_count + 1, timestamp = ? "
+                        "WHERE id = ?",
+                        (self._now(), row["id"]),
+                    )
+                    log.debug(f"Error '{error_type}' repeat_count incremented (id={row['id']}).")
+                    return row["id"]
+                else:
+                    cur = self._conn.execute(
+                        "INSERT INTO errors (timestamp, error_type, description, cause) "
+                        "VALUES (?, ?, ?, ?)",
+                        (self._now(), error_type, description.strip(), cause),
+                    )
+                    log.debug(f"Error #{cur.lastrowid} written: [{error_type}]")
+                    return cur.lastrowid
+            except sqlite3.Error as e:
+                log.error(f"[add_error] DB error: {e}")
+                return None
 
     def add_principle(self, text: str, source_error_id: int | None = None) -> int | None:
         """Add a new principle derived from an error."""
         if not self._validate_description(text, "add_principle"):
             return None
-        try:
-            cur = self._conn.execute(
-                "INSERT INTO principles (timestamp, text, source_error_id, active) "
-                "VALUES (?, ?, ?, 1)",
-                (self._now(), text.strip(), source_error_id),
-            )
-            # Back-fill principle_formed on the source error row
-            if source_error_id is not None:
-                self._conn.execute(
-                    "UPDATE errors SET principle_formed = ? WHERE id = ?",
-                    (text.strip(), source_error_id),
+        with self._pool.write_lock:
+            try:
+                cur = self._conn.execute(
+                    "INSERT INTO principles (timestamp, text, source_error_id, active) "
+                    "VALUES (?, ?, ?, 1)",
+                    (self._now(), text.strip(), source_error_id),
                 )
-            log.info(f"Principle #{cur.lastrowid} formed: {text[:80]}")
-            return cur.lastrowid
-        except sqlite3.Error as e:
-            log.error(f"[add_principle] DB error: {e}")
-            return None
+                # Back-fill principle_formed on the source error row
+                if source_error_id is not None:
+                    self._conn.execute(
+                        "UPDATE errors SET principle_formed = ? WHERE id = ?",
+                        (text.strip(), source_error_id),
+                    )
+                log.info(f"Principle #{cur.lastrowid} formed: {text[:80]}")
+                return cur.lastrowid
+            except sqlite3.Error as e:
+                log.error(f"[add_principle] DB error: {e}")
+                return None
 
     # ──────────────────────────────────────────────────────────────
     # Read methods
@@ -277,8 +385,9 @@ class EpisodicMemory:
     def count(self) -> int:
         """Return total number of episodes. Used by IntrospectionAPI."""
         try:
-            row = self._conn.execute("SELECT COUNT(*) as cnt FROM episodes").fetchone()
-            return row["cnt"] if row else 0
+            with self._pool.reader() as conn:
+                row = conn.execute("SELECT COUNT(*) as cnt FROM episodes").fetchone()
+                return row["cnt"] if row else 0
         except sqlite3.Error as e:
             log.error(f"[count] DB error: {e}")
             return 0
@@ -286,11 +395,12 @@ class EpisodicMemory:
     def get_recent_episodes(self, limit: int = 20) -> list[dict]:
         """Return the last N episodes, newest first."""
         try:
-            rows = self._conn.execute(
-                "SELECT * FROM episodes ORDER BY id DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
-            return [dict(r) for r in rows]
+            with self._pool.reader() as conn:
+                rows = conn.execute(
+                    "SELECT * FROM episodes ORDER BY id DESC LIMIT ?",
+                    (limit,),
+                ).fetchall()
+                return [dict(r) for r in rows]
         except sqlite3.Error as e:
             log.error(f"[get_recent_episodes] DB error: {e}")
             return []
@@ -314,21 +424,22 @@ class EpisodicMemory:
             outcome:    if provided, additionally filter by outcome column.
         """
         try:
-            if outcome is not None:
-                rows = self._conn.execute(
-                    "SELECT * FROM episodes "
-                    "WHERE event_type = ? AND outcome = ? "
-                    "ORDER BY id DESC LIMIT ?",
-                    (event_type, outcome, limit),
-                ).fetchall()
-            else:
-                rows = self._conn.execute(
-                    "SELECT * FROM episodes "
-                    "WHERE event_type = ? "
-                    "ORDER BY id DESC LIMIT ?",
-                    (event_type, limit),
-                ).fetchall()
-            return [dict(r) for r in rows]
+            with self._pool.reader() as conn:
+                if outcome is not None:
+                    rows = conn.execute(
+                        "SELECT * FROM episodes "
+                        "WHERE event_type = ? AND outcome = ? "
+                        "ORDER BY id DESC LIMIT ?",
+                        (event_type, outcome, limit),
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        "SELECT * FROM episodes "
+                        "WHERE event_type = ? "
+                        "ORDER BY id DESC LIMIT ?",
+                        (event_type, limit),
+                    ).fetchall()
+                return [dict(r) for r in rows]
         except sqlite3.Error as e:
             log.error(f"[get_episodes_by_type] DB error: {e}")
             return []
@@ -336,11 +447,12 @@ class EpisodicMemory:
     def get_errors_by_type(self, error_type: str) -> list[dict]:
         """Return all errors of a given type."""
         try:
-            rows = self._conn.execute(
-                "SELECT * FROM errors WHERE error_type = ? ORDER BY id DESC",
-                (error_type,),
-            ).fetchall()
-            return [dict(r) for r in rows]
+            with self._pool.reader() as conn:
+                rows = conn.execute(
+                    "SELECT * FROM errors WHERE error_type = ? ORDER BY id DESC",
+                    (error_type,),
+                ).fetchall()
+                return [dict(r) for r in rows]
         except sqlite3.Error as e:
             log.error(f"[get_errors_by_type] DB error: {e}")
             return []
@@ -350,17 +462,18 @@ class EpisodicMemory:
         Count how many episodes of this event_type occurred in the last N hours.
         Used for Novelty Score calculation.
         """
+        cutoff = time.strftime(
+            "%Y-%m-%dT%H:%M:%S",
+            time.localtime(time.time() - hours * 3600),
+        )
         try:
-            cutoff = time.strftime(
-                "%Y-%m-%dT%H:%M:%S",
-                time.localtime(time.time() - hours * 3600),
-            )
-            row = self._conn.execute(
-                "SELECT COUNT(*) as cnt FROM episodes "
-                "WHERE event_type = ? AND timestamp >= ?",
-                (event_type, cutoff),
-            ).fetchone()
-            return row["cnt"] if row else 0
+            with self._pool.reader() as conn:
+                row = conn.execute(
+                    "SELECT COUNT(*) as cnt FROM episodes "
+                    "WHERE event_type = ? AND timestamp >= ?",
+                    (event_type, cutoff),
+                ).fetchone()
+                return row["cnt"] if row else 0
         except sqlite3.Error as e:
             log.error(f"[count_recent_similar] DB error: {e}")
             return 0
@@ -368,14 +481,67 @@ class EpisodicMemory:
     def get_active_principles(self) -> list[dict]:
         """Return all active principles."""
         try:
-            rows = self._conn.execute(
-                "SELECT * FROM principles WHERE active = 1 ORDER BY id ASC",
-            ).fetchall()
-            return [dict(r) for r in rows]
+            with self._pool.reader() as conn:
+                rows = conn.execute(
+                    "SELECT * FROM principles WHERE active = 1 ORDER BY id ASC",
+                ).fetchall()
+                return [dict(r) for r in rows]
         except sqlite3.Error as e:
             log.error(f"[get_active_principles] DB error: {e}")
             return []
 
+    def search_text(
+        self,
+        query: str,
+        limit: int = 20,
+        event_type: str | None = None,
+        match_all: bool = False,
+    ) -> list[dict]:
+        """
+        Keyword search over episode descriptions, best match first (BM25).
+
+        Args:
+            query:      free text; split into word tokens, punctuation ignored.
+            limit:      max rows returned (default 20).
+            event_type: if provided, exact match on the event_type column.
+            match_all:  require every token (AND) instead of any token (OR).
+
+        Each returned episode dict carries an extra "score" (higher = better).
+        """
+        tokens = _FTS_TOKEN_RE.findall(query.lower())
+        if not tokens:
+            return []
+        type_clause = " AND e.event_type = ?" if event_type else ""
+        type_args = (event_type,) if event_type else ()
+
+        try:
+            with self._pool.reader() as conn:
+                if self._fts:
+                    expr = (" AND " if match_all else " OR ").join(
+                        f'"{t}"' for t in tokens
+                    )
+                    rows = conn.execute(
+                        "SELECT e.*, -bm25(episodes_fts) AS score "
+                        "FROM episodes_fts JOIN episodes e ON e.id = episodes_fts.rowid "
+                        f"WHERE episodes_fts MATCH ?{type_clause} "
+                        "ORDER BY bm25(episodes_fts) LIMIT ?",
+                        (expr, *type_args, limit),
+                    ).fetchall()
+                else:
+                    likes = (" AND " if match_all else " OR ").join(
+                        "e.description LIKE ?" for _ in tokens
+                    )
+                    rows = conn.execute(
+                        "SELECT e.*, 0.0 AS score FROM episodes e "
+                        f"WHERE ({likes}){type_clause} "
+                        "ORDER BY e.id DESC LIMIT ?",
+                        (*(f"%{t}%" for t in tokens), *type_args, limit),
+                    ).fetchall()
+                return [dict(r) for r in rows]
+        except sqlite3.Error as e:
+            log.error(f"[search_text] DB error: {e}")
+            return []
+
     # ──────────────────────────────────────────────────────────────
     # Maintenance (TD-008 fix)
     # ──────────────────────────────────────────────────────────────
@@ -403,78 +569,79 @@ class EpisodicMemory:
             time.localtime(time.time() - days * 86400)
         )
         
-        try:
-            # Count episodes to archive
-            count_row = self._conn.execute(
-                "SELECT COUNT(*) as cnt FROM episodes WHERE timestamp < ?",
-                (cutoff,)
-            ).fetchone()
-            to_archive = count_row["cnt"] if count_row else 0
+        with self._pool.write_lock:
+            try:
+                # Count episodes to archive
+                count_row = self._conn.execute(
+                    "SELECT COUNT(*) as cnt FROM episodes WHERE timestamp < ?",
+                    (cutoff,)
+                ).fetchone()
+                to_archive = count_row["cnt"] if count_row else 0
             
-            if to_archive == 0:
-                log.debug(f"No episodes older than {days} days to archive")
-                return 0
+                if to_archive == 0:
+                    log.debug(f"No episodes older than {days} days to archive")
+                    return 0
             
-            # Create archive directory
-            archive_dir = self._db_path.parent / "archives"
-            archive_dir.mkdir(exist_ok=True)
+                # Create archive directory
+                archive_dir = self._db_path.parent / "archives"
+                archive_dir.mkdir(exist_ok=True)
             
-            # Archive filename based on current month
-            month_str = time.strftime("%Y_%m")
-            archive_path = archive_dir / f"episodic_archive_{month_str}.db"
+                # Archive filename based on current month
+                month_str = time.strftime("%Y_%m")
+                archive_path = archive_dir / f"episodic_archive_{month_str}.db"
             
-            # Open or create archive DB
-            archive_conn = sqlite3.connect(str(archive_path))
-            archive_conn.row_factory = sqlite3.Row
+                # Open or create archive DB
+                archive_conn = sqlite3.connect(str(archive_path))
+                archive_conn.row_factory = sqlite3.Row
             
-            # Create tables in archive if needed
-            archive_conn.executescript("""
-                CREATE TABLE IF NOT EXISTS episodes (
-                    id            INTEGER PRIMARY KEY,
-                    timestamp     TEXT    NOT NULL,
-                    event_type    TEXT    NOT NULL,
-                    description   TEXT    NOT NULL,
-                    outcome       TEXT    NOT NULL DEFAULT 'unknown',
-                    data          TEXT
-                );
-                CREATE INDEX IF NOT EXISTS idx_episodes_timestamp
-                    ON episodes(timestamp);
-            """)
+                # Create tables in archive if needed
+                archive_conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS episodes (
+                        id            INTEGER PRIMARY KEY,
+                        timestamp     TEXT    NOT NULL,
+                        event_type    TEXT    NOT NULL,
+                        description   TEXT    NOT NULL,
+                        outcome       TEXT    NOT NULL DEFAULT 'unknown',
+                        data          TEXT
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_episodes_timestamp
+                        ON episodes(timestamp);
+                """)
             
-            # Copy old episodes to archive
-            rows = self._conn.execute(
-                "SELECT * FROM episodes WHERE timestamp < ?",
-                (cutoff,)
-            ).fetchall()
+                # Copy old episodes to archive
+                rows = self._conn.execute(
+                    "SELECT * FROM episodes WHERE timestamp < ?",
+                    (cutoff,)
+                ).fetchall()
             
-            for row in rows:
-                archive_conn.execute(
-                    "INSERT OR IGNORE INTO episodes VALUES (?, ?, ?, ?, ?, ?)",
-                    tuple(row)
-                )
+                for row in rows:
+                    archive_conn.execute(
+                        "INSERT OR IGNORE INTO episodes VALUES (?, ?, ?, ?, ?, ?)",
+                        tuple(row)
+                    )
             
-            archive_conn.commit()
-            archive_conn.close()
+                archive_conn.commit()
+                archive_conn.close()
             
-            # Delete from main DB
-            self._conn.execute(
-                "DELETE FROM episodes WHERE timestamp < ?",
-                (cutoff,)
-            )
+                # Delete from main DB
+                self._conn.execute(
+                    "DELETE FROM episodes WHERE timestamp < ?",
+                    (cutoff,)
+                )
             
-            # Reclaim disk space
-            log.info(f"Running VACUUM to reclaim space...")
-            self._conn.execute("VACUUM")
+                # Reclaim disk space
+                log.info(f"Running VACUUM to reclaim space...")
+                self._conn.execute("VACUUM")
             
-            log.info(
-                f"Archived {to_archive} episodes older than {days} days "
-                f"to {archive_path.name}"
-            )
-            return to_archive
+                log.info(
+                    f"Archived {to_archive} episodes older than {days} days "
+                    f"to {archive_path.name}"
+                )
+                return to_archive
             
-        except sqlite3.Error as e:
-            log.error(f"[archive_old_episodes] DB error: {e}")
-            return 0
+            except sqlite3.Error as e:
+                log.error(f"[archive_old_episodes] DB error: {e}")
+                return 0
 
     # ──────────────────────────────────────────────────────────────
     # Health check
@@ -488,18 +655,19 @@ class EpisodicMemory:
         """
         required_tables = {"episodes", "errors", "principles"}
         try:
-            rows = self._conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
-            ).fetchall()
-            found = {r["name"] for r in rows}
-            missing = required_tables - found
-            if missing:
-                log.error(f"[health_check] Missing tables: {missing}")
-                return False
-
-            # Smoke-test each table
-            for tbl in required_tables:
-                self._conn.execute(f"SELECT 1 FROM {tbl} LIMIT 1")  # noqa: S608
+            with self._pool.reader() as conn:
+                rows = conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table'"
+                ).fetchall()
+                found = {r["name"] for r in rows}
+                missing = required_tables - found
+                if missing:
+                    log.error(f"[health_check] Missing tables: {missing}")
+                    return False
+
+                # Smoke-test each table
+                for tbl in required_tables:
+                    conn.execute(f"SELECT 1 FROM {tbl} LIMIT 1")  # noqa: S608
 
             log.debug("[health_check] DB healthy.")
             return True
@@ -255,7 +255,49 @@ class MemoryRetrieval:
         )
         
         return results
-    
+
+    def search_episodes(
+        self,
+        query: str,
+        episodic,
+        filters: dict | None = None,
+        limit: int = 10,
+        candidates: int = 200
+    ) -> list[dict]:
+        """
+        Search episodic memory, pre-filtered by its FTS5 index.
+
+        Instead of passing every episode to search(), the keyword match
+        and event_type filter run inside SQLite; only the BM25 top
+        `candidates` rows are ranked here.
+
+        Args:
+            query: Search query
+            episodic: EpisodicMemory instance (must provide search_text)
+            filters: Optional filters (event_type, min_importance, time_range)
+            limit: Maximum results
+            candidates: How many FTS matches to rank
+
+        Returns:
+            Ranked search results (same shape as search())
+        """
+        event_type = (filters or {}).get("event_type")
+        rows = episodic.search_text(query, limit=candidates, event_type=event_type)
+
+        memories = []
+        for row in rows:
+            memory = dict(row)
+            # Episode timestamps are ISO strings; ranking expects epoch seconds
+            try:
+                memory["timestamp"] = time.mktime(
+                    time.strptime(row["timestamp"], "%Y-%m-%dT%H:%M:%S")
+                )
+            except (KeyError, TypeError, ValueError):
+                memory["timestamp"] = time.time()
+            memories.append(memory)
+
+        return self.search(query, memories, filters=filters, limit=limit, use_cache=False)
+
     def find_similar(
         self,
         reference_memory: dict,
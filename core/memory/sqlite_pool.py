@@ -0,0 +1,169 @@
+"""
+Digital Being — SQLitePool
+One writer connection plus a bounded pool of read-only WAL readers.
+
+Design rules:
+  - The writer is the only connection that ever writes (and owns PRAGMA journal_mode)
+  - Every use of the writer holds write_lock (re-entrant): callers on the
+    event loop and the async facades' writer thread share one connection,
+    so a batch transaction must never interleave with another statement
+  - Readers are opened lazily with `mode=ro` and checked out per call
+  - In WAL mode readers never block on the writer (and vice versa)
+  - read_pool_size=0 routes reads to the writer (single-connection behaviour)
+  - All connections get mmap_size / cache_size; the writer gets synchronous=NORMAL
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+log = logging.getLogger("digital_being.sqlite_pool")
+
+DEFAULT_READ_POOL_SIZE = 4
+DEFAULT_MMAP_SIZE      = 256 * 1024 * 1024  # 256 MB of the DB file memory-mapped
+DEFAULT_CACHE_SIZE_KB  = 16 * 1024          # 16 MB page cache per connection
+
+
+class SQLitePool:
+    """
+    Writer + read-only reader connections for one SQLite file.
+
+    Usage:
+        pool = SQLitePool(db_path, read_pool_size=4)
+        writer = pool.open_writer(isolation_level=None)
+        ...
+        with pool.reader() as conn:
+            rows = conn.execute("SELECT ...").fetchall()
+        with pool.write_lock:
+            writer.execute("INSERT ...")
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        cache_size_kb: int = DEFAULT_CACHE_SIZE_KB,
+    ) -> None:
+        self._db_path = db_path
+        self._read_pool_size = max(0, read_pool_size)
+        self._mmap_size = mmap_size
+        self._cache_size_kb = cache_size_kb
+        self._writer: sqlite3.Connection | None = None
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all_readers: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.write_lock = threading.RLock()
+        self._closed = False
+
+    # ──────────────────────────────────────────────────────────────
+    # Connections
+    # ──────────────────────────────────────────────────────────────
+    def _configure(self, conn: sqlite3.Connection) -> None:
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size={int(self._mmap_size)}")
+        conn.execute(f"PRAGMA cache_size=-{int(self._cache_size_kb)}")
+
+    def open_writer(self, **connect_kwargs) -> sqlite3.Connection:
+        """
+        Open (once) and return the writer connection.
+        Callers run their own journal_mode / schema setup on it.
+        """
+        if self._writer is None:
+            self._writer = sqlite3.connect(
+                str(self._db_path),
+                check_same_thread=False,
+                **connect_kwargs,
+            )
+            self._configure(self._writer)
+            self._writer.execute("PRAGMA synchronous=NORMAL")
+            self._closed = False
+        return self._writer
+
+    @property
+    def writer(self) -> sqlite3.Connection | None:
+        return self._writer
+
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{self._db_path.resolve().as_posix()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._configure(conn)
+        conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a read-only connection for the duration of the block.
+        Opens a new reader while under read_pool_size, otherwise waits for one.
+        """
+        if self._read_pool_size == 0 or self._closed:
+            with self.write_lock:
+                yield self._writer
+            return
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            open_failed = False
+            with self._lock:
+                if len(self._all_readers) < self._read_pool_size:
+                    try:
+                        conn = self._open_reader()
+                        self._all_readers.append(conn)
+                    except sqlite3.Error as e:
+                        log.warning(f"SQLitePool: reader open failed ({e}) — using writer.")
+                        open_failed = True
+            if open_failed:
+                with self.write_lock:
+                    yield self._writer
+                return
+            if conn is None:
+                conn = self._idle.get()
+
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    # ──────────────────────────────────────────────────────────────
+    # Lifecycle / stats
+    # ──────────────────────────────────────────────────────────────
+    def close(self) -> None:
+        """Close the writer and all idle readers (busy ones close on return)."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._all_readers.clear()
+        if self._writer is not None:
+            with self.write_lock:
+                self._writer.close()
+                self._writer = None
+
+    def get_stats(self) -> dict:
+        return {
+            "read_pool_size": self._read_pool_size,
+            "readers_open": len(self._all_readers),
+            "readers_idle": self._idle.qsize(),
+        }
@@ -4,9 +4,13 @@ Stage 9: SQLite-backed embedding store with cosine-similarity search.
 
 Design rules:
   - Pure sqlite3 + numpy, no external vector DB
-  - Embeddings stored as BLOB (np.float32.tobytes)
-  - Cosine search: batch processing to avoid loading all vectors
-  - All DB ops use `with self._conn:` (auto-commit)
+  - Embeddings stored as BLOB in the row's codec (float32 / float16 / int8+scale)
+  - SQLite is the source of truth; an in-RAM EmbeddingMatrix mirrors it
+  - Cosine search: one matmul over the pre-normalized matrix + argpartition
+  - Scan mode (search_mode="scan") streams SQLite by id keyset with a top-k heap
+  - All DB writes use `with self._conn:` (auto-commit) on the single writer,
+    under the pool's write_lock (shared with the async facade's writer thread)
+  - Reads use pooled read-only WAL connections (SQLitePool)
   - Errors never crash the caller
   - Dimension validation prevents data corruption
   - Periodic cleanup prevents memory leaks
@@ -16,24 +20,452 @@ Changelog:
   TD-005 fix — added cleanup_old_vectors() to prevent unbounded growth.
   TD-010 fix — added embedding dimension validation.
   P0 fix (2026-02-23) — batch processing, max_vectors limit, memory leak prevention.
+  Perf — EmbeddingMatrix: vectorized top-k search kept in sync with add/cleanup.
+  Perf — scan search pages by `id > last_id` (no OFFSET) with a bounded heap.
+  Perf — optional IVFIndex (k-means ANN) for 100k+ vectors, persisted as .ivf.npz.
+  Schema v2 — per-row `codec` column + vector_meta table; quantized storage codecs.
+  Perf — cached row count, high/low watermark LRU eviction, and
+         PRAGMA incremental_vacuum steps instead of a blocking VACUUM
+         (run from the async writer's idle hook, not from add()).
+  Perf — search() no longer writes: access stats are buffered in memory and
+         flushed with one executemany from the write path or close().
+  Perf — SQLitePool: matrix builds, scans and lookups use read-only connections.
+  Perf — IVF training runs on a background thread, never inside search();
+         EmbeddingMatrix keeps per-list row indices so a probe gathers only
+         the probed lists.
 """
 
 from __future__ import annotations
 
+import heapq
 import logging
+import math
+import os
 import sqlite3
+import threading
 import time
 from pathlib import Path
-from typing import Any
 
 import numpy as np
 
+from core.memory.sqlite_pool import DEFAULT_READ_POOL_SIZE, SQLitePool
+from core.tracing import annotate
+
 log = logging.getLogger("digital_being.vector_memory")
 
 # Constants
 DEFAULT_MAX_VECTORS = 10_000  # Prevent unbounded growth
 DEFAULT_BATCH_SIZE = 1000      # Process in batches to save memory
 DEFAULT_CLEANUP_DAYS = 30      # Auto-cleanup after 30 days
+DEFAULT_EVICT_LOW_WATERMARK = 0.9  # Evict down to 90% of max_vectors
+DEFAULT_VACUUM_STEP_PAGES = 256    # Pages freed per incremental_vacuum step
+DEFAULT_ACCESS_FLUSH_SEC = 60.0    # Max age of buffered access stats
+_ACCESS_FLUSH_MAX_PENDING = 5000   # Flush early if this many ids are buffered
+
+SEARCH_MODES = ("matrix", "scan")
+
+# Storage codecs (schema v2). int8 rows are a float32 scale followed by dim int8s.
+CODECS = ("float32", "float16", "int8")
+SCHEMA_VERSION = 2
+
+# ANN (IVF) defaults
+DEFAULT_ANN_MIN_VECTORS = 20_000  # Below this, exact matrix search is fast enough
+DEFAULT_ANN_NPROBE      = 16      # Lists scanned per query — the recall/latency knob
+_ANN_RETRAIN_GROWTH     = 4.0     # Retrain when the matrix grows 4x past training size
+_ANN_TRAIN_SAMPLE       = 64      # Training rows per list (capped below)
+_ANN_MAX_TRAIN_ROWS     = 50_000
+_ANN_KMEANS_ITERS       = 10
+_ANN_ASSIGN_CHUNK       = 8192
+_ANN_LIST_TAIL          = 0.125   # Regroup list rows once appends exceed 1/8 of them
+
+
+def codec_row_bytes(codec: str, dim: int) -> int:
+    """BLOB size of one embedding stored with `codec`."""
+    if codec == "float16":
+        return dim * 2
+    if codec == "int8":
+        return dim + 4
+    return dim * 4
+
+
+def encode_embedding(arr: np.ndarray, codec: str) -> bytes:
+    """Encode a float32 vector for storage."""
+    if codec == "float16":
+        return arr.astype(np.float16).tobytes()
+    if codec == "int8":
+        peak = float(np.max(np.abs(arr))) if arr.size else 0.0
+        scale = peak / 127.0 if peak > 0 else 1.0
+        q = np.clip(np.rint(arr / scale), -127, 127).astype(np.int8)
+        return np.float32(scale).tobytes() + q.tobytes()
+    return arr.astype(np.float32).tobytes()
+
+
+def decode_embeddings(blobs: list[bytes], codec: str, dim: int) -> np.ndarray:
+    """Decode same-codec BLOBs into a float32 matrix of shape (n, dim)."""
+    n = len(blobs)
+    buf = b"".join(blobs)
+    if codec == "float16":
+        return np.frombuffer(buf, dtype=np.float16).reshape(n, dim).astype(np.float32)
+    if codec == "int8":
+        raw = np.frombuffer(buf, dtype=np.uint8).reshape(n, dim + 4)
+        scales = raw[:, :4].copy().view(np.float32)
+        return raw[:, 4:].view(np.int8).astype(np.float32) * scales
+    return np.frombuffer(buf, dtype=np.float32).reshape(n, dim)
+
+
+class EmbeddingMatrix:
+    """
+    In-RAM mirror of the `vectors` table for vectorized cosine search.
+
+    Keeps a contiguous float32 matrix of L2-normalized embeddings plus
+    parallel id / event_type arrays. Rows are appended into a buffer that
+    grows geometrically, so add() is amortized O(dim). Deletes compact the
+    buffer with a boolean mask.
+
+    The matrix is only a cache: VectorMemory rebuilds it from SQLite on the
+    first search after init() and drops it if anything goes out of sync.
+
+    When an IVFIndex is attached, each row also carries its inverted-list
+    number (-1 = unassigned) so top_k() can restrict scoring to probed lists.
+    Row numbers are grouped by list (CSR: offsets + rows) so a probe gathers
+    only its lists; rows appended since the last grouping form a short tail
+    that is filtered directly. The grouping is rebuilt lazily after deletes,
+    reassignment, or once the tail grows past _ANN_LIST_TAIL.
+    """
+
+    def __init__(self, dim: int) -> None:
+        self._dim   = dim
+        self._lock  = threading.Lock()
+        self._size  = 0
+        self._vecs  = np.zeros((0, dim), dtype=np.float32)
+        self._ids   = np.zeros(0, dtype=np.int64)
+        self._types = np.zeros(0, dtype=object)
+        self._lists = np.zeros(0, dtype=np.int32)
+        # Row numbers grouped by list; rows >= _grouped_size are the tail
+        self._list_offsets: np.ndarray | None = None
+        self._list_rows = np.zeros(0, dtype=np.int64)
+        self._unassigned_rows = np.zeros(0, dtype=np.int64)
+        self._grouped_size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def normalize(arr: np.ndarray) -> np.ndarray:
+        """L2-normalize rows; zero rows stay zero (cosine score 0)."""
+        arr  = np.asarray(arr, dtype=np.float32)
+        norm = np.linalg.norm(arr, axis=-1, keepdims=True)
+        return np.divide(arr, norm, out=np.zeros_like(arr), where=norm > 0)
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        cap    = self._vecs.shape[0]
+        if needed <= cap:
+            return
+        new_cap = max(needed, cap * 2, 64)
+        vecs  = np.zeros((new_cap, self._dim), dtype=np.float32)
+        ids   = np.zeros(new_cap, dtype=np.int64)
+        types = np.zeros(new_cap, dtype=object)
+        lists = np.full(new_cap, -1, dtype=np.int32)
+        vecs[:self._size]  = self._vecs[:self._size]
+        ids[:self._size]   = self._ids[:self._size]
+        types[:self._size] = self._types[:self._size]
+        lists[:self._size] = self._lists[:self._size]
+        self._vecs, self._ids, self._types, self._lists = vecs, ids, types, lists
+
+    def load(self, ids: list[int], event_types: list[str], vecs: np.ndarray) -> None:
+        """Replace contents with the given rows (vecs: shape (n, dim))."""
+        with self._lock:
+            self._size = 0
+            self._vecs = np.zeros((0, self._dim), dtype=np.float32)
+            self._ids   = np.zeros(0, dtype=np.int64)
+            self._types = np.zeros(0, dtype=object)
+            self._lists = np.zeros(0, dtype=np.int32)
+            self._ungroup()
+            self._append(ids, event_types, vecs, None)
+
+    def append(
+        self,
+        ids: list[int],
+        event_types: list[str],
+        vecs: np.ndarray,
+        index: IVFIndex | None = None,
+    ) -> None:
+        """Append rows; if a trained index is given, assign their lists too."""
+        with self._lock:
+            self._append(ids, event_types, vecs, index)
+
+    def _append(
+        self,
+        ids: list[int],
+        event_types: list[str],
+        vecs: np.ndarray,
+        index: IVFIndex | None,
+    ) -> None:
+        n = len(ids)
+        if n == 0:
+            return
+        self._reserve(n)
+        end = self._size + n
+        self._vecs[self._size:end]  = self.normalize(np.reshape(vecs, (n, self._dim)))
+        self._ids[self._size:end]   = ids
+        self._types[self._size:end] = event_types
+        if index is not None and index.trained:
+            self._lists[self._size:end] = index.assign(self._vecs[self._size:end])
+        else:
+            self._lists[self._size:end] = -1
+        self._size = end
+
+    def contains(self, vid: int) -> bool:
+        with self._lock:
+            return bool(np.any(self._ids[:self._size] == vid))
+
+    def sample(self, n: int, seed: int = 0) -> np.ndarray:
+        """Copy of up to n random normalized rows (for index training)."""
+        with self._lock:
+            if self._size <= n:
+                return self._vecs[:self._size].copy()
+            rng = np.random.default_rng(seed)
+            rows = np.sort(rng.choice(self._size, size=n, replace=False))
+            return self._vecs[rows]
+
+    def assign_lists(
+        self,
+        index: IVFIndex,
+        known_ids: np.ndarray | None = None,
+        known_lists: np.ndarray | None = None,
+        centroids: np.ndarray | None = None,
+        trained_size: int = 0,
+    ) -> None:
+        """
+        Set every row's inverted list. Rows whose id is in known_ids reuse the
+        saved assignment; the rest are assigned to their nearest centroid.
+        If `centroids` is given, it replaces the index's centroids first, in the
+        same critical section, so appends and probes never see them half-applied.
+        """
+        with self._lock:
+            if centroids is not None:
+                index.set_centroids(centroids, trained_size)
+            live = self._ids[:self._size]
+            lists = np.full(self._size, -1, dtype=np.int32)
+            if known_ids is not None and known_lists is not None and len(known_ids):
+                order = np.argsort(known_ids)
+                sorted_ids = known_ids[order]
+                pos = np.searchsorted(sorted_ids, live)
+                pos = np.minimum(pos, len(sorted_ids) - 1)
+                hit = sorted_ids[pos] == live
+                lists[hit] = known_lists[order][pos[hit]]
+                lists[lists >= index.nlist] = -1
+            todo = np.flatnonzero(lists < 0)
+            for start in range(0, len(todo), _ANN_ASSIGN_CHUNK):
+                rows = todo[start:start + _ANN_ASSIGN_CHUNK]
+                lists[rows] = index.assign(self._vecs[rows])
+            self._lists[:self._size] = lists
+            self._ungroup()
+
+    def list_assignments(self) -> tuple[np.ndarray, np.ndarray]:
+        """Copy of (ids, lists) for persisting the index."""
+        with self._lock:
+            return self._ids[:self._size].copy(), self._lists[:self._size].copy()
+
+    def remove(self, ids: list[int]) -> int:
+        """Drop rows whose id is in `ids`. Returns number removed."""
+        if not ids:
+            return 0
+        with self._lock:
+            live = self._ids[:self._size]
+            keep = ~np.isin(live, np.asarray(ids, dtype=np.int64))
+            kept = int(keep.sum())
+            removed = self._size - kept
+            if removed:
+                self._vecs[:kept]  = self._vecs[:self._size][keep]
+                self._ids[:kept]   = live[keep]
+                self._types[:kept] = self._types[:self._size][keep]
+                self._lists[:kept] = self._lists[:self._size][keep]
+                self._types[kept:self._size] = None
+                self._size = kept
+                self._ungroup()
+            return removed
+
+    def _ungroup(self) -> None:
+        self._list_offsets = None
+        self._grouped_size = 0
+
+    def _group_lists(self, nlist: int) -> None:
+        """Sort row numbers by list (O(n log n), amortized over many probes)."""
+        lists = self._lists[:self._size]
+        assigned = np.flatnonzero(lists >= 0)
+        self._list_rows = assigned[np.argsort(lists[assigned], kind="stable")]
+        counts = np.bincount(lists[assigned], minlength=nlist)[:nlist]
+        self._list_offsets = np.concatenate(([0], np.cumsum(counts)))
+        self._unassigned_rows = np.flatnonzero(lists < 0)
+        self._grouped_size = self._size
+
+    def _probe_rows(self, probe: np.ndarray, nlist: int) -> np.ndarray:
+        """Row numbers in the probed lists, plus unassigned rows."""
+        tail = self._size - self._grouped_size
+        if (
+            self._list_offsets is None
+            or len(self._list_offsets) != nlist + 1
+            or tail > self._grouped_size * _ANN_LIST_TAIL
+        ):
+            self._group_lists(nlist)
+            tail = 0
+        offsets = self._list_offsets
+        parts = [self._list_rows[offsets[l]:offsets[l + 1]] for l in probe]
+        parts.append(self._unassigned_rows)
+        if tail:
+            rows = np.arange(self._grouped_size, self._size)
+            lists = self._lists[rows]
+            parts.append(rows[np.isin(lists, probe) | (lists < 0)])
+        return np.concatenate(parts)
+
+    def top_k(
+        self,
+        query: np.ndarray,
+        k: int,
+        event_type_filter: str | None = None,
+        index: IVFIndex | None = None,
+    ) -> list[tuple[int, float]]:
+        """
+        Return up to k (id, cosine score) pairs, best first.
+        One matmul over the live rows, then argpartition for top-k.
+        If a trained `index` is given, the query probes it and only rows in
+        the probed lists (or not yet assigned) are scored.
+        """
+        q = self.normalize(query)
+        with self._lock:
+            if self._size == 0 or k <= 0:
+                return []
+            if index is not None and index.trained:
+                # Probed under the lock: centroids and row lists always match
+                rows = self._probe_rows(index.probe(q), index.nlist)
+                vecs, ids = self._vecs[rows], self._ids[rows]
+                types = self._types[rows] if event_type_filter is not None else None
+            else:
+                vecs = self._vecs[:self._size]
+                ids  = self._ids[:self._size]
+                types = self._types[:self._size] if event_type_filter is not None else None
+            if types is not None:
+                mask = types == event_type_filter
+                if not mask.any():
+                    return []
+                vecs, ids = vecs[mask], ids[mask]
+            if ids.shape[0] == 0:
+                return []
+            scores = vecs @ q
+
+            k = min(k, scores.shape[0])
+            if k < scores.shape[0]:
+                part = np.argpartition(-scores, k - 1)[:k]
+            else:
+                part = np.arange(scores.shape[0])
+            order = part[np.argsort(-scores[part], kind="stable")]
+            return [(int(ids[i]), float(scores[i])) for i in order]
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index over an EmbeddingMatrix (pure numpy).
+
+    Spherical k-means splits the normalized vectors into `nlist` clusters.
+    A query scores only the rows of its `nprobe` nearest clusters, so cost
+    drops to roughly nprobe/nlist of a full scan. Raising nprobe trades
+    latency for recall; nprobe >= nlist is exact search.
+
+    Only centroids and the id → list assignment are persisted (.npz next to
+    the SQLite DB); vectors themselves always come from SQLite.
+    """
+
+    def __init__(self, dim: int, nprobe: int = DEFAULT_ANN_NPROBE, nlist: int | None = None) -> None:
+        self._dim          = dim
+        self._nprobe       = max(1, nprobe)
+        self._fixed_nlist  = nlist
+        self._centroids: np.ndarray | None = None
+        self.trained_size  = 0
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    @property
+    def nlist(self) -> int:
+        return 0 if self._centroids is None else self._centroids.shape[0]
+
+    @property
+    def nprobe(self) -> int:
+        return self._nprobe
+
+    def nlist_for(self, n: int) -> int:
+        """Number of lists for n vectors: fixed if configured, else ~sqrt(n)."""
+        if self._fixed_nlist:
+            return max(1, min(self._fixed_nlist, n))
+        return max(1, min(int(math.sqrt(n)), 4096, n))
+
+    def train(self, sample: np.ndarray, nlist: int, total: int, seed: int = 0) -> None:
+        """Fit centroids on normalized sample rows and use them."""
+        self.set_centroids(self.fit(sample, nlist, seed), total)
+
+    def set_centroids(self, centroids: np.ndarray, total: int) -> None:
+        self._centroids = centroids.astype(np.float32)
+        self.trained_size = total
+
+    def fit(self, sample: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+        """Spherical k-means centroids for the sample (does not touch the index)."""
+        nlist = max(1, min(nlist, sample.shape[0]))
+        rng = np.random.default_rng(seed)
+        centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+
+        for _ in range(_ANN_KMEANS_ITERS):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=nlist)
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                # Re-seed empty clusters from random sample rows
+                sums[empty] = sample[rng.choice(sample.shape[0], size=len(empty))]
+            centroids = EmbeddingMatrix.normalize(sums)
+        return centroids.astype(np.float32)
+
+    def assign(self, vecs: np.ndarray) -> np.ndarray:
+        """Nearest-centroid list number for each (normalized) row."""
+        return np.argmax(vecs @ self._centroids.T, axis=1).astype(np.int32)
+
+    def probe(self, query: np.ndarray) -> np.ndarray:
+        """List numbers of the nprobe centroids closest to the query."""
+        scores = self._centroids @ EmbeddingMatrix.normalize(query)
+        if self._nprobe >= len(scores):
+            return np.arange(len(scores), dtype=np.int32)
+        return np.argpartition(-scores, self._nprobe - 1)[:self._nprobe].astype(np.int32)
+
+    def save(self, path: Path, ids: np.ndarray, lists: np.ndarray) -> None:
+        """Atomically write centroids + assignments to `path` (.npz)."""
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez(
+            tmp,
+            centroids=self._centroids,
+            ids=ids,
+            lists=lists,
+            trained_size=np.int64(self.trained_size),
+        )
+        os.replace(tmp, path)
+
+    def load(self, path: Path) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Load centroids from `path`. Returns saved (ids, lists), or None if the
+        file is missing or incompatible with this index's dimension.
+        """
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            centroids = data["centroids"]
+            if centroids.ndim != 2 or centroids.shape[1] != self._dim:
+                log.warning(f"IVFIndex: {path.name} has wrong dimension — ignoring.")
+                return None
+            self._centroids = centroids.astype(np.float32)
+            self.trained_size = int(data["trained_size"])
+            return data["ids"].astype(np.int64), data["lists"].astype(np.int32)
 
 
 class VectorMemory:
@@ -45,7 +477,20 @@ class VectorMemory:
         vm.init()
         vm.add(episode_id=42, event_type="monologue", text="...", embedding=[...])
         results = vm.search(query_embedding=[...], top_k=5)
-        
+
+        # search_mode="matrix" (default) answers from the in-RAM EmbeddingMatrix,
+        # search_mode="scan" reads SQLite batch by batch on every query.
+        # ann_index=True adds an IVF index once ann_min_vectors are stored;
+        # it is trained on a background thread (searches stay exact until it
+        # is ready, see wait_for_ann()); ann_nprobe is the recall/latency knob.
+        # codec="float16" / "int8" stores new rows 2x / ~4x smaller; existing
+        # rows keep their codec until re-encoded by migrate_db.py --codec.
+
+        # Over max_vectors, LRU eviction trims down to
+        # evict_low_watermark * max_vectors in one go; freed pages are handed
+        # back to the OS in vacuum_step_pages chunks by vacuum_step(), which
+        # AsyncVectorMemory runs whenever its writer thread goes idle.
+
         # Automatic cleanup when limit exceeded
         # Or manual: vm.cleanup_old_vectors(days=30)
     """
@@ -56,12 +501,59 @@ class VectorMemory:
         expected_dim: int = 768,
         max_vectors: int = DEFAULT_MAX_VECTORS,
         auto_cleanup: bool = True,
+        search_mode: str = "matrix",
+        ann_index: bool = False,
+        ann_nprobe: int = DEFAULT_ANN_NPROBE,
+        ann_nlist: int | None = None,
+        ann_min_vectors: int = DEFAULT_ANN_MIN_VECTORS,
+        codec: str = "float32",
+        evict_low_watermark: float = DEFAULT_EVICT_LOW_WATERMARK,
+        vacuum_step_pages: int = DEFAULT_VACUUM_STEP_PAGES,
+        access_flush_sec: float = DEFAULT_ACCESS_FLUSH_SEC,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
     ) -> None:
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(
+                f"search_mode must be one of {SEARCH_MODES}, got {search_mode!r}"
+            )
+        if codec not in CODECS:
+            raise ValueError(f"codec must be one of {CODECS}, got {codec!r}")
+        if not 0.0 < evict_low_watermark <= 1.0:
+            raise ValueError(
+                f"evict_low_watermark must be in (0, 1], got {evict_low_watermark}"
+            )
         self._db_path = db_path
         self._expected_dim = expected_dim
         self._max_vectors = max_vectors
         self._auto_cleanup = auto_cleanup
-        self._conn: sqlite3.Connection | None = None
+        self._search_mode = search_mode
+        self._codec = codec
+        self._read_pool_size = read_pool_size
+        self._pool: SQLitePool | None = None
+        self._conn: sqlite3.Connection | None = None   # writer
+        # Row counter maintained by inserts/deletes (avoids COUNT(*) per add)
+        self._row_count = 0
+        self._low_watermark = max(0, int(max_vectors * evict_low_watermark))
+        self._vacuum_step_pages = vacuum_step_pages
+        self._incremental_vacuum = False
+        self._vacuum_pending = False
+        # Buffered access stats: id -> [hits, last_access]; flushed by writers
+        self._access_lock = threading.Lock()
+        self._pending_access: dict[int, list] = {}
+        self._access_flush_sec = access_flush_sec
+        self._last_access_flush = time.monotonic()
+        # None = not loaded yet; rebuilt from SQLite on first matrix search
+        self._matrix: EmbeddingMatrix | None = None
+        self._matrix_build_lock = threading.Lock()
+        # Optional IVF index, persisted next to the DB
+        self._ann: IVFIndex | None = (
+            IVFIndex(expected_dim, nprobe=ann_nprobe, nlist=ann_nlist) if ann_index else None
+        )
+        self._ann_min_vectors = ann_min_vectors
+        self._ann_path = db_path.with_name(db_path.stem + ".ivf.npz")
+        # (Re)training runs on one background thread at a time, off the query path
+        self._ann_lock = threading.Lock()
+        self._ann_thread: threading.Thread | None = None
         
         # Statistics
         self._stats = {
@@ -77,14 +569,24 @@ class VectorMemory:
     def init(self) -> None:
         """Open DB connection and create table + indexes if needed."""
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(
-            str(self._db_path),
-            check_same_thread=False,
-        )
-        self._conn.row_factory = sqlite3.Row
+        self._pool = SQLitePool(self._db_path, read_pool_size=self._read_pool_size)
+        self._conn = self._pool.open_writer()
+        # Must precede anything that writes the header; only takes effect on a
+        # fresh DB — existing files are converted by migrate_db.py
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
         self._conn.execute("PRAGMA journal_mode=WAL")
         self._conn.execute("PRAGMA foreign_keys=ON")
         self._create_table()
+        self._matrix = None
+        self._row_count = self._count_rows()
+        self._incremental_vacuum = (
+            self._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        )
+        if not self._incremental_vacuum:
+            log.info(
+                "VectorMemory: auto_vacuum is not INCREMENTAL — freed pages are "
+                "reused but not returned to the OS. Run migrate_db.py to convert."
+            )
         
         # Check if cleanup needed on init
         if self._auto_cleanup:
@@ -92,14 +594,21 @@ class VectorMemory:
         
         log.info(
             f"VectorMemory initialised. DB: {self._db_path}, "
-            f"expected_dim={self._expected_dim}, max_vectors={self._max_vectors}"
+            f"expected_dim={self._expected_dim}, max_vectors={self._max_vectors}, "
+            f"codec={self._codec}"
         )
 
     def close(self) -> None:
         if self._conn:
-            self._conn.close()
+            self.flush_access_stats()
+        self.wait_for_ann()
+        self._save_ann()
+        self._matrix = None
+        if self._pool:
+            self._pool.close()
+            self._pool = None
             self._conn = None
-            log.info("VectorMemory connection closed.")
+            log.info("VectorMemory connections closed.")
 
     def _create_table(self) -> None:
         with self._conn:
@@ -112,7 +621,12 @@ class VectorMemory:
                     embedding   BLOB      NOT NULL,
                     created_at  REAL      NOT NULL,
                     access_count INTEGER  DEFAULT 0,
-                    last_access REAL
+                    last_access REAL,
+                    codec       TEXT      NOT NULL DEFAULT 'float32'
+                );
+                CREATE TABLE IF NOT EXISTS vector_meta (
+                    key   TEXT PRIMARY KEY,
+                    value TEXT
                 );
                 CREATE INDEX IF NOT EXISTS idx_vectors_event_type
                     ON vectors(event_type);
@@ -121,8 +635,49 @@ class VectorMemory:
                 CREATE INDEX IF NOT EXISTS idx_vectors_access
                     ON vectors(access_count DESC, last_access DESC);
             """)
+        self._migrate_schema()
         log.debug("VectorMemory: table verified/created.")
 
+    def _migrate_schema(self) -> None:
+        """Bring pre-v2 tables up to SCHEMA_VERSION in place (adds `codec`)."""
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(vectors)")}
+        with self._conn:
+            if "codec" not in columns:
+                log.info("VectorMemory: migrating schema — adding codec column.")
+                self._conn.execute(
+                    "ALTER TABLE vectors ADD COLUMN codec TEXT NOT NULL DEFAULT 'float32'"
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO vector_meta (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+
+    def _decode_rows(self, rows: list[sqlite3.Row]) -> tuple[list[sqlite3.Row], np.ndarray]:
+        """
+        Decode the embedding BLOBs of `rows` (which may mix codecs).
+        Returns (valid_rows, float32 block) in matching order; rows with an
+        unknown codec or wrong BLOB size are dropped.
+        """
+        groups: dict[str, list[sqlite3.Row]] = {}
+        for row in rows:
+            codec = row["codec"]
+            if codec not in CODECS:
+                continue
+            if len(row["embedding"]) != codec_row_bytes(codec, self._expected_dim):
+                continue
+            groups.setdefault(codec, []).append(row)
+
+        valid: list[sqlite3.Row] = []
+        blocks: list[np.ndarray] = []
+        for codec, group in groups.items():
+            blocks.append(decode_embeddings(
+                [row["embedding"] for row in group], codec, self._expected_dim,
+            ))
+            valid.extend(group)
+        if not blocks:
+            return [], np.zeros((0, self._expected_dim), dtype=np.float32)
+        return valid, np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
     # ──────────────────────────────────────────────────────────────
     # Validation (TD-010)
     # ──────────────────────────────────────────────────────────────
@@ -175,28 +730,101 @@ class VectorMemory:
         if arr is None:
             return None
 
-        blob = arr.tobytes()
-        try:
-            with self._conn:
-                cur = self._conn.execute(
-                    "INSERT INTO vectors "
-                    "(episode_id, event_type, text, embedding, created_at, last_access) "
-                    "VALUES (?, ?, ?, ?, ?, ?)",
-                    (episode_id, event_type, text, blob, time.time(), time.time()),
-                )
-                row_id = cur.lastrowid
+        blob = encode_embedding(arr, self._codec)
+        with self._pool.write_lock:
+            try:
+                with self._conn:
+                    cur = self._conn.execute(
+                        "INSERT INTO vectors "
+                        "(episode_id, event_type, text, embedding, created_at, last_access, codec) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (episode_id, event_type, text, blob, time.time(), time.time(), self._codec),
+                    )
+                    row_id = cur.lastrowid
+
+                if self._matrix is not None:
+                    # Mirror what a rebuild from SQLite would see (lossy codecs included)
+                    stored = decode_embeddings([blob], self._codec, self._expected_dim)
+                    self._matrix.append([row_id], [event_type], stored, self._ann)
+                    self._maybe_train_ann(self._matrix)
+
+                self._row_count += 1
+                self._stats["total_adds"] += 1
+                log.debug(f"VectorMemory: stored id={row_id} [{event_type}] ep={episode_id}")
             
-            self._stats["total_adds"] += 1
-            log.debug(f"VectorMemory: stored id={row_id} [{event_type}] ep={episode_id}")
+                self._maybe_flush_access_stats()
+                # Check if cleanup needed
+                if self._auto_cleanup:
+                    self._maybe_cleanup()
             
-            # Check if cleanup needed
+                return row_id
+            except sqlite3.Error as e:
+                log.error(f"VectorMemory.add() DB error: {e}")
+                return None
+
+    def add_many(self, records: list[dict]) -> list[int]:
+        """
+        Store many embeddings in a single transaction.
+
+        Each record is a dict with keys: episode_id, event_type, text, embedding.
+        Invalid records are skipped (same validation as add()). Rows are
+        inserted with one executemany and the cleanup check runs once per batch.
+        Returns the new row ids of the stored records, in input order.
+        """
+        now = time.time()
+        params: list[tuple] = []
+        types: list[str] = []
+        blobs: list[bytes] = []
+        for rec in records:
+            arr = self._validate_embedding(rec.get("embedding"))
+            if arr is None:
+                continue
+            blob = encode_embedding(arr, self._codec)
+            params.append((
+                rec.get("episode_id"), rec.get("event_type"), rec.get("text"),
+                blob, now, now, self._codec,
+            ))
+            types.append(rec.get("event_type"))
+            blobs.append(blob)
+
+        if len(params) < len(records):
+            log.warning(
+                f"VectorMemory.add_many(): skipped {len(records) - len(params)} "
+                f"invalid records of {len(records)}"
+            )
+        if not params:
+            return []
+
+        with self._pool.write_lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO vectors "
+                        "(episode_id, event_type, text, embedding, created_at, last_access, codec) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        params,
+                    )
+                    # AUTOINCREMENT ids are consecutive inside one write transaction
+                    last_id = self._conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            except sqlite3.Error as e:
+                log.error(f"VectorMemory.add_many() DB error: {e}")
+                return []
+
+            ids = list(range(last_id - len(params) + 1, last_id + 1))
+            if self._matrix is not None:
+                stored = decode_embeddings(blobs, self._codec, self._expected_dim)
+                self._matrix.append(ids, types, stored, self._ann)
+                self._maybe_train_ann(self._matrix)
+
+            self._row_count += len(ids)
+            self._stats["total_adds"] += len(ids)
+            log.debug(f"VectorMemory: stored {len(ids)} vectors in one batch")
+
+            self._maybe_flush_access_stats()
             if self._auto_cleanup:
                 self._maybe_cleanup()
-            
-            return row_id
-        except sqlite3.Error as e:
-            log.error(f"VectorMemory.add() DB error: {e}")
-            return None
+
+            return ids
 
     # ──────────────────────────────────────────────────────────────
     # Search (memory-efficient batch processing)
@@ -210,7 +838,7 @@ class VectorMemory:
     ) -> list[dict]:
         """
         Find top_k most similar records by cosine similarity.
-        Uses batch processing to avoid loading all vectors into memory.
+        In "scan" mode, batch_size bounds how many rows are held at once.
 
         Returns list of dicts:
             {"id", "episode_id", "event_type", "text", "score", "created_at"}
@@ -223,206 +851,393 @@ class VectorMemory:
 
         self._stats["total_searches"] += 1
 
+        if self._search_mode == "matrix":
+            return self._search_matrix(arr, top_k, event_type_filter)
+
+        return self._search_scan(arr, top_k, event_type_filter, batch_size)
+
+    # ──────────────────────────────────────────────────────────────
+    # Matrix search (in-RAM, vectorized)
+    # ──────────────────────────────────────────────────────────────
+    def _ensure_matrix(self) -> EmbeddingMatrix | None:
+        """Build the EmbeddingMatrix from SQLite if it is not loaded yet."""
+        if self._matrix is not None:
+            return self._matrix
+        # Concurrent first searches (async reader threads) build it only once
+        with self._matrix_build_lock:
+            if self._matrix is not None:
+                return self._matrix
+            return self._build_matrix()
+
+    def _build_matrix(self) -> EmbeddingMatrix | None:
+        t0 = time.monotonic()
+        matrix = EmbeddingMatrix(self._expected_dim)
+        skipped = 0
+        last_id = 0
         try:
-            # Get total count first
-            if event_type_filter:
-                count_row = self._conn.execute(
-                    "SELECT COUNT(*) as cnt FROM vectors WHERE event_type = ?",
-                    (event_type_filter,),
-                ).fetchone()
-            else:
-                count_row = self._conn.execute(
-                    "SELECT COUNT(*) as cnt FROM vectors"
-                ).fetchone()
-            
-            total_count = count_row["cnt"] if count_row else 0
-            
-            if total_count == 0:
-                return []
-            
-            # If total count is manageable, use simple approach
-            if total_count <= batch_size:
-                return self._search_simple(arr, top_k, event_type_filter)
-            
-            # Otherwise, use batch processing
-            return self._search_batched(arr, top_k, event_type_filter, batch_size, total_count)
-            
+            with self._pool.reader() as conn:
+                while True:
+                    rows = conn.execute(
+                        "SELECT id, event_type, embedding, codec FROM vectors "
+                        "WHERE id > ? ORDER BY id LIMIT ?",
+                        (last_id, DEFAULT_BATCH_SIZE),
+                    ).fetchall()
+                    if not rows:
+                        break
+                    last_id = rows[-1]["id"]
+                    valid, block = self._decode_rows(rows)
+                    skipped += len(rows) - len(valid)
+                    matrix.append(
+                        [row["id"] for row in valid],
+                        [row["event_type"] for row in valid],
+                        block,
+                    )
         except sqlite3.Error as e:
-            log.error(f"VectorMemory.search() DB error: {e}")
-            return []
+            log.error(f"VectorMemory._ensure_matrix() DB error: {e}")
+            return None
+
+        # Rows committed by a writer after the last batch were not appended by
+        # add() (no matrix yet) — pick them up now. Publishing and catching up
+        # under the write lock means every row is appended exactly once: by
+        # this pass if committed before, by add() if committed after.
+        with self._pool.write_lock:
+            self._matrix = matrix
+            try:
+                with self._pool.reader() as conn:
+                    rows = conn.execute(
+                        "SELECT id, event_type, embedding, codec FROM vectors WHERE id > ?",
+                        (last_id,),
+                    ).fetchall()
+                valid, block = self._decode_rows(rows)
+                matrix.append(
+                    [row["id"] for row in valid], [row["event_type"] for row in valid], block,
+                )
+            except sqlite3.Error as e:
+                log.warning(f"VectorMemory._ensure_matrix() catch-up failed: {e}")
+        self._load_ann(matrix)
+
+        if skipped:
+            log.warning(
+                f"VectorMemory: skipped {skipped} rows with wrong embedding size "
+                f"while building matrix."
+            )
+        log.info(
+            f"VectorMemory: matrix built with {len(matrix)} vectors "
+            f"in {time.monotonic() - t0:.2f}s"
+        )
+        return matrix
+
+    # ──────────────────────────────────────────────────────────────
+    # ANN index (IVF)
+    # ──────────────────────────────────────────────────────────────
+    def _ann_index(self, matrix: EmbeddingMatrix) -> IVFIndex | None:
+        """The IVF index to probe, or None for exact search (also while training)."""
+        if self._ann is None or len(matrix) < self._ann_min_vectors:
+            return None
+        self._maybe_train_ann(matrix)
+        return self._ann if self._ann.trained else None
+
+    def _maybe_train_ann(self, matrix: EmbeddingMatrix) -> None:
+        """Start background (re)training when the index is missing or outgrown."""
+        if self._ann is None or len(matrix) < self._ann_min_vectors:
+            return
+        if self._ann.trained and len(matrix) <= self._ann.trained_size * _ANN_RETRAIN_GROWTH:
+            return
+        with self._ann_lock:
+            if self._ann_thread is not None and self._ann_thread.is_alive():
+                return
+            self._ann_thread = threading.Thread(
+                target=self._train_ann, args=(matrix,), name="vector-ivf-train", daemon=True,
+            )
+            self._ann_thread.start()
+
+    def wait_for_ann(self, timeout: float | None = None) -> bool:
+        """Wait for background IVF training; False if it did not finish within timeout."""
+        thread = self._ann_thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def _train_ann(self, matrix: EmbeddingMatrix) -> None:
+        t0 = time.monotonic()
+        try:
+            total = len(matrix)
+            nlist = self._ann.nlist_for(total)
+            sample = matrix.sample(min(total, nlist * _ANN_TRAIN_SAMPLE, _ANN_MAX_TRAIN_ROWS))
+            # k-means runs on the copied sample without any lock; the new
+            # centroids are swapped in and all rows reassigned atomically
+            centroids = self._ann.fit(sample, nlist)
+            matrix.assign_lists(self._ann, centroids=centroids, trained_size=total)
+        except Exception as e:
+            log.error(f"VectorMemory: IVF training failed: {e}")
+            return
+        log.info(
+            f"VectorMemory: IVF index trained on {total} vectors "
+            f"(nlist={self._ann.nlist}, nprobe={self._ann.nprobe}) "
+            f"in {time.monotonic() - t0:.2f}s"
+        )
+        self._save_ann()
+
+    def _load_ann(self, matrix: EmbeddingMatrix) -> None:
+        """Restore a persisted IVF index and attach it to a freshly built matrix."""
+        if self._ann is None:
+            return
+        try:
+            saved = self._ann.load(self._ann_path)
+        except (OSError, ValueError, KeyError) as e:
+            log.warning(f"VectorMemory: could not load IVF index {self._ann_path.name}: {e}")
+            return
+        if saved is None:
+            return
+        matrix.assign_lists(self._ann, *saved)
+        log.info(
+            f"VectorMemory: IVF index loaded (nlist={self._ann.nlist}, "
+            f"trained_size={self._ann.trained_size})"
+        )
 
-    def _search_simple(
+    def _save_ann(self) -> None:
+        if self._ann is None or not self._ann.trained or self._matrix is None:
+            return
+        try:
+            self._ann.save(self._ann_path, *self._matrix.list_assignments())
+        except OSError as e:
+            log.warning(f"VectorMemory: could not save IVF index: {e}")
+
+    def _search_matrix(
         self,
         query_arr: np.ndarray,
         top_k: int,
         event_type_filter: str | None,
     ) -> list[dict]:
-        """Simple search for small datasets - loads all vectors."""
-        try:
-            if event_type_filter:
-                rows = self._conn.execute(
-                    "SELECT id, episode_id, event_type, text, embedding, created_at "
-                    "FROM vectors WHERE event_type = ?",
-                    (event_type_filter,),
-                ).fetchall()
-            else:
-                rows = self._conn.execute(
-                    "SELECT id, episode_id, event_type, text, embedding, created_at "
-                    "FROM vectors"
-                ).fetchall()
-        except sqlite3.Error as e:
-            log.error(f"VectorMemory._search_simple() DB error: {e}")
+        """Single matmul over the in-RAM matrix, then fetch top rows from SQLite."""
+        matrix = self._ensure_matrix()
+        if matrix is None:
             return []
 
-        if not rows:
+        index = self._ann_index(matrix)
+        top = matrix.top_k(query_arr, top_k, event_type_filter, index)
+        if index is not None and len(top) < top_k:
+            # Probed lists were too sparse (e.g. rare event_type) — go exact
+            top = matrix.top_k(query_arr, top_k, event_type_filter)
+        if not top:
             return []
 
-        scored: list[tuple[float, Any]] = []
-
-        for row in rows:
-            try:
-                vec = np.frombuffer(row["embedding"], dtype=np.float32)
-                score = self._cosine_similarity(query_arr, vec)
-                scored.append((score, row))
-            except Exception as e:
-                log.debug(f"VectorMemory._search_simple(): skip row id={row['id']}: {e}")
-                continue
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        top = scored[:top_k]
-
-        # Update access stats for top results
-        self._update_access_stats([row["id"] for _, row in top])
+        ids = [vid for vid, _ in top]
+        try:
+            placeholders = ",".join("?" * len(ids))
+            with self._pool.reader() as conn:
+                rows = conn.execute(
+                    "SELECT id, episode_id, event_type, text, created_at "
+                    f"FROM vectors WHERE id IN ({placeholders})",
+                    ids,
+                ).fetchall()
+        except sqlite3.Error as e:
+            log.error(f"VectorMemory._search_matrix() DB error: {e}")
+            return []
 
+        by_id = {row["id"]: row for row in rows}
         results = [
             {
-                "id":         row["id"],
-                "episode_id": row["episode_id"],
-                "event_type": row["event_type"],
-                "text":       row["text"],
-                "score":      float(score),
-                "created_at": row["created_at"],
+                "id":         vid,
+                "episode_id": by_id[vid]["episode_id"],
+                "event_type": by_id[vid]["event_type"],
+                "text":       by_id[vid]["text"],
+                "score":      score,
+                "created_at": by_id[vid]["created_at"],
             }
-            for score, row in top
+            for vid, score in top
+            if vid in by_id
         ]
+
+        self._update_access_stats([r["id"] for r in results])
+
+        annotate(mode="matrix", ann=index is not None, candidates=len(matrix))
         log.debug(
-            f"VectorMemory._search_simple(): top_k={top_k} "
-            f"candidates={len(rows)} results={len(results)}"
+            f"VectorMemory._search_matrix(): top_k={top_k} "
+            f"candidates={len(matrix)} results={len(results)}"
         )
         return results
 
-    def _search_batched(
+    # ──────────────────────────────────────────────────────────────
+    # Scan search (streaming, keyset-paginated)
+    # ──────────────────────────────────────────────────────────────
+    def _search_scan(
         self,
         query_arr: np.ndarray,
         top_k: int,
         event_type_filter: str | None,
         batch_size: int,
-        total_count: int,
     ) -> list[dict]:
-        """Batch processing for large datasets - memory efficient."""
-        log.debug(
-            f"VectorMemory: using batched search for {total_count} vectors "
-            f"(batch_size={batch_size})"
-        )
-        
-        # Keep track of top-k across all batches
-        all_scored: list[tuple[float, dict]] = []
-        
-        offset = 0
-        while offset < total_count:
-            try:
-                if event_type_filter:
-                    rows = self._conn.execute(
-                        "SELECT id, episode_id, event_type, text, embedding, created_at "
-                        "FROM vectors WHERE event_type = ? LIMIT ? OFFSET ?",
-                        (event_type_filter, batch_size, offset),
-                    ).fetchall()
-                else:
-                    rows = self._conn.execute(
-                        "SELECT id, episode_id, event_type, text, embedding, created_at "
-                        "FROM vectors LIMIT ? OFFSET ?",
-                        (batch_size, offset),
-                    ).fetchall()
-                
+        """
+        Stream the table in id order (`WHERE id > last_id`), score each batch
+        as one numpy block and keep a bounded top-k min-heap across batches.
+        Peak memory is O(batch_size + top_k) regardless of table size.
+        """
+        if top_k <= 0:
+            return []
+
+        query = EmbeddingMatrix.normalize(query_arr)
+        heap: list[tuple[float, int, dict]] = []
+        scanned = 0
+        last_id = 0
+
+        with self._pool.reader() as conn:
+            while True:
+                try:
+                    if event_type_filter:
+                        rows = conn.execute(
+                            "SELECT id, episode_id, event_type, text, embedding, codec, created_at "
+                            "FROM vectors WHERE event_type = ? AND id > ? "
+                            "ORDER BY id LIMIT ?",
+                            (event_type_filter, last_id, batch_size),
+                        ).fetchall()
+                    else:
+                        rows = conn.execute(
+                            "SELECT id, episode_id, event_type, text, embedding, codec, created_at "
+                            "FROM vectors WHERE id > ? ORDER BY id LIMIT ?",
+                            (last_id, batch_size),
+                        ).fetchall()
+                except sqlite3.Error as e:
+                    log.error(f"VectorMemory._search_scan() batch error: {e}")
+                    break
+
                 if not rows:
                     break
-                
-                # Score this batch
-                for row in rows:
-                    try:
-                        vec = np.frombuffer(row["embedding"], dtype=np.float32)
-                        score = self._cosine_similarity(query_arr, vec)
-                        
-                        result = {
+                last_id = rows[-1]["id"]
+
+                valid, block = self._decode_rows(rows)
+                if len(valid) < len(rows):
+                    log.debug(
+                        f"VectorMemory._search_scan(): skipped {len(rows) - len(valid)} "
+                        f"rows with wrong embedding size"
+                    )
+                if not valid:
+                    continue
+                scanned += len(valid)
+
+                scores = EmbeddingMatrix.normalize(block) @ query
+
+                # Only rows that can enter the heap are turned into dicts
+                k = min(top_k, len(valid))
+                if k < len(valid):
+                    candidates = np.argpartition(-scores, k - 1)[:k]
+                else:
+                    candidates = range(len(valid))
+                for i in candidates:
+                    score = float(scores[i])
+                    if len(heap) == top_k and score <= heap[0][0]:
+                        continue
+                    row = valid[i]
+                    item = (
+                        score,
+                        -row["id"],
+                        {
                             "id":         row["id"],
                             "episode_id": row["episode_id"],
                             "event_type": row["event_type"],
                             "text":       row["text"],
-                            "score":      float(score),
+                            "score":      score,
                             "created_at": row["created_at"],
-                        }
-                        all_scored.append((score, result))
-                    except Exception as e:
-                        log.debug(f"VectorMemory._search_batched(): skip row id={row['id']}: {e}")
-                        continue
-                
-                offset += batch_size
-                
-            except sqlite3.Error as e:
-                log.error(f"VectorMemory._search_batched() batch error: {e}")
-                break
-        
-        # Sort all results and get top-k
-        all_scored.sort(key=lambda x: x[0], reverse=True)
-        top_results = [result for _, result in all_scored[:top_k]]
-        
+                        },
+                    )
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, item)
+                    else:
+                        heapq.heapreplace(heap, item)
+
+        top_results = [result for _, _, result in sorted(heap, reverse=True)]
+
         # Update access stats for top results
         self._update_access_stats([r["id"] for r in top_results])
-        
+
+        annotate(mode="scan", scanned=scanned)
         log.debug(
-            f"VectorMemory._search_batched(): top_k={top_k} "
-            f"total_candidates={len(all_scored)} results={len(top_results)}"
+            f"VectorMemory._search_scan(): top_k={top_k} "
+            f"scanned={scanned} results={len(top_results)}"
         )
         return top_results
 
     def _update_access_stats(self, vector_ids: list[int]) -> None:
-        """Update access statistics for LRU cleanup."""
+        """
+        Record hits for LRU cleanup. Only touches the in-memory buffer, so
+        search() stays a read-only query; writers flush it to SQLite.
+        """
         if not vector_ids:
             return
-        
-        try:
-            placeholders = ",".join("?" * len(vector_ids))
-            with self._conn:
-                self._conn.execute(
-                    f"UPDATE vectors SET access_count = access_count + 1, "
-                    f"last_access = ? WHERE id IN ({placeholders})",
-                    [time.time()] + vector_ids,
-                )
-        except sqlite3.Error as e:
-            log.warning(f"Failed to update access stats: {e}")
+        now = time.time()
+        with self._access_lock:
+            for vid in vector_ids:
+                entry = self._pending_access.get(vid)
+                if entry is None:
+                    self._pending_access[vid] = [1, now]
+                else:
+                    entry[0] += 1
+                    entry[1] = now
+
+    def _maybe_flush_access_stats(self) -> None:
+        """Flush buffered access stats if they are old or numerous enough."""
+        if not self._pending_access:
+            return
+        if (
+            len(self._pending_access) >= _ACCESS_FLUSH_MAX_PENDING
+            or time.monotonic() - self._last_access_flush >= self._access_flush_sec
+        ):
+            self.flush_access_stats()
+
+    def flush_access_stats(self) -> int:
+        """
+        Write buffered access counts to SQLite in one executemany.
+        Called from the write path, before LRU eviction and on close().
+        Returns the number of rows updated.
+        """
+        with self._access_lock:
+            pending, self._pending_access = self._pending_access, {}
+        self._last_access_flush = time.monotonic()
+        if not pending:
+            return 0
+        with self._pool.write_lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE vectors SET access_count = access_count + ?, "
+                        "last_access = MAX(COALESCE(last_access, 0), ?) WHERE id = ?",
+                        [(hits, last, vid) for vid, (hits, last) in pending.items()],
+                    )
+            except sqlite3.Error as e:
+                log.warning(f"Failed to flush access stats: {e}")
+                return 0
+        log.debug(f"VectorMemory: flushed access stats for {len(pending)} vectors")
+        return len(pending)
 
     # ──────────────────────────────────────────────────────────────
     # Read helpers
     # ──────────────────────────────────────────────────────────────
     def count(self) -> int:
-        """Total number of stored vectors."""
+        """Total number of stored vectors (cached counter, no table scan)."""
+        return self._row_count
+
+    def _count_rows(self) -> int:
+        """COUNT(*) from SQLite — used to seed and resync the cached counter."""
         try:
-            row = self._conn.execute(
-                "SELECT COUNT(*) as cnt FROM vectors"
-            ).fetchone()
+            with self._pool.reader() as conn:
+                row = conn.execute(
+                    "SELECT COUNT(*) as cnt FROM vectors"
+                ).fetchone()
             return row["cnt"] if row else 0
         except sqlite3.Error as e:
-            log.error(f"VectorMemory.count() DB error: {e}")
+            log.error(f"VectorMemory._count_rows() DB error: {e}")
             return 0
 
     def get_recent(self, limit: int = 20) -> list[dict]:
         """Return last N records (no embedding blob — text only), newest first."""
         try:
-            rows = self._conn.execute(
-                "SELECT id, episode_id, event_type, text, created_at "
-                "FROM vectors ORDER BY id DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
+            with self._pool.reader() as conn:
+                rows = conn.execute(
+                    "SELECT id, episode_id, event_type, text, created_at "
+                    "FROM vectors ORDER BY id DESC LIMIT ?",
+                    (limit,),
+                ).fetchall()
             return [dict(r) for r in rows]
         except sqlite3.Error as e:
             log.error(f"VectorMemory.get_recent() DB error: {e}")
@@ -431,13 +1246,27 @@ class VectorMemory:
     def get_stats(self) -> dict:
         """Get memory and usage statistics."""
         return {
-            "total_vectors": self.count(),
+            "total_vectors": self._row_count,
             "max_vectors": self._max_vectors,
             "total_searches": self._stats["total_searches"],
             "total_adds": self._stats["total_adds"],
             "total_cleanups": self._stats["total_cleanups"],
             "last_cleanup_time": self._stats["last_cleanup_time"],
             "auto_cleanup_enabled": self._auto_cleanup,
+            "search_mode": self._search_mode,
+            "codec": self._codec,
+            "schema_version": SCHEMA_VERSION,
+            "evict_low_watermark": self._low_watermark,
+            "incremental_vacuum": self._incremental_vacuum,
+            "vacuum_pending": self._vacuum_pending,
+            "pending_access_stats": len(self._pending_access),
+            "pool": self._pool.get_stats() if self._pool else {},
+            "matrix_loaded": self._matrix is not None,
+            "matrix_vectors": len(self._matrix) if self._matrix is not None else 0,
+            "ann_enabled": self._ann is not None,
+            "ann_trained": self._ann is not None and self._ann.trained,
+            "ann_nlist": self._ann.nlist if self._ann is not None else 0,
+            "ann_nprobe": self._ann.nprobe if self._ann is not None else 0,
         }
 
     # ──────────────────────────────────────────────────────────────
@@ -445,14 +1274,16 @@ class VectorMemory:
     # ──────────────────────────────────────────────────────────────
     def _maybe_cleanup(self) -> None:
         """Check if cleanup needed and trigger if necessary."""
-        current_count = self.count()
+        current_count = self._row_count
         
         if current_count > self._max_vectors:
-            # Exceeded limit - cleanup based on LRU
-            to_delete = current_count - self._max_vectors + 100  # Delete extra for buffer
+            # Exceeded high watermark - evict down to the low watermark so the
+            # next eviction is max_vectors - low_watermark inserts away
+            to_delete = current_count - self._low_watermark
             log.warning(
                 f"VectorMemory: limit exceeded ({current_count} > {self._max_vectors}). "
-                f"Cleaning up {to_delete} least accessed vectors."
+                f"Evicting {to_delete} least accessed vectors "
+                f"(down to {self._low_watermark})."
             )
             self._cleanup_lru(to_delete)
 
@@ -461,35 +1292,50 @@ class VectorMemory:
         Delete least recently used vectors.
         Uses access_count and last_access for smart cleanup.
         """
-        try:
-            with self._conn:
-                # Delete vectors with lowest access_count and oldest last_access
-                cur = self._conn.execute(
-                    "DELETE FROM vectors WHERE id IN ("
-                    "  SELECT id FROM vectors "
-                    "  ORDER BY access_count ASC, last_access ASC "
-                    "  LIMIT ?"
-                    ")",
-                    (count,),
-                )
-            deleted = cur.rowcount
+        self.flush_access_stats()
+        with self._pool.write_lock:
+            try:
+                with self._conn:
+                    # Delete vectors with lowest access_count and oldest last_access
+                    ids = [
+                        row["id"] for row in self._conn.execute(
+                            "SELECT id FROM vectors "
+                            "ORDER BY access_count ASC, last_access ASC "
+                            "LIMIT ?",
+                            (count,),
+                        )
+                    ]
+                    deleted = self._delete_ids(ids)
             
-            if deleted > 0:
-                self._stats["total_cleanups"] += 1
-                self._stats["last_cleanup_time"] = time.time()
-                log.info(f"VectorMemory: LRU cleanup removed {deleted} vectors.")
-                
-                # VACUUM to reclaim space
-                try:
-                    log.debug("VectorMemory: running VACUUM...")
-                    self._conn.execute("VACUUM")
-                except sqlite3.Error as e:
-                    log.warning(f"VectorMemory: VACUUM failed: {e}")
+                if deleted > 0:
+                    self._stats["total_cleanups"] += 1
+                    self._stats["last_cleanup_time"] = time.time()
+                    log.info(f"VectorMemory: LRU cleanup removed {deleted} vectors.")
+                    self._vacuum_pending = True
             
-            return deleted
-        except sqlite3.Error as e:
-            log.error(f"VectorMemory._cleanup_lru() error: {e}")
+                return deleted
+            except sqlite3.Error as e:
+                log.error(f"VectorMemory._cleanup_lru() error: {e}")
+                self._matrix = None  # may be out of sync — rebuild on next search
+                self._row_count = self._count_rows()
+                return 0
+
+    def _delete_ids(self, ids: list[int]) -> int:
+        """
+        Delete rows by id and drop them from the matrix.
+        Must be called inside a `with self._conn:` transaction.
+        """
+        if not ids:
             return 0
+        cur = self._conn.executemany(
+            "DELETE FROM vectors WHERE id = ?",
+            [(vid,) for vid in ids],
+        )
+        if self._matrix is not None:
+            self._matrix.remove(ids)
+        deleted = cur.rowcount if cur.rowcount >= 0 else len(ids)
+        self._row_count = max(0, self._row_count - deleted)
+        return deleted
 
     def delete_old(self, days: int = DEFAULT_CLEANUP_DAYS) -> int:
         """
@@ -497,23 +1343,29 @@ class VectorMemory:
         Returns number of deleted rows.
         """
         cutoff = time.time() - days * 86400
-        try:
-            with self._conn:
-                cur = self._conn.execute(
-                    "DELETE FROM vectors WHERE created_at < ?",
-                    (cutoff,),
-                )
-            deleted = cur.rowcount
+        with self._pool.write_lock:
+            try:
+                with self._conn:
+                    ids = [
+                        row["id"] for row in self._conn.execute(
+                            "SELECT id FROM vectors WHERE created_at < ?",
+                            (cutoff,),
+                        )
+                    ]
+                    deleted = self._delete_ids(ids)
             
-            if deleted > 0:
-                self._stats["total_cleanups"] += 1
-                self._stats["last_cleanup_time"] = time.time()
-                log.info(f"VectorMemory.delete_old(): deleted {deleted} records older than {days}d.")
+                if deleted > 0:
+                    self._stats["total_cleanups"] += 1
+                    self._stats["last_cleanup_time"] = time.time()
+                    self._vacuum_pending = True
+                    log.info(f"VectorMemory.delete_old(): deleted {deleted} records older than {days}d.")
             
-            return deleted
-        except sqlite3.Error as e:
-            log.error(f"VectorMemory.delete_old() DB error: {e}")
-            return 0
+                return deleted
+            except sqlite3.Error as e:
+                log.error(f"VectorMemory.delete_old() DB error: {e}")
+                self._matrix = None  # may be out of sync — rebuild on next search
+                self._row_count = self._count_rows()
+                return 0
 
     def cleanup_old_vectors(self, days: int = DEFAULT_CLEANUP_DAYS) -> int:
         """
@@ -527,38 +1379,48 @@ class VectorMemory:
         
         Call this periodically (e.g. once per 24 hours / ~24 heavy ticks)
         to prevent unbounded memory growth.
+
+        Space is reclaimed with one bounded incremental_vacuum step here;
+        the rest follows in small steps (AsyncVectorMemory's idle hook).
         """
         deleted = self.delete_old(days)
         
         if deleted > 0:
-            # Reclaim disk space
-            try:
-                log.info("VectorMemory: running VACUUM to reclaim space...")
-                self._conn.execute("VACUUM")
-                log.info("VectorMemory: VACUUM complete")
-            except sqlite3.Error as e:
-                log.warning(f"VectorMemory: VACUUM failed: {e}")
+            self.vacuum_step()
         
         return deleted
 
+    def vacuum_step(self, pages: int | None = None) -> int:
+        """
+        Return up to `pages` free pages to the OS with PRAGMA incremental_vacuum.
+        No-op unless a delete left free pages behind. Returns pages freed.
+        """
+        if not self._vacuum_pending or not self._incremental_vacuum:
+            return 0
+        pages = pages or self._vacuum_step_pages
+        with self._pool.write_lock:
+            try:
+                before = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+                # executescript steps the pragma to completion (execute() stops after one page)
+                self._conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+                after = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+            except sqlite3.Error as e:
+                log.warning(f"VectorMemory: incremental_vacuum failed: {e}")
+                return 0
+        if after == 0:
+            self._vacuum_pending = False
+        log.debug(f"VectorMemory: incremental_vacuum freed {before - after} pages, {after} left")
+        return before - after
+
     def health_check(self) -> bool:
         """
         Verify DB is accessible and table exists.
         Returns True if healthy, False otherwise.
         """
         try:
-            self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()
+            with self._pool.reader() as conn:
+                conn.execute("SELECT 1 FROM vectors LIMIT 1").fetchone()
             return True
         except sqlite3.Error as e:
             log.error(f"VectorMemory health_check failed: {e}")
             return False
-
-    # ──────────────────────────────────────────────────────────────
-    # Math
-    # ──────────────────────────────────────────────────────────────
-    @staticmethod
-    def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
-        """Cosine similarity in [-1, 1]. Returns 0 if either vector is zero."""
-        dot  = np.dot(a, b)
-        norm = np.linalg.norm(a) * np.linalg.norm(b)
-        return float(dot / norm) if norm > 0 else 0.0
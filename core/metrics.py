@@ -109,6 +109,47 @@ class MetricsCollector:
             ["model", "type"]  # input | output
         )
         
+        # Token usage per call profile (monologue | goal | reflection | ...)
+        self.llm_profile_tokens = Counter(
+            "llm_profile_tokens_total",
+            "Tokens processed per call profile",
+            ["profile", "type"]  # input | output
+        )
+        
+        # LLM scheduler (per priority class)
+        self.llm_queue_depth = Gauge(
+            "llm_queue_depth",
+            "LLM requests waiting for an Ollama slot",
+            ["priority"]  # critical | important | optional
+        )
+        
+        self.llm_queue_wait = Histogram(
+            "llm_queue_wait_seconds",
+            "Time LLM requests waited for an Ollama slot",
+            ["priority"],
+            buckets=[0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0]
+        )
+        
+        self.llm_queue_rejected_total = Counter(
+            "llm_queue_rejected_total",
+            "LLM requests rejected by the scheduler",
+            ["priority", "reason"]  # deadline | preempted | queue_full
+        )
+        
+        # Prompt prefix reuse (Ollama KV cache)
+        self.llm_prompt_eval = Histogram(
+            "llm_prompt_eval_seconds",
+            "Prompt evaluation time reported by Ollama",
+            ["profile", "prefix"],  # warm | cold
+            buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
+        )
+        
+        self.llm_prompt_eval_saved = Histogram(
+            "llm_prompt_eval_saved_seconds",
+            "Prompt evaluation time saved by prefix reuse, per tick",
+            buckets=[0.0, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0]
+        )
+        
         # ============================================================
         # Cache Metrics
         # ============================================================
@@ -224,6 +265,48 @@ class MetricsCollector:
             ["tick_type"]
         )
         
+        self.tick_step_duration = Histogram(
+            "tick_step_duration_seconds",
+            "Duration of one step of a tick step graph",
+            ["graph", "step", "status"],  # ok | failed | timeout | stopped | cancelled
+            buckets=[0.01, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0]
+        )
+        
+        self.tick_prefetch_total = Counter(
+            "tick_prefetch_total",
+            "Prepared next-tick prompts",
+            ["result"]  # hit | miss | stale | invalidated
+        )
+        
+        self.tick_critical_path = Histogram(
+            "tick_critical_path_seconds",
+            "Critical-path time of a tick step graph",
+            ["graph"],
+            buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0]
+        )
+        
+        self.tick_interval = Gauge(
+            "tick_interval_seconds",
+            "Interval chosen for the next heavy tick"
+        )
+        
+        self.tick_interval_decisions_total = Counter(
+            "tick_interval_decisions_total",
+            "Heavy-tick interval decisions",
+            ["reason"]  # breaker_open | backlog | overrun | llm_queue | idle | steady
+        )
+        
+        self.tick_pressure = Gauge(
+            "tick_pressure",
+            "Heavy-tick load level (0=normal, 1=high, 2=critical)"
+        )
+        
+        self.tick_optional_skipped_total = Counter(
+            "tick_optional_skipped_total",
+            "OPTIONAL tick steps deferred under load",
+            ["step"]
+        )
+        
         log.info(
             f"MetricsCollector initialized. "
             f"Prometheus available: {PROMETHEUS_AVAILABLE}"
@@ -256,6 +339,59 @@ class MetricsCollector:
                 operation=operation
             ).observe(duration)
     
+    def record_llm_tokens(
+        self,
+        model: str,
+        profile: str,
+        prompt_tokens: int,
+        output_tokens: int
+    ) -> None:
+        """Записать расход токенов одного LLM вызова."""
+        self.llm_tokens_used.labels(model=model, type="input").inc(prompt_tokens)
+        self.llm_tokens_used.labels(model=model, type="output").inc(output_tokens)
+        self.llm_profile_tokens.labels(profile=profile, type="input").inc(prompt_tokens)
+        self.llm_profile_tokens.labels(profile=profile, type="output").inc(output_tokens)
+    
+    def record_llm_queue_wait(self, priority: str, wait: float) -> None:
+        """Записать ожидание слота Ollama."""
+        self.llm_queue_wait.labels(priority=priority).observe(wait)
+    
+    def record_llm_queue_rejected(self, priority: str, reason: str) -> None:
+        """Записать отказ планировщика."""
+        self.llm_queue_rejected_total.labels(priority=priority, reason=reason).inc()
+    
+    def record_prompt_eval(self, profile: str, seconds: float, warm: bool) -> None:
+        """Записать время prompt eval (warm = префикс совпал с прошлым вызовом)."""
+        self.llm_prompt_eval.labels(
+            profile=profile, prefix="warm" if warm else "cold"
+        ).observe(seconds)
+    
+    def record_prompt_eval_saved(self, seconds: float) -> None:
+        """Записать сэкономленное за тик время prompt eval."""
+        self.llm_prompt_eval_saved.observe(seconds)
+    
+    def record_graph_step(self, graph: str, step: str, status: str, seconds: float) -> None:
+        """Записать длительность шага графа тика."""
+        self.tick_step_duration.labels(graph=graph, step=step, status=status).observe(seconds)
+    
+    def record_graph_critical_path(self, graph: str, seconds: float) -> None:
+        """Записать длину критического пути графа тика."""
+        self.tick_critical_path.labels(graph=graph).observe(seconds)
+    
+    def record_tick_interval(self, seconds: float, reason: str, pressure: int) -> None:
+        """Записать выбранный интервал тяжёлого тика и причину решения."""
+        self.tick_interval.set(seconds)
+        self.tick_interval_decisions_total.labels(reason=reason).inc()
+        self.tick_pressure.set(pressure)
+    
+    def record_optional_skipped(self, step: str) -> None:
+        """Записать отложенный под нагрузкой OPTIONAL шаг."""
+        self.tick_optional_skipped_total.labels(step=step).inc()
+    
+    def record_prefetch(self, result: str) -> None:
+        """Записать исход предвычисления контекста тика."""
+        self.tick_prefetch_total.labels(result=result).inc()
+    
     def record_cache_hit(self, cache_type: str = "llm") -> None:
         """Записать cache hit."""
         self.cache_hits_total.labels(cache_type=cache_type).inc()
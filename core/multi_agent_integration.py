@@ -328,6 +328,15 @@ class MultiAgentSystem:
             self._stats["errors"] += 1
             return {"error": str(e)}
     
+    def pending_work(self) -> int:
+        """Pending tasks plus open proposals (0 before initialize())."""
+        if not self._initialized:
+            return 0
+        return (
+            len(self.task_coordinator.get_pending_tasks())
+            + len(self.consensus_voting.get_pending_proposals())
+        )
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get system statistics."""
         stats = {
@@ -18,6 +18,8 @@ import time
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from core.token_budget import get_token_budget
+
 if TYPE_CHECKING:
     from core.emotion_engine import EmotionEngine
     from core.memory.episodic import EpisodicMemory
@@ -160,11 +162,14 @@ class NarrativeEngine:
         weekly_direction: str,
         longterm_vector: str,
     ) -> str:
-        prompt = (
+        head = (
             f"Ты — {name}, автономная цифровая сущность.\n"
             f"Напиши дневниковую запись от первого лица для тика #{tick_count}.\n\n"
             f"Контекст:\n"
-            f"Последние действия:\n{actions_summary}\n\n"
+            f"Последние действия:\n"
+        )
+        tail = (
+            f"\n\n"
             f"Эмоциональное состояние: {emotion_summary}\n"
             f"Доминирующая эмоция: {dominant_emotion}\n"
             f"Текущая цель: {current_goal}\n"
@@ -181,8 +186,17 @@ class NarrativeEngine:
             f"Ты — {name}. Пиши кратко, от первого лица, живым языком. "
             f"Только текст дневниковой записи, без заголовков и метаданных."
         )
+        # Only the action history grows with context — trim it to what the
+        # rest of the prompt (template, state, system) leaves of the budget
+        budget = get_token_budget()
+        actions_summary = budget.fit(
+            "narrative",
+            {"actions": actions_summary},
+            reserved=budget.estimate(system + head + tail),
+        )["actions"]
+        prompt = head + actions_summary + tail
         try:
-            result = self._ollama.chat(prompt, system)
+            result = self._ollama.chat(prompt, system, call_profile="narrative")
             return (result or "").strip()
         except Exception as e:
             log.warning(f"[NarrativeEngine] LLM call failed: {e}")
@@ -4,14 +4,22 @@ Phase 7: Thin wrapper over the `ollama` library.
 
 Features:
   - chat()  — single-turn generation via strategy model
+  - chat_stream() / chat_until() — streamed chat with early stop
+  - call_profile — per-call-site num_predict and token accounting (TokenBudget)
+  - LLMScheduler — priority admission / max in-flight requests to Ollama
+  - OllamaPool — per-model routing over several Ollama endpoints
+  - keep_alive / PromptPrefixCache — stable system prefix, optional primed context
   - embed() — text embedding via embed model
+  - embed_many() — batched embeddings, one request per embed_batch_size texts
   - is_available() — lightweight availability ping
-  - Per-tick LLM budget enforced via calls_this_tick counter
+  - Per-tick LLM budget enforced via calls_this_tick counter; prefetch drafts
+    (next_tick_budget()) are counted in calls_next_tick and carried over
   - Retry logic with exponential backoff for transient failures
   - Circuit breaker pattern for cascading failure prevention
   - LLM response cache (5-10x speedup for repeated prompts)
   - Rate limiting (token bucket) to prevent overload
   - Prometheus metrics for full observability
+  - Tracing — chat() / embed() are llm.* spans when a tick trace is open
 
 Changelog:
   TD-006 fix — added retry logic with exponential backoff for reliability.
@@ -19,21 +27,61 @@ Changelog:
   TD-021 fix — added LLM response cache for performance.
   TD-015 fix — added rate limiter to prevent overload.
   TD-013 fix — integrated Prometheus metrics for observability.
+  Perf — LLMCache is tiered (memory + SQLite), keyed on normalized prompts.
+  Perf — SingleFlight: identical concurrent chat/embed calls share one request.
+  Perf — embed_many(): list input to /api/embed instead of N single calls.
+  Perf — EmbeddingCache: persistent text-hash → vector cache for embed paths.
+  Perf — chat_stream()/chat_until(): stop generation once the JSON answer closes.
+  Perf — call_profile: num_predict adapts to observed output length per call site.
+  Perf — LLMScheduler: requests wait for an Ollama slot by priority class.
+  Perf — OllamaPool: least-outstanding balancing, per-endpoint breakers, ejection.
+  Perf — keep_alive + prefix reuse: prompt-eval time saved is tracked per tick.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import time
-from typing import Any
+from pathlib import Path
+from typing import Any, Iterable, Iterator
 
-from core.circuit_breaker import CircuitBreaker, CircuitBreakerOpen, get_registry
+from core.circuit_breaker import CircuitBreakerOpen
+from core.embedding_cache import DEFAULT_CAPACITY, EmbeddingCache, get_embedding_cache
 from core.llm_cache import LLMCache
+from core.llm_scheduler import LLMScheduler, SchedulerRejected, get_llm_scheduler
+from core.llm_stream import EarlyStop
+from core.ollama_pool import OllamaEndpoint, OllamaPool, get_ollama_pool
+from core.prompt_prefix import PRIME_PROMPT, PromptPrefixCache, get_prompt_prefix_cache
 from core.rate_limiter import MultiRateLimiter
 from core.metrics import get_metrics
+from core.single_flight import SingleFlight
+from core.token_budget import (
+    DEFAULT_PROFILE, TokenBudget, charged_to_next_tick, get_token_budget,
+)
+from core.tracing import annotate, traced
 
 log = logging.getLogger("digital_being.ollama_client")
 
+DEFAULT_EMBED_BATCH_SIZE = 32
+
+
+def text_hash(text: str) -> str:
+    """Content hash used to dedupe / coalesce embedding inputs."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_embedding_cache(cfg: dict, embed_model: str) -> EmbeddingCache | None:
+    """EmbeddingCache from `cache.embeddings` in config.yaml, or None if disabled."""
+    emb_cfg = cfg.get("cache", {}).get("embeddings", {})
+    if not emb_cfg.get("enabled", False):
+        return None
+    return get_embedding_cache(
+        Path(emb_cfg.get("path", "memory/embeddings")),
+        embed_model,
+        int(emb_cfg.get("capacity", DEFAULT_CAPACITY)),
+    )
+
 
 class OllamaClient:
     """
@@ -50,8 +98,15 @@ class OllamaClient:
         ollama_cfg = cfg.get("ollama", {})
         self._strategy_model: str  = ollama_cfg.get("strategy_model", "llama3.2")
         self._embed_model:    str  = ollama_cfg.get("embed_model", "nomic-embed-text")
-        self._base_url:       str  = ollama_cfg.get("base_url", "http://localhost:11434")
         self._timeout:        int  = int(ollama_cfg.get("timeout_sec", 30))
+        # Keep models loaded between ticks (None = Ollama's default, 5m)
+        keep_alive = ollama_cfg.get("keep_alive")
+        self._keep_alive_kw: dict[str, Any] = (
+            {"keep_alive": keep_alive} if keep_alive is not None else {}
+        )
+        self._embed_batch_size: int = max(
+            1, int(ollama_cfg.get("embed_batch_size", DEFAULT_EMBED_BATCH_SIZE))
+        )
         self._max_calls:      int  = int(
             cfg.get("resources", {}).get("budget", {}).get("max_llm_calls", 3)
         )
@@ -59,22 +114,30 @@ class OllamaClient:
         self._base_delay:     float = 1.0  # TD-006: initial backoff delay
 
         self.calls_this_tick: int = 0
+        self.calls_next_tick: int = 0   # prefetch calls made ahead of the next tick
 
-        # TD-016: Circuit breaker for Ollama
-        self._circuit_breaker = CircuitBreaker(
-            name="ollama",
-            failure_threshold=5,
-            recovery_timeout=30.0,
-            success_threshold=2,
-        )
-        get_registry().register(self._circuit_breaker)
+        # TD-016: Endpoint pool — one circuit breaker per Ollama instance
+        self._pool: OllamaPool = get_ollama_pool(cfg)
 
         # TD-021: LLM response cache
-        cache_cfg = cfg.get("cache", {})
-        self._cache = LLMCache(
-            max_size=cache_cfg.get("max_size", 100),
-            ttl_seconds=cache_cfg.get("ttl_seconds", 300.0),
-        )
+        # Tiered: in-memory LRU in front of an optional SQLite store;
+        # semantic near-duplicate lookup embeds prompts via self.embed
+        self._cache = LLMCache.from_config(cfg.get("cache", {}), embed_fn=self.embed)
+
+        # Coalesce identical in-flight chat/embed calls (one Ollama request)
+        self._inflight = SingleFlight()
+
+        # Persistent embedding cache (shared with the async client per model)
+        self.embedding_cache = make_embedding_cache(cfg, self._embed_model)
+
+        # Per-call-site generation limits and token accounting
+        self.token_budget: TokenBudget = get_token_budget(cfg)
+
+        # Stable-prefix reuse: prompt-eval accounting, primed contexts
+        self.prompt_prefix: PromptPrefixCache = get_prompt_prefix_cache(cfg)
+
+        # Priority admission in front of Ollama (shared with the async client)
+        self._scheduler: LLMScheduler = get_llm_scheduler(cfg)
 
         # TD-015: Rate limiter
         rate_cfg = cfg.get("rate_limit", {})
@@ -98,13 +161,16 @@ class OllamaClient:
         try:
             import ollama as _ollama
             self._ollama = _ollama
-            # Point the client at the configured host
-            self._client = _ollama.Client(host=self._base_url)
+            # One library client per endpoint; the first one doubles as default
+            self._clients: dict[str, Any] = {
+                ep.url: _ollama.Client(host=ep.url) for ep in self._pool.endpoints
+            }
+            self._client = self._clients[self._pool.endpoints[0].url]
             log.info(
                 f"OllamaClient initialised. "
                 f"strategy={self._strategy_model} "
                 f"embed={self._embed_model} "
-                f"host={self._base_url} "
+                f"hosts={','.join(ep.url for ep in self._pool.endpoints)} "
                 f"max_retries={self._max_retries} "
                 f"circuit_breaker=enabled "
                 f"cache=enabled "
@@ -113,6 +179,7 @@ class OllamaClient:
             )
         except ImportError:
             self._ollama = None  # type: ignore[assignment]
+            self._clients = {}
             self._client = None
             log.warning(
                 "OllamaClient: `ollama` package not installed. "
@@ -123,23 +190,56 @@ class OllamaClient:
     # Budget
     # ────────────────────────────────────────────────────────────
     def reset_tick_counter(self) -> None:
-        """Call at the start of each Heavy Tick."""
-        self.calls_this_tick = 0
+        """Call at the start of each Heavy Tick (prefetch calls are carried over)."""
+        self.calls_this_tick, self.calls_next_tick = self.calls_next_tick, 0
 
     def _check_budget(self) -> bool:
         """Return True if another call is allowed. Logs if exhausted."""
-        if self.calls_this_tick >= self._max_calls:
+        ahead = charged_to_next_tick()
+        used = self.calls_next_tick if ahead else self.calls_this_tick
+        if used >= self._max_calls:
             log.warning(
                 f"LLM budget exhausted "
-                f"({self.calls_this_tick}/{self._max_calls} calls this tick). "
+                f"({used}/{self._max_calls} calls {'next' if ahead else 'this'} tick). "
                 f"Request denied."
             )
             return False
         return True
 
+    def _charge_call(self) -> None:
+        if charged_to_next_tick():
+            self.calls_next_tick += 1
+        else:
+            self.calls_this_tick += 1
+
+    def _refund_call(self) -> None:
+        # A prefetch call may fail after reset_tick_counter() carried it over
+        if charged_to_next_tick() and self.calls_next_tick > 0:
+            self.calls_next_tick -= 1
+        else:
+            self.calls_this_tick = max(0, self.calls_this_tick - 1)
+
+    def _cache_variant(self, call_profile: str | None) -> str:
+        """Cache / single-flight variant: the same prompt to another model or profile differs."""
+        return f"{self._strategy_model}:{call_profile or DEFAULT_PROFILE}"
+
+    def _client_for(self, ep: OllamaEndpoint) -> Any:
+        """Library client bound to endpoint ep."""
+        return self._clients.get(ep.url, self._client)
+
     # ────────────────────────────────────────────────────────────
     # Retry helper
     # ────────────────────────────────────────────────────────────
+    def _scheduled_call(self, priority, model: str, fn):
+        """
+        One attempt: wait for an Ollama slot, then call through the endpoint pool.
+        
+        The slot is taken per attempt, never around the retry loop, so backoff
+        sleeps neither hold a max_in_flight slot nor count as service time.
+        """
+        with self._scheduler.slot(priority):
+            return self._pool.call(model, fn)
+
     def _retry_with_backoff(self, operation, context: str):
         """
         Execute operation with retry logic and exponential backoff.
@@ -157,6 +257,8 @@ class OllamaClient:
         for attempt in range(self._max_retries):
             try:
                 return operation()
+            except (CircuitBreakerOpen, SchedulerRejected):
+                raise   # no endpoint left to try / not admitted
             except Exception as e:
                 last_exception = e
                 
@@ -189,11 +291,13 @@ class OllamaClient:
     # ────────────────────────────────────────────────────────────
     # Core methods
     # ────────────────────────────────────────────────────────────
-    def chat(self, prompt: str, system: str = "") -> str:
+    @traced("llm.chat")
+    def chat(self, prompt: str, system: str = "", call_profile: str | None = None) -> str:
         """
         Send a chat request to the strategy model.
         Returns the response text, or "" on any error.
         Counts against the per-tick budget.
+        call_profile selects num_predict and the token-usage bucket (TokenBudget).
         Protected by: rate limiter → cache → circuit breaker → retry logic.
         All operations tracked in Prometheus metrics.
         """
@@ -205,6 +309,10 @@ class OllamaClient:
         start_time = time.time()
         cached = False
         success = False
+        annotate(
+            model=self._strategy_model, profile=call_profile,
+            prompt_chars=len(system) + len(prompt),
+        )
 
         try:
             # TD-015: Check rate limit first
@@ -222,43 +330,70 @@ class OllamaClient:
             ).inc()
 
             # TD-021: Check cache
-            cached_response = self._cache.get(prompt, system)
+            variant = self._cache_variant(call_profile)
+            cached_response = self._cache.get(prompt, system, variant)
             if cached_response is not None:
                 log.debug(f"Cache HIT for chat prompt (len={len(prompt)})")
                 cached = True
                 success = True
                 self._metrics.record_cache_hit("llm")
+                annotate(cache="hit")
                 return cached_response
             
             self._metrics.record_cache_miss("llm")
+            annotate(cache="miss")
 
             messages: list[dict[str, str]] = []
             if system:
                 messages.append({"role": "system", "content": system})
             messages.append({"role": "user", "content": prompt})
 
-            self.calls_this_tick += 1
-            
+            num_predict = self.token_budget.num_predict(call_profile)
+            priority = self._scheduler.priority_for(call_profile)
+
             def _do_chat_with_retry():
-                def _do_chat():
-                    response = self._client.chat(
-                        model=self._strategy_model,
-                        messages=messages,
-                        options={"num_predict": 512},
-                    )
-                    return response["message"]["content"]
+                def _do_chat(ep: OllamaEndpoint):
+                    if system and self.prompt_prefix.uses_context(call_profile):
+                        response = self._generate_in_context(ep, system, prompt, num_predict)
+                        content = response["response"]
+                    else:
+                        response = self._client_for(ep).chat(
+                            model=self._strategy_model,
+                            messages=messages,
+                            options={"num_predict": num_predict},
+                            **self._keep_alive_kw,
+                        )
+                        content = response["message"]["content"]
+                    self._record_tokens(call_profile, response, system, prompt, content)
+                    return content
                 
-                return self._retry_with_backoff(_do_chat, "chat")
-            
-            # TD-016: Wrap in circuit breaker
-            text = self._circuit_breaker.call(_do_chat_with_retry)
+                # Each attempt picks an endpoint (failover on retry)
+                return self._retry_with_backoff(
+                    lambda: self._scheduled_call(priority, self._strategy_model, _do_chat), "chat"
+                )
             
+            def _call_once() -> str | None:
+                # Only the single-flight leader spends budget and fills the cache
+                self._charge_call()
+                try:
+                    # TD-016: endpoint breakers; each attempt waits for its own slot
+                    result = _do_chat_with_retry()
+                except Exception:
+                    self._refund_call()
+                    raise
+                if result is None:
+                    self._refund_call()
+                    return None
+                self._cache.set(prompt, system, result, variant)
+                return result
+
+            text, shared = self._inflight.do(
+                ("chat", self._cache.key_for(prompt, system, variant)), _call_once
+            )
+            if shared:
+                annotate(coalesced=True)
             if text is None:
-                self.calls_this_tick -= 1
                 return ""
-            
-            # Cache the response
-            self._cache.set(prompt, system, text)
             success = True
             
             log.debug(
@@ -269,12 +404,13 @@ class OllamaClient:
             
         except CircuitBreakerOpen as e:
             log.warning(f"OllamaClient.chat() blocked by circuit breaker: {e}")
-            self.calls_this_tick -= 1
+            return ""
+        except SchedulerRejected as e:
+            log.warning(f"OllamaClient.chat() not scheduled: {e}")
             return ""
         except Exception as e:
             log.error(f"OllamaClient.chat() failed: {e}")
             self._metrics.record_error("ollama", type(e).__name__)
-            self.calls_this_tick -= 1
             return ""
         finally:
             # TD-013: Record metrics
@@ -287,13 +423,231 @@ class OllamaClient:
                 cached=cached
             )
 
+    def chat_stream(
+        self,
+        prompt: str,
+        system: str = "",
+        stop: EarlyStop | None = None,
+        call_profile: str | None = None,
+    ) -> Iterator[str]:
+        """
+        Streamed chat(): yields response chunks as Ollama produces them.
+
+        If `stop` is given, every chunk is fed to it and the HTTP stream is
+        closed as soon as stop.feed() reports completion — Ollama then stops
+        generating. Closing the generator early has the same effect.
+
+        Same protections as chat() except retry and single-flight: a stream
+        that already yielded text cannot be replayed or shared.
+        Complete responses (and completed JSON objects) go to the cache;
+        a cache hit is yielded as a single chunk.
+        """
+        if self._client is None:
+            return
+        if not self._check_budget():
+            return
+
+        start_time = time.time()
+        cached = False
+        success = False
+        spent = False
+        parts: list[str] = []
+
+        try:
+            if not self._rate_limiters.acquire("chat"):
+                log.warning("Chat rate limit exceeded - stream blocked")
+                self._metrics.rate_limit_requests_total.labels(
+                    limiter="chat",
+                    status="rejected"
+                ).inc()
+                return
+
+            self._metrics.rate_limit_requests_total.labels(
+                limiter="chat",
+                status="accepted"
+            ).inc()
+
+            variant = self._cache_variant(call_profile)
+            cached_response = self._cache.get(prompt, system, variant)
+            if cached_response is not None:
+                cached = True
+                success = True
+                self._metrics.record_cache_hit("llm")
+                if stop is not None:
+                    stop.feed(cached_response)
+                yield cached_response
+                return
+
+            self._metrics.record_cache_miss("llm")
+
+            messages: list[dict[str, str]] = []
+            if system:
+                messages.append({"role": "system", "content": system})
+            messages.append({"role": "user", "content": prompt})
+
+            self._charge_call()
+            spent = True
+            last: Any = {}
+            with self._scheduler.slot(self._scheduler.priority_for(call_profile)), \
+                    self._pool.stream(self._strategy_model) as ep:
+                stream = self._client_for(ep).chat(
+                    model=self._strategy_model,
+                    messages=messages,
+                    options={"num_predict": self.token_budget.num_predict(call_profile)},
+                    stream=True,
+                    **self._keep_alive_kw,
+                )
+                try:
+                    for part in stream:
+                        last = part
+                        chunk = part["message"]["content"]
+                        if not chunk:
+                            continue
+                        parts.append(chunk)
+                        yield chunk
+                        if stop is not None and stop.feed(chunk):
+                            break
+                finally:
+                    close = getattr(stream, "close", None)
+                    if close is not None:
+                        close()
+            success = True
+            # Only the final chunk carries eval counts; early-stopped streams are estimated
+            self._record_tokens(call_profile, last, system, prompt, "".join(parts))
+
+            if stop is None or not stop.done:
+                self._cache.set(prompt, system, "".join(parts), variant)
+            elif stop.reason == "json":
+                # A closed JSON object is the whole answer the prompt asked for
+                self._cache.set(prompt, system, stop.text(), variant)
+
+            log.debug(
+                f"chat_stream() call {self.calls_this_tick}/{self._max_calls}: "
+                f"{sum(len(p) for p in parts)} chars"
+                f"{f' (early stop: {stop.reason})' if stop is not None and stop.done else ''}."
+            )
+
+        except GeneratorExit:
+            # Consumer stopped reading — not an error
+            success = True
+            raise
+        except CircuitBreakerOpen as e:
+            if spent and not parts:
+                self._refund_call()
+            log.warning(f"OllamaClient.chat_stream() blocked by circuit breaker: {e}")
+        except SchedulerRejected as e:
+            if spent and not parts:
+                self._refund_call()
+            log.warning(f"OllamaClient.chat_stream() not scheduled: {e}")
+        except Exception as e:
+            if spent and not parts:
+                self._refund_call()
+            log.error(f"OllamaClient.chat_stream() failed: {e}")
+            self._metrics.record_error("ollama", type(e).__name__)
+        finally:
+            self._metrics.record_llm_call(
+                model=self._strategy_model,
+                operation="chat_stream",
+                duration=time.time() - start_time,
+                success=success,
+                cached=cached
+            )
+
+    def chat_until(
+        self,
+        prompt: str,
+        system: str = "",
+        json_object: bool = True,
+        stop_patterns: Iterable[str] | None = None,
+        call_profile: str | None = None,
+    ) -> str:
+        """
+        chat() that stops generating once the answer is complete.
+
+        By default stops after the first balanced JSON object and returns
+        just that object. Returns "" on any error (like chat()).
+        """
+        stop = EarlyStop(json_object=json_object, stop_patterns=stop_patterns)
+        for _ in self.chat_stream(prompt, system, stop=stop, call_profile=call_profile):
+            pass
+        return stop.text()
+
+    def _generate_in_context(
+        self, ep: OllamaEndpoint, system: str, prompt: str, num_predict: int
+    ) -> Any:
+        """
+        "context" mode: /api/generate continuing from the primed system prefix.
+        The prefix is primed once per change (and per endpoint/model).
+        """
+        client = self._client_for(ep)
+        context = self.prompt_prefix.context_for(ep.url, self._strategy_model, system)
+        if context is None:
+            primed = client.generate(
+                model=self._strategy_model,
+                system=system,
+                prompt=PRIME_PROMPT,
+                options={"num_predict": 1},
+                **self._keep_alive_kw,
+            )
+            context = primed.get("context") or []
+            self.prompt_prefix.store_context(ep.url, self._strategy_model, system, context)
+        if not context:
+            # Server returned no context — plain generate with the prefix
+            return client.generate(
+                model=self._strategy_model,
+                system=system,
+                prompt=prompt,
+                options={"num_predict": num_predict},
+                **self._keep_alive_kw,
+            )
+        return client.generate(
+            model=self._strategy_model,
+            prompt=prompt,
+            context=context,
+            options={"num_predict": num_predict},
+            **self._keep_alive_kw,
+        )
+
+    def _record_tokens(
+        self,
+        call_profile: str | None,
+        response: Any,
+        system: str,
+        prompt: str,
+        output: str,
+    ) -> None:
+        """Account a completed call; Ollama's own counts win over the estimate."""
+        try:
+            prompt_tokens = response.get("prompt_eval_count") if response else None
+            output_tokens = response.get("eval_count") if response else None
+        except Exception:
+            prompt_tokens = output_tokens = None
+        prompt_tokens = prompt_tokens or self.token_budget.estimate(system + prompt)
+        output_tokens = output_tokens or self.token_budget.estimate(output)
+        self.token_budget.record(
+            call_profile, prompt_tokens, output_tokens, model=self._strategy_model,
+        )
+        self.prompt_prefix.record(call_profile, system, response)
+        annotate(prompt_tokens=prompt_tokens, output_tokens=output_tokens)
+
+    @traced("llm.embed")
     def embed(self, text: str) -> list[float]:
         """
         Get text embedding via the embed model.
         Returns [] on any error (no budget check — embeddings are cheap).
-        Protected by: rate limiter → circuit breaker → retry logic.
+        Protected by: embedding cache → rate limiter → circuit breaker → retry logic.
         All operations tracked in Prometheus metrics.
         """
+        annotate(model=self._embed_model, text_chars=len(text))
+        if self.embedding_cache is not None:
+            cached_vec = self.embedding_cache.get(text)
+            if cached_vec is not None:
+                self._metrics.record_cache_hit("embedding")
+                annotate(cache="hit")
+                return cached_vec
+            self._metrics.record_cache_miss("embedding")
+            annotate(cache="miss")
+
         if self._client is None:
             return []
         
@@ -316,24 +670,36 @@ class OllamaClient:
             ).inc()
             
             def _do_embed_with_retry():
-                def _do_embed():
-                    response = self._client.embed(
+                def _do_embed(ep: OllamaEndpoint):
+                    response = self._client_for(ep).embed(
                         model=self._embed_model,
                         input=text,
+                        **self._keep_alive_kw,
                     )
                     vectors: list[list[float]] = response.get("embeddings", [])
                     return vectors[0] if vectors else []
                 
-                return self._retry_with_backoff(_do_embed, "embed")
+                return self._retry_with_backoff(
+                    lambda: self._scheduled_call(priority, self._embed_model, _do_embed), "embed"
+                )
             
-            # TD-016: Wrap in circuit breaker
-            result = self._circuit_breaker.call(_do_embed_with_retry)
+            priority = self._scheduler.priority_for()
+
+            # TD-016: endpoint breakers; identical texts share one call
+            result, shared = self._inflight.do(("embed", text_hash(text)), _do_embed_with_retry)
+            if shared:
+                annotate(coalesced=True)
             success = result is not None and len(result) > 0
+            if success and self.embedding_cache is not None:
+                self.embedding_cache.put(text, result)
             return result if result is not None else []
             
         except CircuitBreakerOpen as e:
             log.warning(f"OllamaClient.embed() blocked by circuit breaker: {e}")
             return []
+        except SchedulerRejected as e:
+            log.warning(f"OllamaClient.embed() not scheduled: {e}")
+            return []
         except Exception as e:
             log.error(f"OllamaClient.embed() failed: {e}")
             self._metrics.record_error("ollama", type(e).__name__)
@@ -349,32 +715,143 @@ class OllamaClient:
                 cached=False
             )
 
+    def embed_many(self, texts: list[str], batch_size: int | None = None) -> list[list[float]]:
+        """
+        Embed many texts with one /api/embed request per batch_size texts.
+        Returns one vector per input, in order; [] for any item that failed.
+        Identical texts are sent once. If a whole batch fails, its items are
+        retried one by one via embed() so a single bad input does not sink
+        the rest.
+        """
+        results: list[list[float]] = [[] for _ in texts]
+        if not texts:
+            return results
+
+        size = max(1, batch_size or self._embed_batch_size)
+        positions: dict[str, list[int]] = {}
+        unique: list[tuple[str, str]] = []
+        for i, text in enumerate(texts):
+            key = text_hash(text)
+            if key not in positions:
+                positions[key] = []
+                unique.append((key, text))
+            positions[key].append(i)
+
+        # Embedding cache hits never reach Ollama
+        misses: list[tuple[str, str]] = []
+        for key, text in unique:
+            cached_vec = (
+                self.embedding_cache.get(text) if self.embedding_cache is not None else None
+            )
+            if cached_vec is None:
+                misses.append((key, text))
+                continue
+            for i in positions[key]:
+                results[i] = cached_vec
+
+        if self._client is None:
+            return results
+
+        for start in range(0, len(misses), size):
+            chunk = misses[start:start + size]
+            vectors = self._embed_chunk([text for _, text in chunk])
+            if vectors is None:
+                vectors = [self.embed(text) for _, text in chunk]
+            for (key, text), vec in zip(chunk, vectors):
+                if vec and self.embedding_cache is not None:
+                    self.embedding_cache.put(text, vec)
+                for i in positions[key]:
+                    results[i] = vec
+        return results
+
+    def _embed_chunk(self, chunk: list[str]) -> list[list[float]] | None:
+        """One batched /api/embed call. Returns None if the batch failed."""
+        start_time = time.time()
+        success = False
+        try:
+            if not self._rate_limiters.acquire("embed"):
+                log.warning("Embed rate limit exceeded - batch blocked")
+                self._metrics.rate_limit_requests_total.labels(
+                    limiter="embed",
+                    status="rejected"
+                ).inc()
+                return None
+
+            self._metrics.rate_limit_requests_total.labels(
+                limiter="embed",
+                status="accepted"
+            ).inc()
+
+            def _do_embed(ep: OllamaEndpoint):
+                response = self._client_for(ep).embed(
+                    model=self._embed_model,
+                    input=chunk,
+                    **self._keep_alive_kw,
+                )
+                return response.get("embeddings", [])
+
+            vectors = self._retry_with_backoff(
+                lambda: self._scheduled_call(None, self._embed_model, _do_embed), "embed_many"
+            )
+            if vectors is None or len(vectors) != len(chunk):
+                log.warning(
+                    f"embed_many(): batch of {len(chunk)} returned "
+                    f"{0 if vectors is None else len(vectors)} vectors — falling back."
+                )
+                return None
+            success = True
+            return vectors
+
+        except CircuitBreakerOpen as e:
+            log.warning(f"OllamaClient.embed_many() blocked by circuit breaker: {e}")
+            return [[] for _ in chunk]
+        except SchedulerRejected as e:
+            log.warning(f"OllamaClient.embed_many() not scheduled: {e}")
+            return [[] for _ in chunk]
+        except Exception as e:
+            log.error(f"OllamaClient.embed_many() batch failed: {e}")
+            self._metrics.record_error("ollama", type(e).__name__)
+            return None
+        finally:
+            self._metrics.record_llm_call(
+                model=self._embed_model,
+                operation="embed_batch",
+                duration=time.time() - start_time,
+                success=success,
+                cached=False
+            )
+
     def is_available(self) -> bool:
         """
-        Quick health check — list local models.
-        Returns False if Ollama is unreachable or package missing.
+        Quick health check — list local models on every endpoint.
+        Failed endpoints are ejected from the pool, recovered ones readmitted.
+        Returns True if the strategy model has a routable endpoint;
+        False if Ollama is unreachable or package missing.
         Does NOT use circuit breaker (used BY circuit breaker for health checks).
         """
         if self._client is None:
             return False
-        try:
-            self._client.list()     # lightweight endpoint
+
+        def _probe(ep: OllamaEndpoint) -> bool:
+            self._client_for(ep).list()     # lightweight endpoint
             return True
-        except Exception as e:
-            log.warning(f"Ollama unavailable: {e}")
-            return False
+
+        results = self._pool.check(_probe)
+        if not any(results.values()):
+            log.warning(f"Ollama unavailable: {self._pool.get_stats()}")
+        return self._pool.is_routable(self._strategy_model)
     
     # ────────────────────────────────────────────────────────────
     # Monitoring
     # ────────────────────────────────────────────────────────────
     
     def get_circuit_state(self) -> str:
-        """Получить состояние circuit breaker."""
-        return self._circuit_breaker.get_state()
+        """Получить состояние circuit breakers для strategy model."""
+        return self._pool.get_state(self._strategy_model)
     
     def get_circuit_stats(self) -> dict:
-        """Получить статистику circuit breaker."""
-        return self._circuit_breaker.get_stats()
+        """Получить статистику endpoints и их circuit breakers."""
+        return self._pool.get_stats()
     
     def get_cache_stats(self) -> dict:
         """Получить статистику cache."""
@@ -390,8 +867,16 @@ class OllamaClient:
             "circuit_breaker": self.get_circuit_stats(),
             "cache": self.get_cache_stats(),
             "rate_limiters": self.get_rate_limiter_stats(),
+            "token_budget": self.token_budget.get_stats(),
+            "prompt_prefix": self.prompt_prefix.get_stats(),
+            "scheduler": self._scheduler.get_stats(),
+            "single_flight": self._inflight.get_stats(),
+            "embedding_cache": (
+                self.embedding_cache.get_stats() if self.embedding_cache is not None else {}
+            ),
             "budget": {
                 "calls_this_tick": self.calls_this_tick,
+                "calls_next_tick": self.calls_next_tick,
                 "max_calls": self._max_calls,
                 "remaining": self._max_calls - self.calls_this_tick,
             },
@@ -0,0 +1,275 @@
+"""
+Digital Being — Ollama endpoint pool
+Routes each model to the Ollama instances that serve it.
+
+Design rules:
+  - ollama.endpoints lists instances and the models each one serves
+    (no `models` = serves everything); without it the pool is just base_url
+  - Each request goes to the routable endpoint with the fewest outstanding
+    requests (ties: fewest requests so far), counted across sync and async clients
+  - Every endpoint has its own CircuitBreaker, registered in the global
+    CircuitBreakerRegistry as "ollama@<url>"
+  - Health-based ejection: a failed health probe takes the endpoint out of
+    rotation for eject_seconds; a passing probe puts it back
+  - No routable endpoint → NoEndpointAvailable (a CircuitBreakerOpen),
+    so callers handle it exactly like an open breaker
+
+Пример:
+    pool = get_ollama_pool(cfg)
+    text = pool.call("llama3.2:3b", lambda ep: clients[ep.url].chat(...))
+    vec  = await pool.call_async("nomic-embed-text", lambda ep: post(ep.url, ...))
+    with pool.stream("llama3.2:3b") as ep:
+        ...
+
+config.yaml:
+    ollama:
+      endpoints:
+        - {url: "http://127.0.0.1:11434", models: ["nomic-embed-text"]}
+        - {url: "http://127.0.0.1:11435", models: ["llama3.2:3b"]}
+        - {url: "http://127.0.0.1:11436", models: ["llama3.2:3b"]}
+      eject_seconds: 30
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterable, Iterator, TypeVar
+
+from core.circuit_breaker import CircuitBreaker, CircuitBreakerOpen, get_registry
+
+log = logging.getLogger("digital_being.ollama_pool")
+
+T = TypeVar("T")
+
+DEFAULT_BASE_URL = "http://localhost:11434"
+DEFAULT_EJECT_SECONDS = 30.0
+
+
+class NoEndpointAvailable(CircuitBreakerOpen):
+    """Every endpoint serving the model is ejected or has an open breaker."""
+
+
+class OllamaEndpoint:
+    """One Ollama instance: URL, served models, breaker and load counters."""
+
+    def __init__(
+        self,
+        url: str,
+        models: Iterable[str] = (),
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ) -> None:
+        self.url = url.rstrip("/")
+        self.models = frozenset(models)
+        self.breaker = CircuitBreaker(
+            name=f"ollama@{self.url}",
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            success_threshold=2,
+        )
+        self.outstanding = 0
+        self.requests = 0
+        self.ejected_until = 0.0
+        self.last_error = ""
+
+    def serves(self, model: str) -> bool:
+        return not self.models or model in self.models
+
+    def is_ejected(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.monotonic()) < self.ejected_until
+
+    def is_routable(self, now: float | None = None) -> bool:
+        return not self.is_ejected(now) and self.breaker.allows_request()
+
+    def get_stats(self) -> dict:
+        return {
+            "models": sorted(self.models) or ["*"],
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "ejected": self.is_ejected(),
+            "last_error": self.last_error,
+            "circuit_breaker": self.breaker.get_state(),
+        }
+
+
+class OllamaPool:
+    """Least-outstanding-requests balancer over OllamaEndpoint's. Thread-safe."""
+
+    def __init__(
+        self,
+        endpoints: list[OllamaEndpoint],
+        eject_seconds: float = DEFAULT_EJECT_SECONDS,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("OllamaPool needs at least one endpoint")
+        self.endpoints = list(endpoints)
+        self._eject_seconds = float(eject_seconds)
+        self._lock = threading.Lock()
+        for ep in self.endpoints:
+            get_registry().register(ep.breaker)
+
+    @staticmethod
+    def _spec(cfg: dict) -> tuple[tuple[tuple[str, tuple[str, ...]], ...], float]:
+        """(endpoints, eject_seconds) from the `ollama` config section."""
+        ollama_cfg = cfg.get("ollama", {}) or {}
+        raw = ollama_cfg.get("endpoints") or [
+            {"url": ollama_cfg.get("base_url", DEFAULT_BASE_URL)}
+        ]
+        endpoints = []
+        for item in raw:
+            if isinstance(item, str):
+                item = {"url": item}
+            endpoints.append(
+                (str(item["url"]).rstrip("/"), tuple(sorted(item.get("models") or ())))
+            )
+        eject = float(ollama_cfg.get("eject_seconds", DEFAULT_EJECT_SECONDS))
+        return tuple(endpoints), eject
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "OllamaPool":
+        endpoints, eject = cls._spec(cfg)
+        return cls([OllamaEndpoint(url, models) for url, models in endpoints], eject)
+
+    # ────────────────────────────────────────────────────────────
+    # Routing
+    # ────────────────────────────────────────────────────────────
+    def routes(self, model: str) -> list[OllamaEndpoint]:
+        """All endpoints configured for model, healthy or not."""
+        return [ep for ep in self.endpoints if ep.serves(model)]
+
+    def _select(self, model: str) -> OllamaEndpoint:
+        now = time.monotonic()
+        candidates = [ep for ep in self.routes(model) if ep.is_routable(now)]
+        if not candidates:
+            raise NoEndpointAvailable(f"No healthy Ollama endpoint for model '{model}'")
+        return min(candidates, key=lambda ep: (ep.outstanding, ep.requests))
+
+    @contextmanager
+    def lease(self, model: str) -> Iterator[OllamaEndpoint]:
+        """Pick an endpoint for model and count the request as outstanding on it."""
+        with self._lock:
+            ep = self._select(model)
+            ep.outstanding += 1
+            ep.requests += 1
+        try:
+            yield ep
+        finally:
+            with self._lock:
+                ep.outstanding -= 1
+
+    def call(self, model: str, operation: Callable[[OllamaEndpoint], T]) -> T:
+        """Run operation(endpoint) on the least-loaded endpoint, through its breaker."""
+        with self.lease(model) as ep:
+            try:
+                return ep.breaker.call(lambda: operation(ep))
+            except CircuitBreakerOpen:
+                raise
+            except Exception as e:
+                ep.last_error = str(e)
+                raise
+
+    async def call_async(
+        self, model: str, operation: Callable[[OllamaEndpoint], Awaitable[T]]
+    ) -> T:
+        """Async call(): operation(endpoint) returns a coroutine."""
+        with self.lease(model) as ep:
+            try:
+                return await ep.breaker.call_async(lambda: operation(ep))
+            except CircuitBreakerOpen:
+                raise
+            except Exception as e:
+                ep.last_error = str(e)
+                raise
+
+    @contextmanager
+    def stream(self, model: str) -> Iterator[OllamaEndpoint]:
+        """lease() + breaker.guard() for streamed responses (works inside generators)."""
+        with self.lease(model) as ep, ep.breaker.guard():
+            yield ep
+
+    # ────────────────────────────────────────────────────────────
+    # Health
+    # ────────────────────────────────────────────────────────────
+    def mark_health(self, ep: OllamaEndpoint, healthy: bool, error: str = "") -> None:
+        """Record a health probe: failures eject the endpoint for eject_seconds."""
+        if healthy:
+            if ep.ejected_until:
+                log.info(f"OllamaPool: {ep.url} healthy again — back in rotation.")
+            ep.ejected_until = 0.0
+            return
+        if not ep.is_ejected():
+            log.warning(
+                f"OllamaPool: {ep.url} failed health check ({error or 'unreachable'}) — "
+                f"ejected for {self._eject_seconds:.0f}s."
+            )
+        ep.last_error = error
+        ep.ejected_until = time.monotonic() + self._eject_seconds
+
+    def check(self, probe: Callable[[OllamaEndpoint], bool]) -> dict[str, bool]:
+        """Probe every endpoint (probe may raise); returns {url: healthy}."""
+        results: dict[str, bool] = {}
+        for ep in self.endpoints:
+            try:
+                ok, error = bool(probe(ep)), ""
+            except Exception as e:
+                ok, error = False, str(e)
+            self.mark_health(ep, ok, error)
+            results[ep.url] = ok
+        return results
+
+    async def check_async(
+        self, probe: Callable[[OllamaEndpoint], Awaitable[bool]]
+    ) -> dict[str, bool]:
+        """Async check()."""
+        results: dict[str, bool] = {}
+        for ep in self.endpoints:
+            try:
+                ok, error = bool(await probe(ep)), ""
+            except Exception as e:
+                ok, error = False, str(e)
+            self.mark_health(ep, ok, error)
+            results[ep.url] = ok
+        return results
+
+    def is_routable(self, model: str) -> bool:
+        """True if some endpoint could take a request for model now."""
+        now = time.monotonic()
+        return any(ep.is_routable(now) for ep in self.routes(model))
+
+    # ────────────────────────────────────────────────────────────
+    # Monitoring
+    # ────────────────────────────────────────────────────────────
+    def get_state(self, model: str) -> str:
+        """Breaker-style summary for model: closed | half_open (degraded) | open."""
+        routes = self.routes(model)
+        routable = [ep for ep in routes if ep.is_routable()]
+        if not routable:
+            return "open"
+        if len(routable) < len(routes) or any(
+            ep.breaker.get_state() != "closed" for ep in routable
+        ):
+            return "half_open"
+        return "closed"
+
+    def get_stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {ep.url: ep.get_stats() for ep in self.endpoints}
+
+
+# One pool per endpoint layout: sync and async clients share load and health
+_pools: dict[tuple, OllamaPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_ollama_pool(cfg: dict | None = None) -> OllamaPool:
+    """Получить общий OllamaPool для конфигурации endpoints."""
+    key = OllamaPool._spec(cfg or {})
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = OllamaPool.from_config(cfg or {})
+            _pools[key] = pool
+        return pool
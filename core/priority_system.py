@@ -6,6 +6,8 @@ from typing import Dict, Any, Optional, Callable, List
 from enum import Enum
 import logging
 
+from core.llm_context import llm_priority
+
 logger = logging.getLogger("digital_being.priority_system")
 
 
@@ -117,7 +119,9 @@ class PriorityExecutor:
         try:
             logger.info(f"[PriorityExecutor] Executing {priority.value} step '{step_name}' (timeout={timeout}s)")
             
-            result = await asyncio.wait_for(func(*args, **kwargs), timeout=timeout)
+            # LLM calls made by the step are scheduled with its priority and deadline
+            with llm_priority(priority, timeout):
+                result = await asyncio.wait_for(func(*args, **kwargs), timeout=timeout)
             
             execution_time = (time.time() - start_time) * 1000
             step_result = StepResult(
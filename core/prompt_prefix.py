@@ -0,0 +1,194 @@
+"""
+Digital Being — Prompt prefix reuse
+Stable-prefix / variable-suffix prompt layout and Ollama KV-cache reuse.
+
+Design rules:
+  - Heavy-tick prompts are split into a stable prefix — identity, self-model,
+    strategy, beliefs, output format — sent as the system message, and a
+    variable suffix — values, emotions, world, episodes, time — sent as the
+    user message. Consecutive calls then share a token prefix and Ollama
+    skips re-evaluating it (its runner keeps the KV cache of the last prompt)
+  - ollama.keep_alive keeps models loaded between ticks, so the cache survives
+  - mode "prefix" (default): plain /api/chat, relying on Ollama's prefix cache
+  - mode "context": for the listed profiles, the prefix is primed once per
+    change via /api/generate and the returned `context` is sent with every
+    later call (per endpoint and model; streams always use /api/chat)
+  - Prompt-eval time reported by Ollama is recorded per call as warm (same
+    prefix as the profile's previous call) or cold; the estimated saving
+    (cold average − warm actual) is summed per tick into metrics
+
+Пример:
+    system = join_sections(IDENTITY, self_model_ctx, strategy_ctx, beliefs_ctx)
+    prompt = join_sections(values_ctx, world_ctx, episodes_ctx, instructions)
+    text = await llm.chat(prompt, system, call_profile="monologue")
+
+config.yaml:
+    prompt_cache:
+      mode: prefix              # prefix | context
+      context_profiles: [monologue]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from core.metrics import get_metrics
+
+log = logging.getLogger("digital_being.prompt_prefix")
+
+MODES = ("prefix", "context")
+DEFAULT_MAX_CONTEXTS = 16
+_EWMA_ALPHA = 0.3
+
+# User turn of the priming request in "context" mode
+PRIME_PROMPT = "Запомни этот контекст. Ответь: ок."
+
+
+def join_sections(*sections: str) -> str:
+    """Join non-empty prompt sections with newlines (stable order, no blanks)."""
+    return "\n".join(s.strip("\n") for s in sections if s and s.strip())
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class PromptPrefixCache:
+    """
+    Tracks prefixes per call profile, primed contexts and prompt-eval savings.
+
+    Thread-safe: shared by the sync and async clients.
+    """
+
+    def __init__(
+        self,
+        mode: str = "prefix",
+        context_profiles: list[str] | None = None,
+        max_contexts: int = DEFAULT_MAX_CONTEXTS,
+    ) -> None:
+        if mode not in MODES:
+            log.warning(f"PromptPrefixCache: unknown mode '{mode}' — using 'prefix'.")
+            mode = "prefix"
+        self.mode = mode
+        self._context_profiles = set(context_profiles or ())
+        self._max_contexts = max(1, int(max_contexts))
+        self._contexts: OrderedDict[tuple[str, str, str], list[int]] = OrderedDict()
+
+        self._last_prefix: dict[str, str] = {}    # profile -> prefix digest
+        self._cold_avg: dict[str, float] = {}     # profile -> EWMA cold prompt eval, s
+        self._calls = {"warm": 0, "cold": 0}
+        self._saved_total = 0.0
+        self._saved_tick = 0.0
+        self._primes = 0
+        self._lock = threading.Lock()
+        self._metrics = get_metrics()
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "PromptPrefixCache":
+        """Build from the `prompt_cache` config section."""
+        section = cfg.get("prompt_cache", {}) or {}
+        return cls(
+            mode=str(section.get("mode", "prefix")).lower(),
+            context_profiles=section.get("context_profiles"),
+            max_contexts=section.get("max_contexts", DEFAULT_MAX_CONTEXTS),
+        )
+
+    # ────────────────────────────────────────────────────────────
+    # Context mode
+    # ────────────────────────────────────────────────────────────
+    def uses_context(self, call_profile: str | None) -> bool:
+        """True if this profile's calls go through a primed /api/generate context."""
+        if self.mode != "context":
+            return False
+        return not self._context_profiles or (call_profile in self._context_profiles)
+
+    def context_for(self, endpoint: str, model: str, prefix: str) -> list[int] | None:
+        """Primed context for prefix on endpoint/model, or None."""
+        key = (endpoint, model, _digest(prefix))
+        with self._lock:
+            ctx = self._contexts.get(key)
+            if ctx is not None:
+                self._contexts.move_to_end(key)
+            return ctx
+
+    def store_context(self, endpoint: str, model: str, prefix: str, context: list[int]) -> None:
+        """Remember the context returned by a priming request."""
+        if not context:
+            return
+        key = (endpoint, model, _digest(prefix))
+        with self._lock:
+            self._contexts[key] = list(context)
+            self._contexts.move_to_end(key)
+            self._primes += 1
+            while len(self._contexts) > self._max_contexts:
+                self._contexts.popitem(last=False)
+
+    # ────────────────────────────────────────────────────────────
+    # Measurement
+    # ────────────────────────────────────────────────────────────
+    def record(self, call_profile: str | None, prefix: str, response: Any) -> None:
+        """Account one completed call (response carries prompt_eval_duration, ns)."""
+        profile = call_profile or "default"
+        digest = _digest(prefix)
+        try:
+            duration_ns = response.get("prompt_eval_duration") if response else None
+        except Exception:
+            duration_ns = None
+
+        with self._lock:
+            warm = bool(prefix) and self._last_prefix.get(profile) == digest
+            self._last_prefix[profile] = digest
+            if duration_ns is None:
+                return
+            seconds = duration_ns / 1e9
+            self._calls["warm" if warm else "cold"] += 1
+            cold_avg = self._cold_avg.get(profile)
+            if not warm:
+                self._cold_avg[profile] = (
+                    seconds if cold_avg is None
+                    else cold_avg + _EWMA_ALPHA * (seconds - cold_avg)
+                )
+            elif cold_avg is not None:
+                saved = max(0.0, cold_avg - seconds)
+                self._saved_tick += saved
+                self._saved_total += saved
+        self._metrics.record_prompt_eval(profile, seconds, warm)
+
+    def end_tick(self) -> float:
+        """Flush this tick's estimated saving to metrics; returns it (seconds)."""
+        with self._lock:
+            saved, self._saved_tick = self._saved_tick, 0.0
+        self._metrics.record_prompt_eval_saved(saved)
+        if saved:
+            log.debug(f"PromptPrefixCache: prompt eval saved this tick ≈ {saved:.2f}s")
+        return saved
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "warm_calls": self._calls["warm"],
+                "cold_calls": self._calls["cold"],
+                "saved_total_sec": round(self._saved_total, 3),
+                "cold_avg_sec": {k: round(v, 3) for k, v in self._cold_avg.items()},
+                "primed_contexts": len(self._contexts),
+                "primes": self._primes,
+            }
+
+
+# Shared by all clients (first caller's config wins)
+_cache: PromptPrefixCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_prompt_prefix_cache(cfg: dict | None = None) -> PromptPrefixCache:
+    """Получить общий PromptPrefixCache (создаётся из cfg при первом вызове)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PromptPrefixCache.from_config(cfg or {})
+        return _cache
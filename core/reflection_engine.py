@@ -29,6 +29,8 @@ import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from core.token_budget import get_token_budget
+
 if TYPE_CHECKING:
     from core.emotion_engine import EmotionEngine
     from core.event_bus import EventBus
@@ -160,12 +162,24 @@ class ReflectionEngine:
         conflicts_text  = json.dumps(conflicts, ensure_ascii=False) if conflicts else "нет"
 
         # ── Step 2: LLM reflection ────────────────────────────────
+        # Material is trimmed to the "reflection" prompt budget
+        budget = get_token_budget()
+        ctx = budget.fit(
+            "reflection",
+            {
+                "actions": actions_summary,
+                "principles": principles_text,
+                "conflicts": conflicts_text,
+                "emotion": emotion_ctx,
+            },
+            reserved=budget.estimate(_SYSTEM_PROMPT + _USER_PROMPT_TMPL + values_summary),
+        )
         prompt = _USER_PROMPT_TMPL.format(
-            actions_summary=actions_summary,
-            principles=principles_text,
+            actions_summary=ctx["actions"],
+            principles=ctx["principles"],
             values_summary=values_summary,
-            conflicts=conflicts_text,
-            emotion_context=emotion_ctx or "нет данных",
+            conflicts=ctx["conflicts"] or "нет",
+            emotion_context=ctx["emotion"] or "нет данных",
             longterm_vector=longterm_vector,
         )
 
@@ -278,7 +292,8 @@ class ReflectionEngine:
     def _call_llm(self, prompt: str) -> dict:
         """Call OllamaClient, parse JSON. Returns empty dict on any failure."""
         try:
-            raw = self._ollama.chat(prompt, _SYSTEM_PROMPT)
+            # Streamed: generation stops as soon as the JSON object is closed
+            raw = self._ollama.chat_until(prompt, _SYSTEM_PROMPT, call_profile="reflection")
         except Exception as e:
             log.error(f"[ReflectionEngine] LLM call failed: {e}")
             return {}
@@ -7,6 +7,8 @@ import logging
 
 from core.circuit_breaker import CircuitBreaker
 from core.health_monitor import HealthMonitor, ComponentHealth
+from core.llm_backend import ExecutorBackend, LLMBackend
+from core.llm_scheduler import llm_priority
 
 logger = logging.getLogger("digital_being.resilient_ollama")
 
@@ -21,10 +23,17 @@ class ResilientOllamaClient:
     - Automatic retry
     - Latency tracking
     - Fallback on failures
+    - Awaits an LLMBackend (aiohttp or bounded executor) — never blocks the loop
     """
 
-    def __init__(self, ollama_client, health_monitor: Optional[HealthMonitor] = None):
+    def __init__(
+        self,
+        ollama_client,
+        health_monitor: Optional[HealthMonitor] = None,
+        backend: Optional[LLMBackend] = None,
+    ):
         self.ollama = ollama_client
+        self.backend = backend if backend is not None else ExecutorBackend(ollama_client)
         self.health_monitor = health_monitor
 
         # Circuit breakers for different operations
@@ -56,6 +65,8 @@ class ResilientOllamaClient:
         system: Optional[str] = None,
         timeout: int = 30,
         fallback: Optional[Any] = None,
+        json_object: bool = False,
+        call_profile: Optional[str] = None,
     ) -> Optional[str]:
         """
         Call Ollama chat with circuit breaker protection.
@@ -65,6 +76,8 @@ class ResilientOllamaClient:
             system: Optional system prompt
             timeout: Timeout in seconds
             fallback: Fallback value if call fails
+            json_object: Stream and stop once the first JSON object closes
+            call_profile: Token budget profile (num_predict, usage metrics)
 
         Returns:
             LLM response or fallback
@@ -73,14 +86,16 @@ class ResilientOllamaClient:
         self.total_calls += 1
 
         async def _call():
-            return await asyncio.wait_for(
-                self._ollama_chat(prompt, system),
-                timeout=timeout
-            )
+            # A request still queued in the LLM scheduler at the timeout is rejected
+            with llm_priority(None, timeout):
+                return await asyncio.wait_for(
+                    self._ollama_chat(prompt, system, json_object, call_profile),
+                    timeout=timeout
+                )
 
         try:
             # Call through circuit breaker without fallback parameter
-            result = await self.chat_breaker.call(_call)
+            result = await self.chat_breaker.call_async(_call)
 
             latency_ms = (time.time() - start_time) * 1000
             self.total_latency_ms += latency_ms
@@ -128,6 +143,13 @@ class ResilientOllamaClient:
         Returns:
             Embedding vector or fallback
         """
+        # Embedding cache hit: no backend call, no breaker accounting
+        cache = self.backend.embedding_cache
+        if cache is not None:
+            cached_vec = cache.get(text, count_miss=False)
+            if cached_vec is not None:
+                return cached_vec
+
         async def _call():
             return await asyncio.wait_for(
                 self._ollama_embed(text),
@@ -136,7 +158,7 @@ class ResilientOllamaClient:
 
         try:
             # Call through circuit breaker without fallback parameter
-            result = await self.embed_breaker.call(_call)
+            result = await self.embed_breaker.call_async(_call)
             return result
 
         except Exception as e:
@@ -147,45 +169,81 @@ class ResilientOllamaClient:
                 return fallback
             raise
 
-    async def _ollama_chat(self, prompt: str, system: Optional[str]) -> str:
+    async def embed_many(
+        self,
+        texts: list,
+        timeout: int = 60,
+        fallback: Optional[Any] = None,
+    ) -> Optional[list]:
         """
-        Internal wrapper for ollama.chat() to make it async-compatible.
+        Batched embeddings via OllamaClient.embed_many() (one request per batch).
+
+        Returns:
+            One vector per text ([] for failed items) or fallback
         """
-        loop = asyncio.get_running_loop()
+        async def _call():
+            return await asyncio.wait_for(
+                self.backend.embed_many(texts),
+                timeout=timeout
+            )
+
+        try:
+            return await self.embed_breaker.call_async(_call)
 
-        # Run synchronous ollama.chat in thread pool
-        result = await loop.run_in_executor(
-            None,
-            lambda: self.ollama.chat(prompt, system) if system else self.ollama.chat(prompt)
+        except Exception as e:
+            logger.error(f"[ResilientOllama] Embed batch failed: {e}")
+
+            if fallback is not None:
+                return fallback
+            raise
+
+    async def _ollama_chat(
+        self,
+        prompt: str,
+        system: Optional[str],
+        json_object: bool = False,
+        call_profile: Optional[str] = None,
+    ) -> str:
+        """
+        Internal wrapper: chat through the async backend.
+        """
+        return await self.backend.chat(
+            prompt, system or "", call_profile=call_profile, json_object=json_object
         )
-        return result
 
     async def _ollama_embed(self, text: str) -> list:
         """
-        Internal wrapper for ollama.embed() to make it async-compatible.
+        Internal wrapper: embed through the async backend.
         """
-        loop = asyncio.get_running_loop()
-
-        # Run synchronous ollama.embed in thread pool
-        result = await loop.run_in_executor(
-            None,
-            lambda: self.ollama.embed(text)
-        )
-        return result
+        return await self.backend.embed(text)
 
     def is_available(self) -> bool:
         """
-        Check if Ollama is available.
+        Check if Ollama is available (blocking ping — prefer is_available_async).
 
         Returns:
             True if available (circuit not OPEN)
         """
         from core.circuit_breaker import CircuitState
         return (
-            self.chat_breaker.get_state() != CircuitState.OPEN and
+            self.chat_breaker.get_state() != CircuitState.OPEN.value and
             self.ollama.is_available()
         )
 
+    async def is_available_async(self) -> bool:
+        """Awaitable is_available(): the ping goes through the backend."""
+        from core.circuit_breaker import CircuitState
+        if self.chat_breaker.get_state() == CircuitState.OPEN.value:
+            return False
+        return await self.backend.is_available()
+
+    def reset_tick_counter(self) -> None:
+        """Reset the per-tick LLM budget of the underlying clients."""
+        self.backend.reset_tick_counter()
+
+    async def close(self) -> None:
+        await self.backend.close()
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get client statistics.
@@ -210,6 +268,7 @@ class ResilientOllamaClient:
             "avg_latency_ms": round(avg_latency, 2),
             "chat_breaker": self.chat_breaker.get_stats(),
             "embed_breaker": self.embed_breaker.get_stats(),
+            "backend": self.backend.name,
         }
 
     def reset_breakers(self):
@@ -0,0 +1,146 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one execution: the first
+caller (the leader) runs the function, later callers wait for its result
+instead of issuing a duplicate request.
+
+Used by OllamaClient / AsyncOllamaClient so identical in-flight chat and
+embed calls hit Ollama once and land in LLMCache once.
+
+Пример:
+    flight = SingleFlight()
+    text, shared = flight.do(key, lambda: ollama.chat(prompt, system))
+
+    aflight = AsyncSingleFlight()
+    text, shared = await aflight.do(key, lambda: client.chat(prompt, system))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+log = logging.getLogger("digital_being.single_flight")
+
+
+class _Call:
+    """One in-flight execution shared by the leader and its followers."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Thread-based coalescing.
+
+    Exceptions raised by the leader are re-raised in every follower.
+    Nothing is remembered after the call completes — caching is LLMCache's job.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._executions = 0
+        self._shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """
+        Run fn once per concurrent key.
+
+        Returns:
+            (result, shared) — shared is True for followers
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+            else:
+                self._shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> dict:
+        return {
+            "executions": self._executions,
+            "shared": self._shared,
+            "in_flight": self.in_flight(),
+        }
+
+
+class AsyncSingleFlight:
+    """
+    asyncio-based coalescing.
+
+    The leader's coroutine runs as its own task and every caller awaits it
+    through asyncio.shield(), so cancelling one caller never cancels the
+    request for the others.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self._executions = 0
+        self._shared = 0
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """
+        Await fn() once per concurrent key.
+
+        Returns:
+            (result, shared) — shared is True for followers
+        """
+        task = self._tasks.get(key)
+        shared = task is not None
+        if shared:
+            self._shared += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            self._executions += 1
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def get_stats(self) -> dict:
+        return {
+            "executions": self._executions,
+            "shared": self._shared,
+            "in_flight": self.in_flight(),
+        }
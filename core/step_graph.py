@@ -0,0 +1,349 @@
+"""
+Digital Being — StepGraph
+Heavy-tick steps as a declarative dependency graph.
+
+Design rules:
+  - A Step declares the values it reads (inputs) and produces (outputs);
+    `after` adds ordering-only edges between steps that share state but pass
+    no value (e.g. belief_system → contradiction_resolver)
+  - Inputs are passed to the step as keyword arguments; one output is the
+    return value, several outputs are a tuple in declared order.
+    Inputs no step produces must be given to run() (e.g. the tick number)
+  - A step starts as soon as its inputs exist and its `after` steps are done,
+    so independent steps overlap (one asyncio task each)
+  - Per-step timeout; the whole run has a global deadline — when it passes,
+    running steps are cancelled and the rest are skipped
+  - A failed / timed-out step substitutes its fallback (a value or a zero-arg
+    callable) if it has one; otherwise every step downstream is skipped.
+    A step may return STOP to end its branch without an error.
+    Step errors are logged, never raised out of run()
+  - Every run records per-step start / duration / status and the critical
+    path — the chain of steps that determined the wall time of the run;
+    inside a trace (core.tracing) every step is also a span
+
+Пример:
+    graph = StepGraph("heavy_tick", [
+        Step("monologue", step_monologue, inputs=("n",), outputs=("monologue",)),
+        Step("goal", step_goal, inputs=("n", "monologue"), outputs=("goal",),
+             timeout=20, fallback=dict(DEFAULT_GOAL)),
+        Step("curiosity", step_curiosity, inputs=("n",), after=("goal",)),
+    ])
+    run = await graph.run({"n": n}, deadline=120, label=f"HeavyTick #{n}")
+    run.values["goal"], run.critical_path
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from core.metrics import get_metrics
+from core.tracing import span
+
+log = logging.getLogger("digital_being.step_graph")
+
+# Returned by a step to end its branch: outputs stay unset, dependents are skipped
+STOP = object()
+
+_NO_FALLBACK = object()
+
+
+@dataclass
+class Step:
+    """One node of a StepGraph."""
+    name: str
+    fn: Callable[..., Awaitable[Any]]
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+    timeout: float | None = None
+    fallback: Any = _NO_FALLBACK
+
+    @property
+    def has_fallback(self) -> bool:
+        return self.fallback is not _NO_FALLBACK
+
+
+@dataclass
+class StepRecord:
+    """Timing and outcome of one step in one run (times relative to run start)."""
+    name: str
+    status: str = "pending"   # ok | failed | timeout | stopped | skipped | cancelled
+    start: float | None = None
+    end: float | None = None
+    error: str = ""
+    used_fallback: bool = False
+    critical: bool = False
+
+    @property
+    def duration(self) -> float:
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+    @property
+    def satisfied(self) -> bool:
+        """True if dependents may run."""
+        return self.status == "ok" or self.used_fallback
+
+
+@dataclass
+class GraphRun:
+    """Result of StepGraph.run()."""
+    values: dict[str, Any]
+    steps: dict[str, StepRecord]
+    critical_path: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+    deadline_hit: bool = False
+
+    def summary(self) -> str:
+        path = " → ".join(
+            f"{name} {self.steps[name].duration:.1f}s" for name in self.critical_path
+        )
+        return f"{self.elapsed:.1f}s, critical path: {path or '—'}"
+
+    def to_dict(self) -> dict:
+        return {
+            "elapsed_ms": round(self.elapsed * 1000, 1),
+            "deadline_hit": self.deadline_hit,
+            "critical_path": list(self.critical_path),
+            "steps": {
+                name: {
+                    "status": rec.status,
+                    "used_fallback": rec.used_fallback,
+                    "start_ms": None if rec.start is None else round(rec.start * 1000, 1),
+                    "duration_ms": round(rec.duration * 1000, 1),
+                    "critical": rec.critical,
+                    "error": rec.error,
+                }
+                for name, rec in self.steps.items()
+            },
+        }
+
+
+class StepGraph:
+    """
+    Dependency-graph executor for async steps.
+
+    The structure is validated once (unique names and outputs, known `after`
+    steps, no cycles); the same graph is run every tick.
+    """
+
+    def __init__(self, name: str, steps: list[Step]) -> None:
+        self.name = name
+        self._steps: dict[str, Step] = {}
+        self._producer: dict[str, str] = {}   # value -> step name
+        for step in steps:
+            if step.name in self._steps:
+                raise ValueError(f"StepGraph '{name}': duplicate step '{step.name}'")
+            self._steps[step.name] = step
+            for out in step.outputs:
+                if out in self._producer:
+                    raise ValueError(
+                        f"StepGraph '{name}': '{out}' produced by both "
+                        f"'{self._producer[out]}' and '{step.name}'"
+                    )
+                self._producer[out] = step.name
+        self._deps = {s.name: self._dependencies(s) for s in self._steps.values()}
+        self._check_acyclic()
+        self.external_inputs = frozenset(
+            i for s in self._steps.values() for i in s.inputs if i not in self._producer
+        )
+        self.last_run: GraphRun | None = None
+        self._metrics = get_metrics()
+
+    def _dependencies(self, step: Step) -> tuple[str, ...]:
+        for dep in step.after:
+            if dep not in self._steps:
+                raise ValueError(f"StepGraph '{self.name}': unknown step '{dep}' in {step.name}.after")
+        producers = [self._producer[i] for i in step.inputs if i in self._producer]
+        return tuple(dict.fromkeys([*producers, *step.after]))
+
+    def _check_acyclic(self) -> None:
+        state: dict[str, int] = {}   # 1 = visiting, 2 = done
+
+        def _visit(name: str) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"StepGraph '{self.name}': cycle through '{name}'")
+            state[name] = 1
+            for dep in self._deps[name]:
+                _visit(dep)
+            state[name] = 2
+
+        for name in self._steps:
+            _visit(name)
+
+    # ────────────────────────────────────────────────────────────
+    # Run
+    # ────────────────────────────────────────────────────────────
+    async def run(
+        self,
+        initial: dict[str, Any] | None = None,
+        deadline: float | None = None,
+        label: str | None = None,
+    ) -> GraphRun:
+        """Run every step once; deadline is in seconds from now."""
+        values = dict(initial or {})
+        missing = self.external_inputs - values.keys()
+        if missing:
+            raise ValueError(f"StepGraph '{self.name}': missing inputs {sorted(missing)}")
+
+        label = label or self.name
+        records = {name: StepRecord(name) for name in self._steps}
+        pending = dict(self._steps)
+        running: dict[asyncio.Task, Step] = {}
+        t0 = time.monotonic()
+        end_at = t0 + deadline if deadline is not None else None
+        deadline_hit = False
+
+        try:
+            while True:
+                self._launch_ready(pending, running, records, values, t0)
+                if not running:
+                    break
+                timeout = None if end_at is None else max(0.0, end_at - time.monotonic())
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    deadline_hit = True
+                    log.warning(
+                        f"[{label}] Deadline ({deadline}s) reached — cancelling "
+                        f"{', '.join(s.name for s in running.values())}."
+                    )
+                    break
+                for task in done:
+                    step = running.pop(task)
+                    self._finish(step, task, records[step.name], values, label, t0)
+        finally:
+            now = time.monotonic() - t0
+            for task, step in running.items():
+                task.cancel()
+                records[step.name].status = "cancelled"
+                records[step.name].end = now
+            for name in pending:
+                records[name].status = "skipped"
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        result = GraphRun(
+            values=values,
+            steps=records,
+            critical_path=self._critical_path(records),
+            elapsed=time.monotonic() - t0,
+            deadline_hit=deadline_hit,
+        )
+        self.last_run = result
+        self._record_metrics(result)
+        return result
+
+    def _launch_ready(
+        self,
+        pending: dict[str, Step],
+        running: dict[asyncio.Task, Step],
+        records: dict[str, StepRecord],
+        values: dict[str, Any],
+        t0: float,
+    ) -> None:
+        """Start every step whose dependencies are met; skip the ones that never will be."""
+        progressed = True
+        while progressed:
+            progressed = False
+            for name, step in list(pending.items()):
+                deps = [records[d] for d in self._deps[name]]
+                if any(d.status in ("pending", "running") for d in deps):
+                    continue
+                del pending[name]
+                progressed = True
+                if not all(d.satisfied for d in deps) or any(i not in values for i in step.inputs):
+                    records[name].status = "skipped"
+                    continue
+                kwargs = {i: values[i] for i in step.inputs}
+                records[name].status = "running"
+                records[name].start = time.monotonic() - t0
+                running[asyncio.ensure_future(self._call(step, kwargs))] = step
+
+    @staticmethod
+    async def _call(step: Step, kwargs: dict[str, Any]) -> Any:
+        with span(step.name):
+            if step.timeout is None:
+                return await step.fn(**kwargs)
+            return await asyncio.wait_for(step.fn(**kwargs), timeout=step.timeout)
+
+    def _finish(
+        self,
+        step: Step,
+        task: asyncio.Task,
+        record: StepRecord,
+        values: dict[str, Any],
+        label: str,
+        t0: float,
+    ) -> None:
+        record.end = time.monotonic() - t0
+        try:
+            result = task.result()
+        except asyncio.TimeoutError:
+            record.status = "timeout"
+            log.warning(f"[{label}] STEP {step.name} TIMEOUT ({step.timeout}s).")
+        except Exception as e:
+            record.status, record.error = "failed", str(e)
+            log.error(f"[{label}] STEP {step.name} failed: {e}")
+        else:
+            if result is STOP:
+                record.status = "stopped"
+                return
+            record.status = "ok"
+            self._store(step, result, values)
+            return
+
+        if step.has_fallback:
+            try:
+                fallback = step.fallback() if callable(step.fallback) else step.fallback
+            except Exception as e:
+                log.error(f"[{label}] STEP {step.name} fallback failed: {e}")
+                return
+            record.used_fallback = True
+            self._store(step, fallback, values)
+
+    @staticmethod
+    def _store(step: Step, result: Any, values: dict[str, Any]) -> None:
+        if len(step.outputs) == 1:
+            values[step.outputs[0]] = result
+        elif step.outputs:
+            values.update(zip(step.outputs, result))
+
+    def _critical_path(self, records: dict[str, StepRecord]) -> list[str]:
+        """Walk back from the last step to finish through its latest-finishing dependency."""
+        finished = {n: r for n, r in records.items() if r.end is not None}
+        if not finished:
+            return []
+        path = [max(finished, key=lambda n: finished[n].end)]
+        while True:
+            deps = [d for d in self._deps[path[-1]] if d in finished]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda d: finished[d].end))
+        path.reverse()
+        for name in path:
+            records[name].critical = True
+        return path
+
+    def _record_metrics(self, run: GraphRun) -> None:
+        for rec in run.steps.values():
+            if rec.start is not None:
+                self._metrics.record_graph_step(self.name, rec.name, rec.status, rec.duration)
+        self._metrics.record_graph_critical_path(
+            self.name, sum(run.steps[n].duration for n in run.critical_path)
+        )
+
+    def get_stats(self) -> dict:
+        """Structure plus timing of the last run."""
+        return {
+            "steps": {name: list(deps) for name, deps in self._deps.items()},
+            "last_run": self.last_run.to_dict() if self.last_run else None,
+        }
@@ -0,0 +1,283 @@
+"""
+Digital Being — Adaptive tick interval
+Chooses the pause before the next heavy tick from load and pending work.
+
+Design rules:
+  - end_tick(elapsed) is called after every tick and returns the sleep before
+    the next one; the interval itself (tick start → tick start) always stays
+    within [min_sec, max_sec] and relaxes back to ticks.heavy_tick_sec
+  - Decision order, first match wins (the reason is exported as a metric):
+      breaker_open — an Ollama circuit breaker is open → max_sec
+      backlog      — user messages (wake_on events) or registered backlogs
+                     (multi-agent tasks, unanswered inbox) → min_sec
+      overrun      — the tick-duration EWMA exceeds target_utilization of the
+                     interval → stretch the interval to EWMA / target_utilization
+      llm_queue    — LLMScheduler queue depth ≥ queue_high → interval × growth
+      idle         — no wake_on / activity_on events for idle_after_ticks
+                     ticks → interval × growth (fewer low-value monologues)
+      steady       — back to heavy_tick_sec
+  - Pressure (normal | high | critical) drives the OPTIONAL steps of the next
+    tick: high runs them only every coalesce_every-th tick, critical (open
+    breaker, timed-out tick) skips them. A deferred step returns STOP, so the
+    step graph shows it as "stopped"
+  - A wake_on event during the pause cuts it short: the next tick starts
+    min_sec after the previous one started
+  - Disabled: the fixed interval minus the tick's own duration, as before
+
+Пример:
+    ctl = TickIntervalController.from_config(cfg)
+    ctl.subscribe(bus)
+    ctl.add_backlog("multi_agent", multi_agent.pending_work)
+
+    ctl.begin_tick(n)
+    Step("curiosity", ctl.gate("curiosity", step_curiosity), ...)
+    ...
+    delay = ctl.end_tick(time.monotonic() - tick_start)
+    await ctl.sleep(prefetch.idle(delay, build), tick_start)
+
+config.yaml:
+    tick_interval:
+      enabled: true
+      min_sec: 30
+      max_sec: 300
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from core.circuit_breaker import CircuitBreakerRegistry, get_registry
+from core.llm_scheduler import LLMScheduler, get_llm_scheduler
+from core.metrics import get_metrics
+from core.step_graph import STOP
+
+if TYPE_CHECKING:
+    from core.event_bus import EventBus
+
+log = logging.getLogger("digital_being.tick_interval")
+
+DEFAULT_MIN_SEC = 30.0
+DEFAULT_MAX_SEC = 300.0
+DEFAULT_TARGET_UTILIZATION = 0.5
+DEFAULT_GROWTH = 1.5
+DEFAULT_IDLE_AFTER_TICKS = 3
+DEFAULT_QUEUE_HIGH = 4
+DEFAULT_COALESCE_EVERY = 3
+DEFAULT_WAKE_ON = ("user.message", "user.urgent")
+DEFAULT_ACTIVITY_ON = ("world.updated",)
+_EWMA_ALPHA = 0.3
+
+_PRESSURE = {"normal": 0, "high": 1, "critical": 2}
+
+
+class TickIntervalController:
+    """Adaptive heavy-tick interval and OPTIONAL-step deferral under load."""
+
+    def __init__(
+        self,
+        base_sec: float,
+        enabled: bool = True,
+        min_sec: float = DEFAULT_MIN_SEC,
+        max_sec: float = DEFAULT_MAX_SEC,
+        target_utilization: float = DEFAULT_TARGET_UTILIZATION,
+        growth: float = DEFAULT_GROWTH,
+        idle_after_ticks: int = DEFAULT_IDLE_AFTER_TICKS,
+        queue_high: int = DEFAULT_QUEUE_HIGH,
+        coalesce_every: int = DEFAULT_COALESCE_EVERY,
+        wake_on: tuple[str, ...] = DEFAULT_WAKE_ON,
+        activity_on: tuple[str, ...] = DEFAULT_ACTIVITY_ON,
+        scheduler: LLMScheduler | None = None,
+        breakers: CircuitBreakerRegistry | None = None,
+    ) -> None:
+        self.enabled = enabled
+        self.base_sec = float(base_sec)
+        self.min_sec = min(float(min_sec), self.base_sec)
+        self.max_sec = max(float(max_sec), self.base_sec)
+        self.target_utilization = min(1.0, max(0.05, float(target_utilization)))
+        self.growth = max(1.0, float(growth))
+        self.idle_after_ticks = max(1, int(idle_after_ticks))
+        self.queue_high = max(1, int(queue_high))
+        self.coalesce_every = max(1, int(coalesce_every))
+        self.wake_on = tuple(wake_on)
+        self.activity_on = tuple(activity_on)
+        self._scheduler = scheduler
+        self._breakers = breakers if breakers is not None else get_registry()
+
+        self.interval = self.base_sec
+        self.pressure = "normal"
+        self.reason = "steady"
+        self._tick = 0
+        self._ewma: float | None = None
+        self._idle_ticks = 0
+        self._urgent = 0       # wake_on events since the tick started
+        self._activity = 0     # activity_on events since the tick started
+        self._backlogs: dict[str, Callable[[], int]] = {}
+        self._wake: asyncio.Event | None = None
+        self._stats = {"woken": 0, "optional_skipped": 0}
+        self._decisions: dict[str, int] = {}
+        self._metrics = get_metrics()
+
+    @classmethod
+    def from_config(cls, cfg: dict, scheduler: LLMScheduler | None = None) -> "TickIntervalController":
+        """Build from `ticks.heavy_tick_sec` and the `tick_interval` config section."""
+        section = cfg.get("tick_interval", {}) or {}
+        return cls(
+            base_sec=cfg["ticks"]["heavy_tick_sec"],
+            enabled=bool(section.get("enabled", True)),
+            min_sec=section.get("min_sec", DEFAULT_MIN_SEC),
+            max_sec=section.get("max_sec", DEFAULT_MAX_SEC),
+            target_utilization=section.get("target_utilization", DEFAULT_TARGET_UTILIZATION),
+            growth=section.get("growth", DEFAULT_GROWTH),
+            idle_after_ticks=section.get("idle_after_ticks", DEFAULT_IDLE_AFTER_TICKS),
+            queue_high=section.get("queue_high", DEFAULT_QUEUE_HIGH),
+            coalesce_every=section.get("coalesce_every", DEFAULT_COALESCE_EVERY),
+            wake_on=tuple(section.get("wake_on", DEFAULT_WAKE_ON)),
+            activity_on=tuple(section.get("activity_on", DEFAULT_ACTIVITY_ON)),
+            scheduler=scheduler,
+        )
+
+    # ────────────────────────────────────────────────────────────
+    # Signals
+    # ────────────────────────────────────────────────────────────
+    def subscribe(self, bus: "EventBus") -> None:
+        """Count wake_on / activity_on events; wake_on also ends the pause early."""
+        for event_name in self.wake_on:
+            async def _on_urgent(data: dict) -> None:
+                self._urgent += 1
+                if self._wake is not None:
+                    self._wake.set()
+            bus.subscribe(event_name, _on_urgent)
+        for event_name in self.activity_on:
+            async def _on_activity(data: dict) -> None:
+                self._activity += 1
+            bus.subscribe(event_name, _on_activity)
+
+    def add_backlog(self, name: str, pending: Callable[[], int]) -> None:
+        """Register a source of pending work (e.g. multi-agent tasks)."""
+        self._backlogs[name] = pending
+
+    def _backlog(self) -> int:
+        total = 0
+        for name, pending in self._backlogs.items():
+            try:
+                total += int(pending() or 0)
+            except Exception as e:
+                log.debug(f"TickIntervalController: backlog '{name}' failed: {e}")
+        return total
+
+    def _queue_depth(self) -> int:
+        if self._scheduler is None:
+            self._scheduler = get_llm_scheduler()
+        return sum(self._scheduler.get_stats()["queue_depth"].values())
+
+    # ────────────────────────────────────────────────────────────
+    # Tick side
+    # ────────────────────────────────────────────────────────────
+    def begin_tick(self, n: int) -> None:
+        """A tick starts: events from here on count toward its end_tick()."""
+        self._tick = n
+        self._urgent = 0
+        self._activity = 0
+
+    def allow_optional(self, step: str) -> bool:
+        """May an OPTIONAL step run this tick?"""
+        if not self.enabled or self.pressure == "normal":
+            return True
+        if self.pressure == "high" and self._tick % self.coalesce_every == 0:
+            return True
+        self._stats["optional_skipped"] += 1
+        self._metrics.record_optional_skipped(step)
+        log.info(f"[HeavyTick #{self._tick}] {step} deferred (pressure={self.pressure}).")
+        return False
+
+    def gate(self, step: str, fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """Step function that returns STOP when allow_optional(step) is False."""
+        async def _gated(**kwargs):
+            if not self.allow_optional(step):
+                return STOP
+            return await fn(**kwargs)
+        return _gated
+
+    def end_tick(self, elapsed: float, timed_out: bool = False) -> float:
+        """Decide the next interval; returns the sleep before the next tick."""
+        if not self.enabled:
+            return max(0.0, self.base_sec - elapsed)
+
+        self._ewma = elapsed if self._ewma is None else (
+            _EWMA_ALPHA * elapsed + (1 - _EWMA_ALPHA) * self._ewma
+        )
+        breaker_open = bool(self._breakers.get_unhealthy())
+        backlog = self._urgent + self._backlog()
+        queue_deep = self._queue_depth() >= self.queue_high
+        needed = self._ewma / self.target_utilization
+        overrun = timed_out or needed > self.interval
+        quiet = not (backlog or self._activity)
+        self._idle_ticks = self._idle_ticks + 1 if quiet else 0
+
+        if breaker_open:
+            reason, interval = "breaker_open", self.max_sec
+        elif backlog:
+            reason, interval = "backlog", self.min_sec
+        elif overrun:
+            reason = "overrun"
+            interval = max(needed, self.interval * self.growth) if timed_out else needed
+        elif queue_deep:
+            reason, interval = "llm_queue", self.interval * self.growth
+        elif self._idle_ticks >= self.idle_after_ticks:
+            reason, interval = "idle", max(self.interval, self.base_sec) * self.growth
+        else:
+            reason, interval = "steady", max(self.base_sec, needed)
+
+        if breaker_open or timed_out:
+            self.pressure = "critical"
+        elif overrun or queue_deep:
+            self.pressure = "high"
+        else:
+            self.pressure = "normal"
+
+        self.interval = min(self.max_sec, max(self.min_sec, interval))
+        if reason != self.reason:
+            log.info(
+                f"[HeavyTick #{self._tick}] Next interval {self.interval:.0f}s "
+                f"({reason}, pressure={self.pressure}, tick={elapsed:.1f}s)."
+            )
+        self.reason = reason
+        self._decisions[reason] = self._decisions.get(reason, 0) + 1
+        self._metrics.record_tick_interval(self.interval, reason, _PRESSURE[self.pressure])
+        return max(0.0, self.interval - elapsed)
+
+    async def sleep(self, idle: Awaitable[None], tick_start: float) -> None:
+        """Await the pause (`idle`); a wake_on event cuts it to min_sec after tick_start."""
+        if not self.enabled:
+            await idle
+            return
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        self._wake.clear()
+        idle_task = asyncio.ensure_future(idle)
+        wake_task = asyncio.ensure_future(self._wake.wait())
+        try:
+            await asyncio.wait({idle_task, wake_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            wake_task.cancel()
+            if not idle_task.done():
+                idle_task.cancel()
+            await asyncio.gather(idle_task, wake_task, return_exceptions=True)
+        if idle_task.cancelled():
+            self._stats["woken"] += 1
+            log.info(f"[HeavyTick #{self._tick}] Woken early by a new message.")
+            await asyncio.sleep(max(0.0, tick_start + self.min_sec - time.monotonic()))
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "interval_sec": round(self.interval, 1),
+            "reason": self.reason,
+            "pressure": self.pressure,
+            "tick_ewma_sec": round(self._ewma or 0.0, 2),
+            "decisions": dict(self._decisions),
+            **self._stats,
+        }
@@ -0,0 +1,219 @@
+"""
+Digital Being — Tick prefetch
+Speculative preparation of the next heavy tick during the idle interval.
+
+Design rules:
+  - The tick loop sleeps through prefetch.idle(): lead_sec before the next
+    tick it assembles the monologue prompt (self model, values, episodes,
+    emotions ...) and stores it for the tick to take()
+  - draft: the assembled prompt is sent once at OPTIONAL priority and charged
+    to the next tick's LLM budget (next_tick_budget()), so the monologue
+    answer is already in LLMCache when the tick asks the same question;
+    embed: the draft is embedded too, which warms the embedding
+    cache for semantic_context and the vector store write
+  - A draft still in flight when the tick starts is not cancelled: the
+    tick's identical request joins it through single-flight
+  - Inputs changing (inbox message, file event — prefetch.invalidate_on)
+    drop the prepared prompt; if time is left before the tick, it is
+    prepared again. A stale draft is never used: the tick rebuilds the
+    prompt, which then no longer matches the cached one
+  - One stage task at a time, owned by the prefetcher: a new idle() replaces
+    (cancels) the previous stage, close() cancels it on shutdown
+  - Prepared prompts older than max_age_sec (e.g. after skipped ticks)
+    are not used
+
+Пример:
+    prefetch = TickPrefetcher.from_config(cfg)
+    prefetch.subscribe(bus)
+    ...
+    system, prompt = prefetch.take() or await build_monologue_prompt()
+    await prefetch.idle(delay, build_monologue_prompt, warm=draft, embed=embed)
+
+config.yaml:
+    prefetch:
+      lead_sec: 20
+      invalidate_on: [user.message, user.urgent, world.updated]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from core.llm_scheduler import llm_priority
+from core.metrics import get_metrics
+from core.priority_system import Priority
+from core.token_budget import next_tick_budget
+
+if TYPE_CHECKING:
+    from core.event_bus import EventBus
+
+log = logging.getLogger("digital_being.tick_prefetch")
+
+DEFAULT_LEAD_SEC = 20.0
+DEFAULT_MIN_LEAD_SEC = 3.0
+DEFAULT_MAX_AGE_SEC = 60.0
+DEFAULT_INVALIDATE_ON = ("user.message", "user.urgent", "world.updated")
+
+BuildFn = Callable[[], Awaitable[tuple[str, str]]]
+WarmFn = Callable[[str, str], Awaitable[str]]
+EmbedFn = Callable[[str], Awaitable[object]]
+
+
+class TickPrefetcher:
+    """Prepares the next tick's monologue prompt (and draft) while the loop is idle."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        lead_sec: float = DEFAULT_LEAD_SEC,
+        min_lead_sec: float = DEFAULT_MIN_LEAD_SEC,
+        max_age_sec: float = DEFAULT_MAX_AGE_SEC,
+        draft: bool = True,
+        embed: bool = True,
+        invalidate_on: tuple[str, ...] = DEFAULT_INVALIDATE_ON,
+    ) -> None:
+        self.enabled = enabled
+        self.lead_sec = max(0.0, float(lead_sec))
+        self.min_lead_sec = max(0.0, float(min_lead_sec))
+        self.max_age_sec = float(max_age_sec)
+        self.draft = draft
+        self.embed = embed
+        self.invalidate_on = tuple(invalidate_on)
+
+        self._prepared: tuple[str, str, float] | None = None   # system, prompt, at
+        self._generation = 0
+        self._changed: asyncio.Event | None = None
+        self._stage_task: asyncio.Task | None = None
+        self._stats = {
+            "prepared": 0, "drafts": 0, "invalidated": 0,
+            "hit": 0, "miss": 0, "stale": 0,    # take() results
+        }
+        self._metrics = get_metrics()
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "TickPrefetcher":
+        """Build from the `prefetch` config section."""
+        section = cfg.get("prefetch", {}) or {}
+        return cls(
+            enabled=bool(section.get("enabled", True)),
+            lead_sec=section.get("lead_sec", DEFAULT_LEAD_SEC),
+            min_lead_sec=section.get("min_lead_sec", DEFAULT_MIN_LEAD_SEC),
+            max_age_sec=section.get("max_age_sec", DEFAULT_MAX_AGE_SEC),
+            draft=bool(section.get("draft", True)),
+            embed=bool(section.get("embed", True)),
+            invalidate_on=tuple(section.get("invalidate_on", DEFAULT_INVALIDATE_ON)),
+        )
+
+    # ────────────────────────────────────────────────────────────
+    # Invalidation
+    # ────────────────────────────────────────────────────────────
+    def subscribe(self, bus: "EventBus") -> None:
+        """Invalidate on every event in invalidate_on."""
+        for event_name in self.invalidate_on:
+            async def _on_event(data: dict, event_name: str = event_name) -> None:
+                self.invalidate(event_name)
+            bus.subscribe(event_name, _on_event)
+
+    def invalidate(self, reason: str = "") -> None:
+        """Inputs changed: drop the prepared prompt and wake the idle stage."""
+        self._generation += 1
+        if self._prepared is not None:
+            self._stats["invalidated"] += 1
+            self._metrics.record_prefetch("invalidated")
+            log.debug(f"TickPrefetcher: prepared context invalidated ({reason or 'manual'}).")
+        self._prepared = None
+        if self._changed is not None:
+            self._changed.set()
+
+    # ────────────────────────────────────────────────────────────
+    # Tick side
+    # ────────────────────────────────────────────────────────────
+    def take(self) -> tuple[str, str] | None:
+        """(system, prompt) prepared for this tick, or None (one use)."""
+        prepared, self._prepared = self._prepared, None
+        if prepared is None:
+            result = "miss"
+        elif time.monotonic() - prepared[2] > self.max_age_sec:
+            result = "stale"
+        else:
+            result = "hit"
+        self._stats[result] += 1
+        self._metrics.record_prefetch(result)
+        return prepared[:2] if result == "hit" else None
+
+    async def idle(
+        self,
+        delay: float,
+        build: BuildFn,
+        warm: WarmFn | None = None,
+        embed: EmbedFn | None = None,
+    ) -> None:
+        """Sleep `delay` seconds, preparing the next tick before it ends."""
+        if not self.enabled or delay <= self.min_lead_sec:
+            await asyncio.sleep(delay)
+            return
+        next_tick_at = time.monotonic() + delay
+        self.close()
+        self._stage_task = asyncio.create_task(self._stage(next_tick_at, build, warm, embed))
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Cancel the stage task if it is still running."""
+        task, self._stage_task = self._stage_task, None
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def _stage(
+        self,
+        next_tick_at: float,
+        build: BuildFn,
+        warm: WarmFn | None,
+        embed: EmbedFn | None,
+    ) -> None:
+        self._changed = asyncio.Event()
+        await asyncio.sleep(max(0.0, next_tick_at - self.lead_sec - time.monotonic()))
+
+        while next_tick_at - time.monotonic() > self.min_lead_sec:
+            self._changed.clear()
+            generation = self._generation
+            try:
+                system, prompt = await build()
+            except Exception as e:
+                log.warning(f"TickPrefetcher: prompt assembly failed: {e}")
+                return
+            if generation != self._generation:
+                continue   # inputs changed while assembling
+            self._prepared = (system, prompt, time.monotonic())
+            self._stats["prepared"] += 1
+
+            if warm is not None and self.draft:
+                try:
+                    with llm_priority(Priority.OPTIONAL), next_tick_budget():
+                        draft = await warm(system, prompt)
+                    self._stats["drafts"] += 1
+                    if draft and embed is not None and self.embed and generation == self._generation:
+                        await embed(draft)
+                except Exception as e:
+                    log.debug(f"TickPrefetcher: draft failed: {e}")
+
+            remaining = next_tick_at - self.min_lead_sec - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ready": self._prepared is not None,
+            **self._stats,
+        }
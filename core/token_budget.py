@@ -0,0 +1,263 @@
+"""
+Digital Being — Token budgeting
+Per-call-site prompt budgets and adaptive generation limits.
+
+Design rules:
+  - Every LLM call site names a call profile ("monologue", "goal", ...)
+  - A profile caps the prompt size: injected context is trimmed, in priority
+    order, until the prompt fits (fixed instructions are never trimmed)
+  - num_predict is derived from observed output lengths of that profile
+    (p95 × headroom, clamped to [min_predict, num_predict])
+  - Token counts come from Ollama (prompt_eval_count / eval_count) when present,
+    otherwise from a character-based estimate
+  - Per-profile usage is reported via get_stats() and Prometheus metrics
+  - Calls made inside next_tick_budget() (the idle-time prefetch draft) are
+    charged to the next tick's max_llm_calls, not to the tick that just ended
+
+Пример:
+    budget = get_token_budget(cfg)
+    ctx = budget.fit("goal", {"semantic": sem_ctx, "episodes": eps_ctx},
+                     reserved=budget.estimate(instructions))
+    text = ollama.chat(prompt, system, call_profile="goal")
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from core.metrics import get_metrics
+
+log = logging.getLogger("digital_being.token_budget")
+
+DEFAULT_NUM_PREDICT = 512
+DEFAULT_PROMPT_TOKENS = 4000
+DEFAULT_CHARS_PER_TOKEN = 3.0     # mixed Russian/English text tokenizes densely
+DEFAULT_WINDOW = 50               # observed outputs kept per profile
+MIN_OBSERVATIONS = 5              # before that, the profile's num_predict is used
+DEFAULT_PROFILE = "default"
+
+_TRIM_MARK = "…"
+
+_next_tick_var: ContextVar[bool] = ContextVar("llm_next_tick_budget", default=False)
+
+
+@contextmanager
+def next_tick_budget() -> Iterator[None]:
+    """LLM calls made in this context count against the next tick's call budget."""
+    token = _next_tick_var.set(True)
+    try:
+        yield
+    finally:
+        _next_tick_var.reset(token)
+
+
+def charged_to_next_tick() -> bool:
+    """Идёт ли текущий вызов в счёт бюджета следующего тика."""
+    return _next_tick_var.get()
+
+
+@dataclass
+class CallProfile:
+    """Token limits for one LLM call site."""
+    name: str
+    prompt_tokens: int = DEFAULT_PROMPT_TOKENS
+    num_predict: int = DEFAULT_NUM_PREDICT   # upper bound for generation
+    min_predict: int = 64
+    headroom: float = 1.3
+    adaptive: bool = True
+
+
+class TokenBudget:
+    """
+    Registry of call profiles plus observed token usage.
+
+    Thread-safe: the sync client records from executor threads.
+    """
+
+    def __init__(
+        self,
+        profiles: dict[str, CallProfile] | None = None,
+        chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
+        window: int = DEFAULT_WINDOW,
+    ) -> None:
+        self._profiles: dict[str, CallProfile] = dict(profiles or {})
+        self._profiles.setdefault(
+            DEFAULT_PROFILE, CallProfile(DEFAULT_PROFILE, adaptive=False)
+        )
+        self._chars_per_token = max(0.5, float(chars_per_token))
+        self._window = max(MIN_OBSERVATIONS, int(window))
+        self._outputs: dict[str, deque[int]] = {}
+        self._usage: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._metrics = get_metrics()
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "TokenBudget":
+        """
+        Build from the `token_budget` config section:
+            chars_per_token, window, profiles: {name: {prompt_tokens, num_predict, ...}}
+        """
+        section = cfg.get("token_budget", {}) or {}
+        profiles: dict[str, CallProfile] = {}
+        for name, p in (section.get("profiles") or {}).items():
+            p = p or {}
+            profiles[name] = CallProfile(
+                name=name,
+                prompt_tokens=int(p.get("prompt_tokens", DEFAULT_PROMPT_TOKENS)),
+                num_predict=int(p.get("num_predict", DEFAULT_NUM_PREDICT)),
+                min_predict=int(p.get("min_predict", 64)),
+                headroom=float(p.get("headroom", 1.3)),
+                adaptive=bool(p.get("adaptive", True)),
+            )
+        return cls(
+            profiles=profiles,
+            chars_per_token=section.get("chars_per_token", DEFAULT_CHARS_PER_TOKEN),
+            window=section.get("window", DEFAULT_WINDOW),
+        )
+
+    # ────────────────────────────────────────────────────────────
+    # Estimation / trimming
+    # ────────────────────────────────────────────────────────────
+    def estimate(self, text: str) -> int:
+        """Approximate token count of text."""
+        if not text:
+            return 0
+        return math.ceil(len(text) / self._chars_per_token)
+
+    def trim(self, text: str, max_tokens: int) -> str:
+        """Cut text to about max_tokens, preferring a line boundary."""
+        if max_tokens <= 0 or not text:
+            return ""
+        if self.estimate(text) <= max_tokens:
+            return text
+        max_chars = int(max_tokens * self._chars_per_token) - len(_TRIM_MARK)
+        if max_chars <= 0:
+            return ""
+        cut = text[:max_chars]
+        newline = cut.rfind("\n")
+        if newline > max_chars // 2:
+            cut = cut[:newline]
+        return cut.rstrip() + _TRIM_MARK
+
+    def profile(self, name: str | None) -> CallProfile:
+        """Profile by name; unknown names get the default limits."""
+        if not name:
+            return self._profiles[DEFAULT_PROFILE]
+        prof = self._profiles.get(name)
+        if prof is None:
+            base = self._profiles[DEFAULT_PROFILE]
+            prof = CallProfile(
+                name=name,
+                prompt_tokens=base.prompt_tokens,
+                num_predict=base.num_predict,
+                adaptive=False,
+            )
+            self._profiles[name] = prof
+        return prof
+
+    def fit(
+        self,
+        profile: str,
+        sections: dict[str, str],
+        reserved: int = 0,
+    ) -> dict[str, str]:
+        """
+        Trim context sections so reserved + sections fit the profile budget.
+
+        Args:
+            profile: call profile name
+            sections: context blocks, most important first
+            reserved: tokens of the untrimmable part (instructions, system prompt)
+
+        Returns:
+            Same keys, values trimmed (later sections are cut first)
+        """
+        remaining = self.profile(profile).prompt_tokens - reserved
+        fitted: dict[str, str] = {}
+        trimmed: list[str] = []
+        for key, text in sections.items():
+            text = text or ""
+            cost = self.estimate(text)
+            if cost <= remaining:
+                fitted[key] = text
+                remaining -= cost
+                continue
+            fitted[key] = self.trim(text, remaining)
+            remaining -= self.estimate(fitted[key])
+            trimmed.append(key)
+        if trimmed:
+            log.debug(f"TokenBudget[{profile}]: trimmed {', '.join(trimmed)}")
+        return fitted
+
+    # ────────────────────────────────────────────────────────────
+    # Generation limits
+    # ────────────────────────────────────────────────────────────
+    def num_predict(self, name: str | None) -> int:
+        """num_predict for the next call of this profile."""
+        prof = self.profile(name)
+        if not prof.adaptive:
+            return prof.num_predict
+        with self._lock:
+            outputs = sorted(self._outputs.get(prof.name, ()))
+        if len(outputs) < MIN_OBSERVATIONS:
+            return prof.num_predict
+        p95 = outputs[min(len(outputs) - 1, int(len(outputs) * 0.95))]
+        limit = math.ceil(p95 * prof.headroom)
+        return max(prof.min_predict, min(prof.num_predict, limit))
+
+    def record(
+        self,
+        name: str | None,
+        prompt_tokens: int,
+        output_tokens: int,
+        model: str = "",
+    ) -> None:
+        """Account one completed (non-cached) call."""
+        key = self.profile(name).name
+        with self._lock:
+            self._outputs.setdefault(key, deque(maxlen=self._window)).append(
+                int(output_tokens)
+            )
+            usage = self._usage.setdefault(
+                key, {"calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+            )
+            usage["calls"] += 1
+            usage["prompt_tokens"] += int(prompt_tokens)
+            usage["output_tokens"] += int(output_tokens)
+        self._metrics.record_llm_tokens(model, key, prompt_tokens, output_tokens)
+
+    def get_stats(self) -> dict[str, dict]:
+        """Per-profile usage and current limits."""
+        with self._lock:
+            usage = {k: dict(v) for k, v in self._usage.items()}
+        stats: dict[str, dict] = {}
+        for key, u in usage.items():
+            prof = self.profile(key)
+            u["avg_output_tokens"] = (
+                round(u["output_tokens"] / u["calls"], 1) if u["calls"] else 0
+            )
+            u["prompt_budget"] = prof.prompt_tokens
+            u["num_predict"] = self.num_predict(key)
+            stats[key] = u
+        return stats
+
+
+# Shared by all clients and call sites (first caller's config wins)
+_budget: TokenBudget | None = None
+_budget_lock = threading.Lock()
+
+
+def get_token_budget(cfg: dict | None = None) -> TokenBudget:
+    """Получить общий TokenBudget (создаётся из cfg при первом вызове)."""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = TokenBudget.from_config(cfg or {})
+        return _budget
@@ -0,0 +1,379 @@
+"""
+Digital Being — Tracing
+Per-tick spans (tick → step → LLM call / DB query / file write) with
+flame-graph export.
+
+Design rules:
+  - A trace is opened by Tracer.trace() (one per heavy tick); span() /
+    @traced open children of the current span. The current span lives in a
+    ContextVar, so steps running as separate asyncio tasks nest correctly
+  - Disabled tracing (the default) or code running outside a trace costs one
+    ContextVar lookup: span() returns a shared no-op span, @traced calls
+    straight through, annotate() does nothing
+  - annotate(**attrs) adds attributes to the current span from deep inside a
+    call (prompt_chars, prompt_tokens, cache, rows, scanned ...)
+  - run_in_executor does not copy contextvars: propagate(fn) carries the
+    current span into a worker thread, and install(loop) makes the loop's
+    default executor do that for every run_in_executor(None, ...) call
+  - A trace keeps at most max_spans spans (the rest are counted as dropped);
+    finished traces go to a ring buffer of max_traces
+  - Export: Chrome trace-event JSON (chrome://tracing, Perfetto, speedscope)
+    with one row per task / thread, and collapsed stacks
+    ("tick;step;llm.chat <self µs>") for flamegraph.pl / speedscope.
+    Concurrent children may cover more time than their parent; self time
+    is clamped at zero
+
+Пример:
+    tracer = get_tracer(cfg)
+    tracer.install(asyncio.get_running_loop())
+
+    with tracer.trace("heavy_tick", tick=n):
+        with span("monologue"):
+            ...
+
+    @traced("llm.chat")
+    async def chat(self, prompt, system=""):
+        annotate(prompt_chars=len(prompt))
+
+    to_chrome_trace(tracer.get_traces())
+
+config.yaml:
+    tracing:
+      enabled: true
+      max_traces: 50
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import itertools
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, TypeVar
+
+log = logging.getLogger("digital_being.tracing")
+
+DEFAULT_MAX_TRACES = 50
+DEFAULT_MAX_SPANS = 2000
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_current: ContextVar["Span | None"] = ContextVar("trace_span", default=None)
+_ids = itertools.count(1)
+
+
+def _lane() -> int:
+    """Row of the timeline: the asyncio task, else the thread."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+# ────────────────────────────────────────────────────────────
+# Spans
+# ────────────────────────────────────────────────────────────
+class _NoopSpan:
+    """Stands in for a span when nothing is traced."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """One timed operation inside a trace."""
+
+    __slots__ = ("id", "name", "attrs", "parent", "trace", "lane", "start", "end", "_token")
+
+    def __init__(self, trace: "Trace", name: str, parent: "Span | None", attrs: dict) -> None:
+        self.id = next(_ids)
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.trace = trace
+        self.lane = 0
+        self.start = 0.0
+        self.end: float | None = None
+        self._token = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.lane = _lane()
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _current.reset(self._token)
+        if self.parent is None:
+            self.trace.finish()
+        return False
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class Trace:
+    """All spans of one root operation (one heavy tick)."""
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: dict) -> None:
+        self.id = next(_ids)
+        self.name = name
+        self.started_at = time.time()
+        self.spans: list[Span] = []
+        self.dropped = 0
+        self._tracer = tracer
+        self.root = self._add(name, None, attrs)
+
+    def _add(self, name: str, parent: Span | None, attrs: dict) -> Span | _NoopSpan:
+        if len(self.spans) >= self._tracer.max_spans:
+            self.dropped += 1
+            return _NOOP
+        span_ = Span(self, name, parent, attrs)
+        self.spans.append(span_)
+        return span_
+
+    def finish(self) -> None:
+        self._tracer._commit(self)
+
+    @property
+    def duration(self) -> float:
+        return self.root.duration
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 1),
+            "spans": len(self.spans),
+            "dropped": self.dropped,
+            "attrs": dict(self.root.attrs),
+        }
+
+    def to_dict(self) -> dict:
+        t0 = self.root.start
+        return {
+            **self.summary(),
+            "spans": [
+                {
+                    "id": s.id,
+                    "parent": s.parent.id if s.parent is not None else None,
+                    "name": s.name,
+                    "start_ms": round((s.start - t0) * 1000, 3),
+                    "duration_ms": round(s.duration * 1000, 3),
+                    "attrs": s.attrs,
+                }
+                for s in self.spans
+            ],
+            "span_count": len(self.spans),
+        }
+
+
+def span(name: str, **attrs: Any) -> Span | _NoopSpan:
+    """Child of the current span (no-op outside a trace)."""
+    parent = _current.get()
+    if parent is None:
+        return _NOOP
+    return parent.trace._add(name, parent, attrs)
+
+
+def annotate(**attrs: Any) -> None:
+    """Add attributes to the current span."""
+    current = _current.get()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator: run the function (sync or async) inside span(name)."""
+    def decorator(fn: F) -> F:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def _async(*args, **kwargs):
+                if _current.get() is None:
+                    return await fn(*args, **kwargs)
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return _async  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def _sync(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return _sync  # type: ignore[return-value]
+    return decorator
+
+
+def propagate(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap fn so that, run in another thread, its spans nest under the current one."""
+    parent = _current.get()
+    if parent is None:
+        return fn
+
+    def _run(*args, **kwargs):
+        token = _current.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return _run
+
+
+class TracingExecutor(ThreadPoolExecutor):
+    """Default executor that carries the current span into its threads."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(propagate(fn), *args, **kwargs)
+
+
+# ────────────────────────────────────────────────────────────
+# Tracer
+# ────────────────────────────────────────────────────────────
+class Tracer:
+    """Opens traces and keeps the last max_traces finished ones."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        max_traces: int = DEFAULT_MAX_TRACES,
+        max_spans: int = DEFAULT_MAX_SPANS,
+    ) -> None:
+        self.enabled = enabled
+        self.max_spans = max(1, int(max_spans))
+        self._traces: deque[Trace] = deque(maxlen=max(1, int(max_traces)))
+        self._lock = threading.Lock()
+        self._finished = 0
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "Tracer":
+        """Build from the `tracing` config section."""
+        section = cfg.get("tracing", {}) or {}
+        return cls(
+            enabled=bool(section.get("enabled", False)),
+            max_traces=section.get("max_traces", DEFAULT_MAX_TRACES),
+            max_spans=section.get("max_spans", DEFAULT_MAX_SPANS),
+        )
+
+    def trace(self, name: str, **attrs: Any) -> Span | _NoopSpan:
+        """Root span of a new trace (a child span if a trace is already open)."""
+        if not self.enabled:
+            return _NOOP
+        if _current.get() is not None:
+            return span(name, **attrs)
+        return Trace(self, name, attrs).root
+
+    def install(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Make run_in_executor(None, ...) on `loop` keep the current span."""
+        if self.enabled:
+            loop.set_default_executor(TracingExecutor(thread_name_prefix="traced"))
+
+    def _commit(self, trace: Trace) -> None:
+        with self._lock:
+            self._traces.append(trace)
+            self._finished += 1
+
+    def get_traces(self, limit: int | None = None) -> list[Trace]:
+        """Finished traces, oldest first."""
+        with self._lock:
+            traces = list(self._traces)
+        return traces[-limit:] if limit else traces
+
+    def get_trace(self, trace_id: int) -> Trace | None:
+        with self._lock:
+            return next((t for t in self._traces if t.id == trace_id), None)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "finished": self._finished,
+                "buffered": len(self._traces),
+                "max_spans": self.max_spans,
+            }
+
+
+# ────────────────────────────────────────────────────────────
+# Export
+# ────────────────────────────────────────────────────────────
+def to_chrome_trace(traces: Iterable[Trace]) -> dict:
+    """Chrome trace-event JSON: one complete ("X") event per finished span."""
+    events: list[dict] = []
+    lanes: dict[int, int] = {}
+    for trace in traces:
+        base_us = trace.started_at * 1e6
+        t0 = trace.root.start
+        for s in trace.spans:
+            if s.end is None:
+                continue
+            tid = lanes.setdefault(s.lane, len(lanes) + 1)
+            events.append({
+                "name": s.name,
+                "cat": trace.name,
+                "ph": "X",
+                "ts": round(base_us + (s.start - t0) * 1e6),
+                "dur": round((s.end - s.start) * 1e6),
+                "pid": 1,
+                "tid": tid,
+                "args": {"trace": trace.id, **s.attrs},
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def to_collapsed(traces: Iterable[Trace]) -> str:
+    """Collapsed stacks ("a;b;c <self µs>"), summed over all traces."""
+    totals: dict[str, int] = defaultdict(int)
+    for trace in traces:
+        done = [s for s in trace.spans if s.end is not None]
+        child_time: dict[int, float] = defaultdict(float)
+        for s in done:
+            if s.parent is not None:
+                child_time[s.parent.id] += s.end - s.start
+        for s in done:
+            names, node = [], s
+            while node is not None:
+                names.append(node.name)
+                node = node.parent
+            self_us = round(max(0.0, (s.end - s.start) - child_time[s.id]) * 1e6)
+            if self_us:
+                totals[";".join(reversed(names))] += self_us
+    return "\n".join(f"{stack} {us}" for stack, us in sorted(totals.items()))
+
+
+# Shared by the tick loop, the LLM clients and the API (first caller's config wins)
+_tracer: Tracer | None = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer(cfg: dict | None = None) -> Tracer:
+    """Получить общий Tracer (создаётся из cfg при первом вызове)."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer.from_config(cfg or {})
+        return _tracer
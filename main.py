@@ -80,6 +80,9 @@ from core.meta_cognition import MetaCognition
 from core.milestones import Milestones
 from core.narrative_engine import NarrativeEngine
 from core.ollama_client import OllamaClient
+from core.llm_backend import make_llm_backend
+from core.llm_scheduler import llm_priority
+from core.priority_system import Priority
 from core.reflection_engine import ReflectionEngine
 from core.self_model import SelfModel
 from core.self_modification import SelfModificationEngine
@@ -87,6 +90,7 @@ from core.shell_executor import ShellExecutor
 from core.social_layer import SocialLayer
 from core.strategy_engine import StrategyEngine
 from core.time_perception import TimePerception
+from core.tracing import get_tracer
 from core.value_engine import ValueEngine
 from core.world_model import WorldModel
 
@@ -248,8 +252,9 @@ async def _dream_loop(dream: DreamMode, stop_event: asyncio.Event, logger: loggi
         if dream.should_run():
             logger.info("DreamMode: interval elapsed — starting dream cycle.")
             try:
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(None, dream.run)
+                # Background work: yields the LLM to heavy-tick requests
+                with llm_priority(Priority.OPTIONAL):
+                    result = await asyncio.to_thread(dream.run)
                 if result.get("skipped"):
                     logger.info(f"DreamMode: skipped ({result.get('reason', '?')}).")
             except Exception as e:
@@ -265,7 +270,8 @@ async def _consolidation_loop(consolidator: MemoryConsolidation, stop_event: asy
         if consolidator.should_consolidate():
             logger.info("MemoryConsolidation: starting sleep cycle...")
             try:
-                result = await consolidator.consolidate()
+                with llm_priority(Priority.OPTIONAL):
+                    result = await consolidator.consolidate()
                 logger.info(f"MemoryConsolidation: {result}")
             except Exception as e:
                 logger.error(f"MemoryConsolidation error: {e}")
@@ -347,6 +353,11 @@ async def async_main(cfg: dict, logger: logging.Logger) -> None:
     else:
         logger.info("🔥 Hot Reloader: disabled")
 
+    # Per-tick tracing: run_in_executor(None, ...) keeps the current span
+    tracer = get_tracer(cfg)
+    tracer.install(loop)
+    logger.info(f"Tracing: {'enabled' if tracer.enabled else 'disabled'}")
+
     mem = EpisodicMemory(Path(cfg["memory"]["episodic_db"]))
     mem.init()
     if not mem.health_check():
@@ -359,11 +370,20 @@ async def async_main(cfg: dict, logger: logging.Logger) -> None:
         for p in principles_stored:
             logger.info(f"  • [{p['id']}] {p['text']}")
 
-    vector_mem = VectorMemory(ROOT_DIR / "memory" / "vector_memory.db")
+    vector_cfg = cfg["memory"].get("vector", {})
+    vector_mem = VectorMemory(
+        ROOT_DIR / "memory" / "vector_memory.db",
+        max_vectors=int(vector_cfg.get("max_vectors", 10_000)),
+        search_mode=vector_cfg.get("search_mode", "matrix"),
+        ann_index=bool(vector_cfg.get("ann_index", False)),
+        ann_nprobe=int(vector_cfg.get("ann_nprobe", 16)),
+        ann_min_vectors=int(vector_cfg.get("ann_min_vectors", 20_000)),
+        codec=vector_cfg.get("codec", "float32"),
+    )
     vector_mem.init()
     logger.info(f"VectorMemory ready. Stored vectors: {vector_mem.count()}")
 
-    bus = EventBus()
+    bus = EventBus.from_config(cfg)
     values = ValueEngine(cfg=cfg, bus=bus)
     values.load(state_path=state_path, seed_path=SEED_PATH)
     values.subscribe()
@@ -379,7 +399,9 @@ async def async_main(cfg: dict, logger: logging.Logger) -> None:
     milestones.subscribe()
 
     ollama = OllamaClient(cfg)
-    ollama_ok = ollama.is_available()
+    # Awaitable LLM interface for everything running on the event loop
+    llm = make_llm_backend(cfg, ollama)
+    ollama_ok = await llm.is_available()
     if ollama_ok:
         logger.info("Ollama: ✅ available")
     else:
@@ -762,7 +784,14 @@ async def async_main(cfg: dict, logger: logging.Logger) -> None:
         proactive=proactive,
         meta_optimizer=meta_optimizer,
         multi_agent_coordinator=multi_agent_system,
+        llm=llm,
     )
+    heavy.prefetch.subscribe(bus)
+    heavy.interval_ctl.subscribe(bus)
+    if social_layer is not None:
+        heavy.interval_ctl.add_backlog("inbox", lambda: int(social_layer.get_pending_response() is not None))
+    if multi_agent_system is not None:
+        heavy.interval_ctl.add_backlog("multi_agent", multi_agent_system.pending_work)
     logger.info("⚡ FaultTolerantHeavyTick initialized with FULL ARCHITECTURE.")
 
     ticker = LightTick(cfg=cfg, bus=bus)
@@ -771,7 +800,7 @@ async def async_main(cfg: dict, logger: logging.Logger) -> None:
     api_enabled = api_cfg.get("enabled", True)
     api_components = {
         "episodic": mem, "vector_memory": vector_mem, "value_engine": values, "strategy_engine": strategy,
-        "self_model": self_model, "milestones": milestones, "dream_mode": dream, "ollama": ollama,
+        "self_model": self_model, "milestones": milestones, "dream_mode": dream, "ollama": ollama, "llm": llm,
         "heavy_tick": heavy, "emotion_engine": emotion_engine, "reflection_engine": reflection_engine,
         "narrative_engine": narrative_engine, "goal_persistence": goal_persistence, "attention_system": attention_system,
         "curiosity_engine": curiosity_engine, "self_modification": self_modification,
@@ -799,6 +828,7 @@ async def async_main(cfg: dict, logger: logging.Logger) -> None:
         "rate_limiter": rate_limiter,
         "canary_deployment": canary_deployment,
         "hot_reloader": hot_reloader,
+        "tracer": tracer,
     }
     api = IntrospectionAPI(
         host=api_cfg.get("host", "127.0.0.1"),
@@ -929,6 +959,7 @@ async def async_main(cfg: dict, logger: logging.Logger) -> None:
     monitor.stop()
     if api_enabled:
         await api.stop()
+    await bus.close()
 
     tasks_to_cancel = [light_task, heavy_task]
     if dream_task is not None:
@@ -970,6 +1001,9 @@ async def async_main(cfg: dict, logger: logging.Logger) -> None:
     mem.add_episode("system.stop", "Digital Being stopped cleanly with FULL ARCHITECTURE + HOT RELOAD", outcome="success")
     vector_mem.close()
     mem.close()
+    await llm.close()
+    if ollama.embedding_cache is not None:
+        ollama.embedding_cache.close()
     logger.info("✅ Graceful shutdown complete. Goodbye! 👋")
 
 def main() -> None:
@@ -5,18 +5,35 @@ Adds new columns to existing vector_memory database:
 - access_count (for LRU tracking)
 - last_access (for LRU tracking)
 - Index for efficient cleanup
+- codec column + vector_meta.schema_version (schema v2)
+- auto_vacuum=INCREMENTAL, so VectorMemory can free space in small steps
+
+Optionally re-encodes stored embeddings into a smaller codec
+(float16 = 2x smaller, int8 with per-vector scale = ~4x smaller).
 
 Usage:
     python migrate_db.py
+    python migrate_db.py --codec float16
 """
 
+import argparse
 import sqlite3
 import sys
 from pathlib import Path
 
+from core.memory.vector_memory import (
+    CODECS,
+    SCHEMA_VERSION,
+    codec_row_bytes,
+    decode_embeddings,
+    encode_embedding,
+)
+
+_REENCODE_BATCH = 1000
 
-def migrate_vector_memory(db_path: Path) -> bool:
-    """Migrate vector memory database to new schema."""
+
+def migrate_vector_memory(db_path: Path, codec: str | None = None) -> bool:
+    """Migrate vector memory database to new schema (optionally re-encode)."""
     print(f"Migrating database: {db_path}")
     
     if not db_path.exists():
@@ -55,6 +72,35 @@ def migrate_vector_memory(db_path: Path) -> bool:
         else:
             print("✅ last_access already exists")
         
+        # Add codec if missing (schema v2)
+        if "codec" not in columns:
+            print("➕ Adding codec column...")
+            cursor.execute(
+                "ALTER TABLE vectors ADD COLUMN codec TEXT NOT NULL DEFAULT 'float32'"
+            )
+            changes_made = True
+        else:
+            print("✅ codec already exists")
+        
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS vector_meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        cursor.execute(
+            "INSERT OR REPLACE INTO vector_meta (key, value) VALUES ('schema_version', ?)",
+            (str(SCHEMA_VERSION),),
+        )
+        
+        # Switch to incremental auto_vacuum (needs one full VACUUM, done offline here)
+        cursor.execute("PRAGMA auto_vacuum")
+        if cursor.fetchone()[0] != 2:
+            print("🧹 Enabling incremental auto_vacuum (one-time VACUUM)...")
+            conn.commit()
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+            changes_made = True
+        else:
+            print("✅ incremental auto_vacuum already enabled")
+        
         # Create index if not exists
         print("📊 Creating/verifying index...")
         cursor.execute(
@@ -63,6 +109,10 @@ def migrate_vector_memory(db_path: Path) -> bool:
         )
         
         conn.commit()
+        
+        if codec is not None:
+            changes_made = reencode_vectors(conn, codec) or changes_made
+        
         conn.close()
         
         if changes_made:
@@ -77,8 +127,87 @@ def migrate_vector_memory(db_path: Path) -> bool:
         return False
 
 
+def reencode_vectors(conn: sqlite3.Connection, codec: str) -> bool:
+    """
+    Re-encode every embedding not already stored as `codec`, then VACUUM.
+    Rows are read by id keyset so memory stays bounded.
+    Returns True if any row was changed.
+    """
+    cursor = conn.cursor()
+    size_before = _embedding_bytes(cursor)
+    print(f"🔁 Re-encoding embeddings to {codec}...")
+    
+    converted = 0
+    skipped = 0
+    last_id = 0
+    while True:
+        rows = cursor.execute(
+            "SELECT id, embedding, codec FROM vectors "
+            "WHERE id > ? AND codec != ? ORDER BY id LIMIT ?",
+            (last_id, codec, _REENCODE_BATCH),
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        
+        updates = []
+        for row_id, blob, old_codec in rows:
+            if old_codec not in CODECS:
+                skipped += 1
+                continue
+            # Infer dimension from the BLOB size of the source codec
+            dim = {"float32": len(blob) // 4, "float16": len(blob) // 2}.get(
+                old_codec, len(blob) - 4
+            )
+            if dim <= 0 or codec_row_bytes(old_codec, dim) != len(blob):
+                skipped += 1
+                continue
+            vec = decode_embeddings([blob], old_codec, dim)[0]
+            updates.append((encode_embedding(vec, codec), codec, row_id))
+        
+        cursor.executemany(
+            "UPDATE vectors SET embedding = ?, codec = ? WHERE id = ?", updates
+        )
+        conn.commit()
+        converted += len(updates)
+    
+    if converted == 0:
+        print(f"✅ All embeddings already stored as {codec}")
+        return False
+    
+    print("🧹 Running VACUUM to reclaim space...")
+    conn.execute("VACUUM")
+    size_after = _embedding_bytes(cursor)
+    print(
+        f"✅ Re-encoded {converted} embeddings"
+        + (f" (skipped {skipped} unreadable)" if skipped else "")
+        + f": {size_before / 1e6:.1f} MB → {size_after / 1e6:.1f} MB"
+    )
+    return True
+
+
+def _embedding_bytes(cursor: sqlite3.Cursor) -> int:
+    row = cursor.execute("SELECT COALESCE(SUM(LENGTH(embedding)), 0) FROM vectors").fetchone()
+    return int(row[0])
+
+
 def main():
     """Run all migrations."""
+    parser = argparse.ArgumentParser(description="Digital Being database migration")
+    parser.add_argument(
+        "--codec",
+        choices=CODECS,
+        default=None,
+        help="re-encode stored embeddings into this codec",
+    )
+    parser.add_argument(
+        "--vector-db",
+        type=Path,
+        default=Path("memory") / "vector_memory.db",
+        help="path to the VectorMemory database",
+    )
+    args = parser.parse_args()
+    
     print("="*60)
     print("Digital Being - Database Migration")
     print("="*60)
@@ -93,10 +222,10 @@ def main():
         return 1
     
     # Migrate vector memory
-    vector_db = memory_dir / "vectors.db"
+    vector_db = args.vector_db
     
     if vector_db.exists():
-        if not migrate_vector_memory(vector_db):
+        if not migrate_vector_memory(vector_db, codec=args.codec):
             return 1
     else:
         print(f"ℹ️  No vector database found at {vector_db}")
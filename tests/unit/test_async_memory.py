@@ -0,0 +1,121 @@
+"""
+Unit Tests for the async memory facades
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from core.memory.async_memory import AsyncEpisodicMemory, AsyncVectorMemory
+from core.memory.episodic import EpisodicMemory
+from core.memory.vector_memory import VectorMemory
+
+DIM = 8
+
+
+def _vec(seed: int) -> list[float]:
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal(DIM).astype(np.float32).tolist()
+
+
+@pytest.fixture
+def amem(temp_db):
+    mem = EpisodicMemory(temp_db)
+    mem.init()
+    facade = AsyncEpisodicMemory(mem)
+    yield facade
+    facade.shutdown()
+    mem.close()
+
+
+@pytest.fixture
+def avec(temp_dir):
+    mem = VectorMemory(temp_dir / "vectors.db", expected_dim=DIM)
+    mem.init()
+    facade = AsyncVectorMemory(mem)
+    yield facade
+    facade.shutdown()
+    mem.close()
+
+
+class TestAsyncEpisodicMemory:
+    """Test awaitable episodic reads and writes."""
+
+    async def test_add_and_read(self, amem):
+        """Awaited writes are visible to awaited reads."""
+        ep_id = await amem.add_episode("observation", "saw a file", outcome="success")
+        assert ep_id is not None
+        recent = await amem.get_recent_episodes(5)
+        assert recent[0]["description"] == "saw a file"
+        assert await amem.count() == 1
+
+    async def test_concurrent_writes_are_serialized(self, amem):
+        """Writes submitted together all land, in order, on the writer thread."""
+        ids = await asyncio.gather(
+            *(amem.add_episode("observation", f"event {i}") for i in range(20))
+        )
+        assert ids == sorted(ids)
+        assert await amem.count() == 20
+        assert amem.get_stats()["pending_writes"] == 0
+
+    async def test_batches_and_direct_sync_writes_do_not_interleave(self, amem):
+        """Facade batches and sync writes from the loop thread share the writer safely."""
+        batch = [{"event_type": "batch", "description": f"b{i}"} for i in range(200)]
+
+        async def direct_writes():
+            ids = []
+            for i in range(50):
+                ids.append(amem.sync.add_episode("direct", f"d{i}"))
+                await asyncio.sleep(0)
+            return ids
+
+        results = await asyncio.gather(
+            *(amem.add_episodes(batch) for _ in range(4)), direct_writes()
+        )
+        batch_ids = [i for ids in results[:4] for i in ids]
+        direct_ids = results[4]
+
+        assert None not in direct_ids
+        assert len(set(batch_ids) | set(direct_ids)) == 850
+        assert await amem.count() == 850
+        rows = {r["id"]: r["event_type"] for r in await amem.get_recent_episodes(1000)}
+        assert all(rows[i] == "batch" for i in batch_ids)
+
+
+class TestAsyncVectorMemory:
+    """Test awaitable vector search."""
+
+    async def test_add_and_search(self, avec):
+        """search() finds a vector added through the facade."""
+        for i in range(5):
+            await avec.add(i, "monologue", f"t{i}", _vec(i))
+        assert avec.count() == 5
+        results = await avec.search(_vec(3), top_k=1)
+        assert results[0]["episode_id"] == 3
+        assert "async" in avec.get_stats()
+
+    async def test_idle_writer_runs_vacuum_steps(self, temp_dir):
+        """Freed pages are returned by the writer's idle hook, not by add()."""
+        mem = VectorMemory(temp_dir / "vacuum.db", expected_dim=256, vacuum_step_pages=8)
+        mem.init()
+        facade = AsyncVectorMemory(mem)
+        rng = np.random.default_rng(0)
+        await facade.add_many([
+            {"episode_id": i, "event_type": "m", "text": "t",
+             "embedding": rng.standard_normal(256).tolist()}
+            for i in range(500)
+        ])
+        mem._conn.execute("UPDATE vectors SET created_at = 0")
+        mem._conn.commit()
+        assert await facade.delete_old(days=1) == 500
+        assert mem.get_stats()["vacuum_pending"]
+
+        for _ in range(200):
+            if not mem.get_stats()["vacuum_pending"]:
+                break
+            await asyncio.sleep(0.01)
+        assert mem._conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+        assert facade.get_stats()["async"]["idle_steps"] > 1
+        facade.shutdown()
+        mem.close()
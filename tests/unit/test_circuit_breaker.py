@@ -201,3 +201,49 @@ class TestCircuitBreaker:
         
         assert cb.name == "my_service"
         assert cb.get_stats()["name"] == "my_service"
+
+
+class TestCircuitBreakerAsync:
+    """Test call_async()."""
+
+    async def test_call_async_counts_failures(self):
+        """Awaited failures are recorded and open the circuit."""
+        breaker = CircuitBreaker(name="async_test", failure_threshold=2, recovery_timeout=60.0)
+
+        async def failing():
+            raise ValueError("boom")
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await breaker.call_async(failing)
+
+        async def ok():
+            return "ok"
+
+        with pytest.raises(CircuitBreakerOpen):
+            await breaker.call_async(ok)
+
+
+class TestCircuitBreakerGuard:
+    """Test guard() for streamed operations."""
+
+    def test_guard_counts_failures(self):
+        breaker = CircuitBreaker(name="guard_test", failure_threshold=1, recovery_timeout=60.0)
+        with pytest.raises(ValueError):
+            with breaker.guard():
+                raise ValueError("boom")
+        with pytest.raises(CircuitBreakerOpen):
+            with breaker.guard():
+                pass
+
+    def test_closed_generator_is_not_a_failure(self):
+        breaker = CircuitBreaker(name="guard_gen_test", failure_threshold=1, recovery_timeout=60.0)
+
+        def stream():
+            with breaker.guard():
+                yield from range(10)
+
+        gen = stream()
+        next(gen)
+        gen.close()
+        assert breaker.get_state() == "closed"
@@ -0,0 +1,55 @@
+"""
+Unit Tests for EmbeddingCache
+"""
+
+import pytest
+
+from core.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Test the memory-mapped LRU embedding cache."""
+
+    def test_put_get(self, temp_dir):
+        """Stored vectors come back as float lists."""
+        cache = EmbeddingCache(temp_dir, "nomic-embed-text", capacity=10)
+        assert cache.get("hello") is None
+        cache.put("hello", [0.5, 1.5, 2.5])
+        assert cache.get("hello") == [0.5, 1.5, 2.5]
+        assert cache.get_stats()["hits"] == 1
+
+    def test_persists_across_instances(self, temp_dir):
+        """The memmap files survive a restart."""
+        cache = EmbeddingCache(temp_dir, "m", capacity=10)
+        cache.put("a", [1.0, 2.0])
+        cache.close()
+
+        reopened = EmbeddingCache(temp_dir, "m", capacity=10)
+        assert reopened.get("a") == [1.0, 2.0]
+        assert len(reopened) == 1
+
+    def test_lru_eviction(self, temp_dir):
+        """A full cache evicts the least recently used entry."""
+        cache = EmbeddingCache(temp_dir, "m", capacity=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")            # b is now the oldest
+        cache.put("c", [3.0])
+
+        assert cache.get("b") is None
+        assert cache.get("a") == [1.0]
+        assert cache.get("c") == [3.0]
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_model_scoped(self, temp_dir):
+        """Different models never share entries."""
+        EmbeddingCache(temp_dir, "model-a").put("text", [1.0, 2.0])
+        assert EmbeddingCache(temp_dir, "model-b").get("text") is None
+
+    def test_wrong_dimension_ignored(self, temp_dir):
+        """Vectors of another dimension are not stored."""
+        cache = EmbeddingCache(temp_dir, "m", capacity=4)
+        cache.put("a", [1.0, 2.0])
+        cache.put("b", [1.0, 2.0, 3.0])
+        assert cache.get("b") is None
+        assert len(cache) == 1
@@ -0,0 +1,117 @@
+"""
+Unit Tests for EpisodicMemory
+"""
+
+import threading
+
+import pytest
+
+from core.memory.episodic import EpisodicMemory
+
+
+@pytest.fixture
+def mem(temp_db):
+    m = EpisodicMemory(temp_db)
+    m.init()
+    yield m
+    m.close()
+
+
+class TestEpisodicMemoryBatch:
+    """Test bulk episode inserts."""
+
+    def test_add_episodes(self, mem):
+        """Valid episodes are stored in one batch with consecutive ids."""
+        mem.add_episode("system.start", "before")
+        ids = mem.add_episodes([
+            {"event_type": "replay", "description": "first", "outcome": "success"},
+            {"event_type": "replay", "description": ""},  # invalid — skipped
+            {"event_type": "replay", "description": "second", "data": {"k": 1}},
+            {"event_type": "replay", "description": "third", "outcome": "bogus"},
+        ])
+
+        assert len(ids) == 3
+        rows = {r["id"]: r for r in mem.get_episodes_by_type("replay")}
+        assert [rows[i]["description"] for i in ids] == ["first", "second", "third"]
+        assert rows[ids[2]]["outcome"] == "unknown"
+        assert mem.count() == 4
+
+    def test_add_episodes_empty(self, mem):
+        """Nothing valid means nothing written."""
+        assert mem.add_episodes([{"event_type": "x", "description": "  "}]) == []
+        assert mem.count() == 0
+
+
+class TestEpisodicMemoryReadPool:
+    """Test reads through the read-only connection pool."""
+
+    def test_reads_during_write_transaction(self, temp_db):
+        """Readers see committed rows while the writer holds a transaction."""
+        mem = EpisodicMemory(temp_db)
+        mem.init()
+        mem.add_episode("observation", "first")
+        mem._conn.execute("BEGIN IMMEDIATE")
+        try:
+            assert mem.count() == 1
+            assert len(mem.get_recent_episodes(5)) == 1
+        finally:
+            mem._conn.execute("ROLLBACK")
+        mem.close()
+
+    def test_health_check_does_not_wait_for_writer(self, temp_db):
+        """health_check() reads through the pool, not behind the write lock."""
+        mem = EpisodicMemory(temp_db)
+        mem.init()
+        result = []
+        with mem._pool.write_lock:
+            t = threading.Thread(target=lambda: result.append(mem.health_check()))
+            t.start()
+            t.join(timeout=2)
+        assert result == [True]
+        mem.close()
+
+
+class TestEpisodicMemorySearchText:
+    """Test the FTS5 index and search_text()."""
+
+    def test_search_text_ranks_matches(self, mem):
+        """Matching episodes come back, best BM25 match first."""
+        mem.add_episode("observation", "disk usage is high on the sandbox volume")
+        mem.add_episode("observation", "the weather file changed")
+        mem.add_episode("monologue", "disk disk disk pressure keeps growing")
+
+        results = mem.search_text("disk", limit=5)
+        assert [r["event_type"] for r in results] == ["monologue", "observation"]
+        assert results[0]["score"] >= results[1]["score"]
+
+    def test_search_text_event_type_and_match_all(self, mem):
+        """event_type filter and AND-matching are pushed into SQLite."""
+        mem.add_episode("observation", "disk usage is high")
+        mem.add_episode("monologue", "disk is fine")
+
+        assert len(mem.search_text("disk", event_type="monologue")) == 1
+        assert len(mem.search_text("disk high", match_all=True)) == 1
+        assert len(mem.search_text("disk high")) == 2
+
+    def test_index_backfilled_and_synced(self, temp_db):
+        """Existing rows are indexed on upgrade; deletes leave the index."""
+        m = EpisodicMemory(temp_db)
+        m.init()
+        m.add_episode("observation", "legacy row about kernels")
+        m._conn.executescript(
+            "DROP TRIGGER episodes_fts_ai; DROP TRIGGER episodes_fts_ad; "
+            "DROP TRIGGER episodes_fts_au; DROP TABLE episodes_fts;"
+        )
+        m.close()
+
+        m.init()
+        assert len(m.search_text("kernels")) == 1
+        m._conn.execute("DELETE FROM episodes")
+        assert m.search_text("kernels") == []
+        m.close()
+
+    def test_search_text_ignores_fts_syntax(self, mem):
+        """Quotes and operators in the query are treated as plain words."""
+        mem.add_episode("observation", "parse error near NOT token")
+        assert len(mem.search_text('error "NOT (near')) == 1
+        assert mem.search_text("!!!") == []
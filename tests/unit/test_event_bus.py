@@ -0,0 +1,150 @@
+"""
+Unit Tests for EventBus (direct and queued dispatch, overflow, timeouts)
+"""
+
+import asyncio
+
+import pytest
+
+from core.event_bus import EventBus
+
+
+class Collector:
+    """Handler that records payloads, optionally waiting on a gate first."""
+
+    def __init__(self, gate: asyncio.Event | None = None):
+        self.seen = []
+        self.gate = gate
+
+    async def __call__(self, data: dict) -> None:
+        if self.gate is not None:
+            await self.gate.wait()
+        self.seen.append(data)
+
+
+class TestDirect:
+    """Test the default (backward-compatible) mode."""
+
+    async def test_publish_runs_handlers_before_returning(self):
+        bus, handler = EventBus(), Collector()
+        bus.subscribe("e", handler)
+        await bus.publish("e", {"n": 1})
+        assert handler.seen == [{"n": 1}]
+        assert bus.get_health_report()["mode"] == "direct"
+
+    async def test_timeout_is_a_handler_error(self):
+        bus = EventBus(handler_timeout=0.01)
+
+        async def slow(data):
+            await asyncio.sleep(1)
+
+        bus.subscribe("e", slow)
+        await bus.publish("e", {})
+        report = bus.get_health_report()
+        assert report["failing_handlers"] == {"slow": 1}
+        assert report["queues"]["e → slow"]["timeouts"] == 1
+
+
+class TestQueued:
+    """Test per-subscriber queues and overflow policies."""
+
+    async def test_drop_oldest_keeps_queue_bounded(self):
+        gate = asyncio.Event()
+        bus, handler = EventBus(mode="queued", queue_size=3), Collector(gate)
+        bus.subscribe("e", handler)
+        bus.publish_nowait("e", {"n": 0})
+        await asyncio.sleep(0)      # worker takes n=0 and waits on the gate
+        for n in range(1, 10):
+            bus.publish_nowait("e", {"n": n})
+        gate.set()
+        assert await bus.drain(timeout=1)
+
+        stats = bus.get_health_report()["queues"]["e → Collector"]
+        assert stats["max_depth"] == 3
+        assert stats["dropped"] == 6
+        assert [d["n"] for d in handler.seen] == [0, 7, 8, 9]
+
+    async def test_coalesce_by_key(self):
+        gate = asyncio.Event()
+        bus, handler = EventBus(mode="queued"), Collector(gate)
+        bus.subscribe("world.file_changed", handler, overflow="coalesce", key="path")
+        for rev in range(50):
+            for path in ("a.py", "b.py"):
+                bus.publish_nowait("world.file_changed", {"path": path, "rev": rev})
+        gate.set()
+        assert await bus.drain(timeout=1)
+
+        assert handler.seen == [{"path": "a.py", "rev": 49}, {"path": "b.py", "rev": 49}]
+        stats = bus.get_health_report()["queues"]["world.file_changed → Collector"]
+        assert stats["coalesced"] == 98
+
+    async def test_coalesce_never_drops_distinct_keys(self):
+        gate = asyncio.Event()
+        bus, handler = EventBus(mode="queued", queue_size=10), Collector(gate)
+        bus.subscribe("world.file_created", handler, overflow="coalesce", key="path")
+        for i in range(250):
+            bus.publish_nowait("world.file_created", {"path": f"f{i % 50}.py", "rev": i})
+        gate.set()
+        assert await bus.drain(timeout=1)
+
+        assert len(handler.seen) == 50
+        assert {d["path"] for d in handler.seen} == {f"f{i}.py" for i in range(50)}
+        assert all(d["rev"] >= 200 for d in handler.seen)
+        stats = bus.get_health_report()["queues"]["world.file_created → Collector"]
+        assert stats["dropped"] == 0 and stats["coalesced"] == 200
+
+    async def test_coalesce_drops_only_unkeyed_events(self):
+        gate = asyncio.Event()
+        bus, handler = EventBus(mode="queued", queue_size=2), Collector(gate)
+        bus.subscribe("e", handler, overflow="coalesce", key="path")
+        bus.publish_nowait("e", {"path": "a"})
+        for n in range(4):
+            bus.publish_nowait("e", {"n": n})
+        gate.set()
+        assert await bus.drain(timeout=1)
+        assert handler.seen == [{"path": "a"}, {"n": 2}, {"n": 3}]
+
+    async def test_block_applies_backpressure(self):
+        gate = asyncio.Event()
+        bus, handler = EventBus(mode="queued", queue_size=1, overflow="block"), Collector(gate)
+        bus.subscribe("e", handler)
+        await bus.publish("e", {"n": 0})
+        await asyncio.sleep(0)      # worker holds n=0
+        await bus.publish("e", {"n": 1})
+        blocked = asyncio.ensure_future(bus.publish("e", {"n": 2}))
+        await asyncio.sleep(0.02)
+        assert not blocked.done()
+
+        gate.set()
+        await asyncio.wait_for(blocked, 1)
+        assert await bus.drain(timeout=1)
+        assert [d["n"] for d in handler.seen] == [0, 1, 2]
+
+    async def test_slow_handler_does_not_hold_others(self):
+        bus, fast = EventBus(mode="queued"), Collector()
+        bus.subscribe("e", Collector(asyncio.Event()))   # never finishes
+        bus.subscribe("e", fast)
+        await bus.publish("e", {"n": 1})
+        await asyncio.sleep(0.01)
+        assert fast.seen == [{"n": 1}]
+        await bus.close()
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            EventBus(mode="queued").subscribe("e", Collector(), overflow="spill")
+
+
+class TestConfig:
+    """Test per-event overrides from config."""
+
+    def test_event_overrides(self):
+        bus = EventBus.from_config({"event_bus": {
+            "mode": "queued",
+            "handler_timeout": 5,
+            "events": {"world.file_changed": {"overflow": "coalesce", "key": "path"}},
+        }})
+        bus.subscribe("world.file_changed", Collector())
+        bus.subscribe("user.message", Collector())
+        queues = bus.get_health_report()["queues"]
+        assert queues["world.file_changed → Collector"]["overflow"] == "coalesce"
+        assert queues["user.message → Collector"]["overflow"] == "drop_oldest"
@@ -0,0 +1,79 @@
+"""
+Unit Tests for LLM backends
+"""
+
+import threading
+
+from core.llm_backend import AsyncOllamaBackend, ExecutorBackend, make_llm_backend
+from core.resilient_ollama import ResilientOllamaClient
+
+
+class FakeSyncClient:
+    """Stands in for OllamaClient; records the calling thread."""
+
+    embedding_cache = None
+
+    def __init__(self) -> None:
+        self.threads: list[str] = []
+        self.resets = 0
+
+    def chat(self, prompt, system="", call_profile=None):
+        self.threads.append(threading.current_thread().name)
+        return f"chat:{prompt}:{call_profile}"
+
+    def chat_until(self, prompt, system="", call_profile=None):
+        return '{"ok": true}'
+
+    def embed(self, text):
+        return [1.0, 2.0]
+
+    def embed_many(self, texts):
+        return [[float(len(t))] for t in texts]
+
+    def is_available(self):
+        return True
+
+    def reset_tick_counter(self):
+        self.resets += 1
+
+    def get_comprehensive_stats(self):
+        return {}
+
+
+class TestExecutorBackend:
+    """Test ExecutorBackend."""
+
+    async def test_calls_run_off_the_loop(self):
+        sync = FakeSyncClient()
+        backend = ExecutorBackend(sync, workers=1)
+        assert await backend.chat("q", call_profile="goal") == "chat:q:goal"
+        assert sync.threads[0].startswith("llm-backend")
+        assert await backend.chat("q", json_object=True) == '{"ok": true}'
+        assert await backend.embed_many(["ab"]) == [[2.0]]
+        await backend.close()
+
+    async def test_resilient_client_uses_backend(self):
+        sync = FakeSyncClient()
+        client = ResilientOllamaClient(sync, backend=ExecutorBackend(sync))
+        assert await client.chat("q", call_profile="monologue") == "chat:q:monologue"
+        assert await client.embed("t") == [1.0, 2.0]
+        assert await client.is_available_async()
+        client.reset_tick_counter()
+        assert sync.resets == 1
+        await client.close()
+
+
+class TestMakeBackend:
+    """Test make_llm_backend()."""
+
+    async def test_selection(self):
+        sync = FakeSyncClient()
+        backend = make_llm_backend({"ollama": {"backend": "executor"}}, sync)
+        assert isinstance(backend, ExecutorBackend)
+        await backend.close()
+
+        backend = make_llm_backend({}, sync)
+        assert isinstance(backend, AsyncOllamaBackend)
+        backend.reset_tick_counter()
+        assert sync.resets == 1
+        await backend.close()
@@ -193,3 +193,79 @@ class TestLLMCache:
         
         assert result == "response2"  # Latest value
         assert cache.get_stats()["current_size"] == 1  # Only one entry
+
+
+class TestTieredCache:
+    """Test the persistent tier, key normalization and semantic lookup."""
+
+    def test_persists_across_instances(self, temp_dir):
+        """A fresh cache (e.g. after restart) is served from SQLite."""
+        path = temp_dir / "llm_cache.db"
+        first = LLMCache(max_size=10, persist_path=path)
+        first.set("prompt", "sys", "response")
+        first.close()
+
+        second = LLMCache(max_size=10, persist_path=path)
+        assert second.get("prompt", "sys") == "response"
+        assert second.get_stats()["disk_hits"] == 1
+        # Promoted to L1
+        assert second.get("prompt", "sys") == "response"
+        assert second.get_stats()["disk_hits"] == 1
+        second.close()
+
+    def test_variant_is_part_of_key(self, temp_dir):
+        """A persisted answer is not reused for another model or call profile."""
+        path = temp_dir / "llm_cache.db"
+        first = LLMCache(max_size=10, persist_path=path)
+        first.set("prompt", "sys", "old model", variant="llama3.2:monologue")
+        first.close()
+
+        second = LLMCache(max_size=10, persist_path=path)
+        assert second.get("prompt", "sys", variant="qwen2.5:monologue") is None
+        assert second.get("prompt", "sys", variant="llama3.2:goal") is None
+        assert second.get("prompt", "sys", variant="llama3.2:monologue") == "old model"
+        assert second.key_for("prompt", "sys", "a") != second.key_for("prompt", "sys", "b")
+        second.close()
+
+    def test_volatile_fragments_share_key(self):
+        """Prompts differing only in tick number / timestamp hit the same entry."""
+        cache = LLMCache(max_size=10)
+        cache.set("TICK #41 at 2026-03-01T10:00:00: what now?", "", "answer")
+        assert cache.get("TICK #42 at 2026-03-01T10:05:13: what now?", "") == "answer"
+        assert cache.get("TICK #42: something else", "") is None
+
+    def test_normalize_disabled(self):
+        """normalize=False keeps exact-match keys."""
+        cache = LLMCache(max_size=10, normalize=False)
+        cache.set("tick 1", "", "answer")
+        assert cache.get("tick 2", "") is None
+
+    def test_semantic_lookup(self, temp_dir):
+        """Near-duplicate prompts above the threshold reuse the answer."""
+        vectors = {
+            "how are you": [1.0, 0.0, 0.0],
+            "how are you doing": [0.99, 0.05, 0.0],
+            "weather report": [0.0, 1.0, 0.0],
+        }
+        cache = LLMCache(
+            max_size=10,
+            persist_path=temp_dir / "llm_cache.db",
+            embed_fn=lambda text: vectors[text],
+            semantic_threshold=0.95,
+        )
+        cache.set("how are you", "sys", "fine")
+        assert cache.get("how are you doing", "sys") == "fine"
+        assert cache.get("weather report", "sys") is None
+        assert cache.get_stats()["semantic_hits"] == 1
+        cache.close()
+
+    def test_family_stats(self):
+        """Hit rate is tracked per prompt family (system prompt first line)."""
+        cache = LLMCache(max_size=10)
+        cache.set("p", "You are a planner.\nBe brief.", "r")
+        cache.get("p", "You are a planner.\nBe brief.")
+        cache.get("q", "You are a critic.")
+
+        families = cache.get_family_stats()
+        assert families["You are a planner."]["hit_rate"] == 100.0
+        assert families["You are a critic."]["misses"] == 1
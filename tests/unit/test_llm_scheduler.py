@@ -0,0 +1,213 @@
+"""
+Unit Tests for LLMScheduler
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.llm_scheduler import LLMScheduler, SchedulerRejected, llm_priority
+from core.priority_system import Priority
+
+
+def hold_slot(scheduler: LLMScheduler, release: threading.Event) -> threading.Thread:
+    """Occupy one slot from a background thread until `release` is set."""
+    acquired = threading.Event()
+
+    def _run():
+        with scheduler.slot(Priority.CRITICAL):
+            acquired.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=_run)
+    thread.start()
+    assert acquired.wait(5)
+    return thread
+
+
+def queue_request(scheduler: LLMScheduler, priority: Priority) -> threading.Thread:
+    """Start a thread that waits for a slot and releases it immediately."""
+    def _run():
+        with scheduler.slot(priority):
+            pass
+
+    thread = threading.Thread(target=_run)
+    thread.start()
+    time.sleep(0.02)   # let it reach the queue
+    return thread
+
+
+class TestAdmission:
+    """Test concurrency limit and priority order."""
+
+    def test_max_in_flight_is_respected(self):
+        scheduler = LLMScheduler(max_in_flight=2)
+        lock = threading.Lock()
+        active = peak = 0
+
+        def _work():
+            nonlocal active, peak
+            with scheduler.slot(Priority.IMPORTANT):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+
+        threads = [threading.Thread(target=_work) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+
+        assert peak == 2
+        assert scheduler.get_stats()["classes"]["important"]["granted"] == 6
+
+    def test_waiters_granted_by_priority(self):
+        scheduler = LLMScheduler(max_in_flight=1)
+        release = threading.Event()
+        holder = hold_slot(scheduler, release)
+        order: list[str] = []
+
+        def _wait(priority: Priority):
+            with scheduler.slot(priority):
+                order.append(priority.value)
+
+        waiters = []
+        for priority in (Priority.OPTIONAL, Priority.OPTIONAL, Priority.IMPORTANT):
+            t = threading.Thread(target=_wait, args=(priority,))
+            t.start()
+            waiters.append(t)
+            time.sleep(0.02)   # enqueue in this order
+
+        release.set()
+        for t in [holder, *waiters]:
+            t.join(5)
+        assert order == ["important", "optional", "optional"]
+
+    def test_critical_preempts_queued_optional(self):
+        scheduler = LLMScheduler(max_in_flight=1)
+        release = threading.Event()
+        holder = hold_slot(scheduler, release)
+        errors: list[str] = []
+
+        def _optional():
+            try:
+                with scheduler.slot(Priority.OPTIONAL):
+                    pass
+            except SchedulerRejected as e:
+                errors.append(e.reason)
+
+        t_opt = threading.Thread(target=_optional)
+        t_opt.start()
+        time.sleep(0.02)
+        t_crit = queue_request(scheduler, Priority.CRITICAL)
+        t_opt.join(5)
+
+        assert errors == ["preempted"]
+        release.set()
+        holder.join(5)
+        t_crit.join(5)
+
+    def test_full_queue_rejects_lower_priority(self):
+        scheduler = LLMScheduler(max_in_flight=1, max_queue=1)
+        release = threading.Event()
+        holder = hold_slot(scheduler, release)
+        t = queue_request(scheduler, Priority.IMPORTANT)
+
+        with pytest.raises(SchedulerRejected) as exc:
+            with scheduler.slot(Priority.OPTIONAL):
+                pass
+        assert exc.value.reason == "queue_full"
+        release.set()
+        holder.join(5)
+        t.join(5)
+
+
+class TestDeadlines:
+    """Test deadline-aware admission."""
+
+    def test_expired_deadline_rejected(self):
+        scheduler = LLMScheduler()
+        with pytest.raises(SchedulerRejected) as exc:
+            with scheduler.slot(Priority.IMPORTANT, deadline=time.monotonic() - 1):
+                pass
+        assert exc.value.reason == "deadline"
+
+    def test_context_timeout_applies_while_waiting(self):
+        scheduler = LLMScheduler(max_in_flight=1)
+        release = threading.Event()
+        holder = hold_slot(scheduler, release)
+        try:
+            with llm_priority(Priority.OPTIONAL, timeout=0.05):
+                assert scheduler.priority_for("anything") == Priority.OPTIONAL
+                with pytest.raises(SchedulerRejected):
+                    with scheduler.slot():
+                        pass
+        finally:
+            release.set()
+            holder.join(5)
+        assert scheduler.get_stats()["in_flight"] == 0
+
+    def test_profile_mapping(self):
+        scheduler = LLMScheduler.from_config(
+            {"llm_scheduler": {"profiles": {"goal": "critical"}, "default_priority": "optional"}}
+        )
+        assert scheduler.priority_for("goal") == Priority.CRITICAL
+        assert scheduler.priority_for("narrative") == Priority.OPTIONAL
+
+
+class TestAsyncSlot:
+    """Test slot_async()."""
+
+    async def test_async_waiters_do_not_exceed_limit(self):
+        scheduler = LLMScheduler(max_in_flight=1)
+        active = peak = 0
+
+        async def _work():
+            nonlocal active, peak
+            async with scheduler.slot_async(Priority.IMPORTANT):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(_work() for _ in range(4)))
+        assert peak == 1
+        assert scheduler.get_stats()["in_flight"] == 0
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = LLMScheduler(max_in_flight=1)
+        async with scheduler.slot_async(Priority.CRITICAL):
+            async def _wait():
+                async with scheduler.slot_async(Priority.OPTIONAL):
+                    pass
+
+            task = asyncio.create_task(_wait())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert sum(scheduler.get_stats()["queue_depth"].values()) == 0
+        assert scheduler.get_stats()["in_flight"] == 0
+
+    async def test_cancel_after_grant_keeps_service_estimate(self):
+        """A slot granted to a waiter cancelled before using it is not timed as 0 s."""
+        scheduler = LLMScheduler(max_in_flight=1)
+
+        async def _wait():
+            async with scheduler.slot_async(Priority.OPTIONAL):
+                pass
+
+        async with scheduler.slot_async(Priority.CRITICAL):
+            task = asyncio.create_task(_wait())
+            await asyncio.sleep(0.02)
+        avg = scheduler.get_stats()["avg_service_sec"]     # slot now granted to the waiter
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert scheduler.get_stats()["avg_service_sec"] == avg >= 0.02
+        assert scheduler.get_stats()["in_flight"] == 0
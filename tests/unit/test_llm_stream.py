@@ -0,0 +1,52 @@
+"""
+Unit Tests for LLM stream early-stop detectors
+"""
+
+import json
+
+from core.llm_stream import EarlyStop, JSONObjectScanner
+
+
+class TestJSONObjectScanner:
+    """Test JSONObjectScanner."""
+
+    def test_object_across_chunks(self):
+        scanner = JSONObjectScanner()
+        assert not scanner.feed('Ответ: {"a": {"b"')
+        assert not scanner.feed(': 1}')
+        assert scanner.feed(', "c": 2} trailing')
+        assert scanner.start == 7
+
+    def test_braces_inside_strings_ignored(self):
+        scanner = JSONObjectScanner()
+        assert not scanner.feed('{"text": "a } and \\" { b"')
+        assert scanner.feed("}")
+
+
+class TestEarlyStop:
+    """Test EarlyStop."""
+
+    def test_json_text_is_the_object(self):
+        stop = EarlyStop(json_object=True)
+        for chunk in ['```json\n{"goal": "x",', ' "risk_level": "low"}', "\n```"]:
+            if stop.feed(chunk):
+                break
+        assert stop.reason == "json"
+        assert json.loads(stop.text()) == {"goal": "x", "risk_level": "low"}
+
+    def test_stop_pattern_cuts_at_match(self):
+        stop = EarlyStop(stop_patterns=[r"\n\n"])
+        assert not stop.feed("first line")
+        assert stop.feed("\n\nsecond")
+        assert stop.text() == "first line\n\n"
+
+    def test_max_chars(self):
+        stop = EarlyStop(max_chars=5)
+        assert stop.feed("abcdefgh")
+        assert stop.text() == "abcde"
+
+    def test_incomplete_returns_everything(self):
+        stop = EarlyStop(json_object=True)
+        assert not stop.feed('{"a": ')
+        assert not stop.done
+        assert stop.text() == '{"a": '
@@ -0,0 +1,161 @@
+"""
+Unit Tests for OllamaClient batched embeddings and streamed chat
+"""
+
+import pytest
+
+from core.ollama_client import OllamaClient
+
+
+class FakeOllama:
+    """Stands in for ollama.Client: records embed() inputs."""
+
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.calls: list = []
+        self.fail_on = fail_on
+
+    def embed(self, model, input):
+        self.calls.append(input)
+        items = input if isinstance(input, list) else [input]
+        if self.fail_on in items:
+            raise ValueError("bad input")
+        return {"embeddings": [[float(len(t)), 1.0] for t in items]}
+
+    def chat(self, model, messages, options, stream=False):
+        self.calls.append(messages[-1]["content"])
+        self.options = options
+        self.streamed = []
+        if not stream:
+            return {"message": {"content": "answer"}, "prompt_eval_count": 7, "eval_count": 3}
+
+        def _gen():
+            for chunk in ['{"contradicts": ', 'true', '}', ' because', ' reasons']:
+                self.streamed.append(chunk)
+                yield {"message": {"content": chunk}}
+        return _gen()
+
+
+@pytest.fixture
+def client():
+    c = OllamaClient({"ollama": {"embed_batch_size": 2}, "cache": {"max_size": 10}})
+    c._client = FakeOllama()
+    return c
+
+
+class TestEmbedMany:
+    """Test embed_many()."""
+
+    def test_one_request_per_batch(self, client):
+        """Texts are chunked by embed_batch_size; order is preserved."""
+        result = client.embed_many(["a", "bb", "ccc"])
+        assert client._client.calls == [["a", "bb"], ["ccc"]]
+        assert [v[0] for v in result] == [1.0, 2.0, 3.0]
+
+    def test_duplicates_sent_once(self, client):
+        """Identical texts share one slot in the request."""
+        result = client.embed_many(["x", "x", "yy"])
+        assert client._client.calls == [["x", "yy"]]
+        assert result[0] == result[1]
+
+    def test_failed_batch_falls_back_per_item(self, client):
+        """A bad item only empties its own slot."""
+        client._client = FakeOllama(fail_on="bad")
+        result = client.embed_many(["ok", "bad"])
+        assert result[0] == [2.0, 1.0]
+        assert result[1] == []
+
+
+class TestEmbeddingCacheIntegration:
+    """Test that embed paths consult the embedding cache."""
+
+    def test_embed_hits_cache(self, temp_dir):
+        """A repeated embed() is served without calling Ollama."""
+        c = OllamaClient({
+            "cache": {"max_size": 10, "embeddings": {"enabled": True, "path": str(temp_dir)}},
+        })
+        c._client = FakeOllama()
+        first = c.embed("hello")
+        assert c.embed("hello") == first
+        assert c._client.calls == ["hello"]
+
+        assert c.embed_many(["hello", "new"]) == [first, [3.0, 1.0]]
+        assert c._client.calls == ["hello", ["new"]]
+
+
+class TestChatStream:
+    """Test chat_stream() / chat_until()."""
+
+    def test_stream_yields_all_chunks(self, client):
+        """Without a stop condition the whole completion is streamed and cached."""
+        text = "".join(client.chat_stream("q"))
+        assert text == '{"contradicts": true} because reasons'
+        assert client.calls_this_tick == 1
+        assert client.chat("q") == text
+        assert client._client.calls == ["q"]
+
+    def test_chat_until_stops_after_json(self, client):
+        """Generation is abandoned once the JSON object closes."""
+        assert client.chat_until("q") == '{"contradicts": true}'
+        assert client._client.streamed == ['{"contradicts": ', 'true', '}']
+
+    def test_stop_pattern(self, client):
+        """A stop pattern ends the stream at its match."""
+        text = client.chat_until("q", json_object=False, stop_patterns=[r"because"])
+        assert text == '{"contradicts": true} because'
+
+    def test_no_client_returns_empty(self, client):
+        client._client = None
+        assert client.chat_until("q") == ""
+
+
+class TestCallProfile:
+    """Test call_profile on chat()."""
+
+    def test_profile_sets_num_predict_and_records_usage(self, client):
+        profile = client.token_budget.profile("test_profile")
+        assert client.chat("q", call_profile="test_profile") == "answer"
+        assert client._client.options == {"num_predict": profile.num_predict}
+        usage = client.token_budget.get_stats()["test_profile"]
+        assert usage["prompt_tokens"] == 7
+        assert usage["output_tokens"] == 3
+
+
+class TestChatMetrics:
+    """Test what chat() reports as a cache hit."""
+
+    def test_shared_request_is_not_a_cache_hit(self, client):
+        """Joining another caller's in-flight request is not counted as cached."""
+        calls = []
+        client._metrics.record_llm_call = lambda **kw: calls.append(kw)
+        client._inflight.do = lambda key, fn: ("answer", True)
+        assert client.chat("shared q") == "answer"
+        assert calls[-1]["cached"] is False
+
+        client._cache.set("q2", "", "cached answer", client._cache_variant(None))
+        assert client.chat("q2") == "cached answer"
+        assert calls[-1]["cached"] is True
+
+
+class TestSchedulerSlot:
+    """Test how retries hold the scheduler slot."""
+
+    def test_slot_released_during_backoff(self, client, monkeypatch):
+        """A failed attempt frees its slot before the backoff sleep."""
+        fake = client._client
+        attempts = []
+
+        def flaky_chat(model, messages, options, stream=False):
+            attempts.append(client._scheduler.get_stats()["in_flight"])
+            if len(attempts) == 1:
+                raise ConnectionError("connection refused")
+            return {"message": {"content": "answer"}}
+
+        fake.chat = flaky_chat
+        in_sleep = []
+        monkeypatch.setattr(
+            "core.ollama_client.time.sleep",
+            lambda s: in_sleep.append(client._scheduler.get_stats()["in_flight"]),
+        )
+        assert client.chat("retry me") == "answer"
+        assert attempts == [1, 1]
+        assert in_sleep == [0]
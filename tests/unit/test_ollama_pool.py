@@ -0,0 +1,150 @@
+"""
+Unit Tests for OllamaPool (endpoint routing, balancing, ejection)
+"""
+
+import pytest
+
+from core.circuit_breaker import CircuitBreakerOpen
+from core.ollama_pool import NoEndpointAvailable, OllamaEndpoint, OllamaPool
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from core.async_ollama_client import AsyncOllamaClient  # noqa: E402
+
+
+def make_pool() -> OllamaPool:
+    return OllamaPool([
+        OllamaEndpoint("http://a:1", ["embed-model"]),
+        OllamaEndpoint("http://b:2", ["chat-model"]),
+        OllamaEndpoint("http://c:3", ["chat-model"]),
+    ])
+
+
+class TestRouting:
+    """Test per-model routing and least-outstanding balancing."""
+
+    def test_models_route_to_their_endpoints(self):
+        pool = make_pool()
+        assert pool.call("embed-model", lambda ep: ep.url) == "http://a:1"
+        assert pool.call("chat-model", lambda ep: ep.url) in ("http://b:2", "http://c:3")
+
+    def test_least_outstanding_wins(self):
+        pool = make_pool()
+        with pool.lease("chat-model") as first:
+            second = pool.call("chat-model", lambda ep: ep)
+            assert second is not first
+        assert first.outstanding == 0
+
+    def test_sequential_calls_alternate(self):
+        pool = make_pool()
+        urls = [pool.call("chat-model", lambda ep: ep.url) for _ in range(4)]
+        assert urls.count("http://b:2") == 2
+
+    def test_unrouted_model_raises_breaker_open(self):
+        pool = make_pool()
+        with pytest.raises(CircuitBreakerOpen):
+            pool.call("other-model", lambda ep: ep)
+
+    def test_default_config_is_single_endpoint(self):
+        pool = OllamaPool.from_config({"ollama": {"base_url": "http://x:11434/"}})
+        assert [ep.url for ep in pool.endpoints] == ["http://x:11434"]
+        assert pool.routes("anything")
+
+
+class TestHealth:
+    """Test ejection and per-endpoint breakers."""
+
+    def test_failed_probe_ejects_until_healthy(self):
+        pool = make_pool()
+        pool.check(lambda ep: ep.url != "http://b:2")
+        assert {pool.call("chat-model", lambda ep: ep.url) for _ in range(3)} == {"http://c:3"}
+
+        pool.check(lambda ep: True)
+        assert not pool.endpoints[1].is_ejected()
+        assert pool.get_state("chat-model") == "closed"
+
+    def test_all_ejected(self):
+        pool = make_pool()
+        pool.check(lambda ep: ep.url == "http://a:1")
+        assert pool.get_state("chat-model") == "open"
+        with pytest.raises(NoEndpointAvailable):
+            pool.call("chat-model", lambda ep: ep)
+
+    def test_open_breaker_takes_endpoint_out(self):
+        pool = make_pool()
+        bad = pool.endpoints[1]
+
+        def _fail_on_b(ep):
+            if ep is bad:
+                raise ConnectionError("refused")
+            return ep.url
+
+        for _ in range(20):
+            try:
+                pool.call("chat-model", _fail_on_b)
+            except ConnectionError:
+                pass
+        assert bad.breaker.get_state() == "open"
+        assert "refused" in bad.last_error
+        assert pool.call("chat-model", _fail_on_b) == "http://c:3"
+        assert pool.get_state("chat-model") == "half_open"
+
+
+async def _ollama_stub(name: str) -> TestServer:
+    """Local stand-in for one Ollama instance."""
+    async def chat(request):
+        body = await request.json()
+        return web.json_response({"message": {"content": f"{name}:{body['model']}"}})
+
+    async def embed(request):
+        body = await request.json()
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        return web.json_response({"embeddings": [[float(len(name))] for _ in inputs]})
+
+    async def tags(request):
+        return web.json_response({"models": []})
+
+    app = web.Application()
+    app.router.add_post("/api/chat", chat)
+    app.router.add_post("/api/embed", embed)
+    app.router.add_get("/api/tags", tags)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+class TestAsyncClientWithStandIns:
+    """AsyncOllamaClient against stand-in servers on different ports."""
+
+    async def test_chat_and_embed_split_across_instances(self):
+        servers = {name: await _ollama_stub(name) for name in ("embed", "chatB", "chatC")}
+        url = {name: str(srv.make_url("")).rstrip("/") for name, srv in servers.items()}
+        cfg = {
+            "ollama": {
+                "strategy_model": "llm",
+                "embed_model": "emb",
+                "endpoints": [
+                    {"url": url["embed"], "models": ["emb"]},
+                    {"url": url["chatB"], "models": ["llm"]},
+                    {"url": url["chatC"], "models": ["llm"]},
+                ],
+            },
+            "cache": {"max_size": 10, "embeddings": {"enabled": False}},
+            "rate_limit": {"chat_rate": 1000, "chat_burst": 1000},
+        }
+        client = AsyncOllamaClient(cfg)
+        try:
+            assert await client.is_available()
+            answers = {await client.chat(f"q{i}") for i in range(4)}
+            assert answers == {"chatB:llm", "chatC:llm"}
+            assert await client.embed("text") == [5.0]
+
+            await servers["chatB"].close()
+            assert await client.is_available()
+            assert await client.chat("after outage") == "chatC:llm"
+        finally:
+            await client.close()
+            for srv in servers.values():
+                await srv.close()
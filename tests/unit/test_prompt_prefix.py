@@ -0,0 +1,85 @@
+"""
+Unit Tests for PromptPrefixCache (prefix reuse, primed contexts, savings)
+"""
+
+from core.ollama_client import OllamaClient
+from core.prompt_prefix import PRIME_PROMPT, PromptPrefixCache, join_sections
+
+
+def response(prompt_eval_sec: float) -> dict:
+    return {"prompt_eval_duration": int(prompt_eval_sec * 1e9)}
+
+
+class TestLayout:
+    """Test join_sections()."""
+
+    def test_skips_empty_sections(self):
+        assert join_sections("a", "", "  ", "\nb\n") == "a\nb"
+
+
+class TestSavings:
+    """Test warm/cold accounting and per-tick savings."""
+
+    def test_warm_call_saving_is_counted_per_tick(self):
+        cache = PromptPrefixCache()
+        cache.record("monologue", "PREFIX", response(2.0))   # cold
+        cache.record("monologue", "PREFIX", response(0.5))   # warm
+        assert cache.end_tick() == 1.5
+        assert cache.end_tick() == 0.0
+
+        stats = cache.get_stats()
+        assert stats["warm_calls"] == 1
+        assert stats["cold_calls"] == 1
+        assert stats["saved_total_sec"] == 1.5
+
+    def test_changed_prefix_is_cold(self):
+        cache = PromptPrefixCache()
+        cache.record("goal", "A", response(1.0))
+        cache.record("goal", "B", response(1.0))
+        assert cache.get_stats()["cold_calls"] == 2
+        assert cache.end_tick() == 0.0
+
+    def test_profiles_tracked_separately(self):
+        cache = PromptPrefixCache()
+        cache.record("monologue", "SAME", response(1.0))
+        cache.record("goal", "SAME", response(1.0))
+        assert cache.get_stats()["warm_calls"] == 0
+
+
+class TestContextMode:
+    """Test primed contexts."""
+
+    def test_uses_context_only_for_listed_profiles(self):
+        cache = PromptPrefixCache(mode="context", context_profiles=["monologue"])
+        assert cache.uses_context("monologue")
+        assert not cache.uses_context("goal")
+        assert not PromptPrefixCache().uses_context("monologue")
+
+    def test_contexts_are_bounded(self):
+        cache = PromptPrefixCache(mode="context", max_contexts=2)
+        for i in range(3):
+            cache.store_context("http://a", "m", f"prefix{i}", [i])
+        assert cache.context_for("http://a", "m", "prefix0") is None
+        assert cache.context_for("http://a", "m", "prefix2") == [2]
+        assert cache.context_for("http://b", "m", "prefix2") is None
+
+    def test_client_primes_prefix_once(self):
+        class FakeGenerate:
+            def __init__(self):
+                self.calls = []
+
+            def generate(self, model, prompt, options, system=None, context=None, **kw):
+                self.calls.append((prompt, system, context))
+                return {"response": "ok", "context": [1, 2, 3], "prompt_eval_duration": 10}
+
+        client = OllamaClient({"cache": {"max_size": 10}})
+        client.prompt_prefix = PromptPrefixCache(mode="context")
+        client._client = FakeGenerate()
+
+        assert client.chat("first", "PREFIX") == "ok"
+        assert client.chat("second", "PREFIX") == "ok"
+        assert client._client.calls == [
+            (PRIME_PROMPT, "PREFIX", None),
+            ("first", None, [1, 2, 3]),
+            ("second", None, [1, 2, 3]),
+        ]
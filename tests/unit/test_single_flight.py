@@ -0,0 +1,104 @@
+"""
+Unit Tests for single-flight request coalescing
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    """Test thread-based coalescing."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Identical concurrent keys run the function once."""
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "result"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert [r[0] for r in results] == ["result"] * 5
+        assert sum(1 for r in results if r[1]) == 4
+        assert flight.get_stats()["in_flight"] == 0
+
+    def test_errors_propagate_to_followers(self):
+        """A leader exception is raised in every waiter, then the key is free."""
+        flight = SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def failing():
+            started.set()
+            time.sleep(0.05)
+            raise RuntimeError("boom")
+
+        def follower():
+            started.wait()
+            try:
+                flight.do("k", failing)
+            except RuntimeError as e:
+                errors.append(e)
+
+        t = threading.Thread(target=follower)
+        t.start()
+        with pytest.raises(RuntimeError):
+            flight.do("k", failing)
+        t.join()
+
+        assert len(errors) == 1
+        assert flight.do("k", lambda: "ok") == ("ok", False)
+
+
+class TestAsyncSingleFlight:
+    """Test asyncio-based coalescing."""
+
+    async def test_gather_duplicates(self):
+        """Duplicate keys inside one gather() hit the backend once."""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key.upper()
+
+        results = await asyncio.gather(
+            *(flight.do(k, lambda k=k: fetch(k)) for k in ["a", "b", "a", "a"])
+        )
+
+        assert sorted(calls) == ["a", "b"]
+        assert [r[0] for r in results] == ["A", "B", "A", "A"]
+        assert flight.get_stats() == {"executions": 2, "shared": 2, "in_flight": 0}
+
+    async def test_cancelled_follower_does_not_cancel_leader(self):
+        """Cancelling one caller leaves the shared request running."""
+        flight = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.ensure_future(flight.do("k", fetch))
+        follower = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        follower.cancel()
+
+        assert await leader == ("done", False)
@@ -0,0 +1,143 @@
+"""
+Unit Tests for StepGraph (dependency scheduling, deadline, critical path)
+"""
+
+import asyncio
+
+import pytest
+
+from core.step_graph import STOP, Step, StepGraph
+
+
+def sleeper(seconds: float, result=None):
+    async def _run(**kwargs):
+        await asyncio.sleep(seconds)
+        return result
+    return _run
+
+
+class TestStructure:
+    """Test graph validation."""
+
+    def test_cycle_rejected(self):
+        with pytest.raises(ValueError):
+            StepGraph("g", [
+                Step("a", sleeper(0), inputs=("y",), outputs=("x",)),
+                Step("b", sleeper(0), inputs=("x",), outputs=("y",)),
+            ])
+
+    def test_missing_external_input(self):
+        graph = StepGraph("g", [Step("a", sleeper(0), inputs=("n",))])
+        assert graph.external_inputs == {"n"}
+        with pytest.raises(ValueError):
+            asyncio.run(graph.run())
+
+
+class TestScheduling:
+    """Test data flow and concurrency."""
+
+    async def test_values_flow_between_steps(self):
+        async def double(x):
+            return x * 2
+
+        async def split(y):
+            return y, y + 1
+
+        graph = StepGraph("g", [
+            Step("double", double, inputs=("x",), outputs=("y",)),
+            Step("split", split, inputs=("y",), outputs=("a", "b")),
+        ])
+        run = await graph.run({"x": 3})
+        assert (run.values["a"], run.values["b"]) == (6, 7)
+
+    async def test_independent_steps_overlap(self):
+        graph = StepGraph("g", [
+            Step("root", sleeper(0.01, 1), outputs=("v",)),
+            *(Step(f"leaf{i}", sleeper(0.1), after=("root",)) for i in range(4)),
+        ])
+        run = await graph.run()
+        assert run.elapsed < 0.3
+        assert all(rec.status == "ok" for rec in run.steps.values())
+
+    async def test_after_orders_without_values(self):
+        order = []
+
+        def record(name):
+            async def _run():
+                await asyncio.sleep(0.01)
+                order.append(name)
+            return _run
+
+        graph = StepGraph("g", [
+            Step("second", record("second"), after=("first",)),
+            Step("first", record("first")),
+        ])
+        await graph.run()
+        assert order == ["first", "second"]
+
+
+class TestFailures:
+    """Test fallbacks, STOP and the deadline."""
+
+    async def test_timeout_uses_fallback(self):
+        graph = StepGraph("g", [
+            Step("slow", sleeper(1), outputs=("ctx",), timeout=0.02, fallback=""),
+            Step("use", sleeper(0, "done"), inputs=("ctx",), outputs=("out",)),
+        ])
+        run = await graph.run()
+        assert run.steps["slow"].status == "timeout"
+        assert run.steps["slow"].used_fallback
+        assert run.values["out"] == "done"
+
+    async def test_failure_without_fallback_skips_dependents(self):
+        async def boom():
+            raise RuntimeError("llm down")
+
+        graph = StepGraph("g", [
+            Step("goal", boom, outputs=("goal",)),
+            Step("action", sleeper(0), inputs=("goal",)),
+            Step("curiosity", sleeper(0), after=("action",)),
+            Step("other", sleeper(0)),
+        ])
+        run = await graph.run()
+        assert run.steps["goal"].error == "llm down"
+        assert run.steps["action"].status == "skipped"
+        assert run.steps["curiosity"].status == "skipped"
+        assert run.steps["other"].status == "ok"
+
+    async def test_stop_ends_branch(self):
+        graph = StepGraph("g", [
+            Step("mode", sleeper(0, STOP), outputs=("mode",)),
+            Step("goal", sleeper(0), inputs=("mode",)),
+        ])
+        run = await graph.run()
+        assert run.steps["mode"].status == "stopped"
+        assert run.steps["goal"].status == "skipped"
+
+    async def test_deadline_cancels_running_steps(self):
+        graph = StepGraph("g", [
+            Step("fast", sleeper(0), outputs=("v",)),
+            Step("slow", sleeper(5), inputs=("v",)),
+            Step("after_slow", sleeper(0), after=("slow",)),
+        ])
+        run = await graph.run(deadline=0.05)
+        assert run.deadline_hit
+        assert run.steps["slow"].status == "cancelled"
+        assert run.steps["after_slow"].status == "skipped"
+
+
+class TestCriticalPath:
+    """Test critical-path timing."""
+
+    async def test_longest_chain_is_critical(self):
+        graph = StepGraph("g", [
+            Step("monologue", sleeper(0.01), outputs=("m",)),
+            Step("goal", sleeper(0.05), inputs=("m",), outputs=("g",)),
+            Step("embed", sleeper(0.01), inputs=("m",)),
+            Step("beliefs", sleeper(0.01), after=("goal",)),
+            Step("curiosity", sleeper(0.08), after=("goal",)),
+        ])
+        run = await graph.run()
+        assert run.critical_path == ["monologue", "goal", "curiosity"]
+        assert not run.steps["embed"].critical
+        assert graph.get_stats()["last_run"]["critical_path"] == run.critical_path
@@ -0,0 +1,141 @@
+"""
+Unit Tests for TickIntervalController (adaptive interval, OPTIONAL-step deferral)
+"""
+
+import asyncio
+import time
+
+from core.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from core.event_bus import EventBus
+from core.step_graph import STOP
+from core.tick_interval import TickIntervalController
+
+
+class FakeScheduler:
+    def __init__(self, depth: int = 0):
+        self.depth = depth
+
+    def get_stats(self) -> dict:
+        return {"queue_depth": {"optional": self.depth}}
+
+
+def make_ctl(**kw) -> TickIntervalController:
+    kw.setdefault("base_sec", 90)
+    kw.setdefault("min_sec", 30)
+    kw.setdefault("max_sec", 300)
+    kw.setdefault("scheduler", FakeScheduler())
+    kw.setdefault("breakers", CircuitBreakerRegistry())
+    return TickIntervalController(**kw)
+
+
+class TestInterval:
+    """Test interval decisions."""
+
+    def test_steady_keeps_base(self):
+        ctl = make_ctl(idle_after_ticks=5)
+        assert ctl.end_tick(10.0) == 80.0
+        assert ctl.reason == "steady"
+        assert ctl.pressure == "normal"
+
+    def test_overrun_stretches_interval(self):
+        ctl = make_ctl(target_utilization=0.5)
+        ctl.end_tick(60.0)
+        assert ctl.reason == "overrun"
+        assert ctl.interval == 120.0
+        assert ctl.pressure == "high"
+
+    def test_backlog_shortens_interval(self):
+        ctl = make_ctl()
+        ctl.add_backlog("multi_agent", lambda: 2)
+        assert ctl.end_tick(10.0) == 20.0
+        assert ctl.reason == "backlog"
+
+    def test_idle_ticks_grow_up_to_max(self):
+        ctl = make_ctl(idle_after_ticks=2, growth=2.0)
+        ctl.end_tick(1.0)
+        assert ctl.reason == "steady"
+        ctl.end_tick(1.0)
+        assert (ctl.reason, ctl.interval) == ("idle", 180.0)
+        ctl.end_tick(1.0)
+        assert ctl.interval == 300.0
+
+    def test_deep_llm_queue_is_pressure(self):
+        ctl = make_ctl(scheduler=FakeScheduler(depth=10), queue_high=4, growth=2.0)
+        ctl.end_tick(1.0)
+        assert (ctl.reason, ctl.interval, ctl.pressure) == ("llm_queue", 180.0, "high")
+
+    def test_open_breaker_backs_off(self):
+        breakers = CircuitBreakerRegistry()
+        breaker = CircuitBreaker("ollama:test", failure_threshold=1)
+        breakers.register(breaker)
+        breaker._on_failure()
+        ctl = make_ctl(breakers=breakers)
+        ctl.add_backlog("inbox", lambda: 1)
+        ctl.end_tick(10.0)
+        assert (ctl.reason, ctl.interval, ctl.pressure) == ("breaker_open", 300.0, "critical")
+
+    def test_disabled_is_fixed_interval(self):
+        ctl = make_ctl(enabled=False)
+        ctl.add_backlog("x", lambda: 5)
+        assert ctl.end_tick(100.0) == 0.0
+        assert ctl.end_tick(30.0) == 60.0
+
+
+class TestEvents:
+    """Test bus events and early wake-up."""
+
+    async def test_message_during_tick_is_backlog(self):
+        ctl, bus = make_ctl(), EventBus()
+        ctl.subscribe(bus)
+        ctl.begin_tick(1)
+        await bus.publish("user.message", {"text": "hi"})
+        ctl.end_tick(5.0)
+        assert ctl.reason == "backlog"
+
+        ctl.begin_tick(2)
+        ctl.end_tick(5.0)
+        assert ctl.reason != "backlog"
+
+    async def test_message_during_pause_wakes_early(self):
+        ctl, bus = make_ctl(min_sec=0.05, base_sec=10), EventBus()
+        ctl.subscribe(bus)
+        tick_start = time.monotonic()
+
+        async def _message_arrives():
+            await asyncio.sleep(0.02)
+            await bus.publish("user.urgent", {"text": "now"})
+
+        await asyncio.wait_for(
+            asyncio.gather(ctl.sleep(asyncio.sleep(10), tick_start), _message_arrives()),
+            timeout=1,
+        )
+        assert time.monotonic() - tick_start >= 0.05
+        assert ctl.get_stats()["woken"] == 1
+
+
+class TestOptionalSteps:
+    """Test deferral of OPTIONAL steps under pressure."""
+
+    async def test_high_pressure_coalesces(self):
+        ctl = make_ctl(coalesce_every=3)
+        ctl.end_tick(100.0)   # overrun → high
+        calls = []
+
+        async def curiosity(n):
+            calls.append(n)
+
+        gated = ctl.gate("curiosity", curiosity)
+        results = []
+        for n in range(1, 7):
+            ctl.begin_tick(n)
+            results.append(await gated(n=n))
+        assert calls == [3, 6]
+        assert results.count(STOP) == 4
+        assert ctl.get_stats()["optional_skipped"] == 4
+
+    def test_timeout_skips_all(self):
+        ctl = make_ctl(coalesce_every=1)
+        ctl.end_tick(120.0, timed_out=True)
+        assert ctl.pressure == "critical"
+        ctl.begin_tick(3)
+        assert not ctl.allow_optional("meta_cognition")
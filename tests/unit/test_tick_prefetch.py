@@ -0,0 +1,175 @@
+"""
+Unit Tests for TickPrefetcher (idle-time preparation, invalidation)
+"""
+
+import asyncio
+
+from core.event_bus import EventBus
+from core.ollama_client import OllamaClient
+from core.tick_prefetch import TickPrefetcher
+
+
+class Recorder:
+    """build / warm / embed stand-ins that count their calls."""
+
+    def __init__(self):
+        self.builds = 0
+        self.drafts = []
+        self.embedded = []
+
+    async def build(self):
+        self.builds += 1
+        return "SYSTEM", f"prompt{self.builds}"
+
+    async def warm(self, system, prompt):
+        self.drafts.append(prompt)
+        return f"draft of {prompt}"
+
+    async def embed(self, text):
+        self.embedded.append(text)
+
+
+def make_prefetcher(**kw) -> TickPrefetcher:
+    kw.setdefault("lead_sec", 10)
+    kw.setdefault("min_lead_sec", 0.05)
+    return TickPrefetcher(**kw)
+
+
+class TestIdle:
+    """Test preparation during the idle interval."""
+
+    async def test_prepares_drafts_and_embeds(self):
+        prefetch, rec = make_prefetcher(), Recorder()
+        await prefetch.idle(0.2, rec.build, warm=rec.warm, embed=rec.embed)
+
+        assert prefetch.take() == ("SYSTEM", "prompt1")
+        assert rec.drafts == ["prompt1"]
+        assert rec.embedded == ["draft of prompt1"]
+        assert prefetch.take() is None   # one use
+        assert prefetch.get_stats()["hit"] == 1
+
+    async def test_short_delay_just_sleeps(self):
+        prefetch, rec = make_prefetcher(min_lead_sec=1), Recorder()
+        await prefetch.idle(0.05, rec.build)
+        assert rec.builds == 0
+        assert prefetch.take() is None
+
+    async def test_stage_task_is_owned_and_replaced(self):
+        prefetch, rec = make_prefetcher(), Recorder()
+
+        async def slow_warm(system, prompt):
+            await asyncio.sleep(10)
+
+        await prefetch.idle(0.1, rec.build, warm=slow_warm)
+        first = prefetch._stage_task
+        assert first is not None and not first.done()   # draft outlives idle()
+
+        await prefetch.idle(0.1, rec.build)
+        assert first.cancelled()
+        prefetch.close()
+        assert prefetch._stage_task is None
+
+    async def test_disabled(self):
+        prefetch, rec = make_prefetcher(enabled=False), Recorder()
+        await prefetch.idle(0.1, rec.build)
+        assert rec.builds == 0
+
+
+class TestInvalidation:
+    """Test that changed inputs drop the prepared prompt."""
+
+    async def test_event_reprepares_while_time_remains(self):
+        prefetch, rec = make_prefetcher(), Recorder()
+        bus = EventBus()
+        prefetch.subscribe(bus)
+
+        async def _message_arrives():
+            await asyncio.sleep(0.05)
+            await bus.publish("user.message", {"text": "hi"})
+
+        await asyncio.gather(
+            prefetch.idle(0.3, rec.build, warm=rec.warm),
+            _message_arrives(),
+        )
+        assert prefetch.take() == ("SYSTEM", "prompt2")
+        assert prefetch.get_stats()["invalidated"] == 1
+
+    async def test_invalidated_after_stage_is_a_miss(self):
+        prefetch, rec = make_prefetcher(), Recorder()
+        await prefetch.idle(0.1, rec.build)
+        prefetch.invalidate("world.updated")
+        assert prefetch.take() is None
+        assert prefetch.get_stats()["miss"] == 1
+
+    async def test_old_prompt_is_stale(self):
+        prefetch, rec = make_prefetcher(max_age_sec=0), Recorder()
+        await prefetch.idle(0.1, rec.build)
+        await asyncio.sleep(0.01)
+        assert prefetch.take() is None
+        assert prefetch.get_stats()["stale"] == 1
+
+
+class ChatOnly:
+    """Stands in for ollama.Client: answers every chat() the same way."""
+
+    def __init__(self):
+        self.calls = []
+
+    def chat(self, model, messages, options, stream=False):
+        self.calls.append(messages[-1]["content"])
+        return {"message": {"content": "thought"}, "prompt_eval_count": 5, "eval_count": 2}
+
+
+class TestBudget:
+    """Test the draft against the real client's per-tick call budget."""
+
+    async def test_draft_is_charged_to_next_tick(self):
+        client = OllamaClient({"resources": {"budget": {"max_llm_calls": 3}},
+                               "cache": {"max_size": 10}})
+        client._client = ChatOnly()
+        client.calls_this_tick = 3      # the finished tick used its whole budget
+
+        async def build():
+            return "SYSTEM", "prefetch budget prompt"
+
+        async def warm(system, prompt):
+            return await asyncio.to_thread(client.chat, prompt, system, call_profile="monologue")
+
+        prefetch = make_prefetcher()
+        await prefetch.idle(0.2, build, warm=warm)
+        assert client._client.calls == ["prefetch budget prompt"]
+        assert client.calls_next_tick == 1
+
+        client.reset_tick_counter()
+        assert client.calls_this_tick == 1
+        system, prompt = prefetch.take()
+        assert client.chat(prompt, system, call_profile="monologue") == "thought"
+        assert len(client._client.calls) == 1   # served from the cache
+
+
+class TestHeavyTickStop:
+    """Test that stopping the production tick cancels the stage task."""
+
+    async def test_fault_tolerant_stop_cancels_stage(self, temp_dir):
+        from unittest.mock import MagicMock
+
+        from core.fault_tolerant_heavy_tick import FaultTolerantHeavyTick
+
+        tick = FaultTolerantHeavyTick(
+            cfg={"ticks": {"heavy_tick_sec": 1}}, ollama=MagicMock(), world=MagicMock(),
+            values=MagicMock(), self_model=MagicMock(), mem=MagicMock(),
+            milestones=MagicMock(), log_dir=temp_dir, sandbox_dir=temp_dir,
+        )
+        tick.prefetch.min_lead_sec = 0.05
+        rec = Recorder()
+
+        async def slow_warm(system, prompt):
+            await asyncio.sleep(10)
+
+        await tick.prefetch.idle(0.1, rec.build, warm=slow_warm)
+        stage = tick.prefetch._stage_task
+        assert stage is not None and not stage.done()
+
+        tick.stop()
+        await asyncio.sleep(0)
+        assert stage.cancelled()
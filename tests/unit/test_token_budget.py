@@ -0,0 +1,69 @@
+"""
+Unit Tests for TokenBudget
+"""
+
+from core.token_budget import MIN_OBSERVATIONS, CallProfile, TokenBudget
+
+
+def make_budget() -> TokenBudget:
+    return TokenBudget(
+        profiles={"goal": CallProfile("goal", prompt_tokens=100, num_predict=200, min_predict=16)},
+        chars_per_token=1.0,
+    )
+
+
+class TestTrimming:
+    """Test estimate() / trim() / fit()."""
+
+    def test_trim_prefers_line_boundary(self):
+        budget = make_budget()
+        text = "line one\nline two\nline three"
+        trimmed = budget.trim(text, 20)
+        assert trimmed == "line one\nline two…"
+        assert budget.estimate(trimmed) <= 20
+
+    def test_fit_cuts_later_sections_first(self):
+        budget = make_budget()
+        ctx = budget.fit(
+            "goal",
+            {"first": "a" * 50, "second": "b" * 50, "third": "c" * 50},
+            reserved=20,
+        )
+        assert ctx["first"] == "a" * 50
+        assert 0 < len(ctx["second"]) < 50
+        assert ctx["third"] == ""
+
+    def test_fit_keeps_everything_within_budget(self):
+        budget = make_budget()
+        sections = {"x": "short", "y": ""}
+        assert budget.fit("goal", sections) == sections
+
+
+class TestNumPredict:
+    """Test adaptive num_predict."""
+
+    def test_default_until_enough_observations(self):
+        budget = make_budget()
+        budget.record("goal", 10, 40)
+        assert budget.num_predict("goal") == 200
+
+    def test_adapts_to_observed_outputs(self):
+        budget = make_budget()
+        for _ in range(MIN_OBSERVATIONS):
+            budget.record("goal", 10, 40)
+        assert budget.num_predict("goal") == 52   # 40 * 1.3
+
+    def test_unknown_profile_uses_default_limits(self):
+        budget = make_budget()
+        for _ in range(MIN_OBSERVATIONS):
+            budget.record("other", 10, 5)
+        assert budget.num_predict("other") == 512
+
+    def test_stats_per_profile(self):
+        budget = make_budget()
+        budget.record("goal", 30, 10)
+        budget.record(None, 5, 5)
+        stats = budget.get_stats()
+        assert stats["goal"]["calls"] == 1
+        assert stats["goal"]["prompt_tokens"] == 30
+        assert stats["default"]["output_tokens"] == 5
@@ -0,0 +1,142 @@
+"""
+Unit Tests for Tracing (nested spans, ring buffer, flame-graph export)
+"""
+
+import asyncio
+
+from core.step_graph import Step, StepGraph
+from core.tracing import (
+    Tracer,
+    annotate,
+    propagate,
+    span,
+    to_chrome_trace,
+    to_collapsed,
+    traced,
+)
+
+
+@traced("llm.chat")
+async def fake_chat(prompt: str) -> str:
+    annotate(prompt_chars=len(prompt))
+    await asyncio.sleep(0.01)
+    return "ok"
+
+
+def names(trace) -> dict:
+    """span name -> parent name"""
+    return {s.name: s.parent.name if s.parent else None for s in trace.spans}
+
+
+class TestSpans:
+    """Test nesting and attributes."""
+
+    async def test_steps_nest_across_tasks(self):
+        tracer = Tracer(enabled=True)
+
+        async def monologue():
+            return await fake_chat("hello")
+
+        async def goal_step(m):
+            return await fake_chat(m)
+
+        graph = StepGraph("g", [
+            Step("monologue", monologue, outputs=("m",)),
+            Step("goal", goal_step, inputs=("m",)),
+        ])
+        with tracer.trace("heavy_tick", tick=1):
+            await graph.run()
+
+        (trace,) = tracer.get_traces()
+        assert trace.root.attrs == {"tick": 1}
+        assert [(s.name, s.parent.name) for s in trace.spans if s.name == "llm.chat"] == [
+            ("llm.chat", "monologue"), ("llm.chat", "goal"),
+        ]
+        assert names(trace)["monologue"] == "heavy_tick"
+        chat = next(s for s in trace.spans if s.name == "llm.chat")
+        assert chat.attrs == {"prompt_chars": 5}
+
+    async def test_executor_thread_keeps_parent(self):
+        tracer = Tracer(enabled=True)
+
+        def query():
+            with span("db.query") as s:
+                s.set(rows=3)
+
+        with tracer.trace("tick"):
+            with span("step"):
+                await asyncio.get_running_loop().run_in_executor(None, propagate(query))
+
+        assert names(tracer.get_traces()[0])["db.query"] == "step"
+
+    def test_error_is_recorded(self):
+        tracer = Tracer(enabled=True)
+        try:
+            with tracer.trace("tick"):
+                with span("step"):
+                    raise ValueError("boom")
+        except ValueError:
+            pass
+        step = tracer.get_traces()[0].spans[1]
+        assert step.attrs["error"] == "ValueError"
+        assert step.end is not None
+
+
+class TestDisabled:
+    """Test that nothing is recorded outside a trace."""
+
+    async def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer(enabled=False)
+        with tracer.trace("tick") as root:
+            root.set(tick=1)
+            assert await fake_chat("x") == "ok"
+        assert tracer.get_traces() == []
+
+    def test_helpers_are_noops_outside_trace(self):
+        with span("orphan") as s:
+            s.set(a=1)
+            annotate(b=2)
+        fn = lambda: 1  # noqa: E731
+        assert propagate(fn) is fn
+
+
+class TestBuffer:
+    """Test the ring buffer and span cap."""
+
+    def test_ring_buffer_keeps_last_traces(self):
+        tracer = Tracer(enabled=True, max_traces=2)
+        for n in range(3):
+            with tracer.trace("tick", tick=n):
+                pass
+        assert [t.root.attrs["tick"] for t in tracer.get_traces()] == [1, 2]
+        assert tracer.get_stats()["finished"] == 3
+
+    def test_span_cap_counts_dropped(self):
+        tracer = Tracer(enabled=True, max_spans=3)
+        with tracer.trace("tick"):
+            for _ in range(5):
+                with span("step"):
+                    pass
+        trace = tracer.get_traces()[0]
+        assert len(trace.spans) == 3
+        assert trace.dropped == 3
+
+
+class TestExport:
+    """Test Chrome trace-event and collapsed-stack output."""
+
+    async def test_chrome_and_collapsed(self):
+        tracer = Tracer(enabled=True)
+        with tracer.trace("tick"):
+            with span("monologue"):
+                await fake_chat("hi")
+
+        chrome = to_chrome_trace(tracer.get_traces())
+        events = {e["name"]: e for e in chrome["traceEvents"]}
+        assert set(events) == {"tick", "monologue", "llm.chat"}
+        assert all(e["ph"] == "X" for e in events.values())
+        assert events["llm.chat"]["args"]["prompt_chars"] == 2
+        assert events["llm.chat"]["dur"] >= 10_000
+
+        stacks = dict(line.rsplit(" ", 1) for line in to_collapsed(tracer.get_traces()).splitlines())
+        assert int(stacks["tick;monologue;llm.chat"]) >= 10_000
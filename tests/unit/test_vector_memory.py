@@ -0,0 +1,434 @@
+"""
+Unit Tests for VectorMemory
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from core.memory.vector_memory import EmbeddingMatrix, IVFIndex, VectorMemory
+
+DIM = 8
+
+
+def _vec(seed: int) -> list[float]:
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal(DIM).astype(np.float32).tolist()
+
+
+@pytest.fixture
+def vm(temp_db):
+    mem = VectorMemory(temp_db, expected_dim=DIM, max_vectors=1000)
+    mem.init()
+    yield mem
+    mem.close()
+
+
+class TestVectorMemorySearch:
+    """Test matrix-backed search against the scan path."""
+
+    def test_matrix_matches_scan(self, temp_db):
+        """Matrix and scan modes return the same ranking."""
+        matrix_vm = VectorMemory(temp_db, expected_dim=DIM, search_mode="matrix")
+        matrix_vm.init()
+        for i in range(50):
+            matrix_vm.add(i, "monologue" if i % 2 else "action", f"text {i}", _vec(i))
+
+        scan_vm = VectorMemory(temp_db, expected_dim=DIM, search_mode="scan")
+        scan_vm.init()
+
+        query = _vec(999)
+        for event_type in (None, "action"):
+            m = matrix_vm.search(query, top_k=5, event_type_filter=event_type)
+            s = scan_vm.search(query, top_k=5, event_type_filter=event_type, batch_size=7)
+            assert [r["id"] for r in m] == [r["id"] for r in s]
+            assert np.allclose([r["score"] for r in m], [r["score"] for r in s], atol=1e-5)
+
+        matrix_vm.close()
+        scan_vm.close()
+
+    def test_scan_pages_past_deleted_ids(self, temp_db):
+        """Keyset scan covers every live row even with gaps in the id range."""
+        mem = VectorMemory(temp_db, expected_dim=DIM, search_mode="scan")
+        mem.init()
+        for i in range(30):
+            mem.add(i, "monologue", f"text {i}", _vec(i))
+        mem._conn.execute("DELETE FROM vectors WHERE id % 3 = 0")
+        mem._conn.commit()
+
+        results = mem.search(_vec(28), top_k=25, batch_size=4)
+
+        assert len(results) == 20
+        assert results[0]["episode_id"] == 28
+        scores = [r["score"] for r in results]
+        assert scores == sorted(scores, reverse=True)
+        mem.close()
+
+    def test_exact_match_ranks_first(self, vm):
+        """A stored vector is its own nearest neighbour."""
+        for i in range(20):
+            vm.add(i, "monologue", f"text {i}", _vec(i))
+
+        results = vm.search(_vec(7), top_k=3)
+
+        assert results[0]["episode_id"] == 7
+        assert results[0]["score"] == pytest.approx(1.0, abs=1e-5)
+        assert results[0]["text"] == "text 7"
+
+    def test_matrix_tracks_add_and_delete(self, vm):
+        """Matrix stays in sync with inserts and deletes."""
+        vm.add(1, "monologue", "first", _vec(1))
+        assert vm.search(_vec(1), top_k=1)[0]["episode_id"] == 1  # builds matrix
+
+        vm.add(2, "monologue", "second", _vec(2))
+        assert vm.search(_vec(2), top_k=1)[0]["episode_id"] == 2
+
+        vm._conn.execute("UPDATE vectors SET created_at = ?", (time.time() - 90 * 86400,))
+        vm._conn.commit()
+        assert vm.delete_old(days=30) == 2
+        assert vm.search(_vec(1), top_k=5) == []
+        assert vm.get_stats()["matrix_vectors"] == 0
+
+    def test_lru_cleanup_updates_matrix(self, temp_db):
+        """Auto-cleanup removes evicted rows from the matrix."""
+        mem = VectorMemory(temp_db, expected_dim=DIM, max_vectors=10)
+        mem.init()
+        mem.search(_vec(0), top_k=1)  # load empty matrix
+        for i in range(12):
+            mem.add(i, "monologue", f"text {i}", _vec(i))
+
+        assert mem.get_stats()["matrix_vectors"] == mem.count()
+        mem.close()
+
+    def test_adds_during_matrix_build_appear_once(self, temp_db):
+        """Rows written while the matrix is being built are mirrored exactly once."""
+        mem = VectorMemory(temp_db, expected_dim=DIM, max_vectors=100_000)
+        mem.init()
+        mem.add_many([
+            {"episode_id": i, "event_type": "m", "text": "t", "embedding": _vec(i)}
+            for i in range(3000)
+        ])
+        stop = threading.Event()
+
+        def _writer():
+            i = 3000
+            while not stop.is_set():
+                mem.add(i, "m", "t", _vec(i))
+                i += 1
+
+        writer = threading.Thread(target=_writer)
+        writer.start()
+        try:
+            mem.search(_vec(0), top_k=1)   # builds the matrix
+        finally:
+            stop.set()
+            writer.join()
+
+        ids, _ = mem._matrix.list_assignments()
+        assert len(ids) == len(set(ids.tolist())) == mem.count()
+        mem.close()
+
+    def test_invalid_search_mode(self, temp_db):
+        """Unknown search mode is rejected."""
+        with pytest.raises(ValueError):
+            VectorMemory(temp_db, expected_dim=DIM, search_mode="bogus")
+
+
+class TestEmbeddingMatrix:
+    """Test EmbeddingMatrix primitives."""
+
+    def test_zero_vector_scores_zero(self):
+        """Zero vectors are kept and score 0."""
+        m = EmbeddingMatrix(DIM)
+        m.append([1], ["x"], np.zeros((1, DIM), dtype=np.float32))
+        assert m.top_k(np.ones(DIM, dtype=np.float32), 1) == [(1, 0.0)]
+
+    def test_remove(self):
+        """Removed ids no longer appear in results."""
+        m = EmbeddingMatrix(DIM)
+        m.append([1, 2, 3], ["a", "b", "a"], np.stack([_vec(i) for i in range(3)]))
+        assert m.remove([2]) == 1
+        assert len(m) == 2
+        assert {vid for vid, _ in m.top_k(np.asarray(_vec(0)), 10)} == {1, 3}
+
+
+class TestIVFIndex:
+    """Test the optional ANN index."""
+
+    @staticmethod
+    def _clustered(n: int, seed: int = 0) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        centers = rng.standard_normal((16, DIM))
+        return (centers[rng.integers(0, 16, n)] + 0.1 * rng.standard_normal((n, DIM))).astype(np.float32)
+
+    def test_ann_recall_and_persistence(self, temp_db):
+        """IVF search finds the true neighbour and survives a restart."""
+        data = self._clustered(400)
+        mem = VectorMemory(
+            temp_db, expected_dim=DIM, max_vectors=10_000,
+            ann_index=True, ann_nprobe=4, ann_min_vectors=100,
+        )
+        mem.init()
+        for i, v in enumerate(data):
+            mem.add(i, "monologue", f"text {i}", v.tolist())
+
+        assert mem.search(data[123].tolist(), top_k=1)[0]["episode_id"] == 123
+        assert mem.wait_for_ann(timeout=10)    # trained off the query path
+        assert mem.search(data[123].tolist(), top_k=1)[0]["episode_id"] == 123
+        stats = mem.get_stats()
+        assert stats["ann_trained"] and stats["ann_nlist"] == 20
+
+        mem.add(400, "monologue", "late", data[5].tolist())  # incremental insert
+        top = mem.search(data[5].tolist(), top_k=2)
+        assert {r["episode_id"] for r in top} == {5, 400}
+        mem.close()
+
+        index_path = temp_db.with_name(temp_db.stem + ".ivf.npz")
+        assert index_path.exists()
+
+        reopened = VectorMemory(
+            temp_db, expected_dim=DIM, ann_index=True, ann_nprobe=4, ann_min_vectors=100,
+        )
+        reopened.init()
+        assert reopened.search(data[77].tolist(), top_k=1)[0]["episode_id"] == 77
+        assert reopened.get_stats()["ann_trained"]
+        reopened.close()
+
+    def test_probe_gathers_grouped_lists_and_tail(self):
+        """Probing all lists matches exact search, including rows appended later."""
+        data = self._clustered(300)
+        m = EmbeddingMatrix(DIM)
+        m.append(list(range(300)), ["a"] * 300, data)
+        index = IVFIndex(DIM, nprobe=8)
+        m.assign_lists(index, centroids=index.fit(EmbeddingMatrix.normalize(data), 8),
+                       trained_size=300)
+        q = data[42]
+        assert m.top_k(q, 5, index=index) == m.top_k(q, 5)
+
+        m.append([300], ["b"], data[42:43], index)    # tail row, not regrouped yet
+        assert m.top_k(q, 2, index=index) == m.top_k(q, 2)
+        assert m.top_k(q, 1, "b", index=index)[0][0] == 300
+        m.remove([42])
+        assert 42 not in {vid for vid, _ in m.top_k(q, 5, index=index)}
+
+    def test_exact_below_threshold(self, temp_db):
+        """Below ann_min_vectors the index is never trained."""
+        mem = VectorMemory(temp_db, expected_dim=DIM, ann_index=True, ann_min_vectors=1000)
+        mem.init()
+        for i in range(20):
+            mem.add(i, "monologue", f"text {i}", _vec(i))
+        assert mem.search(_vec(3), top_k=1)[0]["episode_id"] == 3
+        assert not mem.get_stats()["ann_trained"]
+        mem.close()
+
+
+class TestCodecs:
+    """Test quantized storage codecs."""
+
+    @pytest.mark.parametrize("codec", ["float32", "float16", "int8"])
+    def test_codec_roundtrip_ranking(self, temp_db, codec):
+        """Quantized rows still rank the exact match first."""
+        mem = VectorMemory(temp_db, expected_dim=DIM, codec=codec)
+        mem.init()
+        for i in range(30):
+            mem.add(i, "monologue", f"text {i}", _vec(i))
+
+        for mode in ("matrix", "scan"):
+            mem._search_mode = mode
+            top = mem.search(_vec(11), top_k=1)[0]
+            assert top["episode_id"] == 11
+            assert top["score"] == pytest.approx(1.0, abs=1e-2)
+        mem.close()
+
+    def test_blob_sizes(self, temp_db):
+        """float16 halves and int8 quarters (plus scale) the BLOB size."""
+        sizes = {}
+        for codec in ("float32", "float16", "int8"):
+            mem = VectorMemory(temp_db, expected_dim=DIM, codec=codec)
+            mem.init()
+            row_id = mem.add(0, "monologue", codec, _vec(0))
+            sizes[codec] = mem._conn.execute(
+                "SELECT LENGTH(embedding) FROM vectors WHERE id = ?", (row_id,)
+            ).fetchone()[0]
+            mem.close()
+        assert sizes == {"float32": DIM * 4, "float16": DIM * 2, "int8": DIM + 4}
+
+    def test_mixed_codecs_and_legacy_schema(self, temp_db):
+        """A v1 table gains the codec column and mixes with new int8 rows."""
+        import sqlite3
+
+        conn = sqlite3.connect(str(temp_db))
+        conn.execute(
+            "CREATE TABLE vectors (id INTEGER PRIMARY KEY AUTOINCREMENT, episode_id INTEGER, "
+            "event_type TEXT, text TEXT, embedding BLOB NOT NULL, created_at REAL NOT NULL, "
+            "access_count INTEGER DEFAULT 0, last_access REAL)"
+        )
+        conn.execute(
+            "INSERT INTO vectors (episode_id, event_type, text, embedding, created_at) "
+            "VALUES (1, 'monologue', 'legacy', ?, ?)",
+            (np.asarray(_vec(1), dtype=np.float32).tobytes(), time.time()),
+        )
+        conn.commit()
+        conn.close()
+
+        mem = VectorMemory(temp_db, expected_dim=DIM, codec="int8")
+        mem.init()
+        mem.add(2, "monologue", "new", _vec(2))
+
+        assert mem.search(_vec(1), top_k=1)[0]["text"] == "legacy"
+        assert mem.search(_vec(2), top_k=1)[0]["text"] == "new"
+        mem.close()
+
+
+class TestBatchedWrites:
+    """Test the bulk write path."""
+
+    def test_add_many(self, vm):
+        """add_many stores valid records and returns their ids."""
+        vm.search(_vec(0), top_k=1)  # load matrix so it must stay in sync
+        records = [
+            {"episode_id": i, "event_type": "monologue", "text": f"t{i}", "embedding": _vec(i)}
+            for i in range(10)
+        ]
+        records.insert(3, {"episode_id": 99, "event_type": "x", "text": "bad", "embedding": [1.0]})
+
+        ids = vm.add_many(records)
+
+        assert len(ids) == 10
+        assert vm.count() == 10
+        assert vm._row_count == 10
+        hit = vm.search(_vec(4), top_k=1)[0]
+        assert hit["episode_id"] == 4 and hit["id"] == ids[4]
+
+    def test_add_many_triggers_cleanup_once(self, temp_db):
+        """Limit is enforced after a batch that overflows it."""
+        mem = VectorMemory(temp_db, expected_dim=DIM, max_vectors=5)
+        mem.init()
+        mem.add_many([
+            {"episode_id": i, "event_type": "m", "text": "t", "embedding": _vec(i)}
+            for i in range(8)
+        ])
+        assert mem.count() <= 5
+        assert mem.count() == mem._count_rows()
+        assert mem.get_stats()["total_cleanups"] == 1
+        mem.close()
+
+
+class TestEviction:
+    """Test watermark eviction and incremental vacuum."""
+
+    def test_watermark_eviction(self, temp_db):
+        """Crossing max_vectors evicts down to the low watermark."""
+        mem = VectorMemory(temp_db, expected_dim=DIM, max_vectors=20, evict_low_watermark=0.5)
+        mem.init()
+        for i in range(21):
+            mem.add(i, "monologue", f"t{i}", _vec(i))
+
+        assert mem.count() == 10
+        assert mem.count() == mem._count_rows()
+        assert mem.get_stats()["total_cleanups"] == 1
+
+        for i in range(10):
+            mem.add(100 + i, "monologue", "t", _vec(100 + i))
+        assert mem.get_stats()["total_cleanups"] == 1  # still under the high watermark
+        mem.close()
+
+    def test_incremental_vacuum_shrinks_file(self, temp_db):
+        """Freed pages are returned in bounded steps, not one VACUUM."""
+        mem = VectorMemory(temp_db, expected_dim=256, vacuum_step_pages=8)
+        mem.init()
+        assert mem.get_stats()["incremental_vacuum"]
+        rng = np.random.default_rng(0)
+        mem.add_many([
+            {"episode_id": i, "event_type": "m", "text": "t",
+             "embedding": rng.standard_normal(256).tolist()}
+            for i in range(500)
+        ])
+        mem._conn.execute("UPDATE vectors SET created_at = 0")
+        mem._conn.commit()
+        mem.delete_old(days=1)
+        free = mem._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        assert free > 8
+
+        assert mem.vacuum_step() == 8
+        while mem.vacuum_step():
+            pass
+        assert mem._conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+        assert not mem.get_stats()["vacuum_pending"]
+        mem.close()
+
+
+class TestAccessStats:
+    """Test deferred access-stat updates."""
+
+    def test_search_does_not_write(self, vm):
+        """Search buffers hits in memory; flush writes them in one go."""
+        for i in range(5):
+            vm.add(i, "monologue", f"t{i}", _vec(i))
+        changes = vm._conn.total_changes
+
+        vm.search(_vec(2), top_k=1)
+        vm.search(_vec(2), top_k=1)
+
+        assert vm._conn.total_changes == changes
+        assert vm.get_stats()["pending_access_stats"] == 1
+
+        assert vm.flush_access_stats() == 1
+        row = vm._conn.execute(
+            "SELECT access_count FROM vectors WHERE episode_id = 2"
+        ).fetchone()
+        assert row["access_count"] == 2
+
+    def test_close_flushes(self, temp_db):
+        """Pending hits survive close()."""
+        mem = VectorMemory(temp_db, expected_dim=DIM)
+        mem.init()
+        mem.add(1, "monologue", "t", _vec(1))
+        mem.search(_vec(1), top_k=1)
+        mem.close()
+
+        mem.init()
+        row = mem._conn.execute("SELECT access_count FROM vectors").fetchone()
+        assert row["access_count"] == 1
+        mem.close()
+
+
+class TestReadPool:
+    """Test reads through the read-only connection pool."""
+
+    def test_reads_use_pool(self, vm):
+        """Search and get_recent go through read-only connections."""
+        for i in range(5):
+            vm.add(i, "monologue", f"t{i}", _vec(i))
+        assert vm.search(_vec(3), top_k=1)[0]["episode_id"] == 3
+        assert len(vm.get_recent(3)) == 3
+        assert vm.get_stats()["pool"]["readers_open"] >= 1
+
+    def test_reader_not_blocked_by_writer(self, vm):
+        """An open write transaction does not block readers (WAL)."""
+        vm.add(1, "monologue", "t", _vec(1))
+        vm._conn.execute("BEGIN IMMEDIATE")
+        try:
+            assert vm._count_rows() == 1
+            assert vm.health_check()
+        finally:
+            vm._conn.rollback()
+
+    def test_pool_size_zero_uses_writer(self, temp_db):
+        """read_pool_size=0 keeps single-connection behaviour."""
+        mem = VectorMemory(temp_db, expected_dim=DIM, read_pool_size=0)
+        mem.init()
+        mem.add(1, "monologue", "t", _vec(1))
+        assert len(mem.search(_vec(1), top_k=1)) == 1
+        assert mem.get_stats()["pool"]["readers_open"] == 0
+        mem.close()
+
+    def test_matrix_catches_up_rows_added_during_build(self, vm):
+        """Rows written past the build snapshot are appended to the matrix."""
+        for i in range(3):
+            vm.add(i, "monologue", f"t{i}", _vec(i))
+        vm._matrix = None
+        matrix = vm._ensure_matrix()
+        assert matrix is not None and len(matrix) == 3